@@ -5,13 +5,22 @@ AI Interview Analyzer - Complete Interface
 import streamlit as st
 import os
 import tempfile
-from interview_analyzer.audio_processor import AudioProcessor
-from interview_analyzer.ai_analyzer import AIAnalyzer
-from interview_analyzer.sentiment_analyzer import SentimentAnalyzer
+from typing import Optional, Tuple
+from interview_analyzer.audio_processor import select_audio_processor
 from interview_analyzer.report_generator import ReportGenerator
-from interview_analyzer.pdf_generator import PDFGenerator
-from interview_analyzer.config import DOMAINS, ROUND_TYPES, ALLOWED_AUDIO_EXTENSIONS, MAX_FILE_SIZE_MB
+from interview_analyzer.config import DOMAINS, ROUND_TYPES, ALLOWED_AUDIO_EXTENSIONS, MAX_FILE_SIZE_MB, WHISPER_LATENCY_BUDGET
+from interview_analyzer.config import UPLOAD_DIR, OUTPUT_DIR, DISK_QUOTA_MB
+from interview_analyzer.models import InterviewReport, transcript_store
+from interview_analyzer.jobs import JobQueue, QueueFullError, QUEUED, RUNNING, DONE, FAILED
+from interview_analyzer.pipeline import analysis_job, screening_job, transcribe_recording
+from interview_analyzer.pipeline import AUDIO_ANALYSIS_STEPS, transcription_pool_size
+from interview_analyzer.search import ReportIndex, SCORE_COLUMNS
+from interview_analyzer.dedup import NearDuplicateIndex
+from interview_analyzer.resources import governor
+from interview_analyzer.storage import disk_usage, enforce_disk_quota
+import hashlib
 import time
+import uuid
 
 # Page configuration
 st.set_page_config(
@@ -26,8 +35,73 @@ if 'analysis_complete' not in st.session_state:
     st.session_state.analysis_complete = False
 if 'report_data' not in st.session_state:
     st.session_state.report_data = None
-if 'transcript' not in st.session_state:
-    st.session_state.transcript = None
+if 'transcript_id' not in st.session_state:
+    # Lease on the session's transcript in the shared store, released when the session goes away
+    st.session_state.transcript_lease = None
+    st.session_state.transcript_id = None
+if 'acoustic_metrics' not in st.session_state:
+    # Pause statistics of the last transcribed recording, keyed by its transcript ID
+    st.session_state.acoustic_metrics = None
+if 'duplicate' not in st.session_state:
+    # Earlier analysis of a near-duplicate transcript, offered before a new analysis is submitted
+    st.session_state.duplicate = None
+if 'batch' not in st.session_state:
+    # Recordings submitted together as {"name", "job_id"}, compared once all are analyzed
+    st.session_state.batch = []
+if 'owner' not in st.session_state:
+    # Near-duplicate matches are limited to this workspace's own analyses; the workspace ID
+    # is kept in the URL so a refresh, reconnect or bookmark stays in the same workspace
+    st.session_state.owner = st.query_params.get("workspace") or uuid.uuid4().hex
+if st.query_params.get("workspace") != st.session_state.owner:
+    st.query_params["workspace"] = st.session_state.owner
+if 'job_id' not in st.session_state:
+    # The job ID is mirrored in the URL so a refresh or reconnect picks the job back up
+    st.session_state.job_id = st.query_params.get("job")
+
+@st.cache_resource
+def get_report_index() -> ReportIndex:
+    """Search index over every finished report"""
+    return ReportIndex()
+
+@st.cache_resource
+def get_duplicate_index() -> NearDuplicateIndex:
+    """MinHash index of every fully analyzed transcript, scoped to the workspace that submitted it"""
+    return NearDuplicateIndex()
+
+@st.cache_resource
+def get_job_queue() -> JobQueue:
+    """Job queue shared by every session in this server process"""
+    job_queue = JobQueue(pools={"transcription": transcription_pool_size()})
+    job_queue.register("analysis", analysis_job)
+    job_queue.register("screening", screening_job, pool="transcription")
+    # Recordings are transcribed and analyzed on separate pools, so a batch keeps both busy
+    job_queue.register_steps("audio_analysis", AUDIO_ANALYSIS_STEPS)
+
+    report_index = get_report_index()
+    def index_report(job_id, kind, params, result):
+        report_index.add(job_id, result, params.get("domain"), params.get("round_type"))
+    job_queue.add_done_callback(index_report)
+
+    duplicate_index = get_duplicate_index()
+    def index_transcript(job_id, kind, params, result):
+        # Sampled screening transcripts are partial and would match nothing useful
+        if kind != "screening" and result.get("raw_transcript"):
+            duplicate_index.add(job_id, result["raw_transcript"], owner=params.get("owner", ""))
+    job_queue.add_done_callback(index_transcript)
+
+    job_queue.start()
+    # Grow the analysis pool while jobs wait, shrink it under memory pressure
+    governor.attach(job_queue)
+    governor.start()
+    return job_queue
+
+def set_transcript(transcript: str):
+    """Point the session at a transcript in the shared store"""
+    if st.session_state.transcript_lease is not None:
+        st.session_state.transcript_lease.release()
+    lease = transcript_store.lease(transcript) if transcript else None
+    st.session_state.transcript_lease = lease
+    st.session_state.transcript_id = lease.transcript_id if lease else None
 
 def main():
     """Main application function"""
@@ -66,6 +140,15 @@ def main():
             help="Choose the tone for feedback delivery"
         )
         
+        # Transcription latency budget
+        transcription_budget = st.number_input(
+            "Transcription Time Budget (seconds)",
+            min_value=0,
+            value=int(WHISPER_LATENCY_BUDGET),
+            step=30,
+            help="Use the most accurate Whisper model expected to finish in time (0 always uses 'base')"
+        )
+        
         st.markdown("---")
         st.markdown("### 📋 Instructions")
         st.markdown("""
@@ -78,9 +161,11 @@ def main():
         # API Key check
         if not os.getenv("GOOGLE_GEMINI_API_KEY"):
             st.warning("⚠️ Please set GOOGLE_GEMINI_API_KEY in your .env file")
+        
+        show_resources()
     
     # Main content area
-    tab1, tab2 = st.tabs(["📁 Upload & Analyze", "📊 Results"])
+    tab1, tab2, tab3 = st.tabs(["📁 Upload & Analyze", "📊 Results", "🔎 Search"])
     
     with tab1:
         st.header("Input Method")
@@ -95,11 +180,17 @@ def main():
         
         if input_method == "Audio File":
             st.subheader("Upload Audio File")
-            uploaded_file = st.file_uploader(
-                "Choose an audio file",
+            uploaded_files = st.file_uploader(
+                "Choose audio files",
                 type=[ext.replace(".", "") for ext in ALLOWED_AUDIO_EXTENSIONS],
-                help=f"Supported formats: {', '.join(ALLOWED_AUDIO_EXTENSIONS)}"
+                accept_multiple_files=True,
+                help=f"Supported formats: {', '.join(ALLOWED_AUDIO_EXTENSIONS)}. "
+                     "Upload several recordings to analyze them as a batch."
             )
+            uploaded_file = uploaded_files[0] if len(uploaded_files) == 1 else None
+            
+            if len(uploaded_files) > 1:
+                show_batch_upload(uploaded_files, domain, round_type, feedback_tone, transcription_budget)
             
             if uploaded_file:
                 file_size_mb = uploaded_file.size / (1024 * 1024)
@@ -110,101 +201,440 @@ def main():
                     
                     if st.button("🎯 Transcribe Audio", type="primary"):
                         with st.spinner("Transcribing audio... This may take a few minutes."):
+                            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp_file:
+                                tmp_file.write(uploaded_file.getvalue())
+                                tmp_path = tmp_file.name
                             try:
-                                audio_processor = AudioProcessor(model_size="base")
-                                result = audio_processor.process_uploaded_file(uploaded_file)
-                                transcript = result["text"]
-                                st.session_state.transcript = transcript
+                                audio_processor, selection = select_audio_processor(tmp_path, transcription_budget)
+                                if selection["predicted_seconds"] is not None:
+                                    st.caption(
+                                        f"Using Whisper '{selection['model_size']}' "
+                                        f"(about {selection['predicted_seconds']:.0f}s for "
+                                        f"{selection['audio_seconds'] / 60:.1f} min of audio)"
+                                    )
+                                transcript, acoustic = transcribe_recording(
+                                    tmp_path, audio_processor, predicted_seconds=selection["predicted_transcribe_seconds"]
+                                )
+                                set_transcript(transcript)
+                                st.session_state.acoustic_metrics = (st.session_state.transcript_id, acoustic)
                                 
                                 st.success("✅ Transcription complete!")
                                 st.text_area("Transcription Preview", transcript, height=200, disabled=True)
                             except Exception as e:
                                 st.error(f"Error during transcription: {str(e)}")
+                            finally:
+                                os.unlink(tmp_path)
+                    
+                    if round_type == "Screening Round" and st.button(
+                        "⚡ Quick Screen",
+                        help="Analyze the opening, closing and sampled answers only; the full analysis can be run later"
+                    ):
+                        audio_path = save_upload(uploaded_file)
+                        if audio_path:
+                            submit_audio_job("screening", audio_path, domain, round_type, feedback_tone)
         
         else:  # Text Transcript
             st.subheader("Enter Text Transcript")
             transcript = st.text_area(
                 "Paste or type the interview/discussion transcript here:",
                 height=300,
-                value=st.session_state.transcript if st.session_state.transcript else "",
+                value=transcript_store.get(st.session_state.transcript_id),
                 help="Paste the full transcript of the interview or group discussion"
             )
-            st.session_state.transcript = transcript
+            if transcript_store.make_id(transcript) != st.session_state.transcript_id:
+                set_transcript(transcript)
         
         # Analyze button
         if transcript:
             st.markdown("---")
             if st.button("🚀 Analyze Interview", type="primary", use_container_width=True):
                 analyze_interview(transcript, domain, round_type, feedback_tone)
+        
+        if st.session_state.duplicate and transcript:
+            show_duplicate_choice(transcript, domain, round_type, feedback_tone)
+        
+        polling = False
+        if st.session_state.job_id:
+            polling = show_job_status(st.session_state.job_id)
+        
+        if st.session_state.batch:
+            polling = show_batch_status() or polling
     
     with tab2:
         if st.session_state.analysis_complete and st.session_state.report_data:
-            display_results(st.session_state.report_data)
+            display_results(st.session_state.report_data.to_dict())
         else:
             st.info("👈 Please analyze an interview first using the 'Upload & Analyze' tab")
 
-def analyze_interview(transcript: str, domain: str, round_type: str, feedback_tone: str):
-    """Perform comprehensive interview analysis"""
+    with tab3:
+        show_search()
     
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    # Poll running jobs once every tab has been drawn
+    if polling:
+        time.sleep(1)
+        st.rerun()
+
+def show_resources():
+    """Sidebar summary of detected resources and the governor's current decisions"""
+    get_job_queue()
+    snapshot = governor.snapshot()
+    host, plan, memory = snapshot["host"], snapshot["plan"], snapshot["memory"]
+    with st.expander("🖥️ Resources"):
+        st.caption(f"{host['cpus']:g} CPUs ({host['cpu_source']}), "
+                   f"{host['memory_bytes'] / 2 ** 30:.1f} GB memory ({host['memory_source']})")
+        st.progress(min(memory["fraction"], 1.0), text=f"Memory in use: {memory['fraction']:.0%}")
+        for pools in snapshot["pools"]:
+            for pool, state in pools.items():
+                st.caption(f"{pool.title()}: {state['workers']} workers, {state['pending']} waiting")
+        st.caption(f"Whisper threads: {plan['whisper_threads'] or 'torch default'}, "
+                   f"PDF processes: {plan['render_processes']}")
+        for decision in snapshot["decisions"][-3:][::-1]:
+            when = time.strftime("%H:%M:%S", time.localtime(decision["time"]))
+            change = (f"{decision['pool']} {decision['before']} → {decision['after']}"
+                      if decision["action"] == "resize" else f"evicted {decision['cache']}")
+            st.caption(f"{when} {change} ({decision['reason']})")
+
+def show_search():
+    """Search past reports by text and participant scores"""
+    query = st.text_input("Search transcripts, key points and topics", placeholder='"system design" latency')
+    filters = {}
+    with st.expander("Score filters"):
+        columns = st.columns(len(SCORE_COLUMNS) - 1)
+        for column, score in zip(columns, SCORE_COLUMNS[:-1]):
+            low, high = column.slider(score.replace("_", " ").title(), 0.0, 1.0, (0.0, 1.0), 0.05)
+            if (low, high) != (0.0, 1.0):
+                filters[score] = (low, high)
+    if not query and not filters:
+        return
+
+    start = time.perf_counter()
+    results = get_report_index().search(query, filters, limit=20)
+    st.caption(f"{len(results)} result(s) in {(time.perf_counter() - start) * 1000:.0f} ms")
+    for result in results:
+        names = ", ".join(p["name"] for p in result["participants"])
+        st.markdown(f"**{result['timestamp']}** · {result['domain'] or ''} · {result['round_type'] or ''} · {names}")
+        if result["snippet"]:
+            st.markdown(f"> {result['snippet_markdown']}")
+        if st.button("Open report", key=f"search_{result['key']}"):
+            st.session_state.job_id = result["key"]
+            st.query_params["job"] = result["key"]
+            st.rerun()
+
+def find_duplicate(transcript: str, framing: dict):
+    """Most similar earlier analysis of this session whose report is still available, if any"""
+    for match in get_duplicate_index().find(transcript, owner=st.session_state.owner):
+        job = get_job_queue().get(match["key"])
+        if not job or job["status"] != DONE:
+            continue
+        # The same transcript in another tone or framing is re-analyzed from its cached facts
+        if job["result"].get("raw_transcript") == transcript and any(
+            job["params"].get(key) != value for key, value in framing.items()
+        ):
+            return None
+        return {**match, "timestamp": job["result"].get("timestamp", "")}
+    return None
+
+def show_duplicate_choice(transcript: str, domain: str, round_type: str, feedback_tone: str):
+    """Offer the earlier analysis of a near-duplicate transcript instead of a full run"""
+    duplicate = st.session_state.duplicate
+    st.info(
+        f"♻️ This transcript is {duplicate['similarity']:.0%} similar to one analyzed on "
+        f"{duplicate['timestamp']}."
+    )
+    col1, col2, col3 = st.columns(3)
+    if col1.button("📂 Open Earlier Analysis", use_container_width=True):
+        st.session_state.duplicate = None
+        st.session_state.job_id = duplicate["key"]
+        st.query_params["job"] = duplicate["key"]
+        st.rerun()
+    if col2.button("✏️ Update for Changes", use_container_width=True,
+                   help="Re-analyze only the sentences that differ from the earlier transcript"):
+        st.session_state.duplicate = None
+        job = get_job_queue().get(duplicate["key"])
+        previous = {"key": duplicate["key"], "transcript": job["result"].get("raw_transcript", ""),
+                    "report": job["result"]}
+        analyze_interview(transcript, domain, round_type, feedback_tone, previous=previous)
+        st.rerun()
+    if col3.button("🚀 Analyze From Scratch", use_container_width=True):
+        st.session_state.duplicate = None
+        analyze_interview(transcript, domain, round_type, feedback_tone, check_duplicates=False)
+        st.rerun()
+
+def analyze_interview(transcript: str, domain: str, round_type: str, feedback_tone: str,
+                      previous=None, check_duplicates: bool = True):
+    """Submit the interview for analysis on the shared background workers"""
+    params = {
+        "transcript": transcript,
+        "domain": domain,
+        "round_type": round_type,
+        "feedback_tone": feedback_tone,
+        "owner": st.session_state.owner
+    }
+    if previous is None and check_duplicates:
+        st.session_state.duplicate = find_duplicate(
+            transcript, {key: params[key] for key in ("domain", "round_type", "feedback_tone")}
+        )
+        if st.session_state.duplicate:
+            return
+    if previous:
+        params["previous"] = previous
+    if not check_duplicates:
+        # Analyzing from scratch must not reuse the cached facts of this transcript either
+        params["use_cached_facts"] = False
+    # Pause statistics still apply if the transcript was not edited after transcription
+    if st.session_state.acoustic_metrics:
+        transcript_id, acoustic = st.session_state.acoustic_metrics
+        if transcript_id == transcript_store.make_id(transcript):
+            params["acoustic"] = acoustic
+    try:
+        job_id = get_job_queue().submit("analysis", params)
+    except QueueFullError as e:
+        st.error(f"❌ {str(e)}")
+        return
     
+    st.session_state.job_id = job_id
+    st.query_params["job"] = job_id
+
+def fit_disk_quota(*new_paths: str) -> bool:
+    """
+    Make room within DISK_QUOTA_MB after storing uploads
+    
+    Cached PDFs and older recordings are removed, least recently used first; the
+    new uploads and recordings that queued or running jobs still need are kept.
+    
+    Returns:
+        Whether the output and upload directories now fit in the quota
+    """
+    from interview_analyzer.pdf_generator import CACHE_FILE
+    
+    quota_bytes = DISK_QUOTA_MB * 1024 * 1024
+    upload_dir = os.path.abspath(UPLOAD_DIR)
+    pinned = get_job_queue().store.param_values("audio_path", QUEUED, RUNNING)
+    enforce_disk_quota(
+        [OUTPUT_DIR, UPLOAD_DIR], quota_bytes,
+        evictable=lambda path: (os.path.dirname(os.path.abspath(path)) == upload_dir
+                                or bool(CACHE_FILE.fullmatch(os.path.basename(path)))),
+        keep=[*new_paths, *pinned]
+    )
+    return disk_usage([OUTPUT_DIR, UPLOAD_DIR]) <= quota_bytes
+
+def write_upload(uploaded_file) -> Tuple[str, bool]:
+    """Store an uploaded recording under its content hash; returns the path and whether it is new"""
+    data = uploaded_file.getvalue()
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(UPLOAD_DIR, hashlib.sha256(data).hexdigest() + os.path.splitext(uploaded_file.name)[1])
+    if os.path.exists(path):
+        return path, False
+    with open(path, "wb") as f:
+        f.write(data)
+    return path, True
+
+def save_upload(uploaded_file) -> Optional[str]:
+    """
+    Keep an uploaded recording for background jobs within the disk quota
+    
+    Returns:
+        Path of the stored recording, or None (after showing an error) when it does not fit
+    """
+    path, new = write_upload(uploaded_file)
+    if new and not fit_disk_quota(path):
+        os.remove(path)
+        st.error(f"❌ {uploaded_file.name}: not enough disk space left within the {DISK_QUOTA_MB}MB quota "
+                 "while other recordings are being analyzed; please try again later")
+        return None
+    return path
+
+def submit_audio_job(kind: str, audio_path: str, domain: str, round_type: str, feedback_tone: str, **extra):
+    """Submit a screening or full audio analysis job for a stored recording"""
+    params = {
+        "audio_path": audio_path,
+        "domain": domain,
+        "round_type": round_type,
+        "feedback_tone": feedback_tone,
+        "owner": st.session_state.owner,
+        **extra
+    }
     try:
-        # Step 1: Initialize analyzers
-        status_text.text("Initializing analyzers...")
-        progress_bar.progress(10)
-        
-        ai_analyzer = AIAnalyzer()
-        sentiment_analyzer = SentimentAnalyzer()
-        report_generator = ReportGenerator()
-        
-        # Step 2: AI Analysis
-        status_text.text("Performing AI analysis with Gemini...")
-        progress_bar.progress(30)
-        
-        analysis = ai_analyzer.analyze_conversation(
-            transcript=transcript,
-            domain=domain,
-            round_type=round_type,
-            feedback_tone=feedback_tone
-        )
-        
-        # Step 3: Sentiment Analysis
-        status_text.text("Analyzing sentiment and tone...")
-        progress_bar.progress(60)
-        
-        # Enhance participant data with sentiment analysis
-        if "participants" in analysis:
-            for speaker_id, data in analysis["participants"].items():
-                # Count filler words
-                participant_text = transcript  # In real scenario, extract speaker-specific text
-                filler_count = sentiment_analyzer.count_filler_words(participant_text)
-                data["filler_words_count"] = filler_count
-        
-        # Step 4: Generate report
-        status_text.text("Generating comprehensive report...")
-        progress_bar.progress(80)
-        
-        report_data = report_generator.generate_report_data(analysis)
-        st.session_state.report_data = report_data
+        job_id = get_job_queue().submit(kind, params)
+    except QueueFullError as e:
+        st.error(f"❌ {str(e)}")
+        return
+    
+    st.session_state.job_id = job_id
+    st.query_params["job"] = job_id
+
+def show_batch_upload(uploaded_files, domain: str, round_type: str, feedback_tone: str, budget_seconds: float):
+    """Check a multi-file upload and submit every recording for full analysis"""
+    too_large = [f.name for f in uploaded_files if f.size > MAX_FILE_SIZE_MB * 1024 * 1024]
+    if too_large:
+        st.error(f"Files exceed the maximum allowed size of {MAX_FILE_SIZE_MB}MB: {', '.join(too_large)}")
+        return
+    
+    total_mb = sum(f.size for f in uploaded_files) / (1024 * 1024)
+    # Every recording stays stored until its job finishes, so the whole batch must fit at once
+    if total_mb > DISK_QUOTA_MB:
+        st.error(f"Batch of {total_mb:.0f} MB exceeds the {DISK_QUOTA_MB}MB storage quota; "
+                 "please submit fewer recordings at a time")
+        return
+    st.success(f"✅ {len(uploaded_files)} files uploaded ({total_mb:.2f} MB)")
+    if not st.button(f"🚀 Analyze All {len(uploaded_files)} Recordings", type="primary", use_container_width=True):
+        return
+    
+    stored = [write_upload(uploaded_file) for uploaded_file in uploaded_files]
+    new_paths = [path for path, new in stored if new]
+    if new_paths and not fit_disk_quota(*[path for path, _ in stored]):
+        for path in new_paths:
+            os.remove(path)
+        st.error(f"❌ Not enough disk space left within the {DISK_QUOTA_MB}MB quota for this batch "
+                 "while other recordings are being analyzed; please try again later")
+        return
+    
+    batch = []
+    for uploaded_file, (audio_path, _) in zip(uploaded_files, stored):
+        params = {
+            "audio_path": audio_path,
+            "domain": domain,
+            "round_type": round_type,
+            "feedback_tone": feedback_tone,
+            "budget_seconds": budget_seconds,
+            "owner": st.session_state.owner
+        }
+        try:
+            batch.append({"name": uploaded_file.name, "job_id": get_job_queue().submit("audio_analysis", params)})
+        except QueueFullError as e:
+            st.error(f"❌ {uploaded_file.name}: {str(e)}")
+            break
+    st.session_state.batch = batch
+
+def show_batch_status() -> bool:
+    """
+    Per-recording progress of a batch, each result as it completes, then the comparison
+    
+    Returns:
+        Whether recordings are still being analyzed (the caller reruns the script to poll)
+    """
+    batch = st.session_state.batch
+    jobs = [get_job_queue().get(item["job_id"]) for item in batch]
+    finished = [job is None or job["status"] in (DONE, FAILED) for job in jobs]
+    
+    st.markdown("---")
+    st.subheader(f"📦 Batch: {sum(finished)} of {len(batch)} recordings finished")
+    for item, job in zip(batch, jobs):
+        if job is None:
+            st.warning(f"⚠️ {item['name']}: job no longer available")
+        elif job["status"] == FAILED:
+            st.error(f"❌ {item['name']}: {job['error']}")
+        elif job["status"] == DONE:
+            report = job["result"]
+            with st.expander(f"✅ {item['name']}"):
+                st.write(report.get("overall_summary", ""))
+                if st.button("📊 Open Report", key=f"batch_{item['job_id']}"):
+                    st.session_state.job_id = item["job_id"]
+                    st.query_params["job"] = item["job_id"]
+                    st.rerun()
+        else:
+            col1, col2 = st.columns([1, 2])
+            col1.text(item["name"])
+            col2.progress(int(job["progress"] or 0), text=job["stage"] or "Waiting for a free worker...")
+    
+    if all(finished):
+        reports = [(item["name"], job["result"]) for item, job in zip(batch, jobs) if job and job["status"] == DONE]
+        if reports:
+            show_batch_comparison(reports)
+        if st.button("🧹 Clear Batch"):
+            st.session_state.batch = []
+            st.rerun()
+        return False
+    return True
+
+def show_batch_comparison(reports: list):
+    """Compare the participants of every recording in a finished batch"""
+    st.subheader("⚖️ Batch Comparison")
+    rows = []
+    for name, report in reports:
+        recommendation = (report.get("assessment") or {}).get("recommendation", "")
+        for speaker_id, data in report.get("participants", {}).items():
+            rows.append({
+                "Recording": name,
+                "Participant": data.get("name", speaker_id),
+                "Confidence": data.get("confidence_score", 0),
+                "Clarity": data.get("clarity_score", 0),
+                "Empathy": data.get("empathy_score", 0),
+                "Engagement": data.get("engagement_score", 0),
+                "Filler Words": data.get("filler_words_count", 0),
+                "Sentiment": data.get("sentiment", ""),
+                "Recommendation": recommendation,
+            })
+    import pandas as pd
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    
+    participants = {
+        f"{i}_{speaker_id}": {**data, "name": f"{name} · {data.get('name', speaker_id)}"}
+        for i, (name, report) in enumerate(reports)
+        for speaker_id, data in report.get("participants", {}).items()
+    }
+    st.plotly_chart(ReportGenerator().create_confidence_chart(participants), use_container_width=True)
+
+def show_job_status(job_id: str) -> bool:
+    """
+    Show a submitted analysis job's progress and load its report when it finishes
+    
+    Returns:
+        Whether the job is still running (the caller reruns the script to poll)
+    """
+    job = get_job_queue().get(job_id)
+    if job is None:
+        st.session_state.job_id = None
+        st.query_params.pop("job", None)
+        return False
+    
+    if job["status"] == FAILED:
+        st.error(f"❌ Error during analysis: {job['error']}")
+        st.session_state.job_id = None
+        st.query_params.pop("job", None)
+        return False
+    
+    if job["status"] == DONE:
+        # Keep only the compact report; the transcript lives in the shared store
+        if st.session_state.report_data is not None:
+            st.session_state.report_data.release()
+        st.session_state.report_data = InterviewReport.from_dict(job["result"])
         st.session_state.analysis_complete = True
-        
-        progress_bar.progress(100)
-        status_text.text("✅ Analysis complete!")
-        time.sleep(1)
-        
+        st.session_state.job_id = None
+        st.query_params.pop("job", None)
         st.success("🎉 Analysis completed successfully! Check the 'Results' tab for insights.")
-        st.rerun()
-        
-    except Exception as e:
-        st.error(f"❌ Error during analysis: {str(e)}")
-        st.exception(e)
+        return False
+    
+    st.progress(int(job["progress"] or 0))
+    if job["status"] == QUEUED:
+        st.text(f"Waiting for a free worker ({get_job_queue().pending_count} job(s) queued)...")
+    else:
+        st.text(job["stage"] or "Starting analysis...")
+    return True
 
 def display_results(report_data: dict):
     """Display comprehensive analysis results"""
     
     st.header("📊 Analysis Results")
     
+    screening = report_data.get("screening")
+    if report_data.get("sampled") and screening:
+        st.warning(
+            f"⚡ Screening report from {screening['sampled_seconds'] / 60:.1f} of "
+            f"{screening['duration_seconds'] / 60:.1f} minutes "
+            f"({len(screening['windows'])} sampled windows, confidence {screening['confidence']:.0%})"
+        )
+        if st.button("🔄 Run Full Analysis", help="Transcribe and analyze the whole recording to refine this report"):
+            params = screening["params"]
+            if os.path.exists(params["audio_path"]):
+                submit_audio_job(
+                    "audio_analysis", params["audio_path"], params["domain"], params["round_type"],
+                    params["feedback_tone"], refines=report_data.get("timestamp")
+                )
+                st.rerun()
+            else:
+                st.error("❌ The recording is no longer stored; please upload it again")
+    
     # Overall Summary
     st.subheader("📝 Executive Summary")
     st.info(report_data.get("overall_summary", "No summary available."))
@@ -281,6 +711,25 @@ def display_results(report_data: dict):
         confidence_fig = report_gen.create_confidence_chart(participants)
         st.plotly_chart(confidence_fig, use_container_width=True)
     
+    # Pause & Hesitation Analysis (audio input only)
+    acoustic = report_data.get("acoustic_metrics")
+    if acoustic:
+        st.markdown("---")
+        st.subheader("⏸️ Pause & Hesitation Analysis")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Silence", f"{acoustic.get('silence_ratio', 0):.0%}")
+        col2.metric("Pauses / min", f"{acoustic.get('pauses_per_minute', 0):.1f}")
+        col3.metric("Long Silences", acoustic.get("long_pause_count", 0))
+        col4.metric("Longest Pause", f"{acoustic.get('max_pause_seconds', 0):.1f}s")
+        
+        speakers = {label: stats for label, stats in (acoustic.get("speakers") or {}).items() if label}
+        if speakers:
+            st.dataframe(
+                [{"Speaker": label, **stats} for label, stats in speakers.items()],
+                use_container_width=True
+            )
+    
     # Topics and Keywords
     st.markdown("---")
     col1, col2 = st.columns(2)
@@ -339,16 +788,17 @@ def display_results(report_data: dict):
     if st.button("📄 Generate & Download PDF Report", type="primary"):
         with st.spinner("Generating PDF report..."):
             try:
+                # ReportLab is only loaded once someone asks for a PDF
+                from interview_analyzer.pdf_generator import PDFGenerator
                 pdf_gen = PDFGenerator()
-                pdf_path = pdf_gen.generate_pdf(report_data)
+                pdf_bytes = pdf_gen.render_pdf(report_data)
                 
-                with open(pdf_path, "rb") as pdf_file:
-                    st.download_button(
-                        label="⬇️ Download PDF",
-                        data=pdf_file.read(),
-                        file_name=os.path.basename(pdf_path),
-                        mime="application/pdf"
-                    )
+                st.download_button(
+                    label="⬇️ Download PDF",
+                    data=pdf_bytes,
+                    file_name=f"interview_report_{time.strftime('%Y%m%d_%H%M%S')}.pdf",
+                    mime="application/pdf"
+                )
                 st.success("✅ PDF report generated successfully!")
             except Exception as e:
                 st.error(f"Error generating PDF: {str(e)}")
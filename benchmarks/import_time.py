@@ -0,0 +1,165 @@
+"""
+Cold start benchmark for text-only mode
+Measures import time (via python -X importtime) and baseline RSS in a fresh interpreter, and
+checks that neither the text-mode modules nor app.py's own imports load heavy modules
+
+Usage:
+    python benchmarks/import_time.py [--runs 5] [--max-import-ms 400] [--max-rss-mb 120] [--json results.json]
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+
+# What the app needs before a user has uploaded audio or asked for a PDF
+TEXT_MODE_MODULES = [
+    "interview_analyzer.config",
+    "interview_analyzer.models",
+    "interview_analyzer.jobs",
+    "interview_analyzer.pipeline",
+    "interview_analyzer.report_generator",
+    "interview_analyzer.audio_processor",
+]
+
+# Must not be loaded by the modules above
+HEAVY_MODULES = ["whisper", "torch", "plotly", "pandas", "reportlab", "google.generativeai", "librosa"]
+
+PROBE = """
+import json, resource, sys
+{imports}
+print(json.dumps({{
+    "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+def app_modules(path: str = APP_PATH):
+    """
+    Modules app.py imports when it loads, apart from Streamlit itself
+
+    app.py cannot be imported outside Streamlit, so its top-level import
+    statements are read instead.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names = [node.module]
+        else:
+            continue
+        modules.extend(name for name in names if name.split(".")[0] != "streamlit" and name not in modules)
+    return modules
+
+def parse_importtime(stderr: str):
+    """
+    Parse `python -X importtime` output
+
+    Returns:
+        Tuple of (total microseconds of top-level imports, list of (module, cumulative us))
+    """
+    total = 0
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        cumulative_us = int(fields[1])
+        name = fields[2]
+        entries.append((name.strip(), cumulative_us))
+        # Nested imports are indented under the package that triggered them
+        if not name[1:].startswith(" "):
+            total += cumulative_us
+    return total, entries
+
+def run_probe(modules):
+    """Import modules in a fresh interpreter and collect timings and memory"""
+    code = PROBE.format(imports="\n".join(f"import {m}" for m in modules), heavy=HEAVY_MODULES)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import probe failed:\n{proc.stderr[-2000:]}")
+    total_us, entries = parse_importtime(proc.stderr)
+    probe = json.loads(proc.stdout.strip().splitlines()[-1])
+    return total_us, entries, probe
+
+def measure(modules, runs: int):
+    """Best-of-N cold start measurement for a module set"""
+    best = None
+    for _ in range(runs):
+        total_us, entries, probe = run_probe(modules)
+        if best is None or total_us < best[0]:
+            best = (total_us, entries, probe)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement (best is kept)")
+    parser.add_argument("--max-import-ms", type=float, default=400.0, help="Fail if text-mode imports exceed this")
+    parser.add_argument("--max-rss-mb", type=float, default=120.0, help="Fail if RSS after imports exceeds this")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to list")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    baseline_us, _, baseline_probe = measure([], args.runs)
+    total_us, entries, probe = measure(TEXT_MODE_MODULES, args.runs)
+    modules = app_modules()
+    _, _, app_probe = run_probe(modules)
+
+    import_ms = (total_us - baseline_us) / 1000
+    rss_mb = probe["rss_kb"] / 1024
+    results = {
+        "modules": TEXT_MODE_MODULES,
+        "import_ms": round(import_ms, 1),
+        "interpreter_import_ms": round(baseline_us / 1000, 1),
+        "rss_mb": round(rss_mb, 1),
+        "interpreter_rss_mb": round(baseline_probe["rss_kb"] / 1024, 1),
+        "heavy_modules_loaded": probe["heavy"],
+        "app_modules": modules,
+        "app_heavy_modules_loaded": app_probe["heavy"],
+        "slowest_imports": [
+            {"module": name, "cumulative_ms": round(us / 1000, 1)}
+            for name, us in sorted(entries, key=lambda e: e[1], reverse=True)[:args.top]
+        ],
+    }
+
+    print(f"⏱️  Text-mode import time: {results['import_ms']} ms "
+          f"(interpreter startup imports: {results['interpreter_import_ms']} ms)")
+    print(f"🧠 RSS after imports: {results['rss_mb']} MB (bare interpreter: {results['interpreter_rss_mb']} MB)")
+    print("🐢 Slowest imports:")
+    for entry in results["slowest_imports"]:
+        print(f"   {entry['cumulative_ms']:>8.1f} ms  {entry['module']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failures = []
+    if probe["heavy"]:
+        failures.append(f"heavy modules imported eagerly: {', '.join(probe['heavy'])}")
+    if app_probe["heavy"]:
+        failures.append(f"heavy modules imported by app.py at load: {', '.join(app_probe['heavy'])}")
+    if import_ms > args.max_import_ms:
+        failures.append(f"import time {import_ms:.1f} ms > {args.max_import_ms} ms")
+    if rss_mb > args.max_rss_mb:
+        failures.append(f"RSS {rss_mb:.1f} MB > {args.max_rss_mb} MB")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Cold start within budget")
+
+if __name__ == "__main__":
+    main()
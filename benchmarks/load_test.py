@@ -0,0 +1,376 @@
+"""
+Load test simulating concurrent reviewer sessions
+Replays a mix of analyze / view results / download PDF actions against the stub LLM
+
+Usage:
+    python benchmarks/load_test.py --sessions 20 --actions 5 [--mix analyze=1,view=3,pdf=1]
+                                   [--mode pipeline|http|app] [--url http://127.0.0.1:8080]
+                                   [--size 5min] [--think 0.5] [--llm-latency 0.5] [--json results.json]
+
+Modes:
+    pipeline  In-process, like the Streamlit server: sessions share one JobQueue, poll their job,
+              rebuild the charts shown on the Results tab and render PDFs through the cache
+    http      Against the HTTP service (started in-process unless --url is given); the service has
+              no result or PDF endpoints, so "view" maps to GET /health and "pdf" is dropped from the mix
+    app       Streamlit's headless AppTest client driving app.py (requires streamlit)
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+from urllib.parse import urlsplit
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from synthetic import SIZES, SIZE_NAMES, generate_transcript  # noqa: E402
+
+ACTIONS = ("analyze", "view", "pdf")
+
+def rss_bytes() -> int:
+    """Current resident set size (falls back to peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse "analyze=1,view=3,pdf=1" into action weights"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ACTIONS:
+            raise ValueError(f"Unknown action '{name}' (choose from {', '.join(ACTIONS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+class PipelineSession:
+    """One reviewer session against an in-process JobQueue, mirroring app.py"""
+
+    def __init__(self, job_queue, transcript: str, pdf_dir: str, poll_interval: float):
+        from interview_analyzer.pdf_generator import PDFGenerator
+        from interview_analyzer.report_generator import ReportGenerator
+        self.job_queue = job_queue
+        self.transcript = transcript
+        self.poll_interval = poll_interval
+        self.report = None
+        self._charts = ReportGenerator()
+        self._pdf = PDFGenerator(output_dir=pdf_dir)
+
+    def analyze(self):
+        from interview_analyzer.jobs import DONE, FAILED
+        from interview_analyzer.models import InterviewReport
+        job_id = self.job_queue.submit("analysis", {"transcript": self.transcript})
+        while True:
+            job = self.job_queue.get(job_id)
+            if job["status"] == DONE:
+                self.report = InterviewReport.from_dict(job["result"])
+                return
+            if job["status"] == FAILED:
+                raise RuntimeError(job["error"])
+            time.sleep(self.poll_interval)
+
+    def view(self):
+        report_data = self.report.to_dict()
+        self._charts.create_sentiment_chart(report_data.get("sentiment_trend", []))
+        participants = report_data.get("participants", {})
+        if participants:
+            self._charts.create_confidence_chart(participants)
+            for participant in participants.values():
+                self._charts.create_radar_chart(participant)
+
+    def pdf(self):
+        self._pdf.render_pdf(self.report.to_dict())
+
+    def close(self):
+        pass
+
+class HTTPSession:
+    """One client of the HTTP service over a keep-alive connection"""
+
+    def __init__(self, url: str, transcript: str):
+        parts = urlsplit(url)
+        self.conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=300)
+        self.transcript = transcript
+        self.report = None
+
+    def analyze(self):
+        body = json.dumps({"transcript": self.transcript})
+        self.conn.request("POST", "/analyze/transcript", body, {"Content-Type": "application/json"})
+        response = self.conn.getresponse()
+        payload = response.read()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}: {payload[:200]!r}")
+        last = json.loads(payload.decode("utf-8").strip().splitlines()[-1])
+        if last["event"] != "result":
+            raise RuntimeError(last.get("message", "analysis failed"))
+        self.report = last["report"]
+
+    def view(self):
+        self.conn.request("GET", "/health")
+        response = self.conn.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+
+    def close(self):
+        self.conn.close()
+
+_parse_lock = threading.Lock()
+
+def _serialize_script_parsing():
+    """Make Streamlit parse app.py one session at a time
+
+    AppTest re-parses the script on every run, and concurrent ast.parse calls from several
+    threads can fail in CPython 3.11 with "AST constructor recursion depth mismatch"
+    """
+    from streamlit.runtime.scriptrunner import magic
+    if getattr(magic.add_magic, "serialized", False):
+        return
+    add_magic = magic.add_magic
+
+    def serialized_add_magic(code, script_path):
+        with _parse_lock:
+            return add_magic(code, script_path)
+
+    serialized_add_magic.serialized = True
+    magic.add_magic = serialized_add_magic
+
+class AppSession:
+    """One browser session driven through Streamlit's headless AppTest client"""
+
+    def __init__(self, transcript: str, timeout: float):
+        from streamlit.testing.v1 import AppTest
+        _serialize_script_parsing()
+        self.app = AppTest.from_file(os.path.join(REPO_ROOT, "app.py"), default_timeout=timeout)
+        self.app.run()
+        self.app.radio[0].set_value("Text Transcript").run()
+        self.app.text_area[0].input(transcript).run()
+        self.report = None
+
+    def _button(self, label_prefix: str):
+        return next(b for b in self.app.button if b.label.startswith(label_prefix))
+
+    def analyze(self):
+        # The app polls its job with st.rerun() until the report is loaded
+        self._button("🚀").click().run()
+        if self.app.exception:
+            raise RuntimeError(str(self.app.exception[0].message))
+        self.report = self.app.session_state["report_data"]
+
+    def view(self):
+        self.app.run()
+
+    def pdf(self):
+        self._button("📄").click().run()
+        if self.app.exception:
+            raise RuntimeError(str(self.app.exception[0].message))
+
+    def close(self):
+        pass
+
+def run_session(
+    session_factory: Callable,
+    session_index: int,
+    actions: int,
+    weights: Dict[str, float],
+    think: float,
+    seed: int
+) -> Dict:
+    """Run one session's action sequence and return its latencies and errors"""
+    rng = random.Random(seed + session_index)
+    names, probabilities = zip(*weights.items())
+    latencies: Dict[str, List[float]] = {name: [] for name in ACTIONS}
+    errors: Dict[str, int] = {}
+    session = session_factory(session_index)
+    try:
+        for _ in range(actions):
+            action = rng.choices(names, probabilities)[0]
+            # Results and PDFs need a report, as in the UI
+            if action != "analyze" and session.report is None:
+                action = "analyze"
+            start = time.perf_counter()
+            try:
+                getattr(session, action)()
+                latencies[action].append(time.perf_counter() - start)
+            except Exception as e:
+                key = f"{action}: {type(e).__name__}"
+                errors[key] = errors.get(key, 0) + 1
+            if think:
+                time.sleep(rng.uniform(0, 2 * think))
+    finally:
+        session.close()
+    return {"latencies": latencies, "errors": errors}
+
+def start_http_service(workers: int, queue_size: int) -> str:
+    """Start the HTTP service on a free port in a background event loop"""
+    import asyncio
+    from interview_analyzer.server import AnalysisService
+
+    ready = threading.Event()
+    address = {}
+
+    def serve():
+        async def main():
+            service = AnalysisService(workers=workers, queue_size=queue_size)
+            server = await service.start("127.0.0.1", 0)
+            address["port"] = server.sockets[0].getsockname()[1]
+            ready.set()
+            async with server:
+                await server.serve_forever()
+        asyncio.run(main())
+
+    threading.Thread(target=serve, name="load-test-server", daemon=True).start()
+    ready.wait(10)
+    return f"http://127.0.0.1:{address['port']}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent simulated sessions")
+    parser.add_argument("--actions", type=int, default=5, help="Actions per session")
+    parser.add_argument("--mix", default="analyze=1,view=3,pdf=1", help="Action weights")
+    parser.add_argument("--mode", choices=("pipeline", "http", "app"), default="pipeline")
+    parser.add_argument("--url", help="HTTP mode: service URL (default: start one in-process)")
+    parser.add_argument("--size", choices=SIZE_NAMES, default="5min", help="Synthetic transcript size")
+    parser.add_argument("--think", type=float, default=0.2, help="Mean think time between actions (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Stub LLM latency per call (s)")
+    parser.add_argument("--workers", type=int, help="Analysis workers (default: configured value)")
+    parser.add_argument("--queue-size", type=int, default=1000, help="Maximum queued analyses")
+    parser.add_argument("--poll-interval", type=float, default=0.1, help="Pipeline mode: job poll interval (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    if args.mode == "http" and "pdf" in weights:
+        del weights["pdf"]
+        print("ℹ️  HTTP mode: the service has no PDF endpoint, dropping 'pdf' from the mix")
+
+    # Configure the stub LLM before the package reads its settings
+    os.environ["INTERVIEW_ANALYZER_STUB_LLM"] = "1"
+    os.environ["INTERVIEW_ANALYZER_STUB_LLM_LATENCY"] = str(args.llm_latency)
+    # Every analyze action runs the full analysis rather than feedback from cached facts
+    os.environ.setdefault("INTERVIEW_ANALYZER_FACTS_CACHE_ENTRIES", "0")
+
+    _, minutes, speakers = next(s for s in SIZES if s[0] == args.size)
+    transcripts = [generate_transcript(minutes, speakers, seed=args.seed + i) for i in range(args.sessions)]
+
+    with tempfile.TemporaryDirectory(prefix="load_test_") as tmp_dir:
+        if args.mode == "app":
+            # app.py opens its job and index databases from the configured paths
+            for store in ("JOB", "SEARCH", "DEDUP"):
+                os.environ.setdefault(f"INTERVIEW_ANALYZER_{store}_DB", os.path.join(tmp_dir, f"{store.lower()}.sqlite3"))
+        results = run_load(args, weights, transcripts, tmp_dir)
+    report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if results["errors"]:
+        sys.exit(1)
+
+def run_load(args, weights: Dict[str, float], transcripts: List[str], tmp_dir: str) -> Dict:
+    """Run every session concurrently and summarize them; job and index databases live in tmp_dir"""
+    from interview_analyzer.config import ANALYSIS_WORKERS
+    from interview_analyzer.resources import governor
+    workers = args.workers or ANALYSIS_WORKERS or governor.plan["analysis_workers"]
+
+    job_queue = None
+    if args.mode == "pipeline":
+        from interview_analyzer.jobs import JobQueue, JobStore
+        from interview_analyzer.pipeline import analysis_job
+        job_queue = JobQueue(JobStore(os.path.join(tmp_dir, "jobs.sqlite3")), workers, args.queue_size)
+        job_queue.register("analysis", analysis_job)
+        job_queue.start()
+        factory = lambda i: PipelineSession(job_queue, transcripts[i], tmp_dir, args.poll_interval)  # noqa: E731
+        # Load chart and PDF libraries up front so RSS growth reflects session state, not imports
+        import plotly.graph_objects  # noqa: F401
+        import interview_analyzer.pdf_generator  # noqa: F401
+    elif args.mode == "http":
+        url = args.url or start_http_service(workers, args.queue_size)
+        factory = lambda i: HTTPSession(url, transcripts[i])  # noqa: E731
+    else:
+        factory = lambda i: AppSession(transcripts[i], timeout=600)  # noqa: E731
+
+    rss_start = rss_bytes()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions, thread_name_prefix="session") as pool:
+        sessions = list(pool.map(
+            lambda i: run_session(factory, i, args.actions, weights, args.think, args.seed),
+            range(args.sessions)
+        ))
+    wall = time.perf_counter() - start
+    rss_end = rss_bytes()
+    if job_queue is not None:
+        job_queue.shutdown()
+    return summarize(args, sessions, wall, rss_start, rss_end)
+
+def summarize(args, sessions: List[Dict], wall: float, rss_start: int, rss_end: int) -> Dict:
+    """Aggregate per-session results"""
+    actions = {}
+    completed = 0
+    for name in ACTIONS:
+        values = [v for s in sessions for v in s["latencies"][name]]
+        if not values:
+            continue
+        completed += len(values)
+        actions[name] = {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 50) * 1000, 1),
+            "p95_ms": round(percentile(values, 95) * 1000, 1),
+            "p99_ms": round(percentile(values, 99) * 1000, 1),
+            "max_ms": round(max(values) * 1000, 1),
+        }
+    errors: Dict[str, int] = {}
+    for session in sessions:
+        for key, count in session["errors"].items():
+            errors[key] = errors.get(key, 0) + count
+
+    return {
+        "mode": args.mode,
+        "sessions": args.sessions,
+        "actions_per_session": args.actions,
+        "size": args.size,
+        "llm_latency": args.llm_latency,
+        "wall_seconds": round(wall, 2),
+        "throughput_actions_per_s": round(completed / wall, 2) if wall else None,
+        "actions": actions,
+        "errors": errors,
+        "rss_start_mb": round(rss_start / 2**20, 1),
+        "rss_end_mb": round(rss_end / 2**20, 1),
+        "rss_growth_per_session_kb": round((rss_end - rss_start) / 1024 / max(args.sessions, 1), 1),
+    }
+
+def report(results: Dict):
+    """Print a human-readable summary"""
+    print(f"👥 {results['sessions']} sessions x {results['actions_per_session']} actions "
+          f"({results['mode']} mode, {results['size']} transcripts) in {results['wall_seconds']} s")
+    print(f"🚀 Throughput: {results['throughput_actions_per_s']} actions/s")
+    print(f"   {'action':<8} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, stats in results["actions"].items():
+        print(f"   {name:<8} {stats['count']:>6} {stats['p50_ms']:>9} {stats['p95_ms']:>9} "
+              f"{stats['p99_ms']:>9} {stats['max_ms']:>9}")
+    print(f"🧠 RSS {results['rss_start_mb']} MB -> {results['rss_end_mb']} MB "
+          f"({results['rss_growth_per_session_kb']} KB per session)")
+    for key, count in results["errors"].items():
+        print(f"❌ {key} x{count}")
+
+if __name__ == "__main__":
+    main()
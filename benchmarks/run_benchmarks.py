@@ -0,0 +1,296 @@
+"""
+Offline benchmark suite for the analysis pipeline
+Runs per-component microbenchmarks and end-to-end pipeline runs on synthetic data with the stub LLM
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 5min,30min] [--repeat 3] [--only pdf,pipeline]
+                                        [--json results.json] [--thresholds benchmarks/thresholds.json]
+                                        [--baseline previous.json --max-regression 1.5]
+
+Sizes: 5min (2 speakers), 30min (4), 1h (8), 2h (12); use --sizes all for every size.
+Exits with status 1 when a benchmark exceeds its threshold or regresses against the baseline.
+
+Thresholds are relative to the machine they were recorded on. A fixed calibration workload
+is timed on every run, each max_ms is scaled by how much slower or faster this machine is
+than the recorded "_calibration.reference_ms", and then multiplied by the tolerance factor.
+After tightening thresholds, record the new reference with --calibrate.
+"""
+import argparse
+import collections
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+# The stub LLM must be selected before the package reads its configuration
+os.environ.setdefault("INTERVIEW_ANALYZER_STUB_LLM", "1")
+os.environ.setdefault("INTERVIEW_ANALYZER_STUB_LLM_LATENCY", "0")
+# Repeated analyses of the same transcript must not be served from cached facts
+os.environ.setdefault("INTERVIEW_ANALYZER_FACTS_CACHE_ENTRIES", "0")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from synthetic import SIZES, SIZE_NAMES, generate_transcript, write_wav  # noqa: E402
+
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+
+class Skip(Exception):
+    """Raised by a benchmark whose optional dependency is missing"""
+
+MIN_SAMPLE_SECONDS = 0.2
+DEFAULT_TOLERANCE = 1.5
+
+def time_call(fn, repeat: int):
+    """
+    Time fn and return per-call durations in ms, one per sample
+
+    Like timeit's autorange, fast functions are looped until a sample takes at
+    least MIN_SAMPLE_SECONDS so millisecond benchmarks are not dominated by noise.
+    """
+    start = time.perf_counter()
+    fn()  # warm-up, also used to size the loop
+    first = time.perf_counter() - start
+    loops = max(1, int(MIN_SAMPLE_SECONDS / first)) if first > 0 else 1000
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        durations.append((time.perf_counter() - start) * 1000 / loops)
+    return durations
+
+def calibration_workload():
+    """Fixed pure-Python counting and sorting, close to the text processing being benchmarked"""
+    counts = collections.Counter()
+    for i in range(50000):
+        counts[str(i * 7919 % 1009)] += 1
+    return sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+
+def calibrate(repeat: int = 5) -> float:
+    """Median time of the calibration workload on this machine, in ms"""
+    return statistics.median(time_call(calibration_workload, repeat))
+
+def build_benchmarks(sizes, tmp_dir: str):
+    """
+    Collect benchmarks as (name, setup) pairs
+
+    setup() prepares inputs outside the timed region and returns
+    (callable to time, work units, unit name).
+    """
+    from interview_analyzer.sentiment_analyzer import SentimentAnalyzer
+    from interview_analyzer.transcript import split_turns, speech_text, top_keywords
+    from interview_analyzer.pipeline import compute_local_metrics, run_analysis
+
+    benchmarks = []
+    transcripts = {}
+
+    def transcript_for(size):
+        if size not in transcripts:
+            _, minutes, speakers = next(s for s in SIZES if s[0] == size)
+            transcripts[size] = generate_transcript(minutes, speakers, seed=42)
+        return transcripts[size]
+
+    for size in sizes:
+        def fillers(size=size):
+            text = transcript_for(size)
+            analyzer = SentimentAnalyzer()
+            return (lambda: analyzer.count_filler_words(text)), len(text), "chars"
+
+        def sentiment_segments(size=size):
+            segments = [{"text": text} for _, text in split_turns(transcript_for(size))]
+            analyzer = SentimentAnalyzer()
+            return (lambda: analyzer.analyze_segments(segments)), len(segments), "segments"
+
+        def sentiment_batched(size=size):
+            text = transcript_for(size)
+            return (lambda: compute_local_metrics(text)), len(text), "chars"
+
+        def keywords(size=size):
+            text = transcript_for(size)
+            return (lambda: top_keywords(speech_text(text))), len(text), "chars"
+
+        def pipeline(size=size):
+            text = transcript_for(size)
+            return (lambda: run_analysis(text)), 1, "reports"
+
+        benchmarks += [
+            (f"fillers.{size}", fillers),
+            (f"sentiment.segments.{size}", sentiment_segments),
+            (f"sentiment.batched.{size}", sentiment_batched),
+            (f"keywords.{size}", keywords),
+            (f"pipeline.{size}", pipeline),
+        ]
+
+    def sample_report():
+        return run_analysis(transcript_for(sizes[0]))
+
+    def charts():
+        try:
+            import plotly  # noqa: F401
+        except ImportError:
+            raise Skip("plotly not installed")
+        from interview_analyzer.report_generator import ReportGenerator
+        report = sample_report()
+        generator = ReportGenerator()
+        participant = next(iter(report["participants"].values()))
+
+        def build():
+            generator.create_sentiment_chart(report["sentiment_trend"])
+            generator.create_confidence_chart(report["participants"])
+            generator.create_radar_chart(participant)
+        return build, 3, "charts"
+
+    def pdf():
+        try:
+            import reportlab  # noqa: F401
+        except ImportError:
+            raise Skip("reportlab not installed")
+        from interview_analyzer.pdf_generator import PDFGenerator
+        report = sample_report()
+        generator = PDFGenerator(output_dir=tmp_dir, use_cache=False)
+        return (lambda: generator.render_pdf(report)), 1, "pdfs"
+
+    def transcription():
+        try:
+            import whisper  # noqa: F401
+        except ImportError:
+            raise Skip("openai-whisper not installed")
+        from interview_analyzer.audio_processor import AudioProcessor
+        path = write_wav(os.path.join(tmp_dir, "bench.wav"), 30, 2, seed=42)
+        processor = AudioProcessor(model_size="tiny")
+        return (lambda: processor.transcribe_audio(path, language="en")), 30, "audio seconds"
+
+    benchmarks += [("charts", charts), ("pdf.render", pdf), ("transcribe.tiny", transcription)]
+    return benchmarks
+
+def threshold_scale(thresholds, calibration_ms: float, tolerance: float = None) -> float:
+    """
+    Factor applied to every max_ms
+
+    Args:
+        thresholds: Parsed thresholds file; its "_calibration" entry holds the reference
+            calibration time and the default tolerance
+        calibration_ms: Calibration time measured on this machine
+        tolerance: Overrides the file's tolerance factor
+    """
+    calibration = thresholds.get("_calibration", {})
+    if tolerance is None:
+        tolerance = calibration.get("tolerance", DEFAULT_TOLERANCE)
+    reference = calibration.get("reference_ms")
+    speed = calibration_ms / reference if reference and calibration_ms else 1.0
+    return speed * tolerance
+
+def check(results, thresholds, baseline, max_regression: float, scale: float = 1.0):
+    """Compare median timings against scaled thresholds and a previous run"""
+    failures = []
+    baseline_medians = {b["name"]: b["median_ms"] for b in (baseline or {}).get("benchmarks", []) if "median_ms" in b}
+    for bench in results:
+        if "median_ms" not in bench:
+            continue
+        limit = thresholds.get(bench["name"], {}).get("max_ms")
+        if limit is not None and bench["median_ms"] > limit * scale:
+            failures.append(
+                f"{bench['name']}: {bench['median_ms']:.1f} ms > {limit * scale:.1f} ms "
+                f"({limit} ms x {scale:.2f})"
+            )
+        previous = baseline_medians.get(bench["name"])
+        if previous and bench["median_ms"] > previous * max_regression:
+            failures.append(
+                f"{bench['name']}: {bench['median_ms']:.1f} ms is {bench['median_ms'] / previous:.2f}x "
+                f"the baseline {previous:.1f} ms (limit {max_regression}x)"
+            )
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="5min,30min", help="Comma-separated sizes, or 'all'")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (median is reported)")
+    parser.add_argument("--only", help="Comma-separated name prefixes to run")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS, help="JSON file of {name: {max_ms}}")
+    parser.add_argument("--tolerance", type=float, help="Headroom factor on thresholds (default from the file)")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="Record this machine's calibration time as the thresholds' reference and exit")
+    parser.add_argument("--baseline", help="Previous --json output to compare against")
+    parser.add_argument("--max-regression", type=float, default=1.5, help="Allowed slowdown vs the baseline")
+    args = parser.parse_args()
+
+    sizes = SIZE_NAMES if args.sizes == "all" else args.sizes.split(",")
+    unknown = set(sizes) - set(SIZE_NAMES)
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(sorted(unknown))} (choose from {', '.join(SIZE_NAMES)})")
+    prefixes = args.only.split(",") if args.only else None
+
+    thresholds = {}
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds) as f:
+            thresholds = json.load(f)
+    calibration_ms = calibrate()
+    print(f"⚖️  {'calibration':<28} {calibration_ms:>10.2f} ms")
+    if args.calibrate:
+        thresholds.setdefault("_calibration", {"tolerance": DEFAULT_TOLERANCE})["reference_ms"] = round(calibration_ms, 2)
+        with open(args.thresholds, "w") as f:
+            json.dump(thresholds, f, indent=2)
+            f.write("\n")
+        print(f"✅ Recorded calibration reference in {args.thresholds}")
+        return
+    scale = threshold_scale(thresholds, calibration_ms, args.tolerance)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, setup in build_benchmarks(sizes, tmp_dir):
+            if prefixes and not any(name.startswith(p) for p in prefixes):
+                continue
+            try:
+                fn, units, unit_name = setup()
+            except Skip as e:
+                print(f"⏭️  {name:<28} skipped ({e})")
+                results.append({"name": name, "skipped": str(e)})
+                continue
+
+            durations = time_call(fn, args.repeat)
+            median = statistics.median(durations)
+            results.append({
+                "name": name,
+                "median_ms": round(median, 3),
+                "min_ms": round(min(durations), 3),
+                "max_ms": round(max(durations), 3),
+                "runs": args.repeat,
+                "units": units,
+                "unit": unit_name,
+                "throughput_per_s": round(units / (median / 1000), 1) if median else None,
+            })
+            print(f"⏱️  {name:<28} {median:>10.2f} ms   {units / (median / 1000):>12,.0f} {unit_name}/s")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    output = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "calibration_ms": round(calibration_ms, 3),
+        "threshold_scale": round(scale, 3),
+        "sizes": sizes,
+        "benchmarks": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(output, f, indent=2)
+
+    failures = check(results, thresholds, baseline, args.max_regression, scale)
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ All benchmarks within thresholds")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Report search benchmark
+Builds a search index over synthetic reports and measures top-k query latency
+
+Usage:
+    python benchmarks/search_index.py [--reports 100000] [--words 300] [--db /tmp/search.sqlite3]
+
+Transcripts are kept short by default so 100k reports build in minutes; query cost depends
+on posting list lengths (how many reports contain a term), which the topic mix controls.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from synthetic import PHRASES, FILLERS
+
+# (phrase, share of reports that discuss it)
+TOPICS = [
+    ("system design", 0.3),
+    ("conflict resolution", 0.1),
+    ("stakeholder management", 0.05),
+    ("kubernetes migration", 0.01),
+    ("quarterly sales forecast", 0.002),
+]
+
+QUERIES = [
+    ("rare phrase", '"quarterly sales forecast"', None),
+    ("uncommon phrase", '"kubernetes migration"', None),
+    ("common phrase", '"system design"', None),
+    ("very common word", "latency", None),
+    ("phrase + filter", '"conflict resolution"', {"confidence_score": (0.8, None)}),
+    ("two filters", "", {"confidence_score": (0.85, None), "clarity_score": (None, 0.6)}),
+    ("common phrase + filter", '"system design"', {"engagement_score": (0.9, None)}),
+]
+
+def synthetic_report(rng: random.Random, words: int):
+    text, topics = [], []
+    for phrase, share in TOPICS:
+        if rng.random() < share:
+            topics.append(phrase)
+    while sum(len(t.split()) for t in text) < words:
+        if topics and rng.random() < 0.1:
+            text.append(f"we discussed {rng.choice(topics)} in depth")
+        else:
+            text.append(rng.choice(PHRASES))
+        if rng.random() < 0.2:
+            text.append(rng.choice(FILLERS))
+    participants = {
+        f"speaker_{i + 1}": {
+            "name": name,
+            "confidence_score": round(rng.random(), 2),
+            "clarity_score": round(rng.random(), 2),
+            "empathy_score": round(rng.random(), 2),
+            "engagement_score": round(rng.random(), 2),
+            "filler_words_count": rng.randint(0, 40),
+            "key_points": [rng.choice(PHRASES)],
+            "strengths": topics[:1],
+        }
+        for i, name in enumerate(["Interviewer", "Candidate"])
+    }
+    return {
+        "timestamp": "2025-01-01 00:00:00",
+        "overall_summary": "Synthetic interview",
+        "participants": participants,
+        "topics": topics,
+        "keywords": [],
+        "raw_transcript": "Candidate: " + ". ".join(text),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=300, help="Transcript length per report")
+    parser.add_argument("--db", default="/tmp/interview_search_benchmark.sqlite3")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from interview_analyzer.search import ReportIndex
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.db + suffix):
+            os.unlink(args.db + suffix)
+    index = ReportIndex(args.db)
+
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for i in range(args.reports):
+        index.add(f"report-{i}", synthetic_report(rng, args.words), domain=rng.choice(["Tech", "HR", "Sales"]))
+    build = time.perf_counter() - start
+    index.optimize()
+    print(f"📚 Indexed {args.reports} reports in {build:.1f} s "
+          f"({args.reports / build:.0f}/s, {os.path.getsize(args.db) / 1e6:.0f} MB)")
+
+    start = time.perf_counter()
+    index.add("report-0", synthetic_report(rng, args.words))
+    print(f"✏️  Incremental update of one report: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    for name, query, filters in QUERIES:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results = index.search(query, filters, limit=args.limit)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        print(f"   {name:<24} p50 {statistics.median(timings):7.2f} ms   "
+              f"p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms   ({len(results)} results)")
+
+if __name__ == "__main__":
+    main()
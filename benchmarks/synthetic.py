@@ -0,0 +1,185 @@
+"""
+Synthetic interview data for benchmarks and load tests
+Deterministic transcripts and audio at realistic sizes, no recordings or API keys needed
+"""
+from typing import Iterator, List, Tuple
+import random
+import wave
+
+import numpy as np
+
+WORDS_PER_MINUTE = 150
+SAMPLE_RATE = 16000
+
+# (name, minutes, speakers) from a short screening call to a long panel discussion
+SIZES: List[Tuple[str, int, int]] = [
+    ("5min", 5, 2),
+    ("30min", 30, 4),
+    ("1h", 60, 8),
+    ("2h", 120, 12),
+]
+
+SIZE_NAMES = [name for name, _, _ in SIZES]
+
+PHRASES = [
+    "I worked on a distributed caching layer for our payments platform",
+    "the main challenge was keeping latency low while traffic doubled",
+    "we measured everything before changing the database schema",
+    "my role was to coordinate between the backend and data teams",
+    "I would start by clarifying the requirements with the stakeholders",
+    "the trade-off there is consistency versus availability",
+    "we wrote integration tests for every service boundary",
+    "I disagree slightly because the cost of migration is high",
+    "that is a good point and we should consider the user impact",
+    "in my last project we reduced onboarding time by forty percent",
+    "the team adopted code review checklists after that incident",
+    "I prefer to prototype quickly and then harden the design",
+    "communication with the client was weekly and very transparent",
+    "we used feature flags so we could roll back safely",
+    "the candidate experience matters as much as the hiring decision",
+    "I learned to ask for feedback early instead of at the end",
+]
+
+FILLERS = ["um", "uh", "like", "you know", "actually", "basically", "so", "I mean", "kind of"]
+
+QUESTIONS = [
+    "Can you tell me about a project you are proud of?",
+    "How would you approach this problem?",
+    "What would you do differently next time?",
+    "How do you handle disagreement within a team?",
+    "Could you walk us through your reasoning?",
+]
+
+def speaker_names(speakers: int) -> List[str]:
+    """Speaker labels: an interview for two speakers, a moderated discussion otherwise"""
+    if speakers <= 2:
+        return ["Interviewer", "Candidate"][:max(speakers, 1)]
+    return ["Moderator"] + [f"Participant {i}" for i in range(1, speakers)]
+
+def generate_transcript(
+    minutes: float,
+    speakers: int,
+    seed: int = 0,
+    words_per_minute: int = WORDS_PER_MINUTE,
+    filler_rate: float = 0.04
+) -> str:
+    """
+    Generate a speaker-labelled transcript
+
+    Args:
+        minutes: Conversation length at the given speaking rate
+        speakers: Number of distinct speakers (2 to 12 in the standard sizes)
+        seed: Random seed; the same arguments always give the same transcript
+        words_per_minute: Speaking rate used to size the transcript
+        filler_rate: Probability of a filler word before each phrase word
+
+    Returns:
+        Transcript with one "Speaker: text" line per turn
+    """
+    rng = random.Random(seed)
+    names = speaker_names(speakers)
+    target_words = int(minutes * words_per_minute)
+    lines = []
+    words = 0
+    turn = 0
+
+    while words < target_words:
+        # The interviewer or moderator asks every few turns; others answer in turn
+        if turn % 4 == 0 or len(names) == 1:
+            speaker = names[0]
+            text = rng.choice(QUESTIONS)
+        else:
+            speaker = names[1 + rng.randrange(len(names) - 1)]
+            parts = []
+            for phrase in rng.sample(PHRASES, rng.randint(1, 4)):
+                tokens = []
+                for token in phrase.split():
+                    if rng.random() < filler_rate:
+                        tokens.append(rng.choice(FILLERS))
+                    tokens.append(token)
+                parts.append(" ".join(tokens))
+            text = ". ".join(parts).capitalize() + "."
+        lines.append(f"{speaker}: {text}")
+        words += len(text.split())
+        turn += 1
+
+    return "\n".join(lines) + "\n"
+
+def iter_audio(
+    seconds: float,
+    speakers: int,
+    seed: int = 0,
+    sample_rate: int = SAMPLE_RATE,
+    chunk_seconds: float = 30.0
+) -> Iterator[np.ndarray]:
+    """
+    Generate speech-like audio in chunks
+
+    Each speaker has a fixed pitch; turns are runs of amplitude-modulated
+    harmonic "syllables" separated by short gaps and longer pauses between
+    turns, so pause detection and diarization have realistic structure.
+
+    Args:
+        seconds: Total duration
+        speakers: Number of distinct voices
+        seed: Random seed
+        sample_rate: Samples per second
+        chunk_seconds: Length of each yielded chunk
+
+    Yields:
+        float32 mono arrays in [-1, 1]
+    """
+    rng = np.random.default_rng(seed)
+    pitches = np.linspace(95.0, 260.0, max(speakers, 1))
+    total = int(seconds * sample_rate)
+    chunk_size = int(chunk_seconds * sample_rate)
+    buffer = np.zeros(0, dtype=np.float32)
+    produced = 0
+    speaker = 0
+
+    while produced < total:
+        while len(buffer) < chunk_size and produced + len(buffer) < total:
+            turn = [_syllables(rng, pitches[speaker], sample_rate, rng.uniform(2.0, 10.0))]
+            turn.append(np.zeros(int(rng.uniform(0.4, 1.5) * sample_rate), dtype=np.float32))
+            buffer = np.concatenate([buffer, *turn])
+            speaker = (speaker + 1 + int(rng.integers(0, max(speakers - 1, 1)))) % max(speakers, 1)
+
+        take = min(chunk_size, total - produced, len(buffer))
+        yield buffer[:take]
+        buffer = buffer[take:]
+        produced += take
+
+def _syllables(rng: np.random.Generator, pitch: float, sample_rate: int, duration: float) -> np.ndarray:
+    out = []
+    elapsed = 0.0
+    while elapsed < duration:
+        length = rng.uniform(0.12, 0.35)
+        t = np.arange(int(length * sample_rate), dtype=np.float32) / sample_rate
+        f0 = pitch * rng.uniform(0.9, 1.1)
+        voiced = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in (1, 2, 3))
+        envelope = np.sin(np.pi * t / length) ** 2
+        noise = rng.normal(0, 0.02, len(t))
+        out.append((0.3 * voiced * envelope + noise).astype(np.float32))
+        gap = rng.uniform(0.03, 0.12)
+        out.append(np.zeros(int(gap * sample_rate), dtype=np.float32))
+        elapsed += length + gap
+    return np.concatenate(out)
+
+def generate_audio(seconds: float, speakers: int, seed: int = 0, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Generate speech-like audio as a single float32 array (see iter_audio)"""
+    return np.concatenate(list(iter_audio(seconds, speakers, seed, sample_rate)))
+
+def write_wav(path: str, seconds: float, speakers: int, seed: int = 0, sample_rate: int = SAMPLE_RATE) -> str:
+    """
+    Stream synthetic audio to a 16-bit PCM WAV file without holding it in memory
+
+    Returns:
+        The path written
+    """
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        for chunk in iter_audio(seconds, speakers, seed, sample_rate):
+            wav.writeframes((np.clip(chunk, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+    return path
@@ -0,0 +1,145 @@
+"""
+Whisper CPU precision benchmark
+Reports real-time factor and word error rate of int8-quantized vs full-precision models
+
+Usage:
+    python benchmarks/whisper_quantization.py --samples path/to/samples [--models tiny,base,small]
+                                              [--threads 4] [--language en] [--json results.json]
+
+The sample directory holds audio files (.wav, .mp3, .flac, ...). When a file has a matching
+reference transcript (interview1.wav + interview1.txt) WER is computed against it; otherwise the
+full-precision output of the same model is the reference, so WER measures quantization loss.
+Without --samples a 60 s synthetic clip is used, which gives timings only.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".mp4", ".m4a", ".flac", ".ogg")
+SAMPLE_RATE = 16000
+
+def normalize(text: str):
+    """Lowercase words without punctuation"""
+    return re.sub(r"[^a-z0-9' ]+", " ", text.lower()).split()
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance divided by the reference length"""
+    ref, hyp = normalize(reference), normalize(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            ))
+        previous = current
+    return previous[-1] / len(ref)
+
+def load_samples(directory: str):
+    """Decode every audio file once; returns (name, samples, reference text or None)"""
+    import whisper
+
+    samples = []
+    for name in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() not in AUDIO_EXTENSIONS:
+            continue
+        reference_path = os.path.join(directory, stem + ".txt")
+        reference = None
+        if os.path.exists(reference_path):
+            with open(reference_path) as f:
+                reference = f.read()
+        samples.append((name, whisper.load_audio(os.path.join(directory, name)), reference))
+    if not samples:
+        raise SystemExit(f"No audio files in {directory}")
+    return samples
+
+def synthetic_samples():
+    from synthetic import generate_audio
+    return [("synthetic-60s", generate_audio(60, 2, seed=7), None)]
+
+def run(model_size: str, int8: bool, samples, language: str):
+    """Transcribe every sample with one model/precision combination"""
+    from interview_analyzer.audio_processor import AudioProcessor
+
+    start = time.perf_counter()
+    processor = AudioProcessor(model_size, int8=int8)
+    load_seconds = time.perf_counter() - start
+
+    outputs = {}
+    audio_seconds = 0.0
+    compute_seconds = 0.0
+    for name, audio, _ in samples:
+        start = time.perf_counter()
+        outputs[name] = processor.transcribe_audio(audio, language=language)["text"]
+        compute_seconds += time.perf_counter() - start
+        audio_seconds += len(audio) / SAMPLE_RATE
+
+    return {
+        "model": model_size,
+        "precision": processor.precision,
+        "load_seconds": round(load_seconds, 2),
+        "audio_seconds": round(audio_seconds, 1),
+        "compute_seconds": round(compute_seconds, 2),
+        "rtf": round(compute_seconds / audio_seconds, 4) if audio_seconds else None,
+    }, outputs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", help="Directory of audio files with optional .txt references")
+    parser.add_argument("--models", default="tiny,base,small", help="Comma-separated Whisper model sizes")
+    parser.add_argument("--threads", type=int, default=0, help="Torch threads (0 = torch default)")
+    parser.add_argument("--language", default="en", help="Skip language detection")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    try:
+        import torch
+    except ImportError:
+        raise SystemExit("openai-whisper and torch are required for this benchmark")
+    from interview_analyzer.audio_processor import configure_torch_threads
+    configure_torch_threads(args.threads)
+
+    samples = load_samples(args.samples) if args.samples else synthetic_samples()
+    print(f"🎧 {len(samples)} sample(s), {sum(len(a) for _, a, _ in samples) / SAMPLE_RATE:.0f} s of audio, "
+          f"{args.threads or torch.get_num_threads()} torch thread(s)")
+
+    results = []
+    for model_size in args.models.split(","):
+        baseline_outputs = None
+        for int8 in (False, True):
+            result, outputs = run(model_size, int8, samples, args.language)
+            if not int8:
+                baseline_outputs = outputs
+
+            errors = []
+            for name, _, reference in samples:
+                reference = reference if reference is not None else baseline_outputs[name]
+                errors.append(word_error_rate(reference, outputs[name]))
+            result["wer"] = round(sum(errors) / len(errors), 4)
+            result["wer_reference"] = "transcripts" if all(r is not None for _, _, r in samples) else "fp32 output"
+            results.append(result)
+
+            print(f"   whisper-{model_size:<8} {result['precision']:<5} RTF {result['rtf']:<8} "
+                  f"WER {result['wer']:.2%}  (load {result['load_seconds']} s)")
+
+        fp32, int8_result = results[-2], results[-1]
+        if fp32["rtf"] and int8_result["rtf"]:
+            print(f"   ⚡ int8 speedup for {model_size}: {fp32['rtf'] / int8_result['rtf']:.2f}x")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"threads": args.threads or torch.get_num_threads(), "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -10,5 +10,24 @@ __all__ = [
     "sentiment_analyzer",
     "report_generator",
     "pdf_generator",
+    "pdf_charts",
+    "batch_pdf",
+    "models",
+    "storage",
+    "transcript",
+    "acoustic_analyzer",
+    "diarization",
+    "screening",
+    "live",
+    "search",
+    "dedup",
+    "facts",
+    "pipeline",
+    "jobs",
+    "server",
+    "transcription_server",
+    "model_selection",
+    "resources",
+    "instrumentation",
     "config",
 ]
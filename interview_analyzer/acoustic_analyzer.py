@@ -0,0 +1,288 @@
+"""
+Acoustic Analysis Module
+Detects pauses and hesitations from frame-level RMS energy, streaming over the waveform in fixed-size blocks
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import subprocess
+import wave
+
+import numpy as np
+
+from .instrumentation import metrics
+
+SAMPLE_RATE = 16000
+
+# Long pauses kept in the report with their timestamps
+MAX_REPORTED_PAUSES = 50
+
+def iter_audio_blocks(audio_path: str, block_seconds: float = 60.0) -> Tuple[int, Iterator[np.ndarray]]:
+    """
+    Stream an audio file as mono float32 blocks
+
+    WAV files are read directly at their native rate; other formats are decoded
+    by ffmpeg to 16 kHz through a pipe, so only one block is in memory at a time.
+
+    Args:
+        audio_path: Audio file
+        block_seconds: Block length
+
+    Returns:
+        Tuple of (sample rate, iterator of blocks)
+    """
+    try:
+        wav = wave.open(audio_path, "rb")
+    except (wave.Error, EOFError):
+        wav = None
+    if wav is not None and wav.getsampwidth() == 2:
+        return wav.getframerate(), _wav_blocks(wav, block_seconds)
+    if wav is not None:
+        wav.close()
+    return SAMPLE_RATE, _ffmpeg_blocks(audio_path, block_seconds)
+
+def _wav_blocks(wav: wave.Wave_read, block_seconds: float) -> Iterator[np.ndarray]:
+    channels = wav.getnchannels()
+    frames = int(block_seconds * wav.getframerate())
+    with wav:
+        while True:
+            data = wav.readframes(frames)
+            if not data:
+                return
+            samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+            yield samples.reshape(-1, channels).mean(axis=1) if channels > 1 else samples
+
+def _ffmpeg_blocks(audio_path: str, block_seconds: float) -> Iterator[np.ndarray]:
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-i", audio_path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-"
+    ]
+    try:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        raise RuntimeError("ffmpeg is required to decode non-WAV audio")
+    block_bytes = int(block_seconds * SAMPLE_RATE) * 2
+    try:
+        while True:
+            data = process.stdout.read(block_bytes)
+            if not data:
+                break
+            yield np.frombuffer(data[:len(data) // 2 * 2], dtype="<i2").astype(np.float32) / 32768.0
+    finally:
+        process.stdout.close()
+        process.kill()
+        process.wait()
+
+class AcousticAnalyzer:
+    """
+    Pause and hesitation analytics from audio energy.
+
+    Frame RMS is computed for a whole block at once from a cumulative sum of
+    squared samples; silent runs are found with array edge detection, and only
+    the partial frame and open pause at a block boundary carry over, so memory
+    stays flat regardless of recording length.
+    """
+
+    def __init__(
+        self,
+        frame_ms: float = 30.0,
+        hop_ms: float = 10.0,
+        silence_db: float = -40.0,
+        min_pause: float = 0.3,
+        long_pause: float = 2.0,
+        block_seconds: float = 60.0
+    ):
+        """
+        Initialize analyzer
+
+        Args:
+            frame_ms: RMS window length
+            hop_ms: Step between frames
+            silence_db: Frames quieter than this (dBFS) are silent
+            min_pause: Shortest silence counted as a pause (seconds)
+            long_pause: Pauses at least this long are long silences
+            block_seconds: Audio processed per block when streaming
+        """
+        self.frame_ms = frame_ms
+        self.hop_ms = hop_ms
+        self.silence_db = silence_db
+        self.min_pause = min_pause
+        self.long_pause = long_pause
+        self.block_seconds = block_seconds
+
+    def analyze_file(self, audio_path: str, segments: Optional[List[Dict]] = None) -> Dict:
+        """
+        Analyze an audio file
+
+        Args:
+            audio_path: Audio file
+            segments: Whisper segments (with optional "speaker") to align pauses to
+
+        Returns:
+            Acoustic metrics dictionary (see analyze_blocks)
+        """
+        sample_rate, blocks = iter_audio_blocks(audio_path, self.block_seconds)
+        return self.analyze_blocks(blocks, sample_rate, segments)
+
+    def analyze_array(self, samples: np.ndarray, sample_rate: int = SAMPLE_RATE,
+                      segments: Optional[List[Dict]] = None) -> Dict:
+        """Analyze decoded mono samples"""
+        block = int(self.block_seconds * sample_rate)
+        blocks = (samples[i:i + block] for i in range(0, len(samples), block))
+        return self.analyze_blocks(blocks, sample_rate, segments)
+
+    def analyze_blocks(self, blocks: Iterable[np.ndarray], sample_rate: int,
+                       segments: Optional[List[Dict]] = None) -> Dict:
+        """
+        Analyze a stream of mono float32 blocks
+
+        Returns:
+            Dictionary with recording-level pause statistics, the longest pauses
+            and, when segments are given, per-speaker hesitation statistics
+        """
+        with metrics.stage("acoustic.analyze") as stage:
+            pauses, total_frames, speech_frames, hop = self._detect_pauses(blocks, sample_rate)
+            duration = total_frames * hop
+            stage.add("audio_seconds", duration)
+
+            aligned = align_pauses(pauses, segments) if segments else [
+                {"start": start, "end": end, "duration": end - start, "kind": "pause", "speaker": ""}
+                for start, end in pauses
+            ]
+            durations = np.array([p["duration"] for p in aligned]) if aligned else np.zeros(0)
+            long_mask = durations >= self.long_pause
+
+            result = {
+                "duration_seconds": round(duration, 2),
+                "speech_seconds": round(speech_frames * hop, 2),
+                "silence_ratio": round(1 - speech_frames / total_frames, 3) if total_frames else 0.0,
+                "pause_count": len(aligned),
+                "long_pause_count": int(long_mask.sum()),
+                "mean_pause_seconds": round(float(durations.mean()), 2) if len(durations) else 0.0,
+                "max_pause_seconds": round(float(durations.max()), 2) if len(durations) else 0.0,
+                "pauses_per_minute": round(len(aligned) / (duration / 60), 2) if duration else 0.0,
+                "long_pauses": [
+                    _rounded(aligned[i])
+                    for i in sorted(np.flatnonzero(long_mask), key=lambda i: -durations[i])[:MAX_REPORTED_PAUSES]
+                ],
+            }
+            if segments:
+                result["speakers"] = speaker_pause_stats(aligned, segments, self.long_pause)
+            return result
+
+    def _detect_pauses(self, blocks: Iterable[np.ndarray], sample_rate: int):
+        frame = max(1, int(sample_rate * self.frame_ms / 1000))
+        hop = max(1, int(sample_rate * self.hop_ms / 1000))
+        # Energy threshold on mean squared amplitude, equivalent to silence_db on RMS
+        threshold = 10 ** (self.silence_db / 10)
+        min_frames = int(round(self.min_pause * sample_rate / hop))
+
+        pauses: List[Tuple[float, float]] = []
+        carry = np.zeros(0, dtype=np.float32)
+        frame_index = 0
+        speech_frames = 0
+        run_start: Optional[int] = None
+
+        for block in blocks:
+            buffer = np.concatenate([carry, np.asarray(block, dtype=np.float32)])
+            if len(buffer) < frame:
+                carry = buffer
+                continue
+            n_frames = 1 + (len(buffer) - frame) // hop
+
+            squares = np.empty(len(buffer) + 1, dtype=np.float64)
+            squares[0] = 0.0
+            np.cumsum(np.square(buffer, dtype=np.float64), out=squares[1:])
+            starts = np.arange(n_frames) * hop
+            energy = (squares[starts + frame] - squares[starts]) / frame
+            silent = energy < threshold
+            carry = buffer[n_frames * hop:]
+
+            speech_frames += int(n_frames - silent.sum())
+            edges = np.diff(np.concatenate(([1 if run_start is not None else 0], silent.astype(np.int8))))
+            run_starts = list(np.flatnonzero(edges == 1) + frame_index)
+            run_ends = list(np.flatnonzero(edges == -1) + frame_index)
+            if run_start is not None:
+                run_starts.insert(0, run_start)
+
+            for start, end in zip(run_starts, run_ends):
+                # Silence from the very first frame is lead-in, not a pause
+                if start > 0 and end - start >= min_frames:
+                    pauses.append((start * hop / sample_rate, end * hop / sample_rate))
+
+            run_start = run_starts[len(run_ends)] if len(run_starts) > len(run_ends) else None
+            frame_index += n_frames
+
+        # An open run at the end is trailing silence, not a pause
+        return pauses, frame_index, speech_frames, hop / sample_rate
+
+def align_pauses(pauses: List[Tuple[float, float]], segments: List[Dict]) -> List[Dict]:
+    """
+    Classify pauses against Whisper segments
+
+    A pause inside a segment is a hesitation by that segment's speaker; one
+    between segments is a gap, attributed to the speaker who talks next
+    (their response latency) or, after the last segment, to the last speaker.
+
+    Args:
+        pauses: (start, end) times in seconds
+        segments: Whisper segments with start, end and optional speaker
+
+    Returns:
+        List of pause dictionaries with start, end, duration, kind and speaker
+    """
+    if not pauses:
+        return []
+    seg_starts = np.array([s["start"] for s in segments], dtype=np.float64)
+    seg_ends = np.array([s["end"] for s in segments], dtype=np.float64)
+    speakers = [str(s.get("speaker", "")) for s in segments]
+
+    bounds = np.array(pauses, dtype=np.float64)
+    midpoints = bounds.mean(axis=1)
+    index = np.searchsorted(seg_starts, midpoints, side="right") - 1
+    inside = (index >= 0) & (midpoints < seg_ends[np.clip(index, 0, None)])
+
+    aligned = []
+    for (start, end), i, is_inside in zip(pauses, index, inside):
+        if is_inside:
+            kind, speaker = "hesitation", speakers[i]
+        else:
+            # After the last segment there is no next speaker; keep it with the last one
+            kind, speaker = "gap", speakers[min(i + 1, len(speakers) - 1)]
+        aligned.append({"start": start, "end": end, "duration": end - start, "kind": kind, "speaker": speaker})
+    return aligned
+
+def speaker_pause_stats(aligned: List[Dict], segments: List[Dict], long_pause: float = 2.0) -> Dict[str, Dict]:
+    """
+    Per-speaker hesitation statistics
+
+    Returns:
+        Dictionary of speaker label ("" when segments are not diarized) to
+        speaking time, hesitation counts and rates, and mean response gap
+    """
+    stats: Dict[str, Dict] = {}
+    for segment in segments:
+        speaker = str(segment.get("speaker", ""))
+        entry = stats.setdefault(speaker, {"speaking_seconds": 0.0, "hesitations": [], "gaps": []})
+        entry["speaking_seconds"] += max(0.0, segment["end"] - segment["start"])
+    for pause in aligned:
+        entry = stats.setdefault(pause["speaker"], {"speaking_seconds": 0.0, "hesitations": [], "gaps": []})
+        entry["hesitations" if pause["kind"] == "hesitation" else "gaps"].append(pause["duration"])
+
+    result = {}
+    for speaker, entry in stats.items():
+        hesitations = np.array(entry["hesitations"])
+        gaps = np.array(entry["gaps"])
+        minutes = entry["speaking_seconds"] / 60
+        result[speaker] = {
+            "speaking_seconds": round(entry["speaking_seconds"], 2),
+            "hesitation_count": len(hesitations),
+            "hesitation_seconds": round(float(hesitations.sum()), 2),
+            "hesitations_per_minute": round(len(hesitations) / minutes, 2) if minutes else 0.0,
+            "mean_hesitation_seconds": round(float(hesitations.mean()), 2) if len(hesitations) else 0.0,
+            "long_pause_count": int((hesitations >= long_pause).sum() + (gaps >= long_pause).sum()),
+            "mean_response_gap_seconds": round(float(gaps.mean()), 2) if len(gaps) else 0.0,
+        }
+    return result
+
+def _rounded(pause: Dict) -> Dict:
+    return {**pause, "start": round(pause["start"], 2), "end": round(pause["end"], 2),
+            "duration": round(pause["duration"], 2)}
@@ -2,11 +2,26 @@
 AI Analysis Module using Google Gemini
 Performs sentiment, tone, empathy, and clarity analysis
 """
-import google.generativeai as genai
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 import json
 import re
-from .config import GEMINI_API_KEY, SENTIMENT_CATEGORIES, EMOTION_CATEGORIES
+import time
+from .config import GEMINI_API_KEY, SENTIMENT_CATEGORIES, EMOTION_CATEGORIES, USE_STUB_LLM, STUB_LLM_LATENCY
+from .config import FANOUT_MIN_PARTICIPANTS, LLM_CONCURRENCY
+from .transcript import split_turns, group_by_speaker, speech_text, top_keywords, condense_turns
+from .instrumentation import metrics
+
+TONE_INSTRUCTIONS = {
+    "Professional": "Provide professional, objective feedback with constructive suggestions.",
+    "Encouraging": "Provide warm, encouraging feedback that highlights strengths while gently suggesting improvements.",
+    "Critical": "Provide detailed, critical analysis focusing on areas that need significant improvement."
+}
+
+# Shared context passed to each participant's prompt is cut to this many characters
+CONTEXT_SUMMARY_CHARS = 1500
+# The group-level context pass sees the openings of evenly sampled turns, up to this many characters
+CONTEXT_TRANSCRIPT_CHARS = 12000
 
 class AIAnalyzer:
     def __init__(self, api_key: str = None):
@@ -20,6 +35,8 @@ class AIAnalyzer:
         if not self.api_key:
             raise ValueError("Gemini API key is required. Set GOOGLE_GEMINI_API_KEY in .env file")
         
+        # Imported here so text-only startup does not pay for the Gemini client
+        import google.generativeai as genai
         genai.configure(api_key=self.api_key)
         self.model = genai.GenerativeModel('gemini-pro')
     
@@ -42,18 +59,372 @@ class AIAnalyzer:
         Returns:
             Dictionary with comprehensive analysis
         """
+        if self._use_fanout(domain, round_type, transcript):
+            return self.analyze_group(transcript, domain, round_type, feedback_tone)
+        
         prompt = self._build_analysis_prompt(transcript, domain, round_type, feedback_tone)
         
         try:
-            response = self.model.generate_content(prompt)
-            analysis_text = response.text
+            with metrics.stage("llm.analyze") as stage:
+                stage.add("prompt_chars", len(prompt))
+                response = self.model.generate_content(prompt)
+                analysis_text = response.text
+                stage.add("response_chars", len(analysis_text))
             
             # Parse the structured response
-            analysis = self._parse_analysis_response(analysis_text, transcript)
+            with metrics.stage("llm.parse"):
+                analysis = self._parse_analysis_response(analysis_text, transcript)
             return analysis
         except Exception as e:
             raise Exception(f"Error in AI analysis: {str(e)}")
     
+    def _use_fanout(self, domain: str, round_type: str, transcript: str) -> bool:
+        """Group discussions with many labelled speakers are analyzed per participant"""
+        if "Group Discussion" not in (domain, round_type):
+            return False
+        speakers = [s for s in group_by_speaker(split_turns(transcript)) if s]
+        return len(speakers) >= FANOUT_MIN_PARTICIPANTS
+    
+    def analyze_group(
+        self,
+        transcript: str,
+        domain: str = "Group Discussion",
+        round_type: str = "Group Discussion",
+        feedback_tone: str = "Professional"
+    ) -> Dict:
+        """
+        Analyze a group discussion one participant at a time
+        
+        A shared-context pass produces the group-level fields (summary, topics,
+        sentiment trend, assessment) from a condensed transcript of at most
+        CONTEXT_TRANSCRIPT_CHARS, since it only describes the discussion as a
+        whole. Each participant is then analyzed
+        concurrently from their own turns plus a compact summary of the
+        discussion, so response size and latency do not grow with the group,
+        and a malformed response only affects one participant.
+        
+        Args:
+            transcript: Speaker-labelled transcript
+            domain: Domain context
+            round_type: Type of interview round
+            feedback_tone: Tone for feedback (Professional, Encouraging, Critical)
+        
+        Returns:
+            Dictionary in the same schema as analyze_conversation()
+        """
+        turns = split_turns(transcript)
+        speakers = [(name, text) for name, text in group_by_speaker(turns).items() if name]
+        
+        try:
+            prompt = self._build_context_prompt(
+                condense_turns(turns, CONTEXT_TRANSCRIPT_CHARS), domain, round_type, feedback_tone
+            )
+            with metrics.stage("llm.context") as stage:
+                stage.add("prompt_chars", len(prompt))
+                context_text = self.model.generate_content(prompt).text
+                stage.add("response_chars", len(context_text))
+        except Exception as e:
+            raise Exception(f"Error in AI analysis: {str(e)}")
+        
+        with metrics.stage("llm.parse"):
+            analysis = self._parse_analysis_response(context_text, transcript)
+        summary = analysis.get("overall_summary") or ""
+        topics = analysis.get("topics_discussed") or top_keywords(speech_text(transcript), 5)
+        roster = [name for name, _ in speakers]
+        
+        def analyze_participant(speaker: Tuple[str, str]) -> Dict:
+            name, text = speaker
+            prompt = self._build_participant_prompt(
+                name, text, roster, summary, topics, domain, round_type, feedback_tone
+            )
+            try:
+                with metrics.stage("llm.participant") as stage:
+                    stage.add("prompt_chars", len(prompt))
+                    response_text = self.model.generate_content(prompt).text
+                    stage.add("response_chars", len(response_text))
+                participant = self._extract_json(response_text)
+                if not isinstance(participant, dict):
+                    raise ValueError("Participant analysis is not a JSON object")
+            except Exception:
+                metrics.count("llm_fallback_parses")
+                participant = {"key_points": [], "strengths": [], "improvements": []}
+            participant["name"] = name
+            return participant
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(LLM_CONCURRENCY, len(speakers))),
+                                thread_name_prefix="llm") as pool:
+            results = list(pool.map(analyze_participant, speakers))
+        
+        analysis["participants"] = {f"speaker_{i + 1}": data for i, data in enumerate(results)}
+        return analysis
+    
+    def update_analysis(
+        self,
+        previous: Dict,
+        changes: List[Dict],
+        transcript: str,
+        domain: str = "General",
+        round_type: str = "General",
+        feedback_tone: str = "Professional"
+    ) -> Dict:
+        """
+        Revise the analysis of an earlier version of a transcript
+        
+        Only the earlier analysis and the changed sentences are sent, so a
+        lightly edited transcript costs a fraction of a full analysis.
+        
+        Args:
+            previous: Analysis of the earlier version (analyze_conversation() schema)
+            changes: Changed stretches as {"speaker", "before", "after"}
+            transcript: Full new transcript (kept as the raw transcript)
+            domain: Domain context
+            round_type: Type of interview round
+            feedback_tone: Tone for feedback (Professional, Encouraging, Critical)
+        
+        Returns:
+            Dictionary in the same schema as analyze_conversation()
+        """
+        prompt = self._build_update_prompt(previous, changes, domain, round_type, feedback_tone)
+        try:
+            with metrics.stage("llm.update") as stage:
+                stage.add("prompt_chars", len(prompt))
+                response_text = self.model.generate_content(prompt).text
+                stage.add("response_chars", len(response_text))
+        except Exception as e:
+            raise Exception(f"Error in AI analysis: {str(e)}")
+        
+        with metrics.stage("llm.parse"):
+            try:
+                analysis = self._extract_json(response_text)
+                if not isinstance(analysis, dict):
+                    raise ValueError("Analysis is not a JSON object")
+            except ValueError:
+                # An unusable revision still leaves the earlier analysis
+                metrics.count("llm_fallback_parses")
+                analysis = dict(previous)
+        analysis["raw_transcript"] = transcript
+        return analysis
+    
+    def write_narrative(
+        self,
+        facts: Dict,
+        transcript: str,
+        domain: str = "General",
+        round_type: str = "General",
+        feedback_tone: str = "Professional"
+    ) -> Dict:
+        """
+        Write feedback in a new tone or framing for an existing analysis
+        
+        Scores, key points, topics and the sentiment trend are kept; only the
+        strengths, improvements, assessment and detailed feedback are written,
+        from a prompt that holds the facts instead of the transcript.
+        
+        Args:
+            facts: Tone-independent part of an analysis (see facts.split_analysis)
+            transcript: Transcript the facts came from (kept as the raw transcript)
+            domain: Domain context
+            round_type: Type of interview round
+            feedback_tone: Tone for feedback (Professional, Encouraging, Critical)
+        
+        Returns:
+            Dictionary in the same schema as analyze_conversation()
+        """
+        from .facts import merge_analysis
+        
+        prompt = self._build_narrative_prompt(facts, domain, round_type, feedback_tone)
+        try:
+            with metrics.stage("llm.narrative") as stage:
+                stage.add("prompt_chars", len(prompt))
+                response_text = self.model.generate_content(prompt).text
+                stage.add("response_chars", len(response_text))
+        except Exception as e:
+            raise Exception(f"Error in AI analysis: {str(e)}")
+        
+        with metrics.stage("llm.parse"):
+            try:
+                narrative = self._extract_json(response_text)
+                if not isinstance(narrative, dict):
+                    raise ValueError("Narrative is not a JSON object")
+            except ValueError:
+                metrics.count("llm_fallback_parses")
+                narrative = {}
+        analysis = merge_analysis(facts, narrative)
+        analysis["raw_transcript"] = transcript
+        return analysis
+    
+    def _build_context_prompt(self, transcript: str, domain: str, round_type: str, feedback_tone: str) -> str:
+        """Build the group-level prompt used before per-participant analysis, from a condensed transcript"""
+        tone_instruction = TONE_INSTRUCTIONS.get(feedback_tone, TONE_INSTRUCTIONS["Professional"])
+        
+        return f"""You are an expert AI Interview Analyzer and mentor. Analyze the following group discussion transcript as a whole. Individual participants are assessed separately, so do not describe them one by one. Long discussions are condensed to the openings of evenly spaced turns, in order.
+
+DOMAIN: {domain}
+ROUND TYPE: {round_type}
+FEEDBACK TONE: {tone_instruction}
+
+TRANSCRIPT:
+{transcript}
+
+Please provide the group-level analysis in the following JSON format (respond ONLY with valid JSON, no markdown):
+
+{{
+    "overall_summary": "Brief summary of the discussion: positions taken and how it evolved",
+    "sentiment_trend": [
+        {{"segment": "First 25%", "sentiment": "Positive", "confidence": 0.8}},
+        {{"segment": "Second 25%", "sentiment": "Neutral", "confidence": 0.6}},
+        {{"segment": "Third 25%", "sentiment": "Positive", "confidence": 0.7}},
+        {{"segment": "Final 25%", "sentiment": "Positive", "confidence": 0.9}}
+    ],
+    "topics_discussed": ["topic1", "topic2", "topic3"],
+    "keywords": ["keyword1", "keyword2", "keyword3"],
+    "overall_assessment": {{
+        "communication_quality": "Overall assessment of the group",
+        "strengths": ["strength1", "strength2"],
+        "critical_improvements": ["improvement1", "improvement2"],
+        "recommendation": "Overall recommendation for the group"
+    }},
+    "detailed_feedback": {{
+        "structure": "Feedback on how the discussion was structured",
+        "conciseness": "Feedback on conciseness",
+        "technical_depth": "Feedback on depth of content (if applicable)",
+        "interpersonal_skills": "Feedback on turn-taking, listening and collaboration"
+    }}
+}}
+"""
+    
+    def _build_participant_prompt(
+        self,
+        name: str,
+        text: str,
+        roster: List[str],
+        summary: str,
+        topics: List[str],
+        domain: str,
+        round_type: str,
+        feedback_tone: str
+    ) -> str:
+        """Build the prompt for one participant: their own turns plus a compact group context"""
+        tone_instruction = TONE_INSTRUCTIONS.get(feedback_tone, TONE_INSTRUCTIONS["Professional"])
+        
+        return f"""You are an expert AI Interview Analyzer and mentor. Assess one participant of a group discussion from their own contributions.
+
+DOMAIN: {domain}
+ROUND TYPE: {round_type}
+FEEDBACK TONE: {tone_instruction}
+PARTICIPANT: {name}
+PARTICIPANTS: {", ".join(roster)}
+DISCUSSION SUMMARY: {summary[:CONTEXT_SUMMARY_CHARS]}
+TOPICS: {", ".join(map(str, topics))}
+
+CONTRIBUTIONS:
+{text}
+
+Please provide the assessment in the following JSON format (respond ONLY with valid JSON, no markdown):
+
+{{
+    "sentiment": "Overall sentiment (Positive/Negative/Neutral)",
+    "tone": "Primary tone (Confident/Nervous/Calm/Enthusiastic/etc.)",
+    "confidence_score": 0.0-1.0,
+    "clarity_score": 0.0-1.0,
+    "empathy_score": 0.0-1.0,
+    "engagement_score": 0.0-1.0,
+    "key_points": ["point1", "point2", "point3"],
+    "strengths": ["strength1", "strength2"],
+    "improvements": ["improvement1", "improvement2", "improvement3"],
+    "filler_words_count": 0,
+    "speaking_pace": "Fast/Moderate/Slow",
+    "communication_quality": "Excellent/Good/Average/Needs Improvement"
+}}
+
+IMPORTANT:
+- Judge contribution quality, not quantity alone
+- Provide specific, actionable feedback
+- Score all metrics on a 0.0-1.0 scale
+- Consider the domain context ({domain}) in your analysis
+"""
+    
+    def _build_narrative_prompt(self, facts: Dict, domain: str, round_type: str, feedback_tone: str) -> str:
+        """Build the feedback-only prompt written from cached analysis facts"""
+        tone_instruction = TONE_INSTRUCTIONS.get(feedback_tone, TONE_INSTRUCTIONS["Professional"])
+        participants = ",\n".join(
+            f'        "{speaker_id}": {{"strengths": ["strength1", "strength2"], '
+            f'"improvements": ["improvement1", "improvement2", "improvement3"], '
+            f'"communication_quality": "Excellent/Good/Average/Needs Improvement"}}'
+            for speaker_id in facts.get("participants", {})
+        )
+        
+        return f"""You are an expert AI Interview Analyzer and mentor. The interview below has already been analyzed; these are its findings. Write the feedback for it.
+
+DOMAIN: {domain}
+ROUND TYPE: {round_type}
+FEEDBACK TONE: {tone_instruction}
+
+FINDINGS:
+{json.dumps(facts, ensure_ascii=False)}
+
+Please provide the feedback in the following JSON format (respond ONLY with valid JSON, no markdown):
+
+{{
+    "participants": {{
+{participants}
+    }},
+    "overall_assessment": {{
+        "communication_quality": "Overall assessment",
+        "strengths": ["strength1", "strength2"],
+        "critical_improvements": ["improvement1", "improvement2"],
+        "recommendation": "Overall recommendation for the candidate"
+    }},
+    "detailed_feedback": {{
+        "structure": "Feedback on answer structure",
+        "conciseness": "Feedback on conciseness",
+        "technical_depth": "Feedback on technical knowledge (if applicable)",
+        "interpersonal_skills": "Feedback on interpersonal and communication skills"
+    }}
+}}
+
+IMPORTANT:
+- Base the feedback only on the findings; do not change scores or add participants
+- Provide specific, actionable feedback
+- Consider the domain context ({domain}) and round type ({round_type})
+"""
+    
+    def _build_update_prompt(
+        self,
+        previous: Dict,
+        changes: List[Dict],
+        domain: str,
+        round_type: str,
+        feedback_tone: str
+    ) -> str:
+        """Build the prompt that revises an earlier analysis for changed sentences"""
+        tone_instruction = TONE_INSTRUCTIONS.get(feedback_tone, TONE_INSTRUCTIONS["Professional"])
+        edits = "\n".join(
+            f"- {change['speaker'] or 'Unlabelled'}: BEFORE: {change['before'] or '(none)'} | "
+            f"AFTER: {change['after'] or '(removed)'}"
+            for change in changes
+        )
+        
+        return f"""You are an expert AI Interview Analyzer. A transcript you analyzed before has been edited. Revise your earlier analysis so it reflects the edited transcript.
+
+DOMAIN: {domain}
+ROUND TYPE: {round_type}
+FEEDBACK TONE: {tone_instruction}
+
+PREVIOUS ANALYSIS:
+{json.dumps(previous, ensure_ascii=False)}
+
+CHANGED SENTENCES:
+{edits}
+
+Respond ONLY with the complete revised analysis as valid JSON in exactly the same format as the previous analysis (no markdown).
+
+IMPORTANT:
+- Change only what the edits affect; keep everything else as it was
+- Score all metrics on a 0.0-1.0 scale
+- Consider the domain context ({domain}) in your analysis
+"""
+    
     def _build_analysis_prompt(
         self,
         transcript: str,
@@ -63,13 +434,7 @@ class AIAnalyzer:
     ) -> str:
         """Build comprehensive analysis prompt for Gemini"""
         
-        tone_instructions = {
-            "Professional": "Provide professional, objective feedback with constructive suggestions.",
-            "Encouraging": "Provide warm, encouraging feedback that highlights strengths while gently suggesting improvements.",
-            "Critical": "Provide detailed, critical analysis focusing on areas that need significant improvement."
-        }
-        
-        tone_instruction = tone_instructions.get(feedback_tone, tone_instructions["Professional"])
+        tone_instruction = TONE_INSTRUCTIONS.get(feedback_tone, TONE_INSTRUCTIONS["Professional"])
         
         prompt = f"""You are an expert AI Interview Analyzer and mentor. Analyze the following interview/group discussion transcript and provide comprehensive insights.
 
@@ -137,16 +502,7 @@ IMPORTANT:
     def _parse_analysis_response(self, response_text: str, transcript: str) -> Dict:
         """Parse Gemini response and extract structured data"""
         try:
-            # Try to extract JSON from response
-            # Remove markdown code blocks if present
-            cleaned_text = response_text.strip()
-            if "```json" in cleaned_text:
-                cleaned_text = cleaned_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in cleaned_text:
-                cleaned_text = cleaned_text.split("```")[1].split("```")[0].strip()
-            
-            # Parse JSON
-            analysis = json.loads(cleaned_text)
+            analysis = self._extract_json(response_text)
             
             # Add raw transcript for reference
             analysis["raw_transcript"] = transcript
@@ -154,8 +510,18 @@ IMPORTANT:
             return analysis
         except json.JSONDecodeError:
             # Fallback: try to extract key information using regex
+            metrics.count("llm_fallback_parses")
             return self._fallback_parse(response_text, transcript)
     
+    def _extract_json(self, response_text: str):
+        """Parse JSON from a response, removing markdown code blocks if present"""
+        cleaned_text = response_text.strip()
+        if "```json" in cleaned_text:
+            cleaned_text = cleaned_text.split("```json")[1].split("```")[0].strip()
+        elif "```" in cleaned_text:
+            cleaned_text = cleaned_text.split("```")[1].split("```")[0].strip()
+        return json.loads(cleaned_text)
+    
     def _fallback_parse(self, response_text: str, transcript: str) -> Dict:
         """Fallback parser if JSON parsing fails"""
         # Extract key information using pattern matching
@@ -193,8 +559,116 @@ IMPORTANT:
         Keywords:"""
         
         try:
-            response = self.model.generate_content(prompt)
+            with metrics.stage("llm.keywords") as stage:
+                stage.add("prompt_chars", len(prompt))
+                response = self.model.generate_content(prompt)
+                stage.add("response_chars", len(response.text))
             keywords = [k.strip() for k in response.text.split(",")]
             return keywords[:top_n]
         except:
             return []
+
+class _StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class _StubModel:
+    """Stand-in for the Gemini model that answers locally after a fixed delay"""
+    
+    def __init__(self, latency: float):
+        self.latency = latency
+    
+    def generate_content(self, prompt: str) -> _StubResponse:
+        time.sleep(self.latency)
+        transcript = prompt
+        if "TRANSCRIPT:" in prompt:
+            transcript = prompt.split("TRANSCRIPT:", 1)[1].split("Please provide", 1)[0]
+        if "Return only a comma-separated list" in prompt:
+            return _StubResponse(", ".join(top_keywords(speech_text(transcript))))
+        if "\nFINDINGS:\n" in prompt:
+            findings = json.loads(prompt.split("\nFINDINGS:\n", 1)[1].split("\n\nPlease provide", 1)[0])
+            return _StubResponse(json.dumps(self._narrative(findings)))
+        if "\nPREVIOUS ANALYSIS:\n" in prompt:
+            previous = prompt.split("\nPREVIOUS ANALYSIS:\n", 1)[1].split("\n\nCHANGED SENTENCES:", 1)[0]
+            return _StubResponse(previous)
+        if "\nPARTICIPANT: " in prompt:
+            name = prompt.split("\nPARTICIPANT: ", 1)[1].split("\n", 1)[0]
+            return _StubResponse(json.dumps(self._participant(name)))
+        return _StubResponse(json.dumps(self._analysis(transcript)))
+    
+    def _participant(self, speaker: str) -> Dict:
+        # Deterministic per-speaker scores so repeated runs produce identical reports
+        base = 0.5 + (sum(map(ord, speaker)) % 40) / 100
+        return {
+            "name": speaker,
+            "sentiment": "Positive",
+            "tone": "Confident",
+            "confidence_score": round(base, 2),
+            "clarity_score": round(base - 0.05, 2),
+            "empathy_score": round(base - 0.1, 2),
+            "engagement_score": round(base + 0.05, 2),
+            "key_points": ["Stub key point"],
+            "strengths": ["Stub strength"],
+            "improvements": ["Stub improvement"],
+            "filler_words_count": 0,
+            "speaking_pace": "Moderate",
+            "communication_quality": "Good"
+        }
+    
+    def _narrative(self, findings: Dict) -> Dict:
+        analysis = self._analysis("")
+        return {
+            "participants": {
+                speaker_id: {k: v for k, v in self._participant(data.get("name", speaker_id)).items()
+                             if k in ("strengths", "improvements", "communication_quality")}
+                for speaker_id, data in findings.get("participants", {}).items()
+            },
+            "overall_assessment": analysis["overall_assessment"],
+            "detailed_feedback": analysis["detailed_feedback"],
+        }
+    
+    def _analysis(self, transcript: str) -> Dict:
+        speakers = [s for s in group_by_speaker(split_turns(transcript)) if s] or ["Speaker 1"]
+        participants = {f"speaker_{i + 1}": self._participant(speaker) for i, speaker in enumerate(speakers)}
+        return {
+            "overall_summary": f"Stub analysis of a {len(transcript.split())}-word conversation.",
+            "participants": participants,
+            "sentiment_trend": [
+                {"segment": "First 25%", "sentiment": "Neutral", "confidence": 0.6},
+                {"segment": "Second 25%", "sentiment": "Positive", "confidence": 0.7},
+                {"segment": "Third 25%", "sentiment": "Positive", "confidence": 0.7},
+                {"segment": "Final 25%", "sentiment": "Positive", "confidence": 0.8}
+            ],
+            "topics_discussed": top_keywords(speech_text(transcript), 3),
+            "keywords": top_keywords(speech_text(transcript)),
+            "overall_assessment": {
+                "communication_quality": "Good",
+                "strengths": ["Stub strength"],
+                "critical_improvements": ["Stub improvement"],
+                "recommendation": "Stub recommendation"
+            },
+            "detailed_feedback": {
+                "structure": "Stub feedback",
+                "conciseness": "Stub feedback",
+                "technical_depth": "Stub feedback",
+                "interpersonal_skills": "Stub feedback"
+            }
+        }
+
+class StubAIAnalyzer(AIAnalyzer):
+    """
+    Offline AIAnalyzer for load tests and benchmarks
+    
+    Responses are generated locally from the transcript after a configurable
+    delay and go through the same parsing path as real Gemini output.
+    """
+    
+    def __init__(self, api_key: str = None, latency: float = None):
+        self.api_key = api_key or "stub"
+        self.model = _StubModel(STUB_LLM_LATENCY if latency is None else latency)
+
+def create_ai_analyzer(api_key: str = None) -> AIAnalyzer:
+    """Return the configured analyzer (the stub when INTERVIEW_ANALYZER_STUB_LLM=1)"""
+    if USE_STUB_LLM:
+        return StubAIAnalyzer(api_key)
+    return AIAnalyzer(api_key)
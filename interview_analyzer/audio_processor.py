@@ -2,39 +2,126 @@
 Audio Processing Module
 Handles speech-to-text conversion using OpenAI Whisper
 """
-import whisper
 import os
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable, Iterator, Tuple, Union, TYPE_CHECKING
 import tempfile
+import threading
+import time
+from .instrumentation import metrics
+from .config import TRANSCRIPTION_SERVER, WHISPER_INT8, WHISPER_LATENCY_BUDGET
+from .model_selection import get_model_selector, audio_duration
+from .resources import governor
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_torch_threads_lock = threading.Lock()
+_torch_threads_configured = False
+
+def configure_torch_threads(threads: Optional[int] = None):
+    """
+    Set torch's intra-op thread count once per process
+    
+    torch.set_num_threads() is process-global, so only the first call applies: the
+    transcription server's worker initializer, or else the first model load. Later
+    calls, e.g. from concurrent model loads, leave it alone.
+    
+    Args:
+        threads: Thread count (0 keeps torch's default; defaults to the resource governor's plan)
+    """
+    global _torch_threads_configured
+    with _torch_threads_lock:
+        if _torch_threads_configured:
+            return
+        _torch_threads_configured = True
+        if threads is None:
+            threads = governor.plan["whisper_threads"]
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+
+def quantize_linear_layers(model):
+    """
+    Apply dynamic int8 quantization to every linear layer of a CPU model
+    
+    Whisper uses its own nn.Linear subclass, which torch's quantizer does not
+    recognize, so those layers are first swapped for plain nn.Linear modules
+    sharing the same parameters.
+    """
+    import torch
+    
+    for module in list(model.modules()):
+        for name, child in module.named_children():
+            if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+                plain = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+                plain.weight = child.weight
+                plain.bias = child.bias
+                setattr(module, name, plain)
+    
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
 
 class AudioProcessor:
-    def __init__(self, model_size: str = "base"):
+    def __init__(self, model_size: str = "base", int8: bool = WHISPER_INT8, record: bool = True):
         """
         Initialize Whisper model for speech-to-text
         
         Args:
             model_size: Whisper model size (tiny, base, small, medium, large)
+            int8: Quantize linear layers to int8 for faster CPU inference (ignored on GPU)
+            record: Feed the load time into the shared latency model; off when the
+                caller records it elsewhere, as calibration does
         """
-        self.model = whisper.load_model(model_size)
+        # Whisper pulls in torch, so it is only imported when audio is transcribed
+        import whisper
+        configure_torch_threads()
+        self.model_size = model_size
+        start = time.perf_counter()
+        with metrics.stage("whisper.load_model"):
+            self.model = whisper.load_model(model_size)
+        self.int8 = int8 and self.model.device.type == "cpu"
+        if self.int8:
+            with metrics.stage("whisper.quantize"):
+                self.model = quantize_linear_layers(self.model)
+        self.precision = "int8" if self.int8 else "fp32" if self.model.device.type == "cpu" else "fp16"
+        if record:
+            get_model_selector().record_load(model_size, time.perf_counter() - start, self.int8)
     
-    def transcribe_audio(self, audio_path: str, language: Optional[str] = None) -> Dict:
+    def transcribe_audio(
+        self,
+        audio_path: Union[str, "np.ndarray"],
+        language: Optional[str] = None,
+        predicted_seconds: Optional[float] = None,
+        record: bool = True
+    ) -> Dict:
         """
         Transcribe audio file to text
         
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio file, or mono float32 samples at 16 kHz
             language: Optional language code (e.g., 'en', 'hi')
+            predicted_seconds: Transcription time predicted by select_audio_processor(),
+                scored against the actual time
+            record: Feed the time into the latency model; off for excerpts such as
+                screening windows and live steps, which are not whole jobs
         
         Returns:
             Dictionary with transcription and metadata
         """
         try:
-            result = self.model.transcribe(
-                audio_path,
-                language=language,
-                task="transcribe",
-                verbose=False
-            )
+            start = time.perf_counter()
+            with metrics.stage(f"whisper.transcribe.{self.model_size}.{self.precision}") as stage:
+                result = self.model.transcribe(
+                    audio_path,
+                    language=language,
+                    task="transcribe",
+                    fp16=self.precision == "fp16",
+                    verbose=False
+                )
+                segments = result.get("segments") or []
+                stage.add("audio_seconds", segments[-1]["end"] if segments else 0)
+                stage.add("transcript_chars", len(result["text"]))
+            if record:
+                self._record(audio_path, segments, time.perf_counter() - start, predicted_seconds)
             
             return {
                 "text": result["text"],
@@ -44,6 +131,29 @@ class AudioProcessor:
         except Exception as e:
             raise Exception(f"Error transcribing audio: {str(e)}")
     
+    def transcribe_stream(self, chunks: Iterable["np.ndarray"], language: Optional[str] = None, **options) -> Iterator[Dict]:
+        """
+        Transcribe audio incrementally as chunks arrive
+        
+        Args:
+            chunks: Mono float32 chunks at 16 kHz (see live.follow_file and live.socket_chunks)
+            language: Optional language code (e.g., 'en', 'hi')
+            **options: LiveTranscriber settings (window_seconds, step_seconds, ...)
+        
+        Yields:
+            Updates with newly committed segments and running metrics
+        """
+        from .live import LiveTranscriber
+        return LiveTranscriber(self, language=language, **options).run(chunks)
+    
+    def _record(self, audio, segments, elapsed: float, predicted_seconds: Optional[float]):
+        """Feed the actual transcription time back into the latency model"""
+        if isinstance(audio, str):
+            audio_seconds = audio_duration(audio) or (segments[-1]["end"] if segments else 0)
+        else:
+            audio_seconds = len(audio) / 16000
+        get_model_selector().record(self.model_size, audio_seconds, elapsed, predicted_seconds, self.int8)
+    
     def process_uploaded_file(self, uploaded_file) -> Dict:
         """
         Process uploaded audio file from Streamlit
@@ -66,3 +176,101 @@ class AudioProcessor:
             # Clean up temporary file
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
+
+class RemoteAudioProcessor(AudioProcessor):
+    """
+    AudioProcessor backed by the transcription server process
+    
+    Nothing Whisper-related is loaded in this process; audio is decoded into
+    shared memory and transcribed by a worker that keeps the model resident.
+    """
+    
+    def __init__(self, model_size: str = "base", address: Optional[str] = None):
+        """
+        Initialize client
+        
+        Args:
+            model_size: Whisper model size to request
+            address: Server address (defaults to INTERVIEW_ANALYZER_TRANSCRIPTION_SERVER)
+        """
+        from .transcription_server import TranscriptionClient
+        self.model_size = model_size
+        # Quantization is configured on the server; this only keys the latency estimates
+        self.int8 = WHISPER_INT8
+        self.client = TranscriptionClient(address)
+    
+    def transcribe_audio(
+        self,
+        audio_path: Union[str, "np.ndarray"],
+        language: Optional[str] = None,
+        predicted_seconds: Optional[float] = None,
+        record: bool = True
+    ) -> Dict:
+        """
+        Transcribe audio file to text on the transcription server
+        
+        Args:
+            audio_path: Path to audio file, or mono float32 samples at 16 kHz
+            language: Optional language code (e.g., 'en', 'hi')
+            predicted_seconds: Transcription time predicted by select_audio_processor()
+            record: Feed the time into the latency model (off for excerpts)
+        
+        Returns:
+            Dictionary with transcription and metadata
+        """
+        try:
+            start = time.perf_counter()
+            with metrics.stage(f"whisper.remote.{self.model_size}") as stage:
+                if isinstance(audio_path, str):
+                    result = self.client.transcribe_file(audio_path, self.model_size, language)
+                else:
+                    result = self.client.transcribe_array(audio_path, self.model_size, language)
+                segments = result["segments"]
+                stage.add("audio_seconds", segments[-1]["end"] if segments else 0)
+                stage.add("transcript_chars", len(result["text"]))
+            if record:
+                self._record(audio_path, segments, time.perf_counter() - start, predicted_seconds)
+            return result
+        except Exception as e:
+            raise Exception(f"Error transcribing audio: {str(e)}")
+
+def create_audio_processor(model_size: str = "base") -> AudioProcessor:
+    """Return the configured processor (a transcription server client when one is set)"""
+    if TRANSCRIPTION_SERVER:
+        return RemoteAudioProcessor(model_size)
+    return AudioProcessor(model_size)
+
+def select_audio_processor(
+    audio_path: str,
+    budget_seconds: float = WHISPER_LATENCY_BUDGET,
+    queue_depth: int = 0,
+    workers: int = 1,
+    loaded: Optional[Dict[str, AudioProcessor]] = None
+) -> Tuple[AudioProcessor, Dict]:
+    """
+    Create a processor with the largest model predicted to transcribe the file within the budget
+    
+    Args:
+        audio_path: Audio file to be transcribed
+        budget_seconds: Target latency (0 always uses the base model)
+        queue_depth: Transcriptions waiting ahead of this one
+        workers: Transcriptions that run in parallel
+        loaded: Already created processors by model size, reused instead of loading again
+    
+    Returns:
+        Tuple of (processor, selection details); pass the selection's
+        "predicted_transcribe_seconds" to transcribe_audio() so the prediction is scored
+    """
+    loaded = loaded if loaded is not None else {}
+    duration = audio_duration(audio_path) if budget_seconds else None
+    if duration is None:
+        decision = {"model_size": "base", "predicted_seconds": None, "predicted_transcribe_seconds": None,
+                    "within_budget": None, "budget_seconds": budget_seconds, "audio_seconds": None}
+    else:
+        # Models on the transcription server stay resident after first use
+        resident = list(loaded) + (["base"] if TRANSCRIPTION_SERVER else [])
+        decision = get_model_selector().choose(duration, budget_seconds, queue_depth, workers, resident)
+    
+    model_size = decision["model_size"]
+    processor = loaded.get(model_size) or create_audio_processor(model_size)
+    return processor, decision
@@ -0,0 +1,206 @@
+"""
+Batch PDF Generator
+Renders many interview reports in parallel and builds merged cohort reports
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from io import BytesIO
+from datetime import datetime
+from xml.sax.saxutils import escape
+import re
+import time
+import zipfile
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, Paragraph, Spacer, PageBreak
+from reportlab.platypus.tableofcontents import TableOfContents
+
+from .pdf_generator import PDFGenerator, STYLES
+from .resources import governor
+
+COHORT_ENTRY_STYLE = ParagraphStyle(
+    name='CohortEntry',
+    parent=STYLES['Heading1'],
+    fontSize=18,
+    spaceAfter=12
+)
+
+def _render_report(name: str, report_data: Dict) -> Tuple[str, bytes, float]:
+    """Render a single report in a worker process"""
+    start = time.perf_counter()
+    pdf_bytes = PDFGenerator(use_cache=False).render_pdf(report_data)
+    return name, pdf_bytes, time.perf_counter() - start
+
+def _safe_filename(name: str) -> str:
+    """Turn a report name into a safe PDF file name"""
+    stem = re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("._") or "report"
+    return f"{stem}.pdf"
+
+def _unique_filenames(names: List[str]) -> List[str]:
+    """
+    Safe PDF file names for reports, numbered where two names would collide
+
+    "Jane Doe" and "Jane/Doe" map to the same safe name; the second becomes
+    Jane_Doe_2.pdf. Names are compared case-insensitively for filesystems that are.
+    """
+    taken, filenames = set(), []
+    for name in names:
+        filename = _safe_filename(name)
+        stem, counter = filename[:-len(".pdf")], 2
+        while filename.lower() in taken:
+            filename = f"{stem}_{counter}.pdf"
+            counter += 1
+        taken.add(filename.lower())
+        filenames.append(filename)
+    return filenames
+
+def _as_report_dict(report) -> Dict:
+    """Accept report dicts or InterviewReport objects; transcripts are not shipped to workers"""
+    if hasattr(report, "to_dict"):
+        return report.to_dict(include_transcript=False)
+    return {k: v for k, v in report.items() if k != "raw_transcript"}
+
+class _CohortDocTemplate(BaseDocTemplate):
+    """Document template that feeds cohort entry headings into the table of contents"""
+
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, **kwargs)
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id='normal')
+        self.addPageTemplates([PageTemplate(id='cohort', frames=[frame])])
+
+    def afterFlowable(self, flowable):
+        if isinstance(flowable, Paragraph) and flowable.style.name == 'CohortEntry':
+            # Table of contents entries are parsed as paragraph markup again
+            self.notify('TOCEntry', (0, escape(flowable.getPlainText()), self.page))
+
+class BatchPDFGenerator:
+    def __init__(self, output_dir: str = "outputs", max_workers: Optional[int] = None):
+        """
+        Initialize batch PDF generator
+
+        Args:
+            output_dir: Directory to save PDFs
+            max_workers: Number of worker processes (defaults to the resource governor's
+                size for each batch, which drops under memory pressure)
+        """
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+
+    def generate_batch(
+        self,
+        reports: Union[Dict[str, Dict], Iterable[Tuple[str, Dict]]],
+        zip_path: Optional[str] = None,
+        write_files: bool = True
+    ) -> Dict:
+        """
+        Render many reports across a process pool
+
+        Results are written as each render finishes, either as individual
+        files in the output directory or as entries in a zip archive.
+
+        Args:
+            reports: Mapping or iterable of (name, report data) pairs
+            zip_path: Optional path of a zip archive to stream PDFs into
+            write_files: Write individual PDFs to the output directory
+
+        Returns:
+            Dictionary with per-report results and batch throughput
+        """
+        items = list(reports.items() if isinstance(reports, dict) else reports)
+        filenames = _unique_filenames([name for name, _ in items])
+        results = []
+        archive = zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) if zip_path else None
+        pdf_gen = PDFGenerator(self.output_dir, use_cache=False)
+        workers = self.max_workers or governor.pool_size("render_processes")
+        start = time.perf_counter()
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(_render_report, name, _as_report_dict(report)): index
+                    for index, (name, report) in enumerate(items)
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    name, filename = items[index][0], filenames[index]
+                    try:
+                        _, pdf_bytes, render_seconds = future.result()
+                    except Exception as e:
+                        results.append({"name": name, "error": str(e)})
+                        continue
+
+                    result = {
+                        "name": name,
+                        "size_bytes": len(pdf_bytes),
+                        "render_seconds": render_seconds,
+                    }
+                    if write_files:
+                        result["path"] = pdf_gen.save_pdf(pdf_bytes, filename)
+                    if archive is not None:
+                        archive.writestr(filename, pdf_bytes)
+                    results.append(result)
+        finally:
+            if archive is not None:
+                archive.close()
+
+        total_seconds = time.perf_counter() - start
+        rendered = [r for r in results if "error" not in r]
+        return {
+            "results": results,
+            "zip_path": zip_path,
+            "workers": workers,
+            "total_seconds": total_seconds,
+            "reports_per_second": len(rendered) / total_seconds if total_seconds > 0 else 0.0,
+            "failed": len(results) - len(rendered),
+        }
+
+    def generate_cohort_pdf(
+        self,
+        reports: Union[Dict[str, Dict], Iterable[Tuple[str, Dict]]],
+        filename: Optional[str] = None,
+        title: str = "Cohort Interview Report",
+        write_file: bool = True
+    ) -> Union[str, bytes]:
+        """
+        Merge many reports into a single PDF with a table of contents
+
+        Args:
+            reports: Mapping or iterable of (name, report data) pairs
+            filename: Optional custom filename
+            title: Cohort report title
+            write_file: Write the PDF to the output directory
+
+        Returns:
+            Path to the PDF file, or the PDF bytes when write_file is False
+        """
+        items = list(reports.items() if isinstance(reports, dict) else reports)
+        pdf_gen = PDFGenerator(self.output_dir, use_cache=False)
+
+        toc = TableOfContents()
+        toc.levelStyles = [STYLES['Normal']]
+
+        story = [
+            Paragraph(title, STYLES['CustomTitle']),
+            Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", STYLES['Normal']),
+            Spacer(1, 0.3*inch),
+            Paragraph("Contents", STYLES['SectionHeader']),
+            toc,
+        ]
+        for name, report in items:
+            story.append(PageBreak())
+            story.append(Paragraph(escape(name), COHORT_ENTRY_STYLE))
+            story.extend(pdf_gen.build_story(_as_report_dict(report)))
+
+        buffer = BytesIO()
+        doc = _CohortDocTemplate(buffer, pagesize=A4)
+        # Two passes: the first collects page numbers for the table of contents
+        doc.multiBuild(story)
+        pdf_bytes = buffer.getvalue()
+
+        if not write_file:
+            return pdf_bytes
+        if not filename:
+            filename = f"cohort_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        return pdf_gen.save_pdf(pdf_bytes, filename)
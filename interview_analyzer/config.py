@@ -40,3 +40,70 @@ MAX_FILE_SIZE_MB = 100
 # Output Settings
 OUTPUT_DIR = "outputs"
 UPLOAD_DIR = "uploads"
+
+# Disk quota shared by OUTPUT_DIR and UPLOAD_DIR; least recently used files are removed first
+DISK_QUOTA_MB = int(os.getenv("INTERVIEW_ANALYZER_DISK_QUOTA_MB", "500"))
+
+# Background Jobs
+DATA_DIR = "data"
+JOB_DB_PATH = os.getenv("INTERVIEW_ANALYZER_JOB_DB", os.path.join(DATA_DIR, "jobs.sqlite3"))
+# Concurrent analyses (0 = sized to the host by the resource governor)
+ANALYSIS_WORKERS = int(os.getenv("INTERVIEW_ANALYZER_ANALYSIS_WORKERS", "0"))
+MAX_QUEUED_JOBS = int(os.getenv("INTERVIEW_ANALYZER_MAX_QUEUED_JOBS", "100"))
+# Finished jobs are deleted after this many days (checked at startup and hourly after)
+JOB_RETENTION_DAYS = float(os.getenv("INTERVIEW_ANALYZER_JOB_RETENTION_DAYS", "7"))
+
+# Full-text and score index over finished reports
+SEARCH_DB_PATH = os.getenv("INTERVIEW_ANALYZER_SEARCH_DB", os.path.join(DATA_DIR, "search.sqlite3"))
+
+# Near-duplicate transcripts: estimated Jaccard similarity of word shingles at which an
+# earlier analysis is offered for reuse
+DEDUP_DB_PATH = os.getenv("INTERVIEW_ANALYZER_DEDUP_DB", os.path.join(DATA_DIR, "dedup.sqlite3"))
+DEDUP_THRESHOLD = float(os.getenv("INTERVIEW_ANALYZER_DEDUP_THRESHOLD", "0.8"))
+
+# Tone-independent analysis facts per transcript, so a new tone or framing only regenerates feedback
+# (0 entries disables the cache)
+FACTS_DB_PATH = os.getenv("INTERVIEW_ANALYZER_FACTS_DB", os.path.join(DATA_DIR, "facts.sqlite3"))
+FACTS_CACHE_ENTRIES = int(os.getenv("INTERVIEW_ANALYZER_FACTS_CACHE_ENTRIES", "5000"))
+
+# Transcripts at least this long get their local metrics computed in a worker process
+LOCAL_METRICS_PROCESS_MIN_CHARS = int(os.getenv("INTERVIEW_ANALYZER_PROCESS_MIN_CHARS", "200000"))
+
+# Whisper CPU inference: int8 dynamic quantization of linear layers and torch thread count (0 = sized to the host)
+WHISPER_INT8 = os.getenv("INTERVIEW_ANALYZER_WHISPER_INT8", "") == "1"
+WHISPER_THREADS = int(os.getenv("INTERVIEW_ANALYZER_WHISPER_THREADS", "0"))
+
+# Latency budget for transcription in seconds: the largest model predicted to finish in time is used
+# (0 always uses the base model). Measured speeds are kept in WHISPER_PROFILE_PATH.
+WHISPER_LATENCY_BUDGET = float(os.getenv("INTERVIEW_ANALYZER_WHISPER_BUDGET", "0"))
+WHISPER_PROFILE_PATH = os.getenv("INTERVIEW_ANALYZER_WHISPER_PROFILE", os.path.join(DATA_DIR, "whisper_profile.json"))
+
+# Label transcribed segments with speakers (MFCC clustering on CPU) before analysis
+DIARIZATION_ENABLED = os.getenv("INTERVIEW_ANALYZER_DIARIZATION", "1") == "1"
+
+# Dedicated transcription server ("host:port" or a Unix socket path); empty runs Whisper in-process
+TRANSCRIPTION_SERVER = os.getenv("INTERVIEW_ANALYZER_TRANSCRIPTION_SERVER", "")
+TRANSCRIPTION_WORKERS = int(os.getenv("INTERVIEW_ANALYZER_TRANSCRIPTION_WORKERS", "1"))
+TRANSCRIPTION_AUTHKEY = os.getenv("INTERVIEW_ANALYZER_TRANSCRIPTION_AUTHKEY", "")
+
+# Group discussions with at least this many labelled speakers are analyzed one participant per LLM call,
+# with up to LLM_CONCURRENCY calls in flight
+FANOUT_MIN_PARTICIPANTS = int(os.getenv("INTERVIEW_ANALYZER_FANOUT_MIN_PARTICIPANTS", "4"))
+LLM_CONCURRENCY = int(os.getenv("INTERVIEW_ANALYZER_LLM_CONCURRENCY", "8"))
+
+# Resource governor: sizes worker pools and caches to the CPUs and memory available (cgroup limits
+# included), then every GOVERNOR_INTERVAL seconds grows running pools while jobs queue up and shrinks
+# them and evicts idle Whisper models when memory use crosses GOVERNOR_MEMORY_HIGH of the limit.
+# Disabled, pools keep their static defaults.
+GOVERNOR_ENABLED = os.getenv("INTERVIEW_ANALYZER_GOVERNOR", "1") == "1"
+GOVERNOR_INTERVAL = float(os.getenv("INTERVIEW_ANALYZER_GOVERNOR_INTERVAL", "5"))
+GOVERNOR_MEMORY_LOW = float(os.getenv("INTERVIEW_ANALYZER_GOVERNOR_MEMORY_LOW", "0.7"))
+GOVERNOR_MEMORY_HIGH = float(os.getenv("INTERVIEW_ANALYZER_GOVERNOR_MEMORY_HIGH", "0.85"))
+
+# Offline stub LLM for load tests and benchmarks (no API key or network needed)
+USE_STUB_LLM = os.getenv("INTERVIEW_ANALYZER_STUB_LLM", "") == "1"
+STUB_LLM_LATENCY = float(os.getenv("INTERVIEW_ANALYZER_STUB_LLM_LATENCY", "0.5"))
+
+# Instrumentation (near-zero overhead when disabled)
+METRICS_ENABLED = os.getenv("INTERVIEW_ANALYZER_METRICS", "") == "1"
+METRICS_TRACK_MEMORY = os.getenv("INTERVIEW_ANALYZER_METRICS_MEMORY", "") == "1"
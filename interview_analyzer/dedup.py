@@ -0,0 +1,299 @@
+"""
+Near-Duplicate Transcripts
+MinHash signatures over word shingles with LSH banding, so a re-pasted or lightly edited
+transcript is matched to its earlier analysis, and only what changed is sent to the LLM
+
+A lookup reads one bucket per band and compares signatures of the few transcripts found
+there, so its cost depends on the number of similar transcripts, not on the corpus size.
+"""
+from difflib import SequenceMatcher
+from typing import Dict, List, Tuple
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from .config import DEDUP_DB_PATH, DEDUP_THRESHOLD
+from .instrumentation import metrics
+from .transcript import split_turns
+
+# Words per shingle
+SHINGLE_WORDS = 5
+
+# Hash functions per signature, split into LSH bands of NUM_PERM // BANDS rows; with 16
+# bands of 8 a pair at similarity 0.8 shares a bucket 95% of the time, one at 0.5 only 6%
+NUM_PERM = 128
+BANDS = 16
+
+# Prime just above 2**32 for the (a * x + b) % p permutations of 32-bit shingle hashes
+_PRIME = np.uint64(4294967311)
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def shingle_hashes(text: str, k: int = SHINGLE_WORDS) -> np.ndarray:
+    """
+    32-bit hashes of the distinct k-word shingles of a text
+
+    Words are lowercased and punctuation is dropped, so formatting fixes do not
+    change the shingles. Texts shorter than k words form one shingle.
+    """
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    count = max(1, len(words) - k + 1)
+    hashes = {zlib.crc32(" ".join(words[i:i + k]).encode("utf-8")) for i in range(count)}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+class MinHasher:
+    """MinHash signatures from a fixed family of random linear permutations"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes: np.ndarray, chunk: int = 4096) -> np.ndarray:
+        """
+        Minimum of each permutation over the shingle hashes
+
+        a * x + b stays below 2**64 for 32-bit a, b and x, so the permutations
+        are computed exactly in uint64.
+        """
+        signature = np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        for start in range(0, len(hashes), chunk):
+            x = hashes[start:start + chunk]
+            permuted = (self._a[:, None] * x[None, :] + self._b[:, None]) % _PRIME
+            np.minimum(signature, permuted.min(axis=1), out=signature)
+        return signature
+
+def similarity(signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures"""
+    return float(np.mean(signature_a == signature_b))
+
+def sentence_units(transcript: str) -> List[Tuple[str, str]]:
+    """Split a transcript into (speaker, sentence) units for diffing"""
+    return [
+        (speaker, sentence)
+        for speaker, text in split_turns(transcript)
+        for sentence in SENTENCE_END.split(text.strip())
+        if sentence
+    ]
+
+def diff_transcripts(previous: str, current: str) -> List[Dict]:
+    """
+    Sentences that differ between two versions of a transcript
+
+    Sentences are compared by their words, so case, punctuation and spacing
+    fixes are not changes.
+
+    Returns:
+        One entry per changed stretch with speaker, before and after text
+        (before is empty for insertions, after for deletions)
+    """
+    old_units, new_units = sentence_units(previous), sentence_units(current)
+    def normalized(units):
+        return [(speaker, " ".join(re.findall(r"\w+", text.lower()))) for speaker, text in units]
+
+    changes = []
+    matcher = SequenceMatcher(None, normalized(old_units), normalized(new_units), autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        speakers = {speaker for speaker, _ in old_units[i1:i2] + new_units[j1:j2]}
+        changes.append({
+            "speaker": ", ".join(sorted(s for s in speakers if s)),
+            "before": " ".join(text for _, text in old_units[i1:i2]),
+            "after": " ".join(text for _, text in new_units[j1:j2]),
+        })
+    return changes
+
+def report_to_analysis(report: Dict) -> Dict:
+    """Map report data back to the analysis schema produced by the LLM"""
+    return {
+        "overall_summary": report.get("overall_summary", ""),
+        "participants": json.loads(json.dumps(report.get("participants", {}))),
+        "sentiment_trend": list(report.get("sentiment_trend", [])),
+        "topics_discussed": list(report.get("topics", [])),
+        "keywords": list(report.get("keywords", [])),
+        "overall_assessment": dict(report.get("assessment", {})),
+        "detailed_feedback": dict(report.get("detailed_feedback", {})),
+    }
+
+def reanalyze(
+    previous: Dict,
+    transcript: str,
+    analyzer,
+    domain: str = "General",
+    round_type: str = "General",
+    feedback_tone: str = "Professional"
+) -> Dict:
+    """
+    Analyze a transcript starting from the analysis of an earlier version
+
+    When no sentence changed beyond formatting the earlier analysis is reused
+    as is; otherwise the LLM only sees the earlier analysis and the changed
+    sentences.
+
+    Args:
+        previous: {"key", "transcript", "report"} of the earlier analysis
+        transcript: New transcript
+        analyzer: AIAnalyzer to run the update with
+        domain: Domain context
+        round_type: Type of interview round
+        feedback_tone: Tone for feedback
+
+    Returns:
+        Analysis dictionary with a "reuse" entry describing what was done
+    """
+    changes = diff_transcripts(previous["transcript"], transcript)
+    analysis = report_to_analysis(previous["report"])
+    if changes:
+        analysis = analyzer.update_analysis(analysis, changes, transcript, domain, round_type, feedback_tone)
+        metrics.count("dedup_diff_reanalyses")
+    else:
+        analysis["raw_transcript"] = transcript
+        metrics.count("dedup_reuses")
+    analysis["reuse"] = {
+        "from": previous.get("key"),
+        "changed_sentences": len(changes),
+        "llm": "diff" if changes else "skipped",
+    }
+    return analysis
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash/LSH index of analyzed transcripts.
+
+    Each transcript's signature is stored once, and each of its bands under a
+    bucket hash; candidates are the transcripts sharing at least one bucket
+    with the query, confirmed by comparing full signatures. Transcripts are
+    only matched against those of the same owner.
+    """
+
+    def __init__(self, db_path: str = DEDUP_DB_PATH, num_perm: int = NUM_PERM, bands: int = BANDS):
+        """
+        Open (and create if needed) the index
+
+        Args:
+            db_path: SQLite database path, or ":memory:"
+            num_perm: Signature length; changing it (or bands) requires a new database
+            bands: Number of LSH bands (must divide num_perm)
+        """
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS signatures (
+                    key TEXT PRIMARY KEY,
+                    signature BLOB NOT NULL,
+                    added_at REAL,
+                    owner TEXT NOT NULL DEFAULT ''
+                )
+            """)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(signatures)")}
+            if "owner" not in columns:
+                # Indexes created before transcripts were scoped to an owner
+                self._conn.execute("ALTER TABLE signatures ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS buckets (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    key TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (band, bucket)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS buckets_key ON buckets (key)")
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a transcript"""
+        return self.hasher.signature(shingle_hashes(text))
+
+    def _buckets(self, signature: np.ndarray) -> List[int]:
+        # 64-bit hash of each band's rows, as a signed SQLite integer
+        return [
+            int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "little", signed=True)
+            for band in signature.reshape(self.bands, self.rows)
+        ]
+
+    def add(self, key: str, text: str, owner: str = ""):
+        """
+        Index a transcript, replacing any earlier entry with the same key
+
+        Args:
+            key: Identifier of the analysis (the job ID for jobs)
+            text: Transcript that was analyzed
+            owner: Session or user the analysis belongs to
+        """
+        signature = self.signature(text)
+        with self._lock, self._conn:
+            self._delete(key)
+            self._conn.execute(
+                "INSERT INTO signatures (key, signature, added_at, owner) VALUES (?, ?, ?, ?)",
+                (key, signature.tobytes(), time.time(), owner)
+            )
+            self._conn.executemany(
+                "INSERT INTO buckets (band, bucket, key) VALUES (?, ?, ?)",
+                [(band, bucket, key) for band, bucket in enumerate(self._buckets(signature))]
+            )
+
+    def remove(self, key: str):
+        """Drop a transcript from the index"""
+        with self._lock, self._conn:
+            self._delete(key)
+
+    def _delete(self, key: str):
+        self._conn.execute("DELETE FROM buckets WHERE key = ?", (key,))
+        self._conn.execute("DELETE FROM signatures WHERE key = ?", (key,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    def find(self, text: str, threshold: float = DEDUP_THRESHOLD, limit: int = 5, owner: str = "") -> List[Dict]:
+        """
+        Earlier transcripts of the same owner similar to a text
+
+        Args:
+            text: Transcript being ingested
+            threshold: Minimum estimated Jaccard similarity of word shingles
+            limit: Maximum number of matches
+            owner: Session or user whose analyses may match
+
+        Returns:
+            Matches as {"key", "similarity"}, most similar first (newest first on ties)
+        """
+        with metrics.stage("dedup.lookup") as stage:
+            signature = self.signature(text)
+            clauses = " OR ".join("(band = ? AND bucket = ?)" for _ in range(self.bands))
+            params = [value for pair in enumerate(self._buckets(signature)) for value in pair]
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, signature, added_at FROM signatures WHERE owner = ? AND key IN "
+                    f"(SELECT key FROM buckets WHERE {clauses})", [owner] + params
+                ).fetchall()
+            stage.add("candidates", len(rows))
+
+        matches = []
+        for key, blob, added_at in rows:
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint64))
+            if score >= threshold:
+                matches.append((score, added_at or 0.0, key))
+        matches.sort(reverse=True)
+        return [{"key": key, "similarity": round(score, 3)} for score, _, key in matches[:limit]]
@@ -0,0 +1,269 @@
+"""
+Speaker Diarization Module
+Labels Whisper segments with speakers by clustering per-segment MFCC embeddings, CPU only
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .acoustic_analyzer import iter_audio_blocks
+from .instrumentation import metrics
+
+# Merging stops once the closest clusters are further apart than this (cosine distance)
+DEFAULT_THRESHOLD = 0.8
+
+# Clusters with less speech than this share of the total are folded into their nearest neighbour
+MIN_SPEAKER_SHARE = 0.03
+
+def mel_filterbank(sample_rate: int, n_fft: int, n_mels: int, fmin: float = 20.0, fmax: Optional[float] = None) -> np.ndarray:
+    """Triangular mel filters as an (n_mels, n_fft // 2 + 1) matrix"""
+    fmax = fmax or sample_rate / 2
+    def to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+    def to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    bins = np.linspace(0, sample_rate / 2, n_fft // 2 + 1)
+    edges = to_hz(np.linspace(to_mel(fmin), to_mel(fmax), n_mels + 2))
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling))
+
+def dct_matrix(n_mfcc: int, n_mels: int) -> np.ndarray:
+    """Orthonormal DCT-II basis as an (n_mfcc, n_mels) matrix"""
+    k = np.arange(n_mfcc)[:, None]
+    n = np.arange(n_mels)[None, :]
+    basis = np.cos(np.pi / n_mels * (n + 0.5) * k) * np.sqrt(2.0 / n_mels)
+    basis[0] /= np.sqrt(2.0)
+    return basis
+
+class SpeakerDiarizer:
+    """
+    Segment-level speaker diarization.
+
+    Each Whisper segment is embedded as the mean and standard deviation of its
+    voiced MFCC frames. Frames are computed block by block over the waveform
+    and accumulated into per-segment sums, so memory does not grow with the
+    recording. Segments are then clustered with average-linkage agglomerative
+    clustering on a cosine distance matrix.
+    """
+
+    def __init__(
+        self,
+        n_speakers: Optional[int] = None,
+        max_speakers: int = 12,
+        threshold: float = DEFAULT_THRESHOLD,
+        n_mfcc: int = 20,
+        n_mels: int = 40,
+        frame_ms: float = 25.0,
+        hop_ms: float = 20.0,
+        block_seconds: float = 60.0
+    ):
+        """
+        Initialize diarizer
+
+        Args:
+            n_speakers: Exact number of speakers if known
+            max_speakers: Upper bound when the number is estimated
+            threshold: Cosine distance above which clusters are not merged
+            n_mfcc: MFCC coefficients per frame
+            n_mels: Mel bands
+            frame_ms: Analysis window length
+            hop_ms: Step between frames
+            block_seconds: Audio processed per block
+        """
+        self.n_speakers = n_speakers
+        self.max_speakers = max_speakers
+        self.threshold = threshold
+        self.n_mfcc = n_mfcc
+        self.n_mels = n_mels
+        self.frame_ms = frame_ms
+        self.hop_ms = hop_ms
+        self.block_seconds = block_seconds
+
+    def diarize_file(self, audio_path: str, segments: List[Dict]) -> List[Dict]:
+        """
+        Label Whisper segments of an audio file with speakers
+
+        Args:
+            audio_path: Audio file that was transcribed
+            segments: Whisper segments with start and end times
+
+        Returns:
+            Copies of the segments with a "speaker" label ("Speaker 1", ...)
+        """
+        sample_rate, blocks = iter_audio_blocks(audio_path, self.block_seconds)
+        return self.diarize_blocks(blocks, sample_rate, segments)
+
+    def diarize_array(self, samples: np.ndarray, sample_rate: int, segments: List[Dict]) -> List[Dict]:
+        """Label segments of decoded mono samples with speakers"""
+        block = int(self.block_seconds * sample_rate)
+        return self.diarize_blocks((samples[i:i + block] for i in range(0, len(samples), block)), sample_rate, segments)
+
+    def diarize_blocks(self, blocks: Iterable[np.ndarray], sample_rate: int, segments: List[Dict]) -> List[Dict]:
+        """Label segments of a stream of mono float32 blocks with speakers"""
+        if not segments:
+            return []
+        with metrics.stage("diarization") as stage:
+            embeddings, voiced = self.embed_segments(blocks, sample_rate, segments)
+            labels = self.cluster(embeddings, voiced)
+            stage.add("segments", len(segments))
+
+        # Number speakers in order of first appearance
+        names: Dict[int, str] = {}
+        for label in labels:
+            names.setdefault(int(label), f"Speaker {len(names) + 1}")
+        return [{**segment, "speaker": names[int(label)]} for segment, label in zip(segments, labels)]
+
+    def embed_segments(self, blocks: Iterable[np.ndarray], sample_rate: int,
+                       segments: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute one embedding per segment
+
+        Returns:
+            Tuple of (embeddings of shape (n_segments, 2 * n_mfcc), voiced frame counts)
+        """
+        frame = int(sample_rate * self.frame_ms / 1000)
+        hop = int(sample_rate * self.hop_ms / 1000)
+        n_fft = 1 << (frame - 1).bit_length()
+        window = np.hanning(frame).astype(np.float32)
+        mel_dct = dct_matrix(self.n_mfcc, self.n_mels).T
+        filters = mel_filterbank(sample_rate, n_fft, self.n_mels).T
+
+        seg_starts = np.array([s["start"] for s in segments], dtype=np.float64)
+        seg_ends = np.array([s["end"] for s in segments], dtype=np.float64)
+        order = np.argsort(seg_starts, kind="stable")
+        sorted_starts = seg_starts[order]
+
+        sums = np.zeros((len(segments), self.n_mfcc))
+        squares = np.zeros((len(segments), self.n_mfcc))
+        counts = np.zeros(len(segments))
+
+        carry = np.zeros(0, dtype=np.float32)
+        frame_index = 0
+        for block in blocks:
+            buffer = np.concatenate([carry, np.asarray(block, dtype=np.float32)])
+            if len(buffer) < frame:
+                carry = buffer
+                continue
+            n_frames = 1 + (len(buffer) - frame) // hop
+            frames = np.lib.stride_tricks.sliding_window_view(buffer, frame)[::hop][:n_frames] * window
+            carry = buffer[n_frames * hop:]
+
+            spectrum = np.fft.rfft(frames, n=n_fft, axis=1)
+            power = spectrum.real ** 2 + spectrum.imag ** 2
+            log_mel = np.log(power @ filters + 1e-10)
+            mfcc = log_mel @ mel_dct
+
+            # Only voiced frames describe the speaker; silence would pull segments together
+            energy = log_mel.mean(axis=1)
+            voiced = energy > np.percentile(energy, 30) if n_frames > 10 else np.ones(n_frames, dtype=bool)
+
+            centers = (frame_index + np.arange(n_frames)) * hop / sample_rate + self.frame_ms / 2000
+            position = np.searchsorted(sorted_starts, centers, side="right") - 1
+            segment = order[np.clip(position, 0, None)]
+            inside = (position >= 0) & (centers < seg_ends[segment]) & voiced
+
+            np.add.at(sums, segment[inside], mfcc[inside])
+            np.add.at(squares, segment[inside], mfcc[inside] ** 2)
+            np.add.at(counts, segment[inside], 1)
+            frame_index += n_frames
+
+        safe = np.maximum(counts, 1)[:, None]
+        mean = sums / safe
+        std = np.sqrt(np.maximum(squares / safe - mean ** 2, 0.0))
+        # The first coefficient is overall loudness, which depends on the microphone, not the speaker
+        return np.hstack([mean[:, 1:], std[:, 1:]]), counts
+
+    def cluster(self, embeddings: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """
+        Average-linkage agglomerative clustering on cosine distance
+
+        Args:
+            embeddings: One row per segment
+            weights: Voiced frames per segment (segments without any are assigned afterwards)
+
+        Returns:
+            Cluster label per segment
+        """
+        n = len(embeddings)
+        labels = np.zeros(n, dtype=int)
+        usable = np.flatnonzero(weights > 0)
+        if len(usable) <= 1:
+            return labels
+
+        # Standardize each dimension across segments, then compare directions
+        x = embeddings[usable]
+        x = (x - x.mean(axis=0)) / (x.std(axis=0) + 1e-8)
+        x /= np.linalg.norm(x, axis=1, keepdims=True) + 1e-8
+        distance = 1.0 - x @ x.T
+        np.fill_diagonal(distance, np.inf)
+
+        m = len(usable)
+        sizes = np.ones(m)
+        members = np.arange(m)
+        clusters = m
+        target = self.n_speakers or 1
+
+        while clusters > target:
+            flat = np.argmin(distance)
+            a, b = divmod(flat, m)
+            if self.n_speakers is None and clusters <= self.max_speakers and distance[a, b] > self.threshold:
+                break
+            # Lance-Williams update for average linkage: merge b into a
+            merged = (sizes[a] * distance[a] + sizes[b] * distance[b]) / (sizes[a] + sizes[b])
+            distance[a, :] = merged
+            distance[:, a] = merged
+            distance[a, a] = np.inf
+            distance[b, :] = np.inf
+            distance[:, b] = np.inf
+            sizes[a] += sizes[b]
+            members[members == b] = a
+            clusters -= 1
+
+        members = self._fold_small_clusters(members, x, weights[usable])
+        labels[usable] = members
+        # Segments without voiced frames take the label of the closest preceding segment
+        for i in np.flatnonzero(weights <= 0):
+            labels[i] = labels[i - 1] if i > 0 else labels[usable[0]]
+        return labels
+
+    def _fold_small_clusters(self, members: np.ndarray, x: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        if self.n_speakers is not None:
+            return members
+        total = weights.sum()
+        while True:
+            ids = np.unique(members)
+            if len(ids) <= 1:
+                return members
+            shares = np.array([weights[members == c].sum() / total for c in ids])
+            smallest = int(np.argmin(shares))
+            if shares[smallest] >= MIN_SPEAKER_SHARE:
+                return members
+            centroids = np.array([x[members == c].mean(axis=0) for c in ids])
+            similarity = centroids @ centroids[smallest]
+            similarity[smallest] = -np.inf
+            members[members == ids[smallest]] = ids[int(np.argmax(similarity))]
+
+def speaker_transcript(segments: List[Dict]) -> str:
+    """
+    Render labelled segments as a "Speaker N: text" transcript
+
+    Consecutive segments by the same speaker are joined into one turn.
+    """
+    lines = []
+    current, texts = None, []
+    for segment in segments:
+        text = segment.get("text", "").strip()
+        if not text:
+            continue
+        speaker = segment.get("speaker", "")
+        if speaker != current and texts:
+            lines.append(f"{current}: {' '.join(texts)}")
+            texts = []
+        current = speaker
+        texts.append(text)
+    if texts:
+        lines.append(f"{current}: {' '.join(texts)}")
+    return "\n".join(lines)
@@ -0,0 +1,145 @@
+"""
+Analysis Facts
+Separates what an analysis observed (scores, key points, topics, sentiment trend) from the
+feedback written about it, and caches the observations per transcript
+
+Feedback depends on the tone and framing chosen in the sidebar; facts only depend on the
+transcript. With cached facts a new tone needs one short prompt that never includes the
+transcript.
+"""
+from typing import Dict, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .config import FACTS_DB_PATH, FACTS_CACHE_ENTRIES
+from .models import TranscriptStore
+
+# Participant fields written in the requested feedback tone; every other field is a fact
+NARRATIVE_PARTICIPANT_FIELDS = ("strengths", "improvements", "communication_quality")
+
+# Top-level analysis fields written in the requested feedback tone
+NARRATIVE_FIELDS = ("overall_assessment", "detailed_feedback")
+
+# Analysis keys that are neither (kept with the report, not in the cache)
+_TRANSIENT_FIELDS = ("raw_transcript", "reuse")
+
+def split_analysis(analysis: Dict) -> Tuple[Dict, Dict]:
+    """
+    Split an analysis into tone-independent facts and tone-dependent narrative
+
+    Returns:
+        Tuple of (facts, narrative); merge_analysis() puts them back together
+    """
+    facts = {k: v for k, v in analysis.items() if k not in NARRATIVE_FIELDS + _TRANSIENT_FIELDS}
+    narrative = {k: analysis[k] for k in NARRATIVE_FIELDS if k in analysis}
+    facts["participants"], narrative["participants"] = {}, {}
+    for speaker_id, data in (analysis.get("participants") or {}).items():
+        facts["participants"][speaker_id] = {
+            k: v for k, v in data.items() if k not in NARRATIVE_PARTICIPANT_FIELDS
+        }
+        narrative["participants"][speaker_id] = {
+            k: data[k] for k in NARRATIVE_PARTICIPANT_FIELDS if k in data
+        }
+    return facts, narrative
+
+def merge_analysis(facts: Dict, narrative: Dict) -> Dict:
+    """
+    Combine facts with narrative into an analysis
+
+    Narrative for participants that are not in the facts is ignored, so a
+    response cannot add or rename participants.
+    """
+    analysis = json.loads(json.dumps(facts))
+    for key in NARRATIVE_FIELDS:
+        analysis[key] = narrative.get(key) or {}
+    by_name = {
+        str(data.get("name", "")).lower(): data
+        for data in (narrative.get("participants") or {}).values() if isinstance(data, dict)
+    }
+    for speaker_id, data in analysis.get("participants", {}).items():
+        written = (narrative.get("participants") or {}).get(speaker_id) or by_name.get(str(data.get("name", "")).lower())
+        for field in NARRATIVE_PARTICIPANT_FIELDS:
+            data[field] = (written or {}).get(field, [] if field != "communication_quality" else "")
+    return analysis
+
+class FactsCache:
+    """
+    SQLite cache of analysis facts keyed by transcript, evicting the least recently used.
+
+    Each entry records the framing (domain, round type and tone) of the last
+    analysis of its transcript, so callers can tell a framing change from a
+    plain re-analysis.
+    """
+
+    def __init__(self, db_path: str = FACTS_DB_PATH, max_entries: int = FACTS_CACHE_ENTRIES):
+        """
+        Open (and create if needed) the cache
+
+        Args:
+            db_path: SQLite database path, or ":memory:"
+            max_entries: Number of transcripts whose facts are kept
+        """
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS facts (
+                    transcript_id TEXT PRIMARY KEY,
+                    facts TEXT NOT NULL,
+                    framing TEXT,
+                    used_at REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS facts_used ON facts (used_at)")
+
+    def get(self, transcript: str) -> Optional[Dict]:
+        """Cached facts for a transcript, or None"""
+        entry = self.get_entry(transcript)
+        return entry[0] if entry else None
+
+    def get_entry(self, transcript: str) -> Optional[Tuple[Dict, Optional[Dict]]]:
+        """Cached (facts, framing) for a transcript, or None"""
+        transcript_id = TranscriptStore.make_id(transcript)
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT facts, framing FROM facts WHERE transcript_id = ?", (transcript_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE facts SET used_at = ? WHERE transcript_id = ?", (time.time(), transcript_id)
+            )
+        return json.loads(row[0]), json.loads(row[1]) if row[1] else None
+
+    def put(self, transcript: str, facts: Dict, framing: Optional[Dict] = None):
+        """
+        Cache the facts of a transcript's analysis
+
+        Args:
+            transcript: Transcript that was analyzed
+            facts: Facts from split_analysis()
+            framing: {"domain", "round_type", "feedback_tone"} the analysis used
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO facts (transcript_id, facts, framing, used_at) VALUES (?, ?, ?, ?)",
+                (TranscriptStore.make_id(transcript), json.dumps(facts),
+                 json.dumps(framing) if framing else None, time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM facts WHERE transcript_id IN "
+                "(SELECT transcript_id FROM facts ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM facts").fetchone()[0]
@@ -0,0 +1,276 @@
+"""
+Instrumentation Module
+Per-stage wall/CPU time, size counters, cache hits and peak memory, exportable as JSON or Prometheus text
+"""
+from typing import Callable, Dict, Optional, Tuple
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+from .config import METRICS_ENABLED, METRICS_TRACK_MEMORY
+
+logger = logging.getLogger("interview_analyzer.metrics")
+
+PROMETHEUS_PREFIX = "interview_analyzer"
+
+class _NullStage:
+    """Shared no-op context returned while instrumentation is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def add(self, name: str, value: float = 1):
+        pass
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    __slots__ = ("_owner", "name", "_wall", "_cpu", "_sizes", "_memory_base", "_shared")
+
+    def __init__(self, owner: "Instrumentation", name: str):
+        self._owner = owner
+        self.name = name
+        self._sizes: Dict[str, float] = {}
+        self._memory_base: Optional[int] = None
+        self._shared = False
+
+    def __enter__(self):
+        if self._owner.track_memory:
+            self._owner._enter_memory(self)
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        peak = self._owner._exit_memory(self) if self._owner.track_memory else None
+        self._owner._record(self.name, wall, cpu, peak, self._sizes, failed=exc_type is not None)
+        return False
+
+    def add(self, name: str, value: float = 1):
+        """Attach a size measurement (e.g. prompt characters) to this stage"""
+        self._sizes[name] = self._sizes.get(name, 0) + value
+
+class Instrumentation:
+    """
+    Collects per-stage timings and counters.
+
+    When disabled, stage() returns a shared no-op context and count() returns
+    immediately, so instrumented code pays only an attribute check.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED, track_memory: bool = METRICS_TRACK_MEMORY):
+        """
+        Initialize instrumentation
+
+        Args:
+            enabled: Record metrics
+            track_memory: Record peak traced memory per stage (uses tracemalloc, adds overhead)
+        """
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        # Open stages per thread, and the top-level stage that owns the tracemalloc peak
+        self._active: Dict[int, int] = {}
+        self._memory_stage: Optional[_Stage] = None
+        self.enabled = False
+        self.track_memory = False
+        self.configure(enabled, track_memory)
+
+    def configure(self, enabled: bool, track_memory: bool = False):
+        """Enable or disable collection at runtime"""
+        self.enabled = enabled
+        self.track_memory = enabled and track_memory
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name: str):
+        """
+        Context manager timing one stage
+
+        Args:
+            name: Dotted stage name, e.g. "llm.analyze"
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def timed(self, name: str) -> Callable:
+        """
+        Decorator timing every call of a function as a stage
+
+        Args:
+            name: Dotted stage name
+        """
+        def decorator(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Stage(self, name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, value: float = 1, **labels: str):
+        """
+        Increment a counter
+
+        Args:
+            name: Counter name, e.g. "pdf_cache_hits"
+            value: Amount to add
+            labels: Optional label values
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self):
+        """Clear all collected metrics"""
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def _enter_memory(self, stage: _Stage):
+        """
+        Start measuring memory for a stage.
+
+        The tracemalloc peak is process-global, so only the outermost stage resets it and
+        measures its peak above the allocation it started from. Nested stages in the same
+        thread don't reset it; a stage opened by another thread marks the measurement as
+        shared, and shared measurements are dropped.
+        """
+        thread_id = threading.get_ident()
+        with self._lock:
+            if not self._active:
+                tracemalloc.reset_peak()
+                stage._memory_base = tracemalloc.get_traced_memory()[0]
+                self._memory_stage = stage
+            elif thread_id not in self._active and self._memory_stage is not None:
+                self._memory_stage._shared = True
+            self._active[thread_id] = self._active.get(thread_id, 0) + 1
+
+    def _exit_memory(self, stage: _Stage) -> Optional[int]:
+        """Finish a stage; returns its peak memory delta, or None if it wasn't measured alone"""
+        thread_id = threading.get_ident()
+        with self._lock:
+            depth = self._active.get(thread_id, 1) - 1
+            if depth:
+                self._active[thread_id] = depth
+            else:
+                self._active.pop(thread_id, None)
+            if self._memory_stage is not stage:
+                return None
+            self._memory_stage = None
+            if stage._shared:
+                return None
+            return max(0, tracemalloc.get_traced_memory()[1] - stage._memory_base)
+
+    def _record(self, name: str, wall: float, cpu: float, peak: Optional[int], sizes: Dict[str, float], failed: bool):
+        with self._lock:
+            stats = self._stages.setdefault(name, {
+                "calls": 0, "failures": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                "max_wall_seconds": 0.0, "peak_memory_bytes": 0
+            })
+            stats["calls"] += 1
+            stats["failures"] += int(failed)
+            stats["wall_seconds"] += wall
+            stats["cpu_seconds"] += cpu
+            stats["max_wall_seconds"] = max(stats["max_wall_seconds"], wall)
+            if peak is not None:
+                stats["peak_memory_bytes"] = max(stats["peak_memory_bytes"], peak)
+            for size_name, value in sizes.items():
+                stats[size_name] = stats.get(size_name, 0) + value
+
+        if logger.isEnabledFor(logging.INFO):
+            event = {"stage": name, "wall_seconds": round(wall, 6), "cpu_seconds": round(cpu, 6), "failed": failed}
+            if peak is not None:
+                event["peak_memory_bytes"] = peak
+            event.update(sizes)
+            logger.info(json.dumps(event))
+
+    def snapshot(self) -> Dict:
+        """
+        Current metrics
+
+        Returns:
+            Dictionary with per-stage statistics and counters
+        """
+        with self._lock:
+            return {
+                "stages": {name: dict(stats) for name, stats in self._stages.items()},
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in self._counters.items()
+                ],
+            }
+
+    def export_json(self, path: str):
+        """Write the current snapshot as JSON"""
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def prometheus_text(self) -> str:
+        """Render metrics in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+
+        stage_metrics = [
+            ("stage_calls_total", "counter", "calls", "Stage executions"),
+            ("stage_failures_total", "counter", "failures", "Stage executions that raised"),
+            ("stage_wall_seconds_total", "counter", "wall_seconds", "Wall-clock time spent in stage"),
+            ("stage_cpu_seconds_total", "counter", "cpu_seconds", "CPU time of the executing thread"),
+            ("stage_max_wall_seconds", "gauge", "max_wall_seconds", "Slowest single execution"),
+        ]
+        if self.track_memory:
+            stage_metrics.append(("stage_peak_memory_bytes", "gauge", "peak_memory_bytes",
+                                  "Peak traced memory above the stage's starting allocation (top-level stages run alone)"))
+
+        for metric, kind, field, help_text in stage_metrics:
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{metric} {kind}")
+            for name, stats in sorted(snapshot["stages"].items()):
+                lines.append(f'{PROMETHEUS_PREFIX}_{metric}{{stage="{name}"}} {stats[field]}')
+
+        sizes = sorted({
+            field for stats in snapshot["stages"].values() for field in stats
+            if field not in {"calls", "failures", "wall_seconds", "cpu_seconds", "max_wall_seconds", "peak_memory_bytes"}
+        })
+        for field in sizes:
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_stage_{field}_total counter")
+            for name, stats in sorted(snapshot["stages"].items()):
+                if field in stats:
+                    lines.append(f'{PROMETHEUS_PREFIX}_stage_{field}_total{{stage="{name}"}} {stats[field]}')
+
+        seen = set()
+        for counter in sorted(snapshot["counters"], key=lambda c: c["name"]):
+            metric = f"{PROMETHEUS_PREFIX}_{counter['name']}_total"
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} counter")
+                seen.add(metric)
+            labels = ",".join(f'{k}="{v}"' for k, v in sorted(counter["labels"].items()))
+            lines.append(f"{metric}{{{labels}}} {counter['value']}" if labels else f"{metric} {counter['value']}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Write metrics as a Prometheus text file (e.g. for the node_exporter textfile collector)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+# Process-wide instrumentation used by all analyzers
+metrics = Instrumentation()
@@ -0,0 +1,514 @@
+"""
+Background Job Queue
+Runs analysis work on a fixed pool of worker threads with a persistent job table
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+from .config import JOB_DB_PATH, ANALYSIS_WORKERS, MAX_QUEUED_JOBS, JOB_RETENTION_DAYS
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# handler(params, progress) -> result dictionary
+JobHandler = Callable[[Dict, Callable[[str, float], None]], Dict]
+
+# (pool, handler) step of a multi-step job kind
+JobStep = Tuple[str, JobHandler]
+
+# callback(job_id, kind, params, result), run on the worker after a job succeeds
+DoneCallback = Callable[[str, str, Dict, Dict], None]
+
+# Seconds between purges of finished jobs while the queue runs
+PURGE_INTERVAL = 3600
+
+# Seconds between heartbeats of the jobs a process owns; a job whose heartbeat is
+# older than STALE_AFTER belongs to a process that stopped without finishing it
+HEARTBEAT_INTERVAL = 15
+STALE_AFTER = 4 * HEARTBEAT_INTERVAL
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+# Job the calling worker thread is running, set by JobQueue._run
+_current = threading.local()
+
+def current_job() -> Optional[Dict]:
+    """
+    Describe the job the calling worker thread is running
+
+    Lets handlers see their queueing context without it passing through params.
+
+    Returns:
+        {"id", "kind", "created_at", "pool", "queue_depth", "workers"}, where queue_depth
+        is the number of jobs now waiting for the pool; None outside a job
+    """
+    running = getattr(_current, "job", None)
+    if running is None:
+        return None
+    job_queue, job, pool = running
+    return {
+        "id": job["id"],
+        "kind": job["kind"],
+        "created_at": job["created_at"],
+        "pool": pool,
+        "queue_depth": job_queue.pending_in(pool),
+        "workers": job_queue.pool_sizes[pool],
+    }
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a process with this ID is running on this host"""
+    if os.name != "posix":
+        # os.kill would terminate the process; rely on the heartbeat instead
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class JobStore:
+    """SQLite-backed job table that survives app reruns and restarts"""
+
+    _JSON_COLUMNS = ("stage_timings", "params", "result")
+
+    def __init__(self, db_path: str = JOB_DB_PATH):
+        """
+        Open (and create if needed) the job table
+
+        Args:
+            db_path: SQLite database path, or ":memory:"
+        """
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL DEFAULT 0,
+                    stage TEXT DEFAULT '',
+                    stage_timings TEXT DEFAULT '{}',
+                    params TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL,
+                    started_at REAL,
+                    finished_at REAL,
+                    step INTEGER DEFAULT 0,
+                    owner_pid INTEGER,
+                    heartbeat_at REAL
+                )
+            """)
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "step" not in columns:
+                # Tables created before multi-step jobs could resume mid-way
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN step INTEGER DEFAULT 0")
+            if "owner_pid" not in columns:
+                # Tables created before processes sharing the table kept their hands off each other's jobs
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN owner_pid INTEGER")
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+
+    def create(self, kind: str, params: Dict) -> str:
+        """Insert a queued job, owned by the calling process, and return its ID"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, params, created_at, owner_pid, heartbeat_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, json.dumps(params), now, os.getpid(), now)
+            )
+        return job_id
+
+    def update(self, job_id: str, **fields):
+        """Update job columns; dictionaries are stored as JSON"""
+        for column in self._JSON_COLUMNS:
+            if column in fields:
+                fields[column] = json.dumps(fields[column])
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                (*fields.values(), job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a job as a dictionary, or None if unknown"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def claim(self, job_id: str, step: int = 0) -> Optional[Dict]:
+        """
+        Move a job queued for a step to running, unless another worker got there first
+
+        The status check and update are one statement, so a step is claimed
+        once even when several workers or processes share the table. The
+        calling process becomes the job's owner.
+
+        Returns:
+            The claimed job, or None if it is not queued for this step (anymore)
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = COALESCE(started_at, ?), owner_pid = ?, heartbeat_at = ? "
+                "WHERE id = ? AND status = ? AND step = ?",
+                (RUNNING, now, os.getpid(), now, job_id, QUEUED, step)
+            )
+            if cursor.rowcount != 1:
+                return None
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row)
+
+    def heartbeat(self, owner_pid: int) -> int:
+        """Mark the unfinished jobs of a process as still owned; returns the number touched"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE owner_pid = ? AND status IN (?, ?)",
+                (time.time(), owner_pid, QUEUED, RUNNING)
+            )
+        return cursor.rowcount
+
+    def is_orphaned(self, job: Dict) -> bool:
+        """
+        Whether an unfinished job has no live owner to finish it
+
+        Jobs of this process count as orphaned, since it only asks before its
+        workers start; other owners must have exited or stopped sending heartbeats.
+        """
+        owner = job.get("owner_pid")
+        if owner is None or owner == os.getpid():
+            return True
+        return not _pid_alive(owner) or (job.get("heartbeat_at") or 0) < time.time() - STALE_AFTER
+
+    def ids_with_status(self, *statuses: str) -> List[str]:
+        """Return IDs of jobs in any of the given states, oldest first"""
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at",
+                statuses
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def param_values(self, key: str, *statuses: str) -> List:
+        """Return params[key] of jobs in any of the given states, where set (e.g. recordings queued jobs need)"""
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT json_extract(params, '$.' || ?) AS value FROM jobs WHERE status IN ({placeholders})",
+                (key, *statuses)
+            ).fetchall()
+        return [row["value"] for row in rows if row["value"] is not None]
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs older than the given age; returns the number removed"""
+        cutoff = time.time() - older_than_seconds
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (DONE, FAILED, cutoff)
+            )
+        return cursor.rowcount
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        for column in self._JSON_COLUMNS:
+            if job.get(column):
+                job[column] = json.loads(job[column])
+        return job
+
+class JobQueue:
+    """
+    Worker pools fed from the persistent job table.
+
+    Many UI sessions share one queue; they submit jobs and poll their status
+    instead of running analysis on the Streamlit script thread. Each job kind
+    runs on a named pool, and a kind registered with several steps moves from
+    pool to pool, so a batch of recordings is transcribed on one pool while
+    earlier transcripts are analyzed on another.
+    """
+
+    def __init__(
+        self,
+        store: Optional[JobStore] = None,
+        max_workers: Optional[int] = None,
+        max_pending: int = MAX_QUEUED_JOBS,
+        pools: Optional[Dict[str, int]] = None,
+        retention_days: float = JOB_RETENTION_DAYS
+    ):
+        """
+        Initialize job queue (call start() after registering handlers)
+
+        Args:
+            store: Job table (defaults to the configured SQLite database)
+            max_workers: Number of worker threads of the "analysis" pool
+                (defaults to ANALYSIS_WORKERS, or the resource governor's plan)
+            max_pending: Maximum number of queued jobs before submit() fails
+            pools: Worker threads of other pools by name
+            retention_days: Age after which finished jobs are deleted (0 keeps them)
+        """
+        if not max_workers:
+            from .resources import governor
+            max_workers = ANALYSIS_WORKERS or governor.plan["analysis_workers"]
+        self.store = store or JobStore()
+        self.max_pending = max_pending
+        self.retention_seconds = retention_days * 86400
+        self._purged_at = 0.0
+        self.pool_sizes: Dict[str, int] = {"analysis": max_workers, **(pools or {})}
+        self.handlers: Dict[str, List[JobStep]] = {}
+        self.done_callbacks: List[DoneCallback] = []
+        # Items are (job ID, step index); None stops one worker
+        self._pending: Dict[str, "queue.Queue[Optional[Tuple[str, int]]]"] = {
+            pool: queue.Queue() for pool in self.pool_sizes
+        }
+        self._workers: Dict[str, List[threading.Thread]] = {pool: [] for pool in self.pool_sizes}
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def max_workers(self) -> int:
+        """Worker threads of the analysis pool"""
+        return self.pool_sizes["analysis"]
+
+    def register(self, kind: str, handler: JobHandler, pool: str = "analysis"):
+        """Register the handler that runs jobs of a given kind on a pool"""
+        self.register_steps(kind, [(pool, handler)])
+
+    def register_steps(self, kind: str, steps: List[JobStep]):
+        """
+        Register a job kind that runs as a sequence of (pool, handler) steps
+
+        Each handler's result is merged into the params of the next step; the
+        last handler's result is the job result.
+        """
+        for pool, _ in steps:
+            if pool not in self.pool_sizes:
+                raise ValueError(f"Unknown pool '{pool}'")
+        self.handlers[kind] = list(steps)
+
+    def add_done_callback(self, callback: DoneCallback):
+        """Call callback(job_id, kind, params, result) whenever a job succeeds"""
+        self.done_callbacks.append(callback)
+
+    def start(self):
+        """Resume orphaned jobs from a previous run and start the workers"""
+        with self._lock:
+            if any(self._workers.values()):
+                return
+            self._purge()
+            # Jobs interrupted by a restart resume at the step they were on; the
+            # results of earlier steps are already merged into their params.
+            # Jobs of other live processes sharing the table are left to them,
+            # and jobs submitted before start() are already pending here.
+            pending = {item[0] for items in self._pending.values() for item in list(items.queue) if item}
+            for job_id in self.store.ids_with_status(QUEUED, RUNNING):
+                if job_id in pending:
+                    continue
+                job = self.store.get(job_id)
+                if job["kind"] not in self.handlers or not self.store.is_orphaned(job):
+                    continue
+                step = job["step"] or 0
+                pool = self.handlers[job["kind"]][step][0]
+                owner = {"owner_pid": os.getpid(), "heartbeat_at": time.time()}
+                if step:
+                    self.store.update(job_id, status=QUEUED, stage=f"Waiting for a free {pool} worker...", **owner)
+                else:
+                    self.store.update(job_id, status=QUEUED, progress=0, stage="", **owner)
+                self._pending[pool].put((job_id, step))
+            for pool, size in self.pool_sizes.items():
+                for i in range(size):
+                    self._start_worker(pool, i)
+            self._stopped = threading.Event()
+            threading.Thread(target=self._heartbeat, args=(self._stopped,), name="job-heartbeat", daemon=True).start()
+
+    def _heartbeat(self, stopped: threading.Event):
+        """Refresh the heartbeat of this process's jobs until shutdown"""
+        while not stopped.wait(HEARTBEAT_INTERVAL):
+            self.store.heartbeat(os.getpid())
+
+    def _purge(self):
+        """Delete finished jobs past the retention period, at most once per PURGE_INTERVAL"""
+        now = time.time()
+        if self.retention_seconds > 0 and now - self._purged_at >= PURGE_INTERVAL:
+            self._purged_at = now
+            self.store.purge(self.retention_seconds)
+
+    def _start_worker(self, pool: str, index: int):
+        worker = threading.Thread(target=self._work, args=(pool,), name=f"job-{pool}-{index}", daemon=True)
+        worker.start()
+        self._workers[pool].append(worker)
+
+    def resize(self, pool: str, size: int):
+        """
+        Change the number of workers of a pool while running
+
+        Extra workers are started at once; surplus workers exit after their
+        current job, or within a second when idle.
+        """
+        size = max(1, int(size))
+        with self._lock:
+            self.pool_sizes[pool] = size
+            running = any(self._workers.values())
+            self._workers[pool] = [worker for worker in self._workers[pool] if worker.is_alive()]
+            if running:
+                for i in range(len(self._workers[pool]), size):
+                    self._start_worker(pool, i)
+
+    def _retire(self, pool: str) -> bool:
+        """Whether the calling worker should exit because its pool was shrunk"""
+        with self._lock:
+            workers = self._workers[pool]
+            if len(workers) > self.pool_sizes[pool] and threading.current_thread() in workers:
+                workers.remove(threading.current_thread())
+                return True
+            return False
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers after their current job"""
+        with self._lock:
+            workers, self._workers = self._workers, {pool: [] for pool in self.pool_sizes}
+            self._stopped.set()
+        for pool, threads in workers.items():
+            for _ in threads:
+                self._pending[pool].put(None)
+        if wait:
+            for threads in workers.values():
+                for worker in threads:
+                    worker.join()
+
+    def submit(self, kind: str, params: Dict) -> str:
+        """
+        Queue a job
+
+        Args:
+            kind: Registered job kind
+            params: JSON-serializable job parameters
+
+        Returns:
+            Job ID
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        if self.pending_count >= self.max_pending:
+            raise QueueFullError("Too many jobs are waiting; please try again shortly")
+        self._purge()
+        job_id = self.store.create(kind, params)
+        self._pending[self.handlers[kind][0][0]].put((job_id, 0))
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return the current state of a job"""
+        return self.store.get(job_id)
+
+    @property
+    def pending_count(self) -> int:
+        """Number of jobs waiting for a worker, across pools"""
+        return sum(pending.qsize() for pending in self._pending.values())
+
+    def pending_in(self, pool: str) -> int:
+        """Number of jobs waiting for a worker of one pool"""
+        return self._pending[pool].qsize()
+
+    def _work(self, pool: str):
+        while not self._retire(pool):
+            try:
+                item = self._pending[pool].get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if item is None:
+                return
+            self._run(*item)
+
+    def _run(self, job_id: str, step: int):
+        job = self.store.claim(job_id, step)
+        if job is None:
+            return
+        steps = self.handlers[job["kind"]]
+
+        started = time.time()
+
+        timings: Dict[str, float] = dict(job["stage_timings"] or {})
+        current = {"stage": None, "since": started}
+
+        def close_stage(now: float):
+            if current["stage"] is not None:
+                stage = current["stage"]
+                timings[stage] = timings.get(stage, 0.0) + now - current["since"]
+
+        def progress(stage: str, percent: float):
+            if stage != current["stage"]:
+                now = time.time()
+                close_stage(now)
+                current["stage"], current["since"] = stage, now
+            self.store.update(job_id, progress=percent, stage=stage, stage_timings=timings)
+
+        _current.job = (self, job, steps[step][0])
+        try:
+            result = steps[step][1](job["params"], progress)
+        except Exception as e:
+            finished = time.time()
+            close_stage(finished)
+            self.store.update(
+                job_id,
+                status=FAILED,
+                stage_timings=timings,
+                error=str(e),
+                finished_at=finished
+            )
+            return
+        finally:
+            _current.job = None
+
+        finished = time.time()
+        close_stage(finished)
+        if step + 1 < len(steps):
+            next_pool = steps[step + 1][0]
+            # Queued for the next step in the same write, so a restart resumes there
+            self.store.update(
+                job_id,
+                status=QUEUED,
+                step=step + 1,
+                params={**job["params"], **result},
+                stage=f"Waiting for a free {next_pool} worker...",
+                stage_timings=timings
+            )
+            self._pending[next_pool].put((job_id, step + 1))
+            return
+
+        self.store.update(
+            job_id,
+            status=DONE,
+            progress=100,
+            stage_timings=timings,
+            result=result,
+            finished_at=finished
+        )
+        for callback in self.done_callbacks:
+            # The job has its result; a failing callback must not change that
+            try:
+                callback(job_id, job["kind"], job["params"], result)
+            except Exception:
+                logger.exception("Done callback for job %s failed", job_id)
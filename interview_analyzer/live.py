@@ -0,0 +1,373 @@
+"""
+Live Session Analysis
+Transcribes a growing audio stream with a rolling window and keeps filler, sentiment and pace
+metrics up to date without reprocessing earlier audio
+
+Sources (16 kHz mono 16-bit PCM):
+    follow_file(path)        WAV or raw PCM file that another process is still writing
+    socket_chunks(address)   Raw PCM sent by one client over a local TCP or Unix socket
+
+Run with:
+    python -m interview_analyzer.live --file session.wav
+    python -m interview_analyzer.live --listen 127.0.0.1:8766
+    ffmpeg -f pulse -i default -f s16le -ac 1 -ar 16000 tcp://127.0.0.1:8766   # microphone feed
+"""
+from typing import Dict, Iterable, Iterator, List, Optional
+import argparse
+import os
+import re
+import socket
+import struct
+import time
+
+import numpy as np
+
+from .instrumentation import metrics
+from .sentiment_analyzer import SentimentAnalyzer
+
+SAMPLE_RATE = 16000
+
+# Committed words kept to de-duplicate text re-transcribed from the overlap
+TAIL_WORDS = 12
+
+def _wav_data_offset(f) -> Optional[int]:
+    """Offset of the PCM data in a WAV file being written, or None until the header is complete"""
+    f.seek(0)
+    header = f.read(12)
+    if len(header) < 12:
+        return None
+    if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise ValueError("Not a WAV file")
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return None
+        chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+        if chunk_id == b"data":
+            return f.tell()
+        body = f.read(size + size % 2)
+        if len(body) < size:
+            return None
+        if chunk_id == b"fmt ":
+            channels, rate = struct.unpack("<HI", body[2:8])
+            bits = struct.unpack("<H", body[14:16])[0]
+            if (channels, rate, bits) != (1, SAMPLE_RATE, 16):
+                raise ValueError(f"Live audio must be 16 kHz mono 16-bit PCM (got {rate} Hz, "
+                                 f"{channels} channel(s), {bits}-bit)")
+
+def follow_file(path: str, chunk_seconds: float = 1.0, poll_interval: float = 0.2,
+                idle_timeout: float = 10.0) -> Iterator[np.ndarray]:
+    """
+    Stream a file that is still being written, like tail -f
+
+    Args:
+        path: WAV (16 kHz mono 16-bit) or raw s16le PCM file
+        chunk_seconds: Preferred chunk length; shorter chunks are yielded when the writer is slower
+        poll_interval: Seconds between checks for new data
+        idle_timeout: Stop after the file has not grown for this long
+
+    Yields:
+        Mono float32 chunks
+    """
+    chunk_bytes = int(chunk_seconds * SAMPLE_RATE) * 2
+    idle_since = time.monotonic()
+    while not os.path.exists(path):
+        if time.monotonic() - idle_since > idle_timeout:
+            raise FileNotFoundError(path)
+        time.sleep(poll_interval)
+    with open(path, "rb") as f:
+        if path.lower().endswith(".wav"):
+            while (offset := _wav_data_offset(f)) is None:
+                if time.monotonic() - idle_since > idle_timeout:
+                    return
+                time.sleep(poll_interval)
+            f.seek(offset)
+        pending = b""
+        while True:
+            data = f.read(chunk_bytes - len(pending))
+            if data:
+                pending += data
+                idle_since = time.monotonic()
+                if len(pending) >= chunk_bytes:
+                    yield np.frombuffer(pending, dtype="<i2").astype(np.float32) / 32768.0
+                    pending = b""
+                continue
+            if len(pending) >= 2:
+                usable = len(pending) // 2 * 2
+                yield np.frombuffer(pending[:usable], dtype="<i2").astype(np.float32) / 32768.0
+                pending = pending[usable:]
+            if time.monotonic() - idle_since > idle_timeout:
+                return
+            time.sleep(poll_interval)
+
+def socket_chunks(address: str, chunk_seconds: float = 1.0) -> Iterator[np.ndarray]:
+    """
+    Listen on a local socket and stream the PCM sent by the first client
+
+    Args:
+        address: "host:port" or a Unix socket path
+        chunk_seconds: Largest chunk read at once
+
+    Yields:
+        Mono float32 chunks until the client disconnects
+    """
+    from .transcription_server import parse_address
+
+    parsed = parse_address(address)
+    family = socket.AF_UNIX if isinstance(parsed, str) else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as server:
+        if family == socket.AF_INET:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(parsed)
+        server.listen(1)
+        conn, _ = server.accept()
+        pending = b""
+        with conn:
+            while True:
+                data = conn.recv(int(chunk_seconds * SAMPLE_RATE) * 2)
+                if not data:
+                    break
+                pending += data
+                usable = len(pending) // 2 * 2
+                yield np.frombuffer(pending[:usable], dtype="<i2").astype(np.float32) / 32768.0
+                pending = pending[usable:]
+    if family == socket.AF_UNIX:
+        os.unlink(parsed)
+
+def _normalize(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+def _overlap_words(tail: List[str], words: List[str]) -> int:
+    """Number of leading words that repeat the end of the committed text"""
+    tail = [_normalize(w) for w in tail]
+    words_n = [_normalize(w) for w in words[:len(tail)]]
+    for k in range(min(len(tail), len(words_n)), 0, -1):
+        if tail[-k:] == words_n[:k]:
+            return k
+    return 0
+
+def pace_label(words_per_minute: float) -> str:
+    """Pace classification used by SentimentAnalyzer.calculate_speaking_pace"""
+    if words_per_minute > 180:
+        return "Fast"
+    if words_per_minute < 120:
+        return "Slow"
+    return "Moderate"
+
+class LiveMetrics:
+    """
+    Running filler, sentiment and pace figures
+
+    Only newly committed text is scored; sentiment is the word-weighted mean of
+    each update's compound score, so earlier text is never analyzed again.
+    """
+
+    def __init__(self):
+        self._sentiment_analyzer = SentimentAnalyzer()
+        self.words = 0
+        self.filler_words = 0
+        self.speech_seconds = 0.0
+        self.elapsed_seconds = 0.0
+        self._weighted_compound = 0.0
+        self.trend: List[Dict] = []
+
+    def update(self, segments: List[Dict]):
+        """Add newly committed segments"""
+        text = " ".join(segment["text"] for segment in segments).strip()
+        if not text:
+            return
+        words = len(text.split())
+        compound = self._sentiment_analyzer.analyze_sentiment(text)["compound"]
+        self.words += words
+        self.filler_words += self._sentiment_analyzer.count_filler_words(text)
+        self.speech_seconds += sum(max(0.0, s["end"] - s["start"]) for s in segments)
+        self.elapsed_seconds = max(self.elapsed_seconds, segments[-1]["end"])
+        self._weighted_compound += compound * words
+        self.trend.append({"end": round(segments[-1]["end"], 2), "sentiment_score": compound})
+
+    def snapshot(self) -> Dict:
+        """Current metrics"""
+        score = self._weighted_compound / self.words if self.words else 0.0
+        wpm = self.words / self.speech_seconds * 60 if self.speech_seconds else 0.0
+        return {
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "words": self.words,
+            "filler_words_count": self.filler_words,
+            "fillers_per_100_words": round(100 * self.filler_words / self.words, 2) if self.words else 0.0,
+            "words_per_minute": round(wpm, 1),
+            "speaking_pace": pace_label(wpm) if self.words else "",
+            "sentiment": "Positive" if score >= 0.05 else "Negative" if score <= -0.05 else "Neutral",
+            "sentiment_score": round(score, 3),
+        }
+
+class LiveTranscriber:
+    """
+    Rolling-window transcription of an audio stream.
+
+    Whenever step_seconds of new audio has arrived, the uncommitted buffer is
+    transcribed. Segments that end at least holdback_seconds before the live
+    edge are final and committed; the buffer is then cut back to the last
+    committed segment (keeping overlap_seconds of context), so each stretch of
+    audio is transcribed a bounded number of times. Words re-transcribed from
+    the overlap are dropped by matching them against the committed text.
+    """
+
+    def __init__(
+        self,
+        processor,
+        window_seconds: float = 15.0,
+        step_seconds: float = 2.0,
+        overlap_seconds: float = 1.0,
+        holdback_seconds: float = 1.5,
+        language: Optional[str] = None
+    ):
+        """
+        Initialize transcriber
+
+        Args:
+            processor: AudioProcessor (or any object with transcribe_audio(ndarray, language, record))
+            window_seconds: Longest buffer before everything in it is committed
+            step_seconds: New audio that triggers a transcription
+            overlap_seconds: Committed audio kept in front of the buffer for context
+            holdback_seconds: Segments ending this close to the live edge wait for more audio
+            language: Optional language code
+        """
+        self.processor = processor
+        self.window_seconds = window_seconds
+        self.step_seconds = step_seconds
+        self.overlap_seconds = overlap_seconds
+        self.holdback_seconds = holdback_seconds
+        self.language = language
+        self.metrics = LiveMetrics()
+
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0.0
+        self._pending = 0
+        self._committed_until = 0.0
+        self._tail: List[str] = []
+        # (stream time, wall clock) of each chunk's end, for latency
+        self._arrivals: List[tuple] = []
+
+    @property
+    def stream_seconds(self) -> float:
+        """Audio received so far"""
+        return self._buffer_start + len(self._buffer) / SAMPLE_RATE
+
+    def feed(self, samples: np.ndarray) -> List[Dict]:
+        """
+        Add audio; transcribes when enough new audio has accumulated
+
+        Returns:
+            Newly committed segments (times in seconds from the start of the stream)
+        """
+        self._buffer = np.concatenate([self._buffer, np.asarray(samples, dtype=np.float32)])
+        self._pending += len(samples)
+        self._arrivals.append((self.stream_seconds, time.monotonic()))
+        if self._pending < self.step_seconds * SAMPLE_RATE:
+            return []
+        return self._transcribe(flush=False)
+
+    def flush(self) -> List[Dict]:
+        """Transcribe and commit whatever is left at the end of the stream"""
+        if not len(self._buffer) or self.stream_seconds <= self._committed_until:
+            return []
+        return self._transcribe(flush=True)
+
+    def run(self, chunks: Iterable[np.ndarray]) -> Iterator[Dict]:
+        """
+        Consume a stream and yield an update whenever segments are committed
+
+        Yields:
+            Dictionaries with segments (new ones only), text, metrics and
+            latency_seconds (wall time from the audio arriving to its text being committed)
+        """
+        for chunk in chunks:
+            segments = self.feed(chunk)
+            if segments:
+                yield self._update(segments)
+        segments = self.flush()
+        if segments:
+            yield self._update(segments)
+
+    def _update(self, segments: List[Dict]) -> Dict:
+        self.metrics.update(segments)
+        now = time.monotonic()
+        times = np.array([t for t, _ in self._arrivals])
+        arrival = self._arrivals[min(int(np.searchsorted(times, segments[-1]["end"])), len(times) - 1)][1]
+        return {
+            "segments": segments,
+            "text": " ".join(s["text"] for s in segments),
+            "metrics": self.metrics.snapshot(),
+            "latency_seconds": round(now - arrival, 3),
+        }
+
+    def _transcribe(self, flush: bool) -> List[Dict]:
+        with metrics.stage("live.transcribe") as stage:
+            stage.add("audio_seconds", len(self._buffer) / SAMPLE_RATE)
+            # Overlapping steps are not jobs, so they stay out of the latency model
+            result = self.processor.transcribe_audio(self._buffer, language=self.language, record=False)
+        self._pending = 0
+        live_edge = self.stream_seconds
+        full = len(self._buffer) >= self.window_seconds * SAMPLE_RATE
+        segments = result["segments"]
+
+        committed = []
+        for i, segment in enumerate(segments):
+            start = float(segment["start"] + self._buffer_start)
+            end = float(min(segment["end"] + self._buffer_start, live_edge))
+            # A full window commits all but a trailing unfinished segment so the buffer stays bounded
+            forced = flush or (full and (i < len(segments) - 1 or not committed))
+            if end > live_edge - self.holdback_seconds and not forced:
+                break
+            if end <= self._committed_until + 0.05:
+                continue  # already committed from the overlap
+            words = segment["text"].split()
+            if start < self._committed_until:
+                # Starts inside committed audio: drop the words already emitted
+                words = words[_overlap_words(self._tail, words):]
+            if not words:
+                continue
+            committed.append({**segment, "start": max(start, self._committed_until), "end": end,
+                              "text": " ".join(words)})
+            self._tail = (self._tail + words)[-TAIL_WORDS:]
+            self._committed_until = end
+
+        if flush:
+            self._committed_until = live_edge
+        elif full and not committed:
+            # Nothing but silence in a full window
+            self._committed_until = max(self._committed_until, live_edge - self.holdback_seconds)
+        # Keep only uncommitted audio plus a little context before it
+        keep_from = max(self._buffer_start, self._committed_until - self.overlap_seconds)
+        cut = int(round((keep_from - self._buffer_start) * SAMPLE_RATE))
+        if cut > 0:
+            self._buffer = self._buffer[cut:]
+            self._buffer_start += cut / SAMPLE_RATE
+        # Arrival times are only needed for audio that is not committed yet
+        while len(self._arrivals) > 1 and self._arrivals[1][0] <= self._committed_until:
+            self._arrivals.pop(0)
+        return committed
+
+def main():
+    parser = argparse.ArgumentParser(description="Live interview transcription and metrics")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help="Growing 16 kHz mono WAV or raw PCM file")
+    source.add_argument("--listen", help='Accept raw PCM on "host:port" or a Unix socket path')
+    parser.add_argument("--model-size", default="base", help="Whisper model size")
+    parser.add_argument("--language", help="Language code (skips detection on every window)")
+    parser.add_argument("--step", type=float, default=2.0, help="Seconds of new audio per transcription")
+    args = parser.parse_args()
+
+    from .audio_processor import create_audio_processor
+
+    chunks = follow_file(args.file) if args.file else socket_chunks(args.listen)
+    processor = create_audio_processor(args.model_size)
+    for update in processor.transcribe_stream(chunks, language=args.language, step_seconds=args.step):
+        m = update["metrics"]
+        print(f"[{m['elapsed_seconds']:7.1f}s] {update['text']}")
+        print(f"    {m['words']} words, {m['filler_words_count']} fillers, {m['words_per_minute']} wpm "
+              f"({m['speaking_pace']}), {m['sentiment']} {m['sentiment_score']:+.2f}, "
+              f"latency {update['latency_seconds']:.1f}s")
+
+if __name__ == "__main__":
+    main()
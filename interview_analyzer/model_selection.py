@@ -0,0 +1,310 @@
+"""
+Whisper Model Selection
+Picks the largest Whisper model whose predicted transcription time fits a latency budget
+
+Predictions use a per-model real-time factor (processing seconds per audio second) and load
+time, seeded with conservative CPU defaults, set by a calibration run and refined after every
+transcription from the actual versus predicted time.
+
+Calibrate with:
+    python -m interview_analyzer.model_selection --calibrate tiny,base,small [--audio sample.wav]
+"""
+from typing import Dict, List, Optional
+import argparse
+import json
+import os
+import subprocess
+import threading
+import time
+import wave
+
+from .config import WHISPER_PROFILE_PATH, WHISPER_INT8
+
+MODEL_SIZES = ["tiny", "base", "small", "medium", "large"]
+
+# Rough full-precision CPU figures used until a model is calibrated or observed
+DEFAULT_RTF = {"tiny": 0.08, "base": 0.15, "small": 0.45, "medium": 1.2, "large": 2.5}
+DEFAULT_LOAD_SECONDS = {"tiny": 1.0, "base": 2.0, "small": 5.0, "medium": 12.0, "large": 25.0}
+
+# Weight of each new observation in the running estimates
+SMOOTHING = 0.3
+
+def model_key(model_size: str, int8: bool = WHISPER_INT8) -> str:
+    """Profile key for a model size and precision"""
+    return f"{model_size}.int8" if int8 else model_size
+
+def audio_duration(audio_path: str) -> Optional[float]:
+    """
+    Duration of an audio file in seconds without decoding it
+
+    Reads WAV headers directly and asks ffprobe for other formats.
+
+    Returns:
+        Duration, or None when it cannot be determined
+    """
+    try:
+        with wave.open(audio_path, "rb") as wav:
+            return wav.getnframes() / wav.getframerate()
+    except (wave.Error, EOFError, OSError):
+        pass
+    try:
+        output = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", audio_path],
+            capture_output=True, text=True, timeout=30
+        ).stdout.strip()
+        return float(output)
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+class ModelSelector:
+    """
+    Latency model for Whisper transcription.
+
+    predicted time = load time + queue wait + audio seconds x real-time factor,
+    where the queue wait is the number of transcriptions ahead times the
+    recent average transcription time, spread over the available workers.
+    """
+
+    def __init__(self, profile_path: Optional[str] = WHISPER_PROFILE_PATH):
+        """
+        Initialize selector
+
+        Args:
+            profile_path: JSON file the measurements are persisted to (None keeps them in memory)
+        """
+        self.profile_path = profile_path
+        self._lock = threading.Lock()
+        self._profile: Dict = {"models": {}, "job_seconds": None}
+        if profile_path and os.path.exists(profile_path):
+            try:
+                with open(profile_path) as f:
+                    self._profile = json.load(f)
+            except (OSError, ValueError):
+                pass
+
+    def rtf(self, model_size: str, int8: bool = WHISPER_INT8) -> float:
+        """Current real-time factor estimate"""
+        stats = self._profile["models"].get(model_key(model_size, int8), {})
+        if "rtf" in stats:
+            return stats["rtf"]
+        # An uncalibrated int8 model is assumed to be no slower than full precision
+        return self._profile["models"].get(model_size, {}).get("rtf", DEFAULT_RTF.get(model_size, 1.0))
+
+    def load_seconds(self, model_size: str, int8: bool = WHISPER_INT8) -> float:
+        """Current model load time estimate"""
+        stats = self._profile["models"].get(model_key(model_size, int8), {})
+        return stats.get("load_seconds", DEFAULT_LOAD_SECONDS.get(model_size, 10.0))
+
+    def predict(
+        self,
+        model_size: str,
+        audio_seconds: float,
+        queue_depth: int = 0,
+        workers: int = 1,
+        loaded: bool = False,
+        int8: bool = WHISPER_INT8
+    ) -> float:
+        """
+        Predict seconds until a transcription finishes
+
+        Args:
+            model_size: Whisper model size
+            audio_seconds: Duration of the audio
+            queue_depth: Transcriptions waiting ahead of this one
+            workers: Transcriptions that run in parallel
+            loaded: Whether the model is already resident (no load time)
+            int8: Whether the model is quantized
+        """
+        transcribe = audio_seconds * self.rtf(model_size, int8)
+        # Until real jobs have been timed, assume the ones ahead are like this one
+        job_seconds = self._profile.get("job_seconds") or transcribe
+        wait = queue_depth * job_seconds / max(workers, 1)
+        load = 0.0 if loaded else self.load_seconds(model_size, int8)
+        return load + wait + transcribe
+
+    def choose(
+        self,
+        audio_seconds: float,
+        budget_seconds: float,
+        queue_depth: int = 0,
+        workers: int = 1,
+        loaded_sizes: Optional[List[str]] = None,
+        candidates: Optional[List[str]] = None,
+        int8: bool = WHISPER_INT8
+    ) -> Dict:
+        """
+        Pick the largest model that is predicted to finish within the budget
+
+        Args:
+            audio_seconds: Duration of the audio
+            budget_seconds: Target latency
+            queue_depth: Transcriptions waiting ahead of this one
+            workers: Transcriptions that run in parallel
+            loaded_sizes: Model sizes already resident
+            candidates: Sizes to consider, smallest first (defaults to MODEL_SIZES)
+            int8: Whether models are quantized
+
+        Returns:
+            Dictionary with model_size, predicted_seconds, within_budget and per-size predictions
+        """
+        loaded_sizes = loaded_sizes or []
+        predictions = {
+            size: self.predict(size, audio_seconds, queue_depth, workers, size in loaded_sizes, int8)
+            for size in (candidates or MODEL_SIZES)
+        }
+        fitting = [size for size, seconds in predictions.items() if seconds <= budget_seconds]
+        # Nothing fits: the smallest model is the fastest option
+        model_size = fitting[-1] if fitting else next(iter(predictions))
+        return {
+            "model_size": model_size,
+            "predicted_seconds": round(predictions[model_size], 2),
+            "predicted_transcribe_seconds": round(audio_seconds * self.rtf(model_size, int8), 2),
+            "within_budget": bool(fitting),
+            "budget_seconds": budget_seconds,
+            "audio_seconds": round(audio_seconds, 2),
+            "queue_depth": queue_depth,
+            "predictions": {size: round(seconds, 2) for size, seconds in predictions.items()},
+        }
+
+    def record_load(self, model_size: str, seconds: float, int8: bool = WHISPER_INT8):
+        """Record an observed model load time"""
+        with self._lock:
+            stats = self._profile["models"].setdefault(model_key(model_size, int8), {})
+            stats["load_seconds"] = self._blend(stats.get("load_seconds"), seconds)
+            self._save()
+
+    def record(
+        self,
+        model_size: str,
+        audio_seconds: float,
+        actual_seconds: float,
+        predicted_seconds: Optional[float] = None,
+        int8: bool = WHISPER_INT8
+    ):
+        """
+        Record an observed transcription to refine the estimates
+
+        Args:
+            model_size: Model used
+            audio_seconds: Duration of the audio
+            actual_seconds: Measured transcription time (excluding model load and queueing)
+            predicted_seconds: Prediction made before the run, for error tracking
+            int8: Whether the model was quantized
+        """
+        if audio_seconds <= 0:
+            return
+        with self._lock:
+            stats = self._profile["models"].setdefault(model_key(model_size, int8), {})
+            stats["rtf"] = self._blend(stats.get("rtf"), actual_seconds / audio_seconds)
+            stats["observations"] = stats.get("observations", 0) + 1
+            if predicted_seconds:
+                error = abs(actual_seconds - predicted_seconds) / max(actual_seconds, 1e-6)
+                stats["mean_abs_error"] = self._blend(stats.get("mean_abs_error"), error)
+                stats["last_predicted_seconds"] = round(predicted_seconds, 3)
+                stats["last_actual_seconds"] = round(actual_seconds, 3)
+            self._profile["job_seconds"] = self._blend(self._profile.get("job_seconds"), actual_seconds)
+            self._save()
+
+    def calibrate(self, model_size: str, audio_seconds: float, load_seconds: float, transcribe_seconds: float,
+                  int8: bool = WHISPER_INT8):
+        """Replace a model's estimates with a calibration measurement"""
+        with self._lock:
+            stats = self._profile["models"].setdefault(model_key(model_size, int8), {})
+            stats["rtf"] = transcribe_seconds / audio_seconds
+            stats["load_seconds"] = load_seconds
+            stats["calibrated_at"] = time.time()
+            self._save()
+
+    def profile(self) -> Dict:
+        """Copy of the current measurements"""
+        with self._lock:
+            return json.loads(json.dumps(self._profile))
+
+    @staticmethod
+    def _blend(previous: Optional[float], observed: float) -> float:
+        return observed if previous is None else (1 - SMOOTHING) * previous + SMOOTHING * observed
+
+    def _save(self):
+        if not self.profile_path:
+            return
+        os.makedirs(os.path.dirname(self.profile_path) or ".", exist_ok=True)
+        tmp_path = f"{self.profile_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._profile, f, indent=2)
+        os.replace(tmp_path, self.profile_path)
+
+_model_selector: Optional[ModelSelector] = None
+_model_selector_lock = threading.Lock()
+
+def get_model_selector() -> ModelSelector:
+    """Process-wide selector shared by all audio processors, read from the profile on first use"""
+    global _model_selector
+    with _model_selector_lock:
+        if _model_selector is None:
+            _model_selector = ModelSelector()
+        return _model_selector
+
+def calibration_audio(seconds: float = 30.0, sample_rate: int = 16000):
+    """Speech-like calibration clip: harmonic syllables with pauses, so decoding does real work"""
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    pieces = []
+    total = 0
+    while total < seconds * sample_rate:
+        length = int(rng.uniform(0.12, 0.35) * sample_rate)
+        t = np.arange(length) / sample_rate
+        f0 = rng.uniform(100, 220)
+        voiced = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in (1, 2, 3))
+        pieces.append((0.3 * voiced * np.sin(np.pi * t / t[-1]) ** 2).astype(np.float32))
+        pieces.append(np.zeros(int(rng.uniform(0.05, 0.6) * sample_rate), dtype=np.float32))
+        total += len(pieces[-2]) + len(pieces[-1])
+    return np.concatenate(pieces)[:int(seconds * sample_rate)]
+
+def run_calibration(model_sizes: List[str], audio_path: Optional[str] = None, seconds: float = 30.0,
+                    selector: Optional[ModelSelector] = None) -> Dict[str, Dict]:
+    """
+    Measure load time and real-time factor of each model on this host
+
+    Args:
+        model_sizes: Sizes to calibrate
+        audio_path: Representative recording (a synthetic clip is used if omitted)
+        seconds: Length of the synthetic clip
+        selector: Selector to update (defaults to the shared one)
+
+    Returns:
+        Dictionary of model size to measured load_seconds and rtf
+    """
+    import whisper
+    from .audio_processor import AudioProcessor
+
+    selector = selector or get_model_selector()
+    audio = whisper.load_audio(audio_path) if audio_path else calibration_audio(seconds)
+    audio_seconds = len(audio) / 16000
+
+    measured = {}
+    for model_size in model_sizes:
+        start = time.perf_counter()
+        # Measurements go only to the selector being calibrated
+        processor = AudioProcessor(model_size, record=False)
+        load_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        processor.transcribe_audio(audio, language="en", record=False)
+        transcribe_seconds = time.perf_counter() - start
+        selector.calibrate(model_size, audio_seconds, load_seconds, transcribe_seconds, processor.int8)
+        measured[model_size] = {"load_seconds": round(load_seconds, 2), "rtf": round(transcribe_seconds / audio_seconds, 4)}
+    return measured
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate Whisper latency estimates on this host")
+    parser.add_argument("--calibrate", default="tiny,base,small", help="Comma-separated model sizes")
+    parser.add_argument("--audio", help="Representative recording (default: synthetic clip)")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Synthetic clip length")
+    args = parser.parse_args()
+
+    for model_size, stats in run_calibration(args.calibrate.split(","), args.audio, args.seconds).items():
+        print(f"🎯 whisper-{model_size}: RTF {stats['rtf']}, load {stats['load_seconds']} s")
+    print(f"💾 Profile written to {get_model_selector().profile_path}")
+
+if __name__ == "__main__":
+    main()
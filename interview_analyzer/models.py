@@ -0,0 +1,384 @@
+"""
+Report Data Models
+Compact, typed containers for analysis reports with shared transcript storage
+"""
+from typing import Dict, List, Optional, Any
+import hashlib
+import sys
+import threading
+import weakref
+
+
+class TranscriptStore:
+    """
+    Keeps each transcript exactly once, keyed by its SHA-256 digest.
+
+    Reports and session state hold the short ID instead of the text, so a
+    megabyte-sized transcript is not duplicated across the analysis result,
+    the report and the UI session.
+    """
+
+    def __init__(self):
+        self._texts: Dict[str, str] = {}
+        self._refs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_id(text: str) -> str:
+        """Return the transcript ID (SHA-256 hex digest) for a text"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def put(self, text: str) -> str:
+        """
+        Store a transcript and return its ID
+
+        Each call takes a reference; call release() when the holder is done.
+
+        Args:
+            text: Transcript text
+
+        Returns:
+            Transcript ID
+        """
+        transcript_id = self.make_id(text)
+        with self._lock:
+            # Keep the first copy; identical text from another session is dropped
+            self._texts.setdefault(transcript_id, text)
+            self._refs[transcript_id] = self._refs.get(transcript_id, 0) + 1
+        return transcript_id
+
+    def lease(self, text: str) -> "TranscriptLease":
+        """Store a transcript and return a reference that is released when garbage collected"""
+        return TranscriptLease(self, text)
+
+    def release(self, transcript_id: Optional[str]):
+        """Drop one reference to a transcript, removing it when unused"""
+        if not transcript_id:
+            return
+        with self._lock:
+            refs = self._refs.get(transcript_id, 0) - 1
+            if refs > 0:
+                self._refs[transcript_id] = refs
+            else:
+                self._refs.pop(transcript_id, None)
+                self._texts.pop(transcript_id, None)
+
+    def get(self, transcript_id: Optional[str], default: str = "") -> str:
+        """Return the transcript for an ID, or default if unknown"""
+        if not transcript_id:
+            return default
+        return self._texts.get(transcript_id, default)
+
+    def __contains__(self, transcript_id: str) -> bool:
+        return transcript_id in self._texts
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    @property
+    def total_bytes(self) -> int:
+        """Approximate memory held by stored transcripts"""
+        return sum(sys.getsizeof(text) for text in self._texts.values())
+
+
+class TranscriptLease:
+    """
+    One reference to a stored transcript.
+
+    Released by release() or, at the latest, when the lease is garbage
+    collected, so a transcript held by a session that ends without cleaning
+    up (a closed browser tab) still leaves the store.
+    """
+
+    __slots__ = ("transcript_id", "_finalizer", "__weakref__")
+
+    def __init__(self, store: TranscriptStore, text: str):
+        self.transcript_id = store.put(text)
+        self._finalizer = weakref.finalize(self, store.release, self.transcript_id)
+
+    def release(self):
+        """Drop the reference (later calls do nothing)"""
+        self._finalizer()
+
+
+# Process-wide store shared by all sessions
+transcript_store = TranscriptStore()
+
+
+class Participant:
+    """Analysis results for a single speaker"""
+
+    __slots__ = (
+        "name",
+        "sentiment",
+        "tone",
+        "confidence_score",
+        "clarity_score",
+        "empathy_score",
+        "engagement_score",
+        "key_points",
+        "strengths",
+        "improvements",
+        "filler_words_count",
+        "speaking_pace",
+        "communication_quality",
+        "extra",
+    )
+
+    _SCORE_FIELDS = ("confidence_score", "clarity_score", "empathy_score", "engagement_score")
+    _TEXT_FIELDS = ("name", "sentiment", "tone", "speaking_pace", "communication_quality")
+    _LIST_FIELDS = ("key_points", "strengths", "improvements")
+
+    def __init__(
+        self,
+        name: str = "",
+        sentiment: str = "N/A",
+        tone: str = "N/A",
+        confidence_score: float = 0.0,
+        clarity_score: float = 0.0,
+        empathy_score: float = 0.0,
+        engagement_score: float = 0.0,
+        key_points: tuple = (),
+        strengths: tuple = (),
+        improvements: tuple = (),
+        filler_words_count: int = 0,
+        speaking_pace: str = "N/A",
+        communication_quality: str = "N/A",
+        extra: Optional[Dict[str, Any]] = None
+    ):
+        self.name = name
+        self.sentiment = sentiment
+        self.tone = tone
+        self.confidence_score = confidence_score
+        self.clarity_score = clarity_score
+        self.empathy_score = empathy_score
+        self.engagement_score = engagement_score
+        self.key_points = tuple(key_points)
+        self.strengths = tuple(strengths)
+        self.improvements = tuple(improvements)
+        self.filler_words_count = filler_words_count
+        self.speaking_pace = speaking_pace
+        self.communication_quality = communication_quality
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: Dict, default_name: str = "") -> "Participant":
+        """
+        Build a participant from the analysis dictionary format
+
+        Args:
+            data: Participant dictionary as returned by the AI analyzer
+            default_name: Name to use when the dictionary has none
+
+        Returns:
+            Participant instance
+        """
+        known = {}
+        for field in cls._TEXT_FIELDS:
+            if field in data:
+                # Interning shares the repeated labels ("Positive", "Moderate", ...)
+                value = data[field]
+                known[field] = sys.intern(value) if isinstance(value, str) else value
+        for field in cls._SCORE_FIELDS:
+            if field in data:
+                known[field] = _to_float(data[field])
+        for field in cls._LIST_FIELDS:
+            if field in data:
+                known[field] = tuple(data[field] or ())
+        if "filler_words_count" in data:
+            known["filler_words_count"] = data["filler_words_count"]
+        known.setdefault("name", default_name)
+
+        extra = {k: v for k, v in data.items() if k not in cls.__slots__}
+        return cls(extra=extra or None, **known)
+
+    def to_dict(self) -> Dict:
+        """Convert to the dictionary format used by existing callers"""
+        data = {
+            "name": self.name,
+            "sentiment": self.sentiment,
+            "tone": self.tone,
+            "confidence_score": self.confidence_score,
+            "clarity_score": self.clarity_score,
+            "empathy_score": self.empathy_score,
+            "engagement_score": self.engagement_score,
+            "key_points": list(self.key_points),
+            "strengths": list(self.strengths),
+            "improvements": list(self.improvements),
+            "filler_words_count": self.filler_words_count,
+            "speaking_pace": self.speaking_pace,
+            "communication_quality": self.communication_quality,
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self) -> str:
+        return f"Participant(name={self.name!r})"
+
+
+class InterviewReport:
+    """
+    Structured interview report
+
+    The transcript is kept in a TranscriptStore and referenced by ID. A report
+    built from a dict with the transcript holds a lease on it, released by
+    release() or when the report is garbage collected.
+    """
+
+    __slots__ = (
+        "timestamp",
+        "overall_summary",
+        "participants",
+        "sentiment_trend",
+        "topics",
+        "keywords",
+        "assessment",
+        "detailed_feedback",
+        "transcript_id",
+        "extra",
+        "store",
+        "_lease",
+    )
+
+    def __init__(
+        self,
+        timestamp: str = "",
+        overall_summary: str = "",
+        participants: Optional[Dict[str, Participant]] = None,
+        sentiment_trend: Optional[List[Dict]] = None,
+        topics: tuple = (),
+        keywords: tuple = (),
+        assessment: Optional[Dict] = None,
+        detailed_feedback: Optional[Dict] = None,
+        transcript_id: Optional[str] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        store: Optional[TranscriptStore] = None,
+        lease: Optional[TranscriptLease] = None
+    ):
+        self.timestamp = timestamp
+        self.overall_summary = overall_summary
+        self.participants = participants or {}
+        self.sentiment_trend = sentiment_trend or []
+        self.topics = tuple(topics)
+        self.keywords = tuple(keywords)
+        self.assessment = assessment or {}
+        self.detailed_feedback = detailed_feedback or {}
+        self.transcript_id = transcript_id
+        self.extra = extra
+        self.store = store if store is not None else transcript_store
+        self._lease = lease
+
+    @property
+    def raw_transcript(self) -> str:
+        """Transcript text resolved from the report's store"""
+        return self.store.get(self.transcript_id)
+
+    def release(self):
+        """Drop the report's reference to its transcript"""
+        if self._lease is not None:
+            self._lease.release()
+
+    @classmethod
+    def from_dict(cls, data: Dict, store: TranscriptStore = None) -> "InterviewReport":
+        """
+        Build a report from the report dictionary format
+
+        Args:
+            data: Report dictionary (as produced by ReportGenerator.generate_report_data)
+            store: Transcript store to use (defaults to the shared store)
+
+        Returns:
+            InterviewReport instance
+        """
+        if store is None:
+            store = transcript_store
+        transcript_id = data.get("transcript_id")
+        raw_transcript = data.get("raw_transcript")
+        lease = store.lease(raw_transcript) if raw_transcript else None
+        if lease:
+            transcript_id = lease.transcript_id
+
+        participants = {
+            sys.intern(str(speaker_id)): Participant.from_dict(p, default_name=str(speaker_id))
+            for speaker_id, p in (data.get("participants") or {}).items()
+        }
+
+        known = set(cls.__slots__) - {"store", "_lease"} | {"raw_transcript"}
+        extra = {k: v for k, v in data.items() if k not in known}
+
+        return cls(
+            timestamp=data.get("timestamp", ""),
+            overall_summary=data.get("overall_summary", ""),
+            participants=participants,
+            sentiment_trend=data.get("sentiment_trend", []),
+            topics=data.get("topics", ()),
+            keywords=data.get("keywords", ()),
+            assessment=data.get("assessment", {}),
+            detailed_feedback=data.get("detailed_feedback", {}),
+            transcript_id=transcript_id,
+            extra=extra or None,
+            store=store,
+            lease=lease
+        )
+
+    def to_dict(self, include_transcript: bool = True) -> Dict:
+        """
+        Convert to the dictionary format used by existing callers
+
+        Args:
+            include_transcript: Resolve and include raw_transcript
+
+        Returns:
+            Report dictionary
+        """
+        data = {
+            "timestamp": self.timestamp,
+            "overall_summary": self.overall_summary,
+            "participants": {sid: p.to_dict() for sid, p in self.participants.items()},
+            "sentiment_trend": self.sentiment_trend,
+            "topics": list(self.topics),
+            "keywords": list(self.keywords),
+            "assessment": self.assessment,
+            "detailed_feedback": self.detailed_feedback,
+        }
+        if include_transcript:
+            data["raw_transcript"] = self.raw_transcript
+        else:
+            data["transcript_id"] = self.transcript_id
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self) -> str:
+        return f"InterviewReport(timestamp={self.timestamp!r}, participants={len(self.participants)})"
+
+
+def deep_sizeof(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    Approximate the memory footprint of an object graph in bytes
+
+    Shared objects are only counted once, so a transcript referenced from
+    several places contributes its size a single time.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, _seen) + deep_sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, _seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, slot, None), _seen) for slot in obj.__slots__)
+    return size
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
@@ -0,0 +1,157 @@
+"""
+PDF Chart Rendering
+Draws report charts as native ReportLab vector graphics (no browser or image export)
+"""
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.spider import SpiderChart
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.widgets.markers import makeMarker
+from reportlab.lib import colors
+from typing import Dict, List
+
+from .report_generator import sentiment_series, participant_metrics, radar_values, RADAR_CATEGORIES
+
+# Same palette as the Plotly charts in ReportGenerator
+SENTIMENT_COLOR = colors.HexColor('#1f77b4')
+METRIC_COLORS = [colors.HexColor('#2ecc71'), colors.HexColor('#3498db'), colors.HexColor('#9b59b6')]
+RADAR_COLOR = colors.HexColor('#e74c3c')
+
+SENTIMENT_LABELS = {-1: "Negative", 0: "Neutral", 1: "Positive"}
+
+CHART_WIDTH = 450
+CHART_HEIGHT = 220
+
+def _titled_drawing(title: str, width: float = CHART_WIDTH, height: float = CHART_HEIGHT) -> Drawing:
+    """Create a drawing with a centered title on top"""
+    drawing = Drawing(width, height)
+    drawing.add(String(width / 2, height - 14, title, fontName='Helvetica-Bold',
+                       fontSize=11, textAnchor='middle'))
+    return drawing
+
+def _empty_drawing(title: str, message: str) -> Drawing:
+    """Placeholder drawing used when there is no data to plot"""
+    drawing = _titled_drawing(title, height=60)
+    drawing.add(String(CHART_WIDTH / 2, 20, message, fontName='Helvetica',
+                       fontSize=9, textAnchor='middle', fillColor=colors.grey))
+    return drawing
+
+def sentiment_trend_drawing(sentiment_trend: List[Dict]) -> Drawing:
+    """
+    Draw the sentiment trend line chart
+
+    Args:
+        sentiment_trend: List of sentiment data points
+
+    Returns:
+        ReportLab drawing (usable directly as a flowable)
+    """
+    title = "Sentiment Trend Over Time"
+    if not sentiment_trend:
+        return _empty_drawing(title, "No sentiment data available")
+
+    series = sentiment_series(sentiment_trend)
+    drawing = _titled_drawing(title)
+
+    chart = HorizontalLineChart()
+    chart.x, chart.y = 60, 35
+    chart.width, chart.height = CHART_WIDTH - 80, CHART_HEIGHT - 70
+    chart.data = [series["values"]]
+    chart.joinedLines = 1
+    chart.lines[0].strokeColor = SENTIMENT_COLOR
+    chart.lines[0].strokeWidth = 2
+    chart.lines[0].symbol = makeMarker('FilledCircle', size=5, fillColor=SENTIMENT_COLOR)
+    chart.categoryAxis.categoryNames = series["segments"]
+    chart.categoryAxis.joinAxisMode = 'bottom'
+    chart.categoryAxis.labels.fontSize = 8
+    chart.categoryAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.valueMin = -1
+    chart.valueAxis.valueMax = 1
+    chart.valueAxis.valueStep = 1
+    chart.valueAxis.labelTextFormat = lambda v: SENTIMENT_LABELS.get(int(round(v)), "")
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.visibleGrid = 1
+    chart.valueAxis.gridStrokeColor = colors.lightgrey
+    drawing.add(chart)
+    return drawing
+
+def participant_comparison_drawing(participants: Dict) -> Drawing:
+    """
+    Draw the grouped bar chart comparing participant scores
+
+    Args:
+        participants: Dictionary of participant data
+
+    Returns:
+        ReportLab drawing
+    """
+    title = "Communication Metrics by Participant"
+    if not participants:
+        return _empty_drawing(title, "No participant data available")
+
+    metrics = participant_metrics(participants)
+    drawing = _titled_drawing(title)
+
+    chart = VerticalBarChart()
+    chart.x, chart.y = 45, 45
+    chart.width, chart.height = CHART_WIDTH - 140, CHART_HEIGHT - 80
+    chart.data = [metrics["confidence"], metrics["clarity"], metrics["empathy"]]
+    chart.groupSpacing = 10
+    chart.barSpacing = 1
+    for i, color in enumerate(METRIC_COLORS):
+        chart.bars[i].fillColor = color
+        chart.bars[i].strokeColor = None
+    chart.categoryAxis.categoryNames = [str(name) for name in metrics["names"]]
+    chart.categoryAxis.labels.fontSize = 8
+    chart.categoryAxis.labels.fontName = 'Helvetica'
+    chart.categoryAxis.labels.angle = 20 if len(metrics["names"]) > 4 else 0
+    chart.categoryAxis.labels.boxAnchor = 'ne' if len(metrics["names"]) > 4 else 'n'
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.valueMax = 1
+    chart.valueAxis.valueStep = 0.25
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.visibleGrid = 1
+    chart.valueAxis.gridStrokeColor = colors.lightgrey
+    drawing.add(chart)
+
+    legend = Legend()
+    legend.x, legend.y = CHART_WIDTH - 80, CHART_HEIGHT - 50
+    legend.fontSize = 8
+    legend.fontName = 'Helvetica'
+    legend.alignment = 'right'
+    legend.colorNamePairs = list(zip(METRIC_COLORS, ['Confidence', 'Clarity', 'Empathy']))
+    drawing.add(legend)
+    return drawing
+
+def radar_drawing(participant_data: Dict, size: float = 200) -> Drawing:
+    """
+    Draw the communication skills radar chart for one participant
+
+    Args:
+        participant_data: Single participant's analysis data
+        size: Width and height of the drawing
+
+    Returns:
+        ReportLab drawing
+    """
+    drawing = _titled_drawing("Communication Skills Radar", width=size, height=size)
+
+    chart = SpiderChart()
+    chart.x, chart.y = 30, 15
+    chart.width, chart.height = size - 60, size - 50
+    # The faint outer strand pins the scale to 0-1 (SpiderChart normalizes to the data max)
+    chart.data = [radar_values(participant_data), [1.0] * len(RADAR_CATEGORIES)]
+    chart.labels = RADAR_CATEGORIES
+    chart.spokeLabels.fontSize = 7
+    chart.spokeLabels.fontName = 'Helvetica'
+    chart.strands[0].fillColor = colors.Color(RADAR_COLOR.red, RADAR_COLOR.green, RADAR_COLOR.blue, alpha=0.3)
+    chart.strands[0].strokeColor = RADAR_COLOR
+    chart.strands[0].strokeWidth = 1.5
+    chart.strands[1].fillColor = None
+    chart.strands[1].strokeColor = colors.lightgrey
+    chart.strands[1].strokeWidth = 0.5
+    drawing.add(chart)
+    return drawing
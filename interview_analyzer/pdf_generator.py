@@ -3,59 +3,112 @@ PDF Report Generator
 Creates downloadable PDF reports for interview analysis
 """
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-from typing import Dict
+from typing import Dict, Iterable, List, Optional
+from io import BytesIO
 import os
+import re
+import tempfile
 from datetime import datetime
+from .pdf_charts import sentiment_trend_drawing, participant_comparison_drawing, radar_drawing
+from .config import UPLOAD_DIR, DISK_QUOTA_MB
+from .storage import content_hash, touch, enforce_disk_quota
+from .instrumentation import metrics
+
+# Bump whenever the layout changes so cached PDFs are re-rendered
+TEMPLATE_VERSION = "4"
+
+# Report fields that never appear in the PDF and are left out of the cache key
+_UNRENDERED_FIELDS = ("raw_transcript", "transcript_id", "pipeline_timings")
+
+# Content-addressed cache files (see _cache_path); the only files the disk quota removes
+CACHE_FILE = re.compile(r"report_[0-9a-f]{24}\.pdf")
+
+def _build_stylesheet() -> StyleSheet1:
+    """Build the sample stylesheet with the report's custom paragraph styles"""
+    styles = getSampleStyleSheet()
+    
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#34495e'),
+        spaceAfter=12,
+        spaceBefore=12
+    ))
+    
+    # The sample sheet already defines 'BodyText', so the report body gets its own name
+    styles.add(ParagraphStyle(
+        name='ReportBody',
+        parent=styles['Normal'],
+        fontSize=11,
+        leading=14,
+        alignment=TA_JUSTIFY
+    ))
+    
+    return styles
+
+# Built once per process and shared by every PDFGenerator (styles are read-only during layout)
+STYLES = _build_stylesheet()
+
+METRICS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+# Places the metrics table and radar chart side by side
+SIDE_BY_SIDE_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 0),
+])
 
 class PDFGenerator:
-    def __init__(self, output_dir: str = "outputs"):
+    def __init__(
+        self,
+        output_dir: str = "outputs",
+        include_charts: bool = True,
+        use_cache: bool = True,
+        disk_quota_mb: Optional[float] = None
+    ):
         """
         Initialize PDF generator
         
         Args:
-            output_dir: Directory to save PDFs
+            output_dir: Directory to save PDFs (created on first write)
+            include_charts: Draw sentiment, comparison and radar charts as vector graphics
+            use_cache: Reuse PDFs already rendered for identical report data
+            disk_quota_mb: Combined size limit for the output and upload directories
         """
         self.output_dir = output_dir
-        os.makedirs(output_dir, exist_ok=True)
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-    
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles"""
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#34495e'),
-            spaceAfter=12,
-            spaceBefore=12
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='BodyText',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            leading=14,
-            alignment=TA_JUSTIFY
-        ))
+        self.include_charts = include_charts
+        self.use_cache = use_cache
+        self.disk_quota_mb = DISK_QUOTA_MB if disk_quota_mb is None else disk_quota_mb
+        self.styles = STYLES
     
     def generate_pdf(self, report_data: Dict, filename: str = None) -> str:
         """
-        Generate PDF report from analysis data
+        Generate PDF report from analysis data and write it to the output directory
+        
+        Without a custom filename the content-addressed cache file is returned.
         
         Args:
             report_data: Report data dictionary
@@ -64,12 +117,123 @@ class PDFGenerator:
         Returns:
             Path to generated PDF file
         """
+        if self.use_cache and not filename:
+            path = self._cache_path(report_data)
+            if os.path.exists(path):
+                touch(path)
+                metrics.count("pdf_cache_hits")
+                return path
+            metrics.count("pdf_cache_misses")
+            self._write_cache(path, self._render(report_data))
+            return path
+        return self.save_pdf(self.render_pdf(report_data), filename)
+    
+    def render_pdf(self, report_data: Dict) -> bytes:
+        """
+        Render PDF report in memory
+        
+        When caching is enabled, identical report data returns the previously
+        rendered bytes from the output directory.
+        
+        Args:
+            report_data: Report data dictionary
+        
+        Returns:
+            PDF file contents
+        """
+        if not self.use_cache:
+            return self._render(report_data)
+        
+        path = self._cache_path(report_data)
+        try:
+            with open(path, "rb") as pdf_file:
+                pdf_bytes = pdf_file.read()
+            touch(path)
+            metrics.count("pdf_cache_hits")
+            return pdf_bytes
+        except FileNotFoundError:
+            metrics.count("pdf_cache_misses")
+        
+        pdf_bytes = self._render(report_data)
+        self._write_cache(path, pdf_bytes)
+        return pdf_bytes
+    
+    def cache_key(self, report_data: Dict) -> str:
+        """Hash of the rendered report content and template version"""
+        rendered = {k: v for k, v in report_data.items() if k not in _UNRENDERED_FIELDS}
+        return content_hash(rendered, TEMPLATE_VERSION, f"charts={self.include_charts}")
+    
+    def _cache_path(self, report_data: Dict) -> str:
+        return os.path.join(self.output_dir, f"report_{self.cache_key(report_data)[:24]}.pdf")
+    
+    def _write_cache(self, path: str, pdf_bytes: bytes):
+        """Atomically store a rendered PDF and trim the directories to the quota"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        # Unique per writer, so concurrent renders of the same report never share a temp file
+        with tempfile.NamedTemporaryFile(dir=self.output_dir, suffix=".tmp", delete=False) as pdf_file:
+            pdf_file.write(pdf_bytes)
+        os.replace(pdf_file.name, path)
+        self.enforce_quota(keep=(path,))
+    
+    def enforce_quota(self, keep: Iterable[str] = ()) -> List[str]:
+        """
+        Apply the disk quota to the output and upload directories
+        
+        Uploads count towards the quota but only cached PDFs are removed;
+        uploads may still be waiting for background jobs.
+        
+        Args:
+            keep: Paths that must not be removed (e.g. the PDF just written)
+        
+        Returns:
+            Paths of removed files
+        """
+        quota_bytes = int(self.disk_quota_mb * 1024 * 1024)
+        return enforce_disk_quota(
+            [self.output_dir, UPLOAD_DIR], quota_bytes,
+            evictable=lambda path: bool(CACHE_FILE.fullmatch(os.path.basename(path))), keep=keep
+        )
+    
+    @metrics.timed("pdf.render")
+    def _render(self, report_data: Dict) -> bytes:
+        """Lay out the report into PDF bytes"""
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4)
+        doc.build(self.build_story(report_data))
+        return buffer.getvalue()
+    
+    def save_pdf(self, pdf_bytes: bytes, filename: str = None) -> str:
+        """
+        Write rendered PDF bytes to the output directory
+        
+        Args:
+            pdf_bytes: PDF file contents
+            filename: Optional custom filename
+        
+        Returns:
+            Path to written PDF file
+        """
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"interview_report_{timestamp}.pdf"
         
+        os.makedirs(self.output_dir, exist_ok=True)
         filepath = os.path.join(self.output_dir, filename)
-        doc = SimpleDocTemplate(filepath, pagesize=A4)
+        with open(filepath, "wb") as pdf_file:
+            pdf_file.write(pdf_bytes)
+        self.enforce_quota(keep=(filepath,))
+        return filepath
+    
+    def build_story(self, report_data: Dict) -> List:
+        """
+        Build the flowables that make up a report
+        
+        Args:
+            report_data: Report data dictionary
+        
+        Returns:
+            List of ReportLab flowables
+        """
         story = []
         
         # Title
@@ -84,11 +248,20 @@ class PDFGenerator:
         # Overall Summary
         story.append(Paragraph("Executive Summary", self.styles['SectionHeader']))
         summary = report_data.get("overall_summary", "No summary available.")
-        story.append(Paragraph(summary, self.styles['BodyText']))
+        story.append(Paragraph(summary, self.styles['ReportBody']))
         story.append(Spacer(1, 0.2*inch))
         
-        # Participants Analysis
         participants = report_data.get("participants", {})
+        
+        # Visualizations
+        if self.include_charts:
+            story.append(Paragraph("Visualizations", self.styles['SectionHeader']))
+            story.append(sentiment_trend_drawing(report_data.get("sentiment_trend", [])))
+            story.append(Spacer(1, 0.2*inch))
+            story.append(participant_comparison_drawing(participants))
+            story.append(Spacer(1, 0.2*inch))
+        
+        # Participants Analysis
         if participants:
             story.append(Paragraph("Participant Analysis", self.styles['SectionHeader']))
             
@@ -110,17 +283,13 @@ class PDFGenerator:
                 ]
                 
                 metrics_table = Table(metrics_data, colWidths=[2*inch, 1.5*inch])
-                metrics_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                story.append(metrics_table)
+                metrics_table.setStyle(METRICS_TABLE_STYLE)
+                if self.include_charts:
+                    layout = Table([[metrics_table, radar_drawing(data)]], colWidths=[3.7*inch, 3*inch])
+                    layout.setStyle(SIDE_BY_SIDE_STYLE)
+                    story.append(layout)
+                else:
+                    story.append(metrics_table)
                 story.append(Spacer(1, 0.2*inch))
                 
                 # Key Points
@@ -128,7 +297,7 @@ class PDFGenerator:
                 if key_points:
                     story.append(Paragraph("<b>Key Points:</b>", self.styles['Normal']))
                     for point in key_points:
-                        story.append(Paragraph(f"• {point}", self.styles['BodyText']))
+                        story.append(Paragraph(f"• {point}", self.styles['ReportBody']))
                     story.append(Spacer(1, 0.1*inch))
                 
                 # Strengths
@@ -136,7 +305,7 @@ class PDFGenerator:
                 if strengths:
                     story.append(Paragraph("<b>Strengths:</b>", self.styles['Normal']))
                     for strength in strengths:
-                        story.append(Paragraph(f"• {strength}", self.styles['BodyText']))
+                        story.append(Paragraph(f"• {strength}", self.styles['ReportBody']))
                     story.append(Spacer(1, 0.1*inch))
                 
                 # Improvements
@@ -144,11 +313,44 @@ class PDFGenerator:
                 if improvements:
                     story.append(Paragraph("<b>Areas for Improvement:</b>", self.styles['Normal']))
                     for improvement in improvements:
-                        story.append(Paragraph(f"• {improvement}", self.styles['BodyText']))
+                        story.append(Paragraph(f"• {improvement}", self.styles['ReportBody']))
                     story.append(Spacer(1, 0.2*inch))
                 
                 story.append(PageBreak())
         
+        # Pause & Hesitation Analysis
+        acoustic = report_data.get("acoustic_metrics")
+        if acoustic:
+            story.append(Paragraph("Pause & Hesitation Analysis", self.styles['SectionHeader']))
+            pause_data = [
+                ["Metric", "Value"],
+                ["Recording Length", f"{acoustic.get('duration_seconds', 0) / 60:.1f} min"],
+                ["Silence Ratio", f"{acoustic.get('silence_ratio', 0):.0%}"],
+                ["Pauses", str(acoustic.get("pause_count", 0))],
+                ["Pauses per Minute", f"{acoustic.get('pauses_per_minute', 0):.1f}"],
+                ["Long Silences", str(acoustic.get("long_pause_count", 0))],
+                ["Longest Pause", f"{acoustic.get('max_pause_seconds', 0):.1f} s"],
+            ]
+            pause_table = Table(pause_data, colWidths=[2*inch, 1.5*inch])
+            pause_table.setStyle(METRICS_TABLE_STYLE)
+            story.append(pause_table)
+            story.append(Spacer(1, 0.2*inch))
+            
+            speakers = {label: stats for label, stats in (acoustic.get("speakers") or {}).items() if label}
+            if speakers:
+                speaker_data = [["Speaker", "Hesitations/min", "Mean Hesitation", "Response Gap"]]
+                for label, stats in speakers.items():
+                    speaker_data.append([
+                        label,
+                        f"{stats.get('hesitations_per_minute', 0):.1f}",
+                        f"{stats.get('mean_hesitation_seconds', 0):.1f} s",
+                        f"{stats.get('mean_response_gap_seconds', 0):.1f} s",
+                    ])
+                speaker_table = Table(speaker_data, colWidths=[1.8*inch, 1.4*inch, 1.4*inch, 1.4*inch])
+                speaker_table.setStyle(METRICS_TABLE_STYLE)
+                story.append(speaker_table)
+                story.append(Spacer(1, 0.2*inch))
+        
         # Overall Assessment
         assessment = report_data.get("assessment", {})
         if assessment:
@@ -156,14 +358,14 @@ class PDFGenerator:
             
             recommendation = assessment.get("recommendation", "")
             if recommendation:
-                story.append(Paragraph(f"<b>Recommendation:</b> {recommendation}", self.styles['BodyText']))
+                story.append(Paragraph(f"<b>Recommendation:</b> {recommendation}", self.styles['ReportBody']))
                 story.append(Spacer(1, 0.2*inch))
             
             critical_improvements = assessment.get("critical_improvements", [])
             if critical_improvements:
                 story.append(Paragraph("<b>Critical Areas for Improvement:</b>", self.styles['Normal']))
                 for improvement in critical_improvements:
-                    story.append(Paragraph(f"• {improvement}", self.styles['BodyText']))
+                    story.append(Paragraph(f"• {improvement}", self.styles['ReportBody']))
                 story.append(Spacer(1, 0.2*inch))
         
         # Topics and Keywords
@@ -176,13 +378,13 @@ class PDFGenerator:
             if topics:
                 story.append(Paragraph("<b>Topics Discussed:</b>", self.styles['Normal']))
                 topics_text = ", ".join(topics)
-                story.append(Paragraph(topics_text, self.styles['BodyText']))
+                story.append(Paragraph(topics_text, self.styles['ReportBody']))
                 story.append(Spacer(1, 0.1*inch))
             
             if keywords:
                 story.append(Paragraph("<b>Key Keywords:</b>", self.styles['Normal']))
                 keywords_text = ", ".join(keywords)
-                story.append(Paragraph(keywords_text, self.styles['BodyText']))
+                story.append(Paragraph(keywords_text, self.styles['ReportBody']))
                 story.append(Spacer(1, 0.2*inch))
         
         # Detailed Feedback
@@ -194,9 +396,7 @@ class PDFGenerator:
                 if feedback:
                     category_title = category.replace("_", " ").title()
                     story.append(Paragraph(f"<b>{category_title}:</b>", self.styles['Normal']))
-                    story.append(Paragraph(feedback, self.styles['BodyText']))
+                    story.append(Paragraph(feedback, self.styles['ReportBody']))
                     story.append(Spacer(1, 0.1*inch))
         
-        # Build PDF
-        doc.build(story)
-        return filepath
+        return story
@@ -0,0 +1,485 @@
+"""
+Analysis Pipeline
+Runs the full transcript analysis outside the UI so it can execute on background workers
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
+import time
+
+from .ai_analyzer import create_ai_analyzer
+from .sentiment_analyzer import SentimentAnalyzer
+from .report_generator import ReportGenerator
+from .transcript import split_turns, group_by_speaker, speech_text, top_keywords
+from .config import LOCAL_METRICS_PROCESS_MIN_CHARS, DIARIZATION_ENABLED
+from .resources import governor, WHISPER_MODEL_BYTES
+
+# progress(stage, percent) callback used to report pipeline progress
+ProgressCallback = Callable[[str, float], None]
+
+def _no_progress(stage: str, percent: float):
+    pass
+
+class StageGraph:
+    """
+    Small dependency graph of pipeline stages.
+
+    Each stage function receives the results of its dependencies as positional
+    arguments. Stages whose dependencies are satisfied run concurrently, so the
+    wall time approaches the slowest path rather than the sum of all stages.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Tuple[Callable, Tuple, Tuple[str, ...], str]] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: Callable,
+        deps: Tuple[str, ...] = (),
+        args: Tuple = (),
+        executor: str = "thread"
+    ):
+        """
+        Add a stage
+
+        Args:
+            name: Stage name (also the key of its result)
+            fn: Stage function; must be picklable for process stages
+            deps: Names of stages whose results are passed to fn after args
+            args: Fixed leading arguments for fn
+            executor: "thread" or "process"
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor '{executor}'")
+        self._stages[name] = (fn, tuple(args), tuple(deps), executor)
+
+    def run(
+        self,
+        thread_pool: Executor,
+        process_pool: Optional[Executor] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Execute all stages
+
+        Args:
+            thread_pool: Executor for thread stages
+            process_pool: Executor for process stages (thread_pool is used if omitted)
+            progress: Optional callback invoked as stages finish
+
+        Returns:
+            Tuple of (stage results, stage wall times in seconds)
+        """
+        progress = progress or _no_progress
+        pending = dict(self._stages)
+        results: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        running = {}
+        started = {}
+
+        while pending or running:
+            ready = [name for name, stage in pending.items() if all(d in results for d in stage[2])]
+            for name in ready:
+                fn, args, deps, executor = pending.pop(name)
+                pool = process_pool if executor == "process" and process_pool is not None else thread_pool
+                started[name] = time.perf_counter()
+                running[pool.submit(fn, *args, *(results[d] for d in deps))] = name
+
+            if not running:
+                raise ValueError(f"Stages with unsatisfiable dependencies: {', '.join(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception:
+                    for other in running:
+                        other.cancel()
+                    raise
+                timings[name] = time.perf_counter() - started[name]
+                finished = len(timings)
+                progress(f"Finished {name.replace('_', ' ')}", 10 + 85 * finished / len(self._stages))
+
+        return results, timings
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all pipeline runs, created on first use"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=governor.plan["local_metrics_processes"])
+        return _process_pool
+
+_facts_cache = None
+_facts_cache_lock = threading.Lock()
+
+def _get_facts_cache():
+    """Facts cache shared by all pipeline runs, opened on first use (None when disabled)"""
+    global _facts_cache
+    from .config import FACTS_CACHE_ENTRIES
+    from .facts import FactsCache
+
+    if FACTS_CACHE_ENTRIES <= 0:
+        return None
+    with _facts_cache_lock:
+        if _facts_cache is None:
+            _facts_cache = FactsCache()
+        return _facts_cache
+
+def compute_local_metrics(transcript: str) -> Dict[str, Dict]:
+    """
+    Compute filler words, speaking pace and sentiment per speaker without the LLM
+
+    Args:
+        transcript: Full conversation transcript
+
+    Returns:
+        Dictionary of speaker label to metrics; "" holds unlabelled text
+    """
+    sentiment_analyzer = SentimentAnalyzer()
+    metrics = {}
+    for speaker, text in group_by_speaker(split_turns(transcript)).items():
+        sentiment = sentiment_analyzer.analyze_sentiment(text)
+        metrics[speaker] = {
+            "filler_words_count": sentiment_analyzer.count_filler_words(text),
+            "speaking_pace": sentiment_analyzer.calculate_speaking_pace(text),
+            "sentiment": sentiment["sentiment"],
+            "sentiment_score": sentiment["compound"],
+        }
+    return metrics
+
+def merge_local_metrics(analysis: Dict, transcript: str, local_metrics: Dict[str, Dict], keywords: List[str]):
+    """
+    Merge locally computed metrics into the LLM analysis in place
+
+    Filler counts come from each participant's own turns when the participant
+    can be matched to a speaker label, otherwise from the whole transcript.
+    """
+    by_label = {label.lower(): m for label, m in local_metrics.items() if label}
+    sentiment_analyzer = None
+
+    for speaker_id, data in analysis.get("participants", {}).items():
+        metrics = by_label.get(str(data.get("name", "")).lower()) or by_label.get(str(speaker_id).lower())
+        if metrics is None:
+            sentiment_analyzer = sentiment_analyzer or SentimentAnalyzer()
+            data["filler_words_count"] = sentiment_analyzer.count_filler_words(transcript)
+            continue
+        data["filler_words_count"] = metrics["filler_words_count"]
+        data.setdefault("speaking_pace", metrics["speaking_pace"])
+        data.setdefault("sentiment", metrics["sentiment"])
+
+    if not analysis.get("keywords"):
+        analysis["keywords"] = keywords
+
+def merge_acoustic_metrics(analysis: Dict, acoustic: Dict):
+    """
+    Attach audio pause statistics to the analysis in place
+
+    Participants whose name or ID matches a speaker label from diarized
+    segments also get that speaker's hesitation statistics.
+    """
+    analysis["acoustic_metrics"] = acoustic
+    by_label = {label.lower(): stats for label, stats in (acoustic.get("speakers") or {}).items() if label}
+    for speaker_id, data in analysis.get("participants", {}).items():
+        stats = by_label.get(str(data.get("name", "")).lower()) or by_label.get(str(speaker_id).lower())
+        if stats is not None:
+            data["pause_metrics"] = stats
+
+def run_analysis(
+    transcript: str,
+    domain: str = "General",
+    round_type: str = "General",
+    feedback_tone: str = "Professional",
+    progress: Optional[ProgressCallback] = None,
+    acoustic: Optional[Dict] = None,
+    previous: Optional[Dict] = None,
+    use_cached_facts: bool = True
+) -> Dict:
+    """
+    Perform comprehensive interview analysis
+
+    LLM analysis, local metrics and keyword extraction run concurrently and are
+    merged into the report once all of them finish.
+
+    Args:
+        transcript: Full conversation transcript
+        domain: Domain context (Tech, HR, etc.)
+        round_type: Type of interview round
+        feedback_tone: Tone for feedback (Professional, Encouraging, Critical)
+        progress: Optional progress callback
+        acoustic: Pause statistics from AcousticAnalyzer when the transcript came from audio
+        previous: {"key", "transcript", "report"} of an earlier version of this transcript;
+            its analysis is reused or revised for the changed sentences only
+        use_cached_facts: Reuse cached facts of this transcript (False always analyzes in full)
+
+    A transcript last analyzed in a different tone or framing reuses its cached
+    facts, and only the feedback is written again; analyzing it again in the
+    same framing runs the full analysis.
+
+    Returns:
+        Report data dictionary
+    """
+    progress = progress or _no_progress
+    progress("Initializing analyzers...", 5)
+
+    def llm_analysis() -> Dict:
+        from .facts import split_analysis
+
+        analyzer = create_ai_analyzer()
+        facts_cache = _get_facts_cache()
+        framing = {"domain": domain, "round_type": round_type, "feedback_tone": feedback_tone}
+        if previous:
+            from .dedup import reanalyze
+            analysis = reanalyze(previous, transcript, analyzer, domain, round_type, feedback_tone)
+        else:
+            cached = facts_cache.get_entry(transcript) if facts_cache is not None and use_cached_facts else None
+            if cached and cached[1] != framing:
+                # Same transcript, new tone or framing: only the feedback is written again
+                analysis = analyzer.write_narrative(cached[0], transcript, domain, round_type, feedback_tone)
+                facts_cache.put(transcript, cached[0], framing)
+                analysis["reuse"] = {"llm": "narrative"}
+                return analysis
+            analysis = analyzer.analyze_conversation(
+                transcript=transcript,
+                domain=domain,
+                round_type=round_type,
+                feedback_tone=feedback_tone
+            )
+        if facts_cache is not None and analysis.get("participants"):
+            facts_cache.put(transcript, split_analysis(analysis)[0], framing)
+        return analysis
+
+    def build_report(analysis: Dict, local_metrics: Dict, keywords: List[str]) -> Dict:
+        reuse = analysis.pop("reuse", None)
+        merge_local_metrics(analysis, transcript, local_metrics, keywords)
+        if acoustic:
+            merge_acoustic_metrics(analysis, acoustic)
+        report = ReportGenerator().generate_report_data(analysis)
+        if reuse:
+            report["reuse"] = reuse
+        return report
+
+    # Long transcripts are scored in a worker process so VADER does not hold the GIL
+    use_process = len(transcript) >= LOCAL_METRICS_PROCESS_MIN_CHARS
+
+    graph = StageGraph()
+    graph.add("llm_analysis", llm_analysis)
+    graph.add("local_metrics", compute_local_metrics, args=(transcript,),
+              executor="process" if use_process else "thread")
+    graph.add("keywords", lambda: top_keywords(speech_text(transcript)))
+    graph.add("report", build_report, ("llm_analysis", "local_metrics", "keywords"))
+
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="pipeline") as thread_pool:
+        results, timings = graph.run(
+            thread_pool,
+            process_pool=_get_process_pool() if use_process else None,
+            progress=progress
+        )
+
+    report_data = results["report"]
+    report_data["pipeline_timings"] = timings
+    progress("Analysis complete", 100)
+    return report_data
+
+def analysis_job(params: Dict, progress: ProgressCallback) -> Dict:
+    """
+    Job handler that runs run_analysis() with the job's parameters
+
+    An optional "previous" param holds the earlier analysis of a near-duplicate
+    transcript, and "use_cached_facts" False forces a full analysis (see run_analysis).
+    """
+    return run_analysis(
+        transcript=params["transcript"],
+        domain=params.get("domain", "General"),
+        round_type=params.get("round_type", "General"),
+        feedback_tone=params.get("feedback_tone", "Professional"),
+        progress=progress,
+        acoustic=params.get("acoustic"),
+        previous=params.get("previous"),
+        use_cached_facts=params.get("use_cached_facts", True)
+    )
+
+def transcribe_recording(
+    audio_path: str,
+    processor,
+    language: Optional[str] = None,
+    predicted_seconds: Optional[float] = None
+) -> Tuple[str, Dict]:
+    """
+    Transcribe a recording, label its speakers and compute pause statistics
+
+    Args:
+        audio_path: Audio file
+        processor: AudioProcessor (or RemoteAudioProcessor) to transcribe with
+        language: Optional language code
+        predicted_seconds: Transcription time predicted when the processor was selected
+
+    Returns:
+        Tuple of (transcript, acoustic metrics); the transcript has "Speaker N:"
+        turns when diarization is enabled
+    """
+    from .acoustic_analyzer import AcousticAnalyzer
+    from .diarization import SpeakerDiarizer, speaker_transcript
+
+    result = processor.transcribe_audio(audio_path, language=language, predicted_seconds=predicted_seconds)
+    transcript, segments = result["text"], result["segments"]
+    if DIARIZATION_ENABLED and segments:
+        # Speaker labels let local metrics and pauses be computed per participant
+        segments = SpeakerDiarizer().diarize_file(audio_path, segments)
+        transcript = speaker_transcript(segments)
+    return transcript, AcousticAnalyzer().analyze_file(audio_path, segments)
+
+_audio_processors: Dict[str, Any] = {}
+# Jobs currently transcribing with each model size; those models are never unloaded
+_audio_processors_in_use: Dict[str, int] = {}
+_audio_processors_lock = threading.Lock()
+
+def _trim_audio_processors(budget_bytes: int) -> int:
+    """
+    Unload Whisper models, largest first, until the rest fit in a byte budget
+
+    Models in use by a job stay loaded, even if that leaves the budget exceeded.
+
+    Args:
+        budget_bytes: Memory the loaded models may take
+
+    Returns:
+        Estimated bytes freed
+    """
+    freed = 0
+    with _audio_processors_lock:
+        loaded = sorted(_audio_processors, key=lambda size: WHISPER_MODEL_BYTES.get(size, 0), reverse=True)
+        total = sum(WHISPER_MODEL_BYTES.get(size, 0) for size in loaded)
+        for model_size in loaded:
+            if total <= budget_bytes:
+                break
+            if not _audio_processors_in_use.get(model_size):
+                del _audio_processors[model_size]
+                total -= WHISPER_MODEL_BYTES.get(model_size, 0)
+                freed += WHISPER_MODEL_BYTES.get(model_size, 0)
+    return freed
+
+governor.add_cache("whisper_models", _trim_audio_processors)
+
+def _get_audio_processor(audio_path: str, budget_seconds: float) -> Tuple[Any, Dict]:
+    """
+    Select a Whisper processor for a job, reusing models loaded by earlier jobs
+
+    The model is marked in use until _release_audio_processor() is called
+    with its size. On a job queue worker, the budget counts from when the job
+    was submitted, and the jobs waiting for the same pool count against it.
+
+    Returns:
+        Tuple of (processor, selection details) as from select_audio_processor()
+    """
+    from .audio_processor import select_audio_processor
+    from .jobs import current_job
+
+    queue_depth, workers = 0, 1
+    job = current_job()
+    if job is not None:
+        queue_depth, workers = job["queue_depth"], job["workers"]
+        if budget_seconds:
+            # Kept positive: a spent budget picks the fastest model, while 0 means no budget
+            budget_seconds = max(budget_seconds - (time.time() - job["created_at"]), 1e-3)
+
+    with _audio_processors_lock:
+        processor, selection = select_audio_processor(
+            audio_path, budget_seconds, queue_depth, workers, loaded=_audio_processors
+        )
+        model_size = selection["model_size"]
+        _audio_processors[model_size] = processor
+        _audio_processors_in_use[model_size] = _audio_processors_in_use.get(model_size, 0) + 1
+    budget = governor.plan["whisper_cache_bytes"]
+    if budget is not None:
+        _trim_audio_processors(budget)
+    return processor, selection
+
+def _release_audio_processor(model_size: str):
+    """Mark a model from _get_audio_processor() as no longer used by the calling job"""
+    with _audio_processors_lock:
+        _audio_processors_in_use[model_size] -= 1
+        if not _audio_processors_in_use[model_size]:
+            del _audio_processors_in_use[model_size]
+
+def transcription_job(params: Dict, progress: ProgressCallback) -> Dict:
+    """
+    Job step that transcribes a stored recording
+
+    Params hold "audio_path" and optional "language" and "budget_seconds".
+
+    Returns:
+        {"transcript", "acoustic"}, the params analysis_job takes from audio
+    """
+    progress("Transcribing audio...", 2)
+    processor, selection = _get_audio_processor(params["audio_path"], params.get("budget_seconds", 0))
+    try:
+        transcript, acoustic = transcribe_recording(
+            params["audio_path"], processor, params.get("language"), selection["predicted_transcribe_seconds"]
+        )
+    finally:
+        _release_audio_processor(selection["model_size"])
+    progress("Transcription complete", 40)
+    return {"transcript": transcript, "acoustic": acoustic}
+
+def transcribed_analysis_job(params: Dict, progress: ProgressCallback) -> Dict:
+    """Job step that analyzes the output of transcription_job, reporting progress from 40%"""
+    report = analysis_job(params, lambda stage, percent: progress(stage, 40 + percent * 0.6))
+    if params.get("refines"):
+        report["refines"] = params["refines"]
+    return report
+
+def audio_analysis_job(params: Dict, progress: ProgressCallback) -> Dict:
+    """
+    Job handler that transcribes a stored recording in full and analyzes it
+
+    Params are those of analysis_job with "audio_path" instead of "transcript",
+    plus optional "language" and "budget_seconds". Used to refine a sampled
+    screening report; the result records the report it refines in "refines".
+    Job queues with a transcription pool run it as AUDIO_ANALYSIS_STEPS instead.
+    """
+    return transcribed_analysis_job({**params, **transcription_job(params, progress)}, progress)
+
+def transcription_pool_size() -> int:
+    """
+    Workers for a job queue's transcription pool
+
+    Serialized for an in-process Whisper model, which is not safe to share
+    across threads. Read on use, so importing the pipeline does not detect
+    the host's resources.
+    """
+    return governor.plan["transcription_workers"]
+
+# audio_analysis_job as (pool, handler) steps for JobQueue.register_steps
+AUDIO_ANALYSIS_STEPS = [("transcription", transcription_job), ("analysis", transcribed_analysis_job)]
+
+def screening_job(params: Dict, progress: ProgressCallback) -> Dict:
+    """
+    Job handler that produces a sampled screening report for a stored recording
+
+    Params are those of audio_analysis_job; the report keeps them under
+    "screening" -> "params" so the full analysis can be scheduled from it later.
+    """
+    from .screening import QuickScreener
+
+    processor, selection = _get_audio_processor(params["audio_path"], 0)
+    try:
+        report = QuickScreener().screen(
+            params["audio_path"],
+            processor,
+            domain=params.get("domain", "General"),
+            round_type=params.get("round_type", "Screening Round"),
+            feedback_tone=params.get("feedback_tone", "Professional"),
+            language=params.get("language"),
+            diarize=DIARIZATION_ENABLED,
+            progress=progress
+        )
+    finally:
+        _release_audio_processor(selection["model_size"])
+    report["screening"]["params"] = dict(params)
+    return report
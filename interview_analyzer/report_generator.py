@@ -2,12 +2,79 @@
 Report Generator Module
 Creates structured reports and visualizations
 """
-from typing import Dict, List
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
+from typing import Dict, List, TYPE_CHECKING
 from datetime import datetime
 import os
+from .models import InterviewReport
+from .instrumentation import metrics
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+def _plotly():
+    """Import Plotly on first chart, keeping it out of the report data path"""
+    import plotly.graph_objects as go
+    return go
+
+# Numeric positions used to plot sentiment labels
+SENTIMENT_VALUES = {"Positive": 1, "Neutral": 0, "Negative": -1, "Confident": 0.8, "Nervous": -0.5}
+
+RADAR_CATEGORIES = ['Confidence', 'Clarity', 'Empathy', 'Engagement', 'Communication']
+
+def sentiment_series(sentiment_trend: List[Dict]) -> Dict[str, List]:
+    """
+    Prepare sentiment trend data for charting
+    
+    Args:
+        sentiment_trend: List of sentiment data points
+    
+    Returns:
+        Dictionary with segment labels, sentiment labels, plotted values and confidence
+    """
+    sentiments = [s.get("sentiment", "Neutral") for s in sentiment_trend]
+    return {
+        "segments": [s.get("segment", f"Segment {i+1}") for i, s in enumerate(sentiment_trend)],
+        "sentiments": sentiments,
+        "values": [SENTIMENT_VALUES.get(s, 0) for s in sentiments],
+        "confidence": [s.get("confidence", 0.5) for s in sentiment_trend],
+    }
+
+def participant_metrics(participants: Dict) -> Dict[str, List]:
+    """
+    Prepare per-participant score comparison data for charting
+    
+    Args:
+        participants: Dictionary of participant data
+    
+    Returns:
+        Dictionary with participant names and confidence, clarity and empathy scores
+    """
+    metrics = {"names": [], "confidence": [], "clarity": [], "empathy": []}
+    for speaker_id, data in participants.items():
+        metrics["names"].append(data.get("name", speaker_id))
+        metrics["confidence"].append(data.get("confidence_score", 0))
+        metrics["clarity"].append(data.get("clarity_score", 0))
+        metrics["empathy"].append(data.get("empathy_score", 0))
+    return metrics
+
+def radar_values(participant_data: Dict) -> List[float]:
+    """
+    Prepare radar chart values for a participant, in RADAR_CATEGORIES order
+    
+    Args:
+        participant_data: Single participant's analysis data
+    
+    Returns:
+        List of scores
+    """
+    return [
+        participant_data.get("confidence_score", 0),
+        participant_data.get("clarity_score", 0),
+        participant_data.get("empathy_score", 0),
+        participant_data.get("engagement_score", 0),
+        (participant_data.get("confidence_score", 0) + 
+         participant_data.get("clarity_score", 0)) / 2
+    ]
 
 class ReportGenerator:
     def __init__(self, output_dir: str = "outputs"):
@@ -20,6 +87,7 @@ class ReportGenerator:
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
     
+    @metrics.timed("report.build")
     def generate_report_data(self, analysis: Dict, sentiment_data: List[Dict] = None) -> Dict:
         """
         Generate comprehensive report data structure
@@ -47,9 +115,30 @@ class ReportGenerator:
         if sentiment_data:
             report["sentiment_trend"] = sentiment_data
         
+        # Pause statistics are only available for audio input
+        if analysis.get("acoustic_metrics"):
+            report["acoustic_metrics"] = analysis["acoustic_metrics"]
+        
         return report
     
-    def create_sentiment_chart(self, sentiment_trend: List[Dict]) -> go.Figure:
+    def generate_report(self, analysis: Dict, sentiment_data: List[Dict] = None) -> InterviewReport:
+        """
+        Generate a compact report object
+        
+        The transcript is moved into the shared transcript store, so the
+        returned report only holds a reference to it.
+        
+        Args:
+            analysis: AI analysis results
+            sentiment_data: Optional sentiment trend data
+        
+        Returns:
+            InterviewReport instance
+        """
+        return InterviewReport.from_dict(self.generate_report_data(analysis, sentiment_data))
+    
+    @metrics.timed("charts.sentiment")
+    def create_sentiment_chart(self, sentiment_trend: List[Dict]) -> "go.Figure":
         """
         Create sentiment trend visualization
         
@@ -59,6 +148,8 @@ class ReportGenerator:
         Returns:
             Plotly figure
         """
+        go = _plotly()
+        
         if not sentiment_trend:
             # Create empty chart
             fig = go.Figure()
@@ -70,13 +161,11 @@ class ReportGenerator:
             return fig
         
         # Prepare data
-        segments = [s.get("segment", f"Segment {i+1}") for i, s in enumerate(sentiment_trend)]
-        sentiments = [s.get("sentiment", "Neutral") for s in sentiment_trend]
-        confidence = [s.get("confidence", 0.5) for s in sentiment_trend]
-        
-        # Map sentiments to numeric values for visualization
-        sentiment_map = {"Positive": 1, "Neutral": 0, "Negative": -1, "Confident": 0.8, "Nervous": -0.5}
-        sentiment_values = [sentiment_map.get(s, 0) for s in sentiments]
+        series = sentiment_series(sentiment_trend)
+        segments = series["segments"]
+        sentiments = series["sentiments"]
+        confidence = series["confidence"]
+        sentiment_values = series["values"]
         
         fig = go.Figure()
         
@@ -105,7 +194,8 @@ class ReportGenerator:
         
         return fig
     
-    def create_confidence_chart(self, participants: Dict) -> go.Figure:
+    @metrics.timed("charts.confidence")
+    def create_confidence_chart(self, participants: Dict) -> "go.Figure":
         """
         Create confidence score comparison chart
         
@@ -115,6 +205,8 @@ class ReportGenerator:
         Returns:
             Plotly figure
         """
+        go = _plotly()
+        
         if not participants:
             fig = go.Figure()
             fig.add_annotation(
@@ -124,16 +216,11 @@ class ReportGenerator:
             )
             return fig
         
-        names = []
-        confidence_scores = []
-        clarity_scores = []
-        empathy_scores = []
-        
-        for speaker_id, data in participants.items():
-            names.append(data.get("name", speaker_id))
-            confidence_scores.append(data.get("confidence_score", 0))
-            clarity_scores.append(data.get("clarity_score", 0))
-            empathy_scores.append(data.get("empathy_score", 0))
+        metrics = participant_metrics(participants)
+        names = metrics["names"]
+        confidence_scores = metrics["confidence"]
+        clarity_scores = metrics["clarity"]
+        empathy_scores = metrics["empathy"]
         
         fig = go.Figure()
         
@@ -170,7 +257,8 @@ class ReportGenerator:
         
         return fig
     
-    def create_radar_chart(self, participant_data: Dict) -> go.Figure:
+    @metrics.timed("charts.radar")
+    def create_radar_chart(self, participant_data: Dict) -> "go.Figure":
         """
         Create radar/spider chart for participant metrics
         
@@ -180,15 +268,10 @@ class ReportGenerator:
         Returns:
             Plotly figure
         """
-        categories = ['Confidence', 'Clarity', 'Empathy', 'Engagement', 'Communication']
-        values = [
-            participant_data.get("confidence_score", 0),
-            participant_data.get("clarity_score", 0),
-            participant_data.get("empathy_score", 0),
-            participant_data.get("engagement_score", 0),
-            (participant_data.get("confidence_score", 0) + 
-             participant_data.get("clarity_score", 0)) / 2
-        ]
+        go = _plotly()
+        
+        categories = RADAR_CATEGORIES
+        values = radar_values(participant_data)
         
         fig = go.Figure()
         
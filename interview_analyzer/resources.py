@@ -0,0 +1,460 @@
+"""
+Resource Governor
+Detects the CPUs and memory this process may use (cgroup v1/v2 limits included), sizes worker
+pools and caches from them, and adjusts running pools to queue depth and memory pressure
+
+os.cpu_count() and /proc/meminfo report the host, not a container's share of it; pools sized
+from them oversubscribe a 2-CPU container on a 64-core node. Explicit settings (e.g.
+INTERVIEW_ANALYZER_ANALYSIS_WORKERS) are kept as is and never adjusted.
+
+Usage:
+    python -m interview_analyzer.resources
+"""
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import os
+import threading
+import time
+
+from .config import ANALYSIS_WORKERS, WHISPER_THREADS, TRANSCRIPTION_SERVER, TRANSCRIPTION_WORKERS
+from .config import GOVERNOR_ENABLED, GOVERNOR_INTERVAL, GOVERNOR_MEMORY_LOW, GOVERNOR_MEMORY_HIGH
+from .instrumentation import metrics
+
+# Approximate resident memory per unit of work, used to bound pools on small-memory hosts
+ANALYSIS_JOB_BYTES = 64 * 2 ** 20
+METRICS_PROCESS_BYTES = 120 * 2 ** 20
+RENDER_PROCESS_BYTES = 150 * 2 ** 20
+
+# Share of the memory limit that loaded Whisper models may take
+WHISPER_CACHE_SHARE = 0.25
+
+# fp32 weights of each Whisper model in memory
+WHISPER_MODEL_BYTES = {
+    "tiny": 150 * 2 ** 20,
+    "base": 290 * 2 ** 20,
+    "small": 970 * 2 ** 20,
+    "medium": 3 * 2 ** 30,
+    "large": 6 * 2 ** 30,
+}
+
+# cgroup v1 reports "no limit" as a page-aligned value near 2**63
+_UNLIMITED = 2 ** 60
+
+# Idle ticks before a grown pool shrinks back towards its base size
+_IDLE_TICKS = 6
+
+def pool_bounds(plan: Dict, pool: str) -> Optional[Tuple[int, int, int]]:
+    """
+    (minimum, base, maximum) size of a named pool under a plan, or None if it is not adjusted
+
+    Analyses wait on the LLM and may grow past the base size; transcriptions only
+    shrink under memory pressure and return to the base as jobs wait.
+    """
+    if pool == "analysis":
+        return plan["analysis_min"], plan["analysis_workers"], plan["analysis_max"]
+    if pool == "transcription":
+        return 1, plan["transcription_workers"], plan["transcription_workers"]
+    return None
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except (OSError, ValueError):
+        return None
+
+def _read_int(path: str) -> Optional[int]:
+    value = _read(path)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+def _stat(path: str, key: str) -> Optional[int]:
+    """Value of one "key value" line of a cgroup stat file"""
+    for line in (_read(path) or "").splitlines():
+        name, _, value = line.partition(" ")
+        if name == key and value.isdigit():
+            return int(value)
+    return None
+
+def size_plan(cpus: float, memory_bytes: int, enabled: bool = True) -> Dict:
+    """
+    Pool sizes and cache budgets for a host
+
+    Analyses mostly wait on the LLM, so their pool may grow past the core
+    count; Whisper, local metrics and PDF rendering are CPU bound and get
+    at most one thread or process per core.
+
+    Args:
+        cpus: CPUs available (may be fractional under a CFS quota)
+        memory_bytes: Memory limit
+        enabled: False returns the static defaults used before sizing existed
+
+    Returns:
+        Dictionary of pool sizes, analysis pool bounds and cache budgets
+    """
+    cores = max(1, int(cpus))
+    # An in-process Whisper model is not safe to share across threads, so transcription is
+    # serialized unless it is delegated to the transcription server's worker processes
+    transcription = TRANSCRIPTION_WORKERS if TRANSCRIPTION_SERVER else 1
+    if not enabled:
+        analysis = ANALYSIS_WORKERS or 2
+        return {
+            "analysis_workers": analysis,
+            "analysis_min": analysis,
+            "analysis_max": analysis,
+            "transcription_workers": transcription,
+            "whisper_threads": WHISPER_THREADS,
+            "local_metrics_processes": os.cpu_count() or 1,
+            "render_processes": os.cpu_count() or 1,
+            "whisper_cache_bytes": None,
+        }
+
+    analysis = min(max(2, cores), 8)
+    analysis_min = min(analysis, 2)
+    analysis_max = max(analysis, min(4 * cores, 32, int(memory_bytes * 0.5 // ANALYSIS_JOB_BYTES)))
+    if ANALYSIS_WORKERS:
+        analysis = analysis_min = analysis_max = ANALYSIS_WORKERS
+    # Leave a core for analyses and rendering once there are enough to spare
+    whisper_threads = WHISPER_THREADS or (cores - 1 if cores >= 4 else cores)
+    return {
+        "analysis_workers": analysis,
+        "analysis_min": analysis_min,
+        "analysis_max": analysis_max,
+        "transcription_workers": transcription,
+        "whisper_threads": whisper_threads,
+        "local_metrics_processes": max(1, min(cores, int(memory_bytes * 0.25 // METRICS_PROCESS_BYTES))),
+        "render_processes": max(1, min(cores, int(memory_bytes * 0.25 // RENDER_PROCESS_BYTES))),
+        "whisper_cache_bytes": int(memory_bytes * WHISPER_CACHE_SHARE),
+    }
+
+class ResourceGovernor:
+    """
+    Sizes pools from the detected host and adjusts attached job queues.
+
+    The plan is computed on first use. start() runs tick() every interval
+    seconds: the "analysis" and "transcription" pools of each attached job
+    queue (a JobQueue or the HTTP service) grow while jobs wait and memory
+    use is below the low watermark, up to pool_bounds(), shrink by half
+    above the high watermark, and drift back to their base size when idle.
+    Caches registered with add_cache() are emptied under memory pressure,
+    and pools created on demand are sized with pool_size().
+    """
+
+    def __init__(
+        self,
+        cgroup_root: str = "/sys/fs/cgroup",
+        proc_root: str = "/proc",
+        enabled: bool = GOVERNOR_ENABLED,
+        interval: float = GOVERNOR_INTERVAL,
+        memory_low: float = GOVERNOR_MEMORY_LOW,
+        memory_high: float = GOVERNOR_MEMORY_HIGH
+    ):
+        """
+        Initialize governor
+
+        Args:
+            cgroup_root: Mount point of the cgroup hierarchy
+            proc_root: Mount point of procfs
+            enabled: Size pools from the host and adjust them (False keeps static defaults)
+            interval: Seconds between adjustments
+            memory_low: Memory use (fraction of the limit) below which pools may grow
+            memory_high: Memory use at which pools shrink and caches are emptied
+        """
+        self.cgroup_root = cgroup_root
+        self.proc_root = proc_root
+        self.enabled = enabled
+        self.interval = interval
+        self.memory_low = memory_low
+        self.memory_high = memory_high
+        self._lock = threading.Lock()
+        self._host: Optional[Dict] = None
+        self._plan: Optional[Dict] = None
+        self._queues: List = []
+        self._caches: Dict[str, Callable[[int], int]] = {}
+        # Consecutive idle ticks by (queue, pool)
+        self._idle_ticks: Dict[Tuple[int, str], int] = {}
+        self._decisions = deque(maxlen=50)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # Detection
+
+    def _cgroup_dirs(self, controller: str) -> Tuple[List[str], List[str]]:
+        """Candidate v2 and v1 directories of this process's cgroup, innermost first"""
+        v2, v1 = [], []
+        for line in (_read(os.path.join(self.proc_root, "self", "cgroup")) or "").splitlines():
+            _, controllers, path = line.split(":", 2)
+            path = path.lstrip("/")
+            if not controllers:
+                v2.append(os.path.join(self.cgroup_root, path))
+            elif controller in controllers.split(","):
+                v1.append(os.path.join(self.cgroup_root, controllers, path))
+        # Inside a container the own cgroup is usually mounted as the root
+        v2.append(self.cgroup_root)
+        v1 += [os.path.join(self.cgroup_root, controller), os.path.join(self.cgroup_root, "cpu,cpuacct")]
+        return v2, v1
+
+    def cpu_limit(self) -> Tuple[float, str]:
+        """CPUs available and where the limit comes from"""
+        try:
+            cpus, source = float(len(os.sched_getaffinity(0))), "affinity"
+        except AttributeError:
+            cpus, source = float(os.cpu_count() or 1), "cpu_count"
+        v2, v1 = self._cgroup_dirs("cpu")
+        quota = None
+        for path in v2:
+            fields = (_read(os.path.join(path, "cpu.max")) or "").split()
+            if len(fields) == 2:
+                if fields[0] != "max":
+                    quota = int(fields[0]) / int(fields[1])
+                break
+        else:
+            for path in v1:
+                limit = _read_int(os.path.join(path, "cpu.cfs_quota_us"))
+                period = _read_int(os.path.join(path, "cpu.cfs_period_us"))
+                if limit is not None and period:
+                    if limit > 0:
+                        quota = limit / period
+                    break
+        if quota is not None and quota < cpus:
+            cpus, source = quota, "cgroup"
+        return cpus, source
+
+    def _meminfo(self, key: str) -> Optional[int]:
+        for line in (_read(os.path.join(self.proc_root, "meminfo")) or "").splitlines():
+            name, _, value = line.partition(":")
+            if name == key:
+                return int(value.split()[0]) * 1024
+        return None
+
+    def _memory_cgroup(self) -> Optional[Tuple[str, int, int]]:
+        """(version, directory, limit) of the innermost cgroup that limits memory"""
+        v2, v1 = self._cgroup_dirs("memory")
+        for path in v2:
+            value = _read(os.path.join(path, "memory.max"))
+            if value is not None:
+                if value.isdigit() and int(value) < _UNLIMITED:
+                    return "v2", path, int(value)
+                return None
+        for path in v1:
+            limit = _read_int(os.path.join(path, "memory.limit_in_bytes"))
+            if limit is not None:
+                return ("v1", path, limit) if limit < _UNLIMITED else None
+        return None
+
+    def memory_limit(self) -> Tuple[int, str]:
+        """Memory available in bytes and where the limit comes from"""
+        total = self._meminfo("MemTotal") or 0
+        cgroup = self._memory_cgroup()
+        if cgroup and (not total or cgroup[2] < total):
+            return cgroup[2], "cgroup"
+        return total, "meminfo"
+
+    def memory_pressure(self) -> Dict:
+        """
+        Current memory use against the limit
+
+        Cgroup usage counts the page cache, so reclaimable inactive file pages
+        are subtracted (the working set container runtimes evict on).
+
+        Returns:
+            Dictionary with used_bytes, limit_bytes, fraction and psi_some_avg10
+            (share of the last 10 s some task stalled on memory, when available)
+        """
+        limit, source = self.memory_limit()
+        cgroup = self._memory_cgroup() if source == "cgroup" else None
+        if cgroup and cgroup[0] == "v2":
+            used = _read_int(os.path.join(cgroup[1], "memory.current")) or 0
+            used -= _stat(os.path.join(cgroup[1], "memory.stat"), "inactive_file") or 0
+            psi_path = os.path.join(cgroup[1], "memory.pressure")
+        elif cgroup:
+            used = _read_int(os.path.join(cgroup[1], "memory.usage_in_bytes")) or 0
+            used -= _stat(os.path.join(cgroup[1], "memory.stat"), "total_inactive_file") or 0
+            psi_path = os.path.join(self.proc_root, "pressure", "memory")
+        else:
+            used = limit - (self._meminfo("MemAvailable") or limit)
+            psi_path = os.path.join(self.proc_root, "pressure", "memory")
+        psi = None
+        for line in (_read(psi_path) or "").splitlines():
+            if line.startswith("some "):
+                fields = dict(field.split("=") for field in line.split()[1:])
+                psi = float(fields.get("avg10", 0))
+        used = max(0, used)
+        return {
+            "used_bytes": used,
+            "limit_bytes": limit,
+            "fraction": round(used / limit, 3) if limit else 0.0,
+            "psi_some_avg10": psi,
+        }
+
+    def detect(self) -> Dict:
+        """CPUs and memory available to this process"""
+        cpus, cpu_source = self.cpu_limit()
+        memory, memory_source = self.memory_limit()
+        return {
+            "cpus": round(cpus, 2),
+            "cpu_source": cpu_source,
+            "memory_bytes": memory,
+            "memory_source": memory_source,
+        }
+
+    # Plan
+
+    @property
+    def plan(self) -> Dict:
+        """Current pool sizes and cache budgets (detected on first use)"""
+        with self._lock:
+            if self._plan is None:
+                self._host = self.detect()
+                self._plan = size_plan(self._host["cpus"], self._host["memory_bytes"], self.enabled)
+            return dict(self._plan)
+
+    def attach(self, job_queue):
+        """
+        Adjust the pools of a job queue from now on
+
+        Anything with pool_sizes, pending_in(pool) and resize(pool, size) can be
+        attached, like JobQueue.
+        """
+        self.plan
+        with self._lock:
+            if job_queue not in self._queues:
+                self._queues.append(job_queue)
+
+    def detach(self, job_queue):
+        """Stop adjusting a job queue's pools"""
+        with self._lock:
+            if job_queue in self._queues:
+                self._queues.remove(job_queue)
+            for key in [key for key in self._idle_ticks if key[0] == id(job_queue)]:
+                del self._idle_ticks[key]
+
+    def pool_size(self, key: str) -> int:
+        """
+        Size for a pool created now, such as a batch's render processes
+
+        Args:
+            key: Plan entry with the base size (e.g. "render_processes")
+
+        Returns:
+            The planned size, halved while memory use is above the high watermark
+        """
+        size = self.plan[key]
+        if self.enabled and self.memory_pressure()["fraction"] >= self.memory_high:
+            size = max(1, size // 2)
+        return size
+
+    def add_cache(self, name: str, trim: Callable[[int], int]):
+        """
+        Register a cache to empty under memory pressure
+
+        Args:
+            name: Cache name shown in decisions
+            trim: Function evicting entries down to a byte budget, returning the bytes freed
+        """
+        with self._lock:
+            self._caches[name] = trim
+
+    def _decide(self, action: str, reason: str, **details) -> Dict:
+        decision = {"time": round(time.time(), 3), "action": action, "reason": reason, **details}
+        self._decisions.append(decision)
+        metrics.count("governor_decisions", action=action)
+        return decision
+
+    def tick(self) -> List[Dict]:
+        """
+        Adjust attached pools and caches once
+
+        Returns:
+            Decisions taken (also kept for snapshot())
+        """
+        if not self.enabled:
+            return []
+        plan = self.plan
+        pressure = self.memory_pressure()
+        # PSI above 10% means tasks are already stalling on reclaim
+        high = pressure["fraction"] >= self.memory_high or (pressure["psi_some_avg10"] or 0) >= 10
+        decisions = []
+        with self._lock:
+            queues, caches = list(self._queues), dict(self._caches)
+        for job_queue in queues:
+            for pool, size in list(job_queue.pool_sizes.items()):
+                bounds = pool_bounds(plan, pool)
+                if bounds is None:
+                    continue
+                low, base, top = bounds
+                depth = job_queue.pending_in(pool)
+                target, reason = size, ""
+                if high and size > low:
+                    target, reason = max(low, size // 2), "memory pressure"
+                elif depth and not high and pressure["fraction"] < self.memory_low and size < top:
+                    target, reason = min(top, size + depth), f"{depth} jobs waiting"
+                key = (id(job_queue), pool)
+                with self._lock:
+                    idle = self._idle_ticks[key] = 0 if depth else self._idle_ticks.get(key, 0) + 1
+                if target == size and not depth and size > base and idle >= _IDLE_TICKS:
+                    target, reason = size - 1, "idle"
+                if target != size:
+                    job_queue.resize(pool, target)
+                    decisions.append(self._decide("resize", reason, pool=pool, before=size, after=target))
+        if high:
+            for name, trim in caches.items():
+                freed = trim(0)
+                if freed:
+                    decisions.append(self._decide("evict", "memory pressure", cache=name, freed_bytes=freed))
+        return decisions
+
+    def start(self):
+        """Adjust pools every interval seconds on a daemon thread (no-op when disabled)"""
+        with self._lock:
+            if not self.enabled or (self._thread and self._thread.is_alive()):
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="resource-governor", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop adjusting pools"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.tick()
+            except Exception:
+                # A failed adjustment keeps the current sizes; the next tick retries
+                metrics.count("governor_errors")
+
+    def snapshot(self) -> Dict:
+        """Detected host, current plan, memory pressure, pool sizes and recent decisions"""
+        plan = self.plan
+        with self._lock:
+            queues = list(self._queues)
+            host = dict(self._host or {})
+            decisions = list(self._decisions)
+        return {
+            "enabled": self.enabled,
+            "host": host,
+            "plan": plan,
+            "memory": self.memory_pressure(),
+            "pools": [
+                {pool: {"workers": size, "pending": job_queue.pending_in(pool)}
+                 for pool, size in job_queue.pool_sizes.items()}
+                for job_queue in queues
+            ],
+            "decisions": decisions,
+        }
+
+# Process-wide governor shared by job queues, pipelines and the HTTP service
+governor = ResourceGovernor()
+
+def main():
+    print(json.dumps(governor.snapshot(), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Quick Screening
+Analyzes a long recording from sampled windows (the opening, the densest speech in each stretch
+of the middle, and the closing) so a screening verdict takes seconds instead of a full run
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import subprocess
+import wave
+
+import numpy as np
+
+from .acoustic_analyzer import iter_audio_blocks
+from .instrumentation import metrics
+from .model_selection import audio_duration
+
+SAMPLE_RATE = 16000
+
+def speech_density(blocks: Iterable[np.ndarray], sample_rate: int, window_seconds: float = 5.0,
+                   silence_db: float = -40.0, frame_ms: float = 30.0) -> np.ndarray:
+    """
+    Fraction of non-silent frames in each window, from one streaming energy pass
+
+    Args:
+        blocks: Mono float32 blocks
+        sample_rate: Sample rate of the blocks
+        window_seconds: Resolution of the density curve
+        silence_db: Frames quieter than this (dBFS) are silent
+        frame_ms: Energy frame length (frames do not overlap)
+
+    Returns:
+        Array with one speech fraction per window
+    """
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    window_samples = max(frame, int(window_seconds * sample_rate))
+    threshold = 10 ** (silence_db / 10)
+
+    voiced = np.zeros(0)
+    totals = np.zeros(0)
+    carry = np.zeros(0, dtype=np.float32)
+    frame_index = 0
+    for block in blocks:
+        buffer = np.concatenate([carry, np.asarray(block, dtype=np.float32)])
+        n_frames = len(buffer) // frame
+        carry = buffer[n_frames * frame:]
+        if not n_frames:
+            continue
+        energy = np.square(buffer[:n_frames * frame].reshape(n_frames, frame), dtype=np.float64).mean(axis=1)
+        # Frames belong to the window they start in
+        window = (frame_index + np.arange(n_frames)) * frame // window_samples
+        size = int(window[-1]) + 1
+        if size > len(voiced):
+            voiced = np.pad(voiced, (0, size - len(voiced)))
+            totals = np.pad(totals, (0, size - len(totals)))
+        voiced += np.bincount(window, weights=(energy >= threshold).astype(np.float64), minlength=size)
+        totals += np.bincount(window, minlength=size)
+        frame_index += n_frames
+    return voiced / np.maximum(totals, 1)
+
+def choose_windows(
+    density: np.ndarray,
+    window_seconds: float,
+    duration: float,
+    opening: float = 90.0,
+    closing: float = 60.0,
+    samples: int = 6,
+    sample_seconds: float = 45.0
+) -> List[Tuple[float, float]]:
+    """
+    Pick the stretches of a recording to transcribe
+
+    The middle of the recording is split into equal strata and, in each, the
+    sample_seconds span with the most speech is taken, so answers are sampled
+    from every part of the conversation rather than wherever talk is densest.
+
+    Args:
+        density: Speech fraction per window (see speech_density)
+        window_seconds: Window length of the density curve
+        duration: Recording length in seconds
+        opening: Seconds always taken from the start
+        closing: Seconds always taken from the end
+        samples: Number of strata sampled between opening and closing
+        sample_seconds: Length of each sampled span
+
+    Returns:
+        Sorted, non-overlapping (start, end) times; the whole recording when it is short
+    """
+    if duration <= opening + closing + samples * sample_seconds:
+        return [(0.0, duration)]
+
+    windows = [(0.0, opening)]
+    span = max(1, int(round(sample_seconds / window_seconds)))
+    cumulative = np.concatenate(([0.0], np.cumsum(density)))
+    bounds = np.linspace(opening, duration - closing, samples + 1)
+    for low, high in zip(bounds[:-1], bounds[1:]):
+        first = int(np.ceil(low / window_seconds))
+        last = int(high // window_seconds) - span
+        if last < first:
+            windows.append((low, min(high, low + sample_seconds)))
+            continue
+        starts = np.arange(first, last + 1)
+        best = int(starts[np.argmax(cumulative[starts + span] - cumulative[starts])])
+        windows.append((best * window_seconds, min((best + span) * window_seconds, high)))
+    windows.append((duration - closing, duration))
+    return windows
+
+def load_window(audio_path: str, start: float, seconds: float) -> np.ndarray:
+    """
+    Decode one stretch of a recording as mono float32 samples at 16 kHz
+
+    16 kHz WAV files are read directly; anything else is decoded by ffmpeg,
+    which seeks to the start instead of decoding the whole file.
+    """
+    try:
+        with wave.open(audio_path, "rb") as wav:
+            if wav.getframerate() == SAMPLE_RATE and wav.getsampwidth() == 2:
+                wav.setpos(min(int(start * SAMPLE_RATE), wav.getnframes()))
+                data = wav.readframes(int(seconds * SAMPLE_RATE))
+                samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+                channels = wav.getnchannels()
+                return samples.reshape(-1, channels).mean(axis=1) if channels > 1 else samples
+    except (wave.Error, EOFError):
+        pass
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-ss", f"{start:.3f}", "-t", f"{seconds:.3f}",
+        "-i", audio_path, "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-"
+    ]
+    try:
+        data = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except FileNotFoundError:
+        raise RuntimeError("ffmpeg is required to decode non-WAV audio")
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to load audio: {e.stderr.decode(errors='replace')[-500:]}")
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+
+def sampling_confidence(window_scores: List[float], population: int) -> float:
+    """
+    How far the sampled windows can be trusted to represent the whole recording
+
+    One minus twice the standard error of the mean window sentiment, with the
+    finite population correction, so consistent windows and high coverage both
+    raise confidence and full coverage gives 1.0.
+
+    Args:
+        window_scores: Sentiment compound score (-1..1) of each sampled window
+        population: Number of windows of the same length the recording holds
+    """
+    n = len(window_scores)
+    if n == 0:
+        return 0.0
+    if n >= population:
+        return 1.0
+    if n == 1:
+        return 0.0
+    correction = np.sqrt(1 - n / population)
+    standard_error = np.std(window_scores, ddof=1) / np.sqrt(n) * correction
+    return round(float(np.clip(1 - 2 * standard_error, 0.0, 1.0)), 2)
+
+class QuickScreener:
+    """
+    Screening analysis of a long recording from sampled windows.
+
+    One energy pass over the file gives a speech density curve; the opening,
+    the closing and the densest span of each stretch in between are then
+    decoded, transcribed and analyzed as one conversation. The report has the
+    full schema, is flagged "sampled" and carries a confidence estimate.
+    """
+
+    def __init__(
+        self,
+        opening: float = 90.0,
+        closing: float = 60.0,
+        samples: int = 6,
+        sample_seconds: float = 45.0,
+        window_seconds: float = 5.0
+    ):
+        """
+        Initialize screener
+
+        Args:
+            opening: Seconds always taken from the start
+            closing: Seconds always taken from the end
+            samples: Spans sampled between opening and closing
+            sample_seconds: Length of each sampled span
+            window_seconds: Resolution of the speech density pass
+        """
+        self.opening = opening
+        self.closing = closing
+        self.samples = samples
+        self.sample_seconds = sample_seconds
+        self.window_seconds = window_seconds
+
+    def plan(self, audio_path: str) -> Dict:
+        """
+        Choose the windows to transcribe
+
+        Returns:
+            Dictionary with duration_seconds, speech_seconds and windows
+            (start, end and speech_density of each)
+        """
+        with metrics.stage("screening.plan") as stage:
+            sample_rate, blocks = iter_audio_blocks(audio_path)
+            density = speech_density(blocks, sample_rate, self.window_seconds)
+            duration = audio_duration(audio_path) or len(density) * self.window_seconds
+            stage.add("audio_seconds", duration)
+
+        windows = choose_windows(density, self.window_seconds, duration, self.opening, self.closing,
+                                 self.samples, self.sample_seconds)
+        def window_density(start: float, end: float) -> float:
+            first = int(start // self.window_seconds)
+            part = density[first:max(first + 1, int(np.ceil(end / self.window_seconds)))]
+            return round(float(part.mean()), 3) if len(part) else 0.0
+
+        return {
+            "duration_seconds": round(duration, 2),
+            "speech_seconds": round(float(density.sum()) * self.window_seconds, 2),
+            "windows": [
+                {"start": round(start, 2), "end": round(end, 2), "speech_density": window_density(start, end)}
+                for start, end in windows
+            ],
+        }
+
+    def transcribe(self, audio_path: str, processor, plan: Dict, language: Optional[str] = None,
+                   diarize: bool = True) -> Tuple[str, List[Dict]]:
+        """
+        Transcribe the planned windows
+
+        Args:
+            audio_path: Recording
+            processor: AudioProcessor (or RemoteAudioProcessor) to transcribe with
+            plan: Result of plan()
+            language: Optional language code
+            diarize: Label speakers consistently across all windows
+
+        Returns:
+            Tuple of (transcript, segments with recording times and a "window" index)
+        """
+        from .diarization import SpeakerDiarizer, speaker_transcript
+
+        pieces, segments, offset = [], [], 0.0
+        for index, window in enumerate(plan["windows"]):
+            audio = load_window(audio_path, window["start"], window["end"] - window["start"])
+            # A window's time says nothing about the whole-file prediction, so it isn't recorded
+            result = processor.transcribe_audio(audio, language=language, record=False)
+            for segment in result["segments"]:
+                # Positions within the concatenated windows, for diarization
+                segments.append({**segment, "window": index,
+                                 "start": segment["start"] + offset, "end": segment["end"] + offset})
+            pieces.append(audio)
+            offset += len(audio) / SAMPLE_RATE
+
+        if diarize and segments:
+            segments = SpeakerDiarizer().diarize_array(np.concatenate(pieces), SAMPLE_RATE, segments)
+            transcript = speaker_transcript(segments)
+        else:
+            transcript = " ".join(segment["text"].strip() for segment in segments)
+
+        # Back to recording times
+        starts = np.cumsum([0.0] + [len(p) / SAMPLE_RATE for p in pieces])
+        for segment in segments:
+            shift = plan["windows"][segment["window"]]["start"] - starts[segment["window"]]
+            segment["start"] += shift
+            segment["end"] += shift
+        return transcript, segments
+
+    def screen(
+        self,
+        audio_path: str,
+        processor,
+        domain: str = "General",
+        round_type: str = "Screening Round",
+        feedback_tone: str = "Professional",
+        language: Optional[str] = None,
+        diarize: bool = True,
+        progress=None
+    ) -> Dict:
+        """
+        Produce a sampled screening report
+
+        Returns:
+            Report data dictionary with "sampled": True and a "screening"
+            section (windows, coverage, confidence)
+        """
+        from .pipeline import run_analysis
+        from .sentiment_analyzer import SentimentAnalyzer
+
+        progress = progress or (lambda stage, percent: None)
+        progress("Finding speech to sample...", 2)
+        plan = self.plan(audio_path)
+        progress(f"Transcribing {len(plan['windows'])} sampled window(s)...", 5)
+        transcript, segments = self.transcribe(audio_path, processor, plan, language, diarize)
+
+        def scaled(stage: str, percent: float):
+            progress(stage, 10 + percent * 0.9)
+        report = run_analysis(transcript, domain, round_type, feedback_tone, progress=scaled)
+
+        sampled_seconds = sum(w["end"] - w["start"] for w in plan["windows"])
+        window_texts = [" ".join(s["text"] for s in segments if s["window"] == i)
+                        for i in range(len(plan["windows"]))]
+        sentiment_analyzer = SentimentAnalyzer()
+        scores = [sentiment_analyzer.analyze_sentiment(text)["compound"] for text in window_texts if text.strip()]
+        population = max(1, int(plan["duration_seconds"] // self.sample_seconds))
+
+        report["sampled"] = sampled_seconds < plan["duration_seconds"]
+        report["screening"] = {
+            **plan,
+            "sampled_seconds": round(sampled_seconds, 2),
+            "coverage": round(sampled_seconds / plan["duration_seconds"], 3) if plan["duration_seconds"] else 1.0,
+            "confidence": sampling_confidence(scores, population) if report["sampled"] else 1.0,
+        }
+        return report
@@ -0,0 +1,340 @@
+"""
+Report Search
+Inverted index with BM25 ranking over past transcripts, key points and topics, combined with
+numeric filters on participant scores
+
+The index lives in SQLite: an FTS5 table holds the text (porter-stemmed) and a participants
+table holds one indexed row of scores per participant, so a query touches only the postings
+of its terms and the matching participant rows, never the stored reports.
+
+Usage:
+    python -m interview_analyzer.search --rebuild                 # index every finished job
+    python -m interview_analyzer.search '"system design"' --filter confidence_score=0.7:
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import argparse
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from .config import SEARCH_DB_PATH
+
+# Participant scores that can be filtered on
+SCORE_COLUMNS = ("confidence_score", "clarity_score", "empathy_score", "engagement_score", "filler_words_count")
+
+# BM25 weights of the transcript, key_points and topics columns
+COLUMN_WEIGHTS = (1.0, 2.0, 3.0)
+
+# Queries matching more reports than this rank only the most recent ones; finding matches is
+# cheap but BM25 scores them one by one, and a word in most of 100k transcripts takes ~250 ms
+RANK_WINDOW = 1000
+
+QUERY_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+
+# Snippets mark matches with control characters, which transcripts do not contain, so
+# the transcript text can be escaped for display before the highlighting is added
+MATCH_START, MATCH_END = "\x02", "\x03"
+MARKDOWN_SPECIAL = re.compile(r"([\\`*_{}\[\]()<>#+\-.!|~:$])")
+
+# (low, high) bounds of a score filter; None leaves that side open
+Range = Tuple[Optional[float], Optional[float]]
+
+def fts_query(text: str) -> str:
+    """
+    Convert a user query to FTS5 syntax
+
+    Quoted text is matched as a phrase, other words must all appear. Operators
+    and punctuation are not passed through, so any input is a valid query.
+    """
+    parts = []
+    for phrase, word in QUERY_TOKEN.findall(text):
+        tokens = re.findall(r"\w+", phrase or word)
+        if tokens:
+            parts.append('"' + " ".join(tokens) + '"')
+    return " ".join(parts)
+
+def markdown_snippet(snippet: str) -> str:
+    """Render a snippet with match markers as Markdown; the transcript text is escaped"""
+    text = MARKDOWN_SPECIAL.sub(r"\\\1", " ".join(snippet.split()))
+    return text.replace(MATCH_START, "**").replace(MATCH_END, "**")
+
+def _as_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+class ReportIndex:
+    """Search index over finished reports, updated one report at a time"""
+
+    def __init__(self, db_path: str = SEARCH_DB_PATH):
+        """
+        Open (and create if needed) the index
+
+        Args:
+            db_path: SQLite database path, or ":memory:"
+        """
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS reports (
+                    id INTEGER PRIMARY KEY,
+                    key TEXT UNIQUE NOT NULL,
+                    timestamp TEXT,
+                    domain TEXT,
+                    round_type TEXT,
+                    summary TEXT,
+                    indexed_at REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS reports_domain ON reports (domain)")
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'report_text'"
+            ).fetchone()
+            if not exists:
+                # rowid matches reports.id
+                self._conn.execute(
+                    "CREATE VIRTUAL TABLE report_text USING fts5("
+                    "transcript, key_points, topics, tokenize = 'porter unicode61')"
+                )
+                self._conn.execute(
+                    "INSERT INTO report_text (report_text, rank) VALUES ('rank', ?)",
+                    (f"bm25({', '.join(map(str, COLUMN_WEIGHTS))})",)
+                )
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS participants (
+                    report_id INTEGER NOT NULL,
+                    name TEXT,
+                    {", ".join(f"{column} REAL" for column in SCORE_COLUMNS)}
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS participants_report ON participants (report_id)")
+            for column in SCORE_COLUMNS:
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS participants_{column} ON participants ({column}, report_id)"
+                )
+
+    def add(self, key: str, report: Dict, domain: Optional[str] = None, round_type: Optional[str] = None):
+        """
+        Index a report, replacing any earlier version with the same key
+
+        Args:
+            key: Report identifier (the job ID for reports produced by jobs)
+            report: Report data dictionary
+            domain: Domain the analysis was run with
+            round_type: Round type the analysis was run with
+        """
+        participants = list((report.get("participants") or {}).values())
+        key_points = "\n".join(
+            str(point) for p in participants for point in (p.get("key_points") or []) + (p.get("strengths") or [])
+        )
+        topics = "\n".join(map(str, list(report.get("topics") or []) + list(report.get("keywords") or [])))
+
+        with self._lock, self._conn:
+            self._delete(key)
+            cursor = self._conn.execute(
+                "INSERT INTO reports (key, timestamp, domain, round_type, summary, indexed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, report.get("timestamp", ""), domain, round_type, report.get("overall_summary", ""), time.time())
+            )
+            report_id = cursor.lastrowid
+            self._conn.execute(
+                "INSERT INTO report_text (rowid, transcript, key_points, topics) VALUES (?, ?, ?, ?)",
+                (report_id, report.get("raw_transcript", ""), key_points, topics)
+            )
+            self._conn.executemany(
+                f"INSERT INTO participants (report_id, name, {', '.join(SCORE_COLUMNS)}) "
+                f"VALUES (?, ?{', ?' * len(SCORE_COLUMNS)})",
+                [(report_id, str(p.get("name", ""))) + tuple(_as_float(p.get(c)) for c in SCORE_COLUMNS)
+                 for p in participants]
+            )
+
+    def remove(self, key: str):
+        """Drop a report from the index"""
+        with self._lock, self._conn:
+            self._delete(key)
+
+    def _delete(self, key: str):
+        row = self._conn.execute("SELECT id FROM reports WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return
+        self._conn.execute("DELETE FROM report_text WHERE rowid = ?", (row["id"],))
+        self._conn.execute("DELETE FROM participants WHERE report_id = ?", (row["id"],))
+        self._conn.execute("DELETE FROM reports WHERE id = ?", (row["id"],))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def search(
+        self,
+        query: str = "",
+        filters: Optional[Dict[str, Range]] = None,
+        domain: Optional[str] = None,
+        limit: int = 10,
+        rank_window: Optional[int] = RANK_WINDOW
+    ) -> List[Dict]:
+        """
+        Find reports by text and participant scores
+
+        Args:
+            query: Words and "quoted phrases"; empty matches every report
+            filters: Score column to (low, high) bounds; one participant must satisfy all of them
+            domain: Only reports analyzed with this domain
+            limit: Number of results
+            rank_window: Rank only this many of the most recent matches (None ranks all)
+
+        Returns:
+            Best matches first (newest first without a text query), each with key,
+            score, timestamp, domain, round_type, summary, snippet (matches in **),
+            snippet_markdown (the snippet escaped for Markdown) and participants
+        """
+        # Conditions on "{id}", the report ID of whichever table the query reads
+        conditions, params = [], []
+        participant_conditions = []
+        for column, (low, high) in (filters or {}).items():
+            if column not in SCORE_COLUMNS:
+                raise ValueError(f"Cannot filter on '{column}'; use one of {', '.join(SCORE_COLUMNS)}")
+            if low is not None:
+                participant_conditions.append(f"p.{column} >= ?")
+                params.append(low)
+            if high is not None:
+                participant_conditions.append(f"p.{column} <= ?")
+                params.append(high)
+        if participant_conditions:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM participants p WHERE p.report_id = {id} AND "
+                + " AND ".join(participant_conditions) + ")"
+            )
+        if domain:
+            conditions.append("{id} IN (SELECT id FROM reports WHERE domain = ?)")
+            params.append(domain)
+
+        match = fts_query(query)
+        with self._lock:
+            if match:
+                # Rank on the text index alone; the report rows and snippets are only
+                # fetched for the top results
+                where = "report_text MATCH ?" + "".join(
+                    " AND " + c.format(id="report_text.rowid") for c in conditions
+                )
+                params = [match] + params
+                if rank_window:
+                    cutoff = self._conn.execute(
+                        f"SELECT rowid FROM report_text WHERE {where} ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                        params + [rank_window - 1]
+                    ).fetchone()
+                    if cutoff is not None:
+                        where += " AND report_text.rowid >= ?"
+                        params.append(cutoff[0])
+                ranked = self._conn.execute(
+                    f"SELECT rowid, rank FROM report_text WHERE {where} ORDER BY rank LIMIT ?", params + [limit]
+                ).fetchall()
+                ids = [row["rowid"] for row in ranked]
+                scores = {row["rowid"]: row["rank"] for row in ranked}
+                snippets = dict(self._conn.execute(
+                    "SELECT rowid, snippet(report_text, -1, ?, ?, '…', 12) FROM report_text "
+                    f"WHERE report_text MATCH ? AND rowid IN ({', '.join('?' * len(ids))})",
+                    [MATCH_START, MATCH_END, match] + ids
+                ).fetchall()) if ids else {}
+            else:
+                where = " AND ".join(c.format(id="r.id") for c in conditions)
+                ids = [row[0] for row in self._conn.execute(
+                    "SELECT r.id FROM reports r" + (f" WHERE {where}" if where else "") + " ORDER BY r.id DESC LIMIT ?",
+                    params + [limit]
+                )]
+                scores, snippets = {}, {}
+
+            placeholders = ", ".join("?" * len(ids))
+            reports = {row["id"]: row for row in self._conn.execute(
+                f"SELECT * FROM reports WHERE id IN ({placeholders})", ids
+            )}
+            participants: Dict[int, List[Dict]] = {}
+            for p in self._conn.execute(f"SELECT * FROM participants WHERE report_id IN ({placeholders})", ids):
+                participants.setdefault(p["report_id"], []).append({k: p[k] for k in p.keys() if k != "report_id"})
+
+        return [
+            {
+                "key": reports[report_id]["key"],
+                # BM25 from FTS5 is negative; flip it so higher is better
+                "score": round(-scores[report_id], 4) if report_id in scores else None,
+                "timestamp": reports[report_id]["timestamp"],
+                "domain": reports[report_id]["domain"],
+                "round_type": reports[report_id]["round_type"],
+                "summary": reports[report_id]["summary"],
+                "snippet": snippets.get(report_id, "").replace(MATCH_START, "**").replace(MATCH_END, "**"),
+                "snippet_markdown": markdown_snippet(snippets.get(report_id, "")),
+                "participants": participants.get(report_id, []),
+            }
+            for report_id in ids
+        ]
+
+    def rebuild_from_jobs(self, store, kinds: Iterable[str] = ("analysis", "screening", "audio_analysis")) -> int:
+        """
+        Index every finished job's report
+
+        Args:
+            store: JobStore holding the results
+            kinds: Job kinds whose results are reports
+
+        Returns:
+            Number of reports indexed
+        """
+        from .jobs import DONE
+
+        count = 0
+        for job_id in store.ids_with_status(DONE):
+            job = store.get(job_id)
+            if job and job["kind"] in kinds and job["result"]:
+                params = job["params"] or {}
+                self.add(job_id, job["result"], params.get("domain"), params.get("round_type"))
+                count += 1
+        return count
+
+    def optimize(self):
+        """Merge index segments (worth running after bulk loads)"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO report_text (report_text) VALUES ('optimize')")
+
+def parse_filter(text: str) -> Tuple[str, Range]:
+    """Parse "column=low" / "column=low:high" / "column=:high" into a filter"""
+    column, _, bounds = text.partition("=")
+    low, _, high = bounds.partition(":")
+    return column, (float(low) if low else None, float(high) if high else None)
+
+def main():
+    parser = argparse.ArgumentParser(description="Search past interview reports")
+    parser.add_argument("query", nargs="?", default="", help='Words and "quoted phrases"')
+    parser.add_argument("--filter", action="append", default=[], type=parse_filter, metavar="COLUMN=LOW:HIGH",
+                        help=f"Participant score range ({', '.join(SCORE_COLUMNS)})")
+    parser.add_argument("--domain", help="Only this domain")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--rebuild", action="store_true", help="Index every finished job first")
+    args = parser.parse_args()
+
+    index = ReportIndex()
+    if args.rebuild:
+        from .jobs import JobStore
+        print(f"📚 Indexed {index.rebuild_from_jobs(JobStore())} report(s)")
+        index.optimize()
+
+    start = time.perf_counter()
+    results = index.search(args.query, dict(args.filter), args.domain, args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    for result in results:
+        names = ", ".join(p["name"] for p in result["participants"])
+        score = f"{result['score']:.2f}" if result["score"] is not None else "-"
+        print(f"{score:>7}  {result['timestamp']}  {result['key'][:12]}  {names}")
+        if result["snippet"]:
+            print(f"         {result['snippet']}")
+    print(f"🔎 {len(results)} result(s) in {elapsed:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Uses VADER and additional heuristics for sentiment analysis
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from typing import Dict, List
 import re
+from .instrumentation import metrics
 
 class SentimentAnalyzer:
     def __init__(self):
@@ -18,7 +19,9 @@ class SentimentAnalyzer:
         Returns:
             Dictionary with sentiment scores and classification
         """
-        scores = self.analyzer.polarity_scores(text)
+        with metrics.stage("vader.polarity") as stage:
+            stage.add("text_chars", len(text))
+            scores = self.analyzer.polarity_scores(text)
         
         # Classify sentiment
         if scores['compound'] >= 0.05:
@@ -82,10 +85,11 @@ class SentimentAnalyzer:
         ]
         
         count = 0
-        text_lower = text.lower()
-        for pattern in filler_patterns:
-            matches = re.findall(pattern, text_lower)
-            count += len(matches)
+        with metrics.stage("fillers.count"):
+            text_lower = text.lower()
+            for pattern in filler_patterns:
+                matches = re.findall(pattern, text_lower)
+                count += len(matches)
         
         return count
     
@@ -0,0 +1,483 @@
+"""
+HTTP Analysis Service
+Lightweight asyncio HTTP/1.1 server exposing transcript and audio analysis for machine clients
+
+Run with:
+    python -m interview_analyzer.server --port 8080
+    INTERVIEW_ANALYZER_STUB_LLM=1 python -m interview_analyzer.server   # offline load testing
+
+Endpoints:
+    GET  /health                 Service status and queue depth
+    GET  /metrics                Stage timings and counters (Prometheus text; INTERVIEW_ANALYZER_METRICS=1)
+    POST /analyze/transcript     JSON {"transcript", "domain", "round_type", "feedback_tone"}
+    POST /analyze/audio          Raw audio body; options as query parameters (filename, domain, ...)
+
+Analysis responses stream newline-delimited JSON events (chunked encoding):
+    {"event": "queued", "position": 3}
+    {"event": "progress", "stage": "...", "percent": 40}
+    {"event": "transcript", "text": "...", "model_size": "small"}    (audio only; the report
+                                                                     also gets acoustic_metrics)
+    {"event": "result", "report": {...}}  or  {"event": "error", "message": "..."}
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+
+from .config import ANALYSIS_WORKERS, MAX_QUEUED_JOBS, MAX_FILE_SIZE_MB, ALLOWED_AUDIO_EXTENSIONS
+from .pipeline import run_analysis, transcribe_recording
+from .instrumentation import metrics
+from .resources import governor
+
+KEEPALIVE_TIMEOUT = 15.0
+BODY_TIMEOUT = 60.0
+MAX_HEADER_BYTES = 16 * 1024
+MAX_JSON_BYTES = 5 * 1024 * 1024
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    408: "Request Timeout", 411: "Length Required", 413: "Payload Too Large",
+    415: "Unsupported Media Type", 431: "Request Header Fields Too Large",
+    500: "Internal Server Error", 503: "Service Unavailable"
+}
+
+class HTTPError(Exception):
+    """Error that maps directly to an HTTP error response"""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+class _Request:
+    __slots__ = ("method", "path", "query", "headers", "body", "keep_alive")
+
+    def __init__(self, method: str, path: str, query: Dict[str, str], headers: Dict[str, str], keep_alive: bool):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = b""
+        self.keep_alive = keep_alive
+
+class AnalysisService:
+    """
+    Asyncio HTTP front end over the analysis pipeline.
+
+    Requests are admitted into a bounded queue that worker tasks drain; when
+    the queue is full new requests get 503 with Retry-After instead of piling
+    up. The blocking pipeline runs on thread pools. The resource governor
+    resizes the "analysis" (worker tasks) and "transcription" pools while
+    the service runs.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: int = MAX_QUEUED_JOBS,
+        max_body_mb: float = MAX_FILE_SIZE_MB
+    ):
+        """
+        Initialize service
+
+        Args:
+            workers: Number of analyses that run at the same time (defaults to
+                ANALYSIS_WORKERS, or the resource governor's plan)
+            queue_size: Maximum number of admitted requests waiting for a worker
+            max_body_mb: Maximum request body size
+        """
+        plan = governor.plan
+        self.workers = workers or ANALYSIS_WORKERS or plan["analysis_workers"]
+        self.queue_size = queue_size
+        self.max_body_bytes = int(max_body_mb * 1024 * 1024)
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Current sizes; transcription is serialized for an in-process Whisper model,
+        # which is not safe to share across threads
+        self.pool_sizes = {"analysis": self.workers, "transcription": plan["transcription_workers"]}
+        # Worker tasks bound the analyses in flight; threads start on demand, so the
+        # pool only needs room for the largest size the governor may pick
+        self._analysis_pool = ThreadPoolExecutor(
+            max_workers=max(self.workers, plan["analysis_max"]),
+            thread_name_prefix="http-analysis"
+        )
+        self._transcription_pool = ThreadPoolExecutor(
+            max_workers=self.pool_sizes["transcription"],
+            thread_name_prefix="http-transcribe"
+        )
+        # Processors by model size; which size is used depends on the latency budget
+        self._audio_processors: Dict = {}
+        self._audio_lock = threading.Lock()
+        self._transcriptions_pending = 0
+        self._worker_tasks = []
+        # Worker tasks waiting for a request, which can be cancelled when the pool shrinks
+        self._idle_workers = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """Start worker tasks, hand the pools to the resource governor and listen for connections"""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.pool_sizes["analysis"])]
+        governor.attach(self)
+        governor.start()
+        return await asyncio.start_server(self._handle_connection, host, port, limit=MAX_HEADER_BYTES)
+
+    async def stop(self):
+        """Cancel workers and release thread pools"""
+        governor.detach(self)
+        for task in self._worker_tasks:
+            task.cancel()
+        self._analysis_pool.shutdown(wait=False)
+        self._transcription_pool.shutdown(wait=False)
+
+    # Pool sizing (called by the resource governor)
+
+    def pending_in(self, pool: str) -> int:
+        """Requests waiting for a worker of one pool"""
+        if pool == "transcription":
+            return max(0, self._transcriptions_pending - self.pool_sizes["transcription"])
+        return self._queue.qsize() if self._queue else 0
+
+    def resize(self, pool: str, size: int):
+        """
+        Change the number of workers of a pool while serving (from any thread)
+
+        Extra analysis workers start at once; surplus ones exit when idle or
+        after their current request. A resized transcription pool takes new
+        transcriptions while the old one finishes those already running.
+        """
+        self.pool_sizes[pool] = max(1, int(size))
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._apply_size, pool)
+
+    def _apply_size(self, pool: str):
+        size = self.pool_sizes[pool]
+        if pool == "transcription":
+            previous = self._transcription_pool
+            self._transcription_pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix="http-transcribe")
+            previous.shutdown(wait=False)
+            return
+        surplus = len(self._worker_tasks) - size
+        for task in list(self._idle_workers)[:max(0, surplus)]:
+            self._idle_workers.discard(task)
+            self._worker_tasks.remove(task)
+            task.cancel()
+        for _ in range(len(self._worker_tasks), size):
+            self._worker_tasks.append(asyncio.create_task(self._worker()))
+
+    # Connection handling
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_head(reader), KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if request is None:
+                    break
+                try:
+                    await self._read_body(reader, request)
+                    await self._dispatch(request, writer)
+                except HTTPError as e:
+                    # The unread body of a rejected request would corrupt the next one
+                    if e.status in (400, 408, 411, 413):
+                        request.keep_alive = False
+                    await self._send_json(writer, e.status, {"error": e.message}, request.keep_alive, e.headers)
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HTTPError as e:
+            try:
+                await self._send_json(writer, e.status, {"error": e.message}, False)
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    async def _read_head(self, reader: asyncio.StreamReader) -> Optional[_Request]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, "Request headers too large")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        url = urlsplit(target)
+        return _Request(method.upper(), url.path, dict(parse_qsl(url.query)), headers, keep_alive)
+
+    def _body_limit(self, path: str) -> int:
+        """Largest body a route accepts (0 for routes without a body)"""
+        return {"/analyze/transcript": MAX_JSON_BYTES, "/analyze/audio": self.max_body_bytes}.get(path, 0)
+
+    async def _read_body(self, reader: asyncio.StreamReader, request: _Request):
+        """Read the body after checking Content-Length against the route's limit, so oversized
+        bodies are rejected before any of them is read"""
+        if request.method not in ("POST", "PUT"):
+            return
+        if "chunked" in request.headers.get("transfer-encoding", "").lower():
+            raise HTTPError(411, "Chunked request bodies are not supported; send Content-Length")
+        try:
+            length = int(request.headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        limit = self._body_limit(request.path)
+        if not limit:
+            # Routing rejects the request; its unread body rules out reusing the connection
+            request.keep_alive = request.keep_alive and length == 0
+            return
+        if length > limit:
+            raise HTTPError(413, f"Body exceeds {limit / (1024 * 1024):g}MB limit")
+        try:
+            request.body = await asyncio.wait_for(reader.readexactly(length), BODY_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HTTPError(408, "Timed out reading request body")
+
+    async def _dispatch(self, request: _Request, writer: asyncio.StreamWriter):
+        if request.path == "/health":
+            if request.method != "GET":
+                raise HTTPError(405, "Use GET")
+            await self._send_json(writer, 200, self.health(), request.keep_alive)
+            return
+
+        if request.path == "/metrics":
+            if request.method != "GET":
+                raise HTTPError(405, "Use GET")
+            data = metrics.prometheus_text().encode("utf-8")
+            await self._send_head(writer, 200, "text/plain; version=0.0.4", request.keep_alive, length=len(data))
+            writer.write(data)
+            await writer.drain()
+            return
+
+        if request.path == "/analyze/transcript":
+            if request.method != "POST":
+                raise HTTPError(405, "Use POST")
+            params = self._transcript_params(request)
+        elif request.path == "/analyze/audio":
+            if request.method != "POST":
+                raise HTTPError(405, "Use POST")
+            params = self._audio_params(request)
+        else:
+            raise HTTPError(404, f"No route for {request.path}")
+
+        await self._stream_job(params, writer, request.keep_alive)
+
+    def health(self) -> Dict:
+        """Service status"""
+        return {
+            "status": "ok",
+            "workers": self.pool_sizes["analysis"],
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_size": self.queue_size,
+            "resources": governor.snapshot(),
+        }
+
+    def _transcript_params(self, request: _Request) -> Dict:
+        try:
+            payload = json.loads(request.body or b"{}")
+        except json.JSONDecodeError:
+            raise HTTPError(400, "Body must be JSON")
+        transcript = payload.get("transcript") if isinstance(payload, dict) else None
+        if not transcript or not isinstance(transcript, str):
+            raise HTTPError(400, "Field 'transcript' is required")
+        return {
+            "transcript": transcript,
+            "domain": payload.get("domain", "General"),
+            "round_type": payload.get("round_type", "General"),
+            "feedback_tone": payload.get("feedback_tone", "Professional"),
+        }
+
+    def _audio_params(self, request: _Request) -> Dict:
+        if not request.body:
+            raise HTTPError(400, "Audio body is empty")
+        suffix = os.path.splitext(request.query.get("filename", "audio.wav"))[1].lower()
+        if suffix not in ALLOWED_AUDIO_EXTENSIONS:
+            raise HTTPError(415, f"Supported formats: {', '.join(ALLOWED_AUDIO_EXTENSIONS)}")
+        return {
+            "audio": request.body,
+            "suffix": suffix,
+            "language": request.query.get("language"),
+            "domain": request.query.get("domain", "General"),
+            "round_type": request.query.get("round_type", "General"),
+            "feedback_tone": request.query.get("feedback_tone", "Professional"),
+        }
+
+    # Job execution
+
+    async def _stream_job(self, params: Dict, writer: asyncio.StreamWriter, keep_alive: bool):
+        events: asyncio.Queue = asyncio.Queue()
+        try:
+            self._queue.put_nowait((params, events))
+        except asyncio.QueueFull:
+            raise HTTPError(503, "Analysis queue is full", {"Retry-After": "5"})
+
+        await self._send_head(writer, 200, "application/x-ndjson", keep_alive, chunked=True)
+        await self._send_chunk(writer, {"event": "queued", "position": self._queue.qsize()})
+        while True:
+            event = await events.get()
+            await self._send_chunk(writer, event)
+            if event["event"] in ("result", "error"):
+                break
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        while True:
+            self._idle_workers.add(task)
+            try:
+                params, events = await self._queue.get()
+            finally:
+                self._idle_workers.discard(task)
+
+            def emit(event: Dict):
+                loop.call_soon_threadsafe(events.put_nowait, event)
+
+            def progress(stage: str, percent: float):
+                emit({"event": "progress", "stage": stage, "percent": round(percent, 1)})
+
+            try:
+                if "audio" in params:
+                    queue_depth = self._transcriptions_pending
+                    self._transcriptions_pending += 1
+                    try:
+                        transcript, model_size, acoustic = await loop.run_in_executor(
+                            self._transcription_pool, self._transcribe, params, queue_depth
+                        )
+                    finally:
+                        self._transcriptions_pending -= 1
+                    emit({"event": "transcript", "text": transcript, "model_size": model_size})
+                else:
+                    transcript, acoustic = params["transcript"], None
+                report = await loop.run_in_executor(
+                    self._analysis_pool,
+                    lambda: run_analysis(
+                        transcript,
+                        domain=params["domain"],
+                        round_type=params["round_type"],
+                        feedback_tone=params["feedback_tone"],
+                        progress=progress,
+                        acoustic=acoustic
+                    )
+                )
+                emit({"event": "result", "report": report})
+            except Exception as e:
+                emit({"event": "error", "message": str(e)})
+            finally:
+                self._queue.task_done()
+            # The pool shrank while this request ran
+            if len(self._worker_tasks) > self.pool_sizes["analysis"]:
+                self._worker_tasks.remove(task)
+                return
+
+    def _transcribe(self, params: Dict, queue_depth: int) -> Tuple[str, str, Dict]:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=params["suffix"]) as tmp_file:
+            tmp_file.write(params["audio"])
+            tmp_path = tmp_file.name
+        try:
+            with self._audio_lock:
+                from .audio_processor import select_audio_processor
+                processor, selection = select_audio_processor(
+                    tmp_path,
+                    queue_depth=queue_depth,
+                    workers=self.pool_sizes["transcription"],
+                    loaded=self._audio_processors
+                )
+                self._audio_processors[selection["model_size"]] = processor
+            text, acoustic = transcribe_recording(
+                tmp_path, processor, params.get("language"), selection["predicted_transcribe_seconds"]
+            )
+            return text, selection["model_size"], acoustic
+        finally:
+            os.unlink(tmp_path)
+
+    # Response writing
+
+    async def _send_head(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        content_type: str,
+        keep_alive: bool,
+        chunked: bool = False,
+        length: int = 0,
+        extra_headers: Optional[Dict[str, str]] = None
+    ):
+        headers = [f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}", f"Content-Type: {content_type}"]
+        headers.append("Transfer-Encoding: chunked" if chunked else f"Content-Length: {length}")
+        headers.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        if keep_alive:
+            headers.append(f"Keep-Alive: timeout={int(KEEPALIVE_TIMEOUT)}")
+        for name, value in (extra_headers or {}).items():
+            headers.append(f"{name}: {value}")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+    async def _send_chunk(self, writer: asyncio.StreamWriter, event: Dict):
+        data = (json.dumps(event) + "\n").encode("utf-8")
+        writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+        await writer.drain()
+
+    async def _send_json(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Dict,
+        keep_alive: bool,
+        extra_headers: Optional[Dict[str, str]] = None
+    ):
+        data = json.dumps(payload).encode("utf-8")
+        await self._send_head(writer, status, "application/json", keep_alive,
+                              length=len(data), extra_headers=extra_headers)
+        writer.write(data)
+        await writer.drain()
+
+async def serve(host: str, port: int, workers: int, queue_size: int):
+    """Run the service until cancelled"""
+    service = AnalysisService(workers=workers, queue_size=queue_size)
+    server = await service.start(host, port)
+    print(f"🚀 Interview Analyzer service listening on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Interview Analyzer HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=ANALYSIS_WORKERS, help="Concurrent analyses (0 = sized to the host)")
+    parser.add_argument("--queue-size", type=int, default=MAX_QUEUED_JOBS, help="Waiting requests before 503")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.queue_size))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Storage Utilities
+Content hashing and disk quota enforcement for the output and upload directories
+"""
+from typing import Callable, Dict, Iterable, List, Optional
+import hashlib
+import json
+import os
+import time
+
+def content_hash(data: Dict, *salt: str) -> str:
+    """
+    Compute a stable hash of JSON-serializable data
+
+    Args:
+        data: Dictionary to hash (key order does not matter)
+        salt: Extra strings mixed into the hash, e.g. a template version
+
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    for part in salt:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(json.dumps(data, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+def touch(path: str):
+    """Mark a file as recently used"""
+    now = time.time()
+    os.utime(path, (now, now))
+
+def _last_used(stat: os.stat_result) -> float:
+    # atime is unreliable on relatime/noatime mounts, so cache hits also bump mtime
+    return max(stat.st_atime, stat.st_mtime)
+
+def disk_usage(directories: Iterable[str]) -> int:
+    """Combined size in bytes of the files under the directories"""
+    total = 0
+    for directory in directories:
+        for root, _, names in os.walk(directory):
+            for name in names:
+                try:
+                    total += os.stat(os.path.join(root, name)).st_size
+                except OSError:
+                    continue
+    return total
+
+def enforce_disk_quota(
+    directories: Iterable[str],
+    quota_bytes: int,
+    evictable: Optional[Callable[[str], bool]] = None,
+    keep: Iterable[str] = ()
+) -> List[str]:
+    """
+    Delete least recently used files until the directories fit in the quota
+
+    Every file counts towards the quota, but only evictable ones are deleted,
+    so the directories may stay above it.
+
+    Args:
+        directories: Directories sharing the quota
+        quota_bytes: Maximum combined size in bytes
+        evictable: Whether a file may be deleted (default: any file)
+        keep: Paths that are never deleted, e.g. files that queued jobs still need
+
+    Returns:
+        Paths of removed files
+    """
+    keep = {os.path.abspath(path) for path in keep}
+    files = []
+    total = 0
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        for root, _, names in os.walk(directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                total += stat.st_size
+                if os.path.abspath(path) not in keep and (evictable is None or evictable(path)):
+                    files.append((_last_used(stat), stat.st_size, path))
+
+    removed = []
+    if total <= quota_bytes:
+        return removed
+
+    files.sort()
+    for _, size, path in files:
+        if total <= quota_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            # Another process may have removed or still be writing it
+            continue
+        total -= size
+        removed.append(path)
+    return removed
@@ -0,0 +1,123 @@
+"""
+Transcript Utilities
+Splits speaker-labelled transcripts into turns and extracts keywords locally
+"""
+from collections import Counter
+from typing import Dict, List, Tuple
+import re
+
+# "Interviewer: ...", "Speaker 2: ...", "Jane Doe: ..." (up to four words before the colon)
+SPEAKER_LINE = re.compile(r"^\s*([A-Za-z][\w.'-]*(?: [\w.'-]+){0,3})\s*:\s*(.*)$")
+
+WORD = re.compile(r"[a-z][a-z'+#-]{2,}")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers herself him himself his how i if in into is it its itself just
+let me more most my myself no nor not now of off on once only or other our ours ourselves out over
+own really same she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we well were what when where which
+while who whom why will with would yes you your yours yourself yourselves um uh like know yeah
+okay ok right think thing things going get got one also actually basically mean kind sort lot
+""".split())
+
+def split_turns(transcript: str) -> List[Tuple[str, str]]:
+    """
+    Split a transcript into (speaker, text) turns
+
+    Lines without a speaker label continue the previous turn. Text before the
+    first label, or a transcript without labels, is attributed to speaker "".
+
+    Args:
+        transcript: Full conversation transcript
+
+    Returns:
+        List of (speaker, text) tuples in order
+    """
+    turns: List[Tuple[str, str]] = []
+    speaker, lines = "", []
+    for line in transcript.splitlines():
+        match = SPEAKER_LINE.match(line)
+        if match:
+            if lines:
+                turns.append((speaker, " ".join(lines)))
+            speaker, lines = match.group(1).strip(), [match.group(2).strip()]
+        elif line.strip():
+            lines.append(line.strip())
+    if lines:
+        turns.append((speaker, " ".join(lines)))
+    return turns
+
+def group_by_speaker(turns: List[Tuple[str, str]]) -> Dict[str, str]:
+    """
+    Concatenate each speaker's turns
+
+    Args:
+        turns: List of (speaker, text) tuples
+
+    Returns:
+        Dictionary of speaker to their combined text, in order of first appearance
+    """
+    grouped: Dict[str, List[str]] = {}
+    for speaker, text in turns:
+        grouped.setdefault(speaker, []).append(text)
+    return {speaker: " ".join(texts) for speaker, texts in grouped.items()}
+
+def speech_text(transcript: str) -> str:
+    """Return the spoken text of a transcript with speaker labels removed"""
+    return " ".join(text for _, text in split_turns(transcript))
+
+def top_keywords(text: str, top_n: int = 10) -> List[str]:
+    """
+    Extract the most frequent content words without calling the LLM
+
+    Args:
+        text: Text to analyze
+        top_n: Number of keywords to return
+
+    Returns:
+        List of keywords, most frequent first
+    """
+    counts = Counter(w for w in WORD.findall(text.lower()) if w not in STOPWORDS)
+    return [word for word, _ in counts.most_common(top_n)]
+
+def condense_turns(turns: List[Tuple[str, str]], max_chars: int, min_turn_chars: int = 120) -> str:
+    """
+    Shorten a transcript to about max_chars while keeping its order and shape
+
+    Every turn keeps its opening, cut to an equal share of the budget; when that
+    share would fall below min_turn_chars, evenly spaced turns are kept instead,
+    so each part of the discussion stays represented.
+
+    Args:
+        turns: List of (speaker, text) tuples
+        max_chars: Approximate size of the result
+        min_turn_chars: Shortest opening kept per turn
+
+    Returns:
+        Transcript with "Speaker: text" lines
+    """
+    lines = [f"{speaker}: {text}" if speaker else text for speaker, text in turns]
+    if sum(len(line) + 1 for line in lines) <= max_chars:
+        return "\n".join(lines)
+
+    if len(lines) * min_turn_chars <= max_chars:
+        keep, marker_chars = len(lines), 0
+    else:
+        # Each kept turn is preceded by an omission marker line
+        marker_chars = len("[... 10000 turns omitted ...]\n")
+        keep = max(1, max_chars // (min_turn_chars + marker_chars))
+    share = max(4, max_chars // keep - marker_chars - 1)
+    condensed, previous = [], -1
+    for n in range(keep):
+        # Spaced so the first and last turns are always kept
+        index = n * (len(lines) - 1) // (keep - 1) if keep > 1 else 0
+        if index > previous + 1:
+            condensed.append(f"[... {index - previous - 1} turns omitted ...]")
+        line = lines[index]
+        condensed.append(line if len(line) <= share else line[:share - 3].rstrip() + "...")
+        previous = index
+    if previous < len(lines) - 1:
+        condensed.append(f"[... {len(lines) - previous - 1} turns omitted ...]")
+    return "\n".join(condensed)
@@ -0,0 +1,381 @@
+"""
+Transcription Server
+Long-lived worker processes keep Whisper models resident; app processes hand over decoded audio
+through shared memory and receive segments over a local socket
+
+Run with:
+    export INTERVIEW_ANALYZER_TRANSCRIPTION_AUTHKEY=$(python -c "import secrets; print(secrets.token_hex(16))")
+    python -m interview_analyzer.transcription_server --address 127.0.0.1:8765 --workers 1
+    INTERVIEW_ANALYZER_TRANSCRIPTION_SERVER=127.0.0.1:8765 streamlit run app.py
+
+Protocol (multiprocessing.connection messages):
+    {"op": "ping"}
+    {"op": "transcribe", "shm": <block name>, "samples": n, "model_size": "base", "language": None}
+Replies are {"ok": True, ...} or {"ok": False, "error": "..."}. Audio is mono float32 at 16 kHz
+and never goes through pickle: only the shared memory block's name crosses the socket.
+Messages themselves are pickled, so both sides refuse to run without
+INTERVIEW_ANALYZER_TRANSCRIPTION_AUTHKEY, and addresses without a host bind to localhost.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from multiprocessing.connection import Client, Listener
+from typing import Dict, Iterator, Optional, Tuple, Union
+import argparse
+import subprocess
+import sys
+import tempfile
+import threading
+
+import numpy as np
+
+from .config import TRANSCRIPTION_SERVER, TRANSCRIPTION_WORKERS, TRANSCRIPTION_AUTHKEY
+from .resources import governor
+
+SAMPLE_RATE = 16000
+# Samples decoded per read from ffmpeg (10 s of audio)
+DECODE_CHUNK_SAMPLES = 10 * SAMPLE_RATE
+
+Address = Union[str, Tuple[str, int]]
+
+def parse_address(address: str) -> Address:
+    """Parse "host:port" into a TCP address; anything else is a Unix socket path"""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return host or "127.0.0.1", int(port)
+    return address
+
+def _authkey(authkey: Optional[str]) -> bytes:
+    """
+    Shared secret for the connection handshake
+
+    Without one, multiprocessing.connection unpickles messages from anyone who can
+    reach the socket, so a missing key is an error rather than an open server.
+    """
+    authkey = TRANSCRIPTION_AUTHKEY if authkey is None else authkey
+    if not authkey:
+        raise ValueError(
+            "The transcription server requires a shared secret: set INTERVIEW_ANALYZER_TRANSCRIPTION_AUTHKEY "
+            "to the same value for the server and the app processes"
+        )
+    return authkey.encode()
+
+def estimate_samples(audio_path: str, sample_rate: int = SAMPLE_RATE) -> Optional[int]:
+    """Sample count from ffprobe's duration, or None when it can't tell"""
+    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", audio_path]
+    try:
+        output = subprocess.run(cmd, capture_output=True, check=True, timeout=30).stdout
+        return int(float(output) * sample_rate) + sample_rate
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+def decode_pcm_chunks(
+    audio_path: str,
+    sample_rate: int = SAMPLE_RATE,
+    chunk_samples: int = DECODE_CHUNK_SAMPLES
+) -> Iterator[np.ndarray]:
+    """
+    Decode any ffmpeg-readable file to mono 16-bit PCM (the same conversion Whisper uses)
+
+    The stream is read chunk by chunk, so at most one chunk of int16 samples is held
+    besides whatever the caller keeps.
+
+    Yields:
+        Arrays of little-endian int16 samples
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-nostats", "-loglevel", "error", "-threads", "0", "-i", audio_path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate), "-"
+    ]
+    with tempfile.TemporaryFile() as stderr:
+        try:
+            process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=stderr)
+        except FileNotFoundError:
+            raise RuntimeError("ffmpeg is required to decode audio")
+        try:
+            while True:
+                data = process.stdout.read(chunk_samples * 2)
+                if len(data) >= 2:
+                    yield np.frombuffer(data[:len(data) - len(data) % 2], dtype="<i2")
+                if len(data) < chunk_samples * 2:
+                    break
+            if process.wait() != 0:
+                stderr.seek(0)
+                raise RuntimeError(f"Failed to load audio: {stderr.read().decode(errors='replace')[-500:]}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            process.wait()
+
+# Worker process side
+
+_processors: Dict[str, object] = {}
+
+def _load_model(model_size: str):
+    # AudioProcessor applies the configured int8 quantization
+    if model_size not in _processors:
+        from .audio_processor import AudioProcessor
+        _processors[model_size] = AudioProcessor(model_size)
+    return _processors[model_size]
+
+def _init_worker(model_size: str, threads: Optional[int] = None):
+    from .audio_processor import configure_torch_threads
+    configure_torch_threads(threads or 0)
+    if sys.version_info < (3, 13):
+        # Attaching to a block registers it with the resource tracker, which would
+        # unlink the client's memory when this worker exits. Blocks are always
+        # owned by clients, so workers never track them (track=False on 3.13+).
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+
+        def register_untracked(name, rtype):
+            if rtype != "shared_memory":
+                register(name, rtype)
+        resource_tracker.register = register_untracked
+    _load_model(model_size)
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+def _transcribe_shared(name: str, samples: int, model_size: str, language: Optional[str]) -> Dict:
+    shm = _attach(name)
+    try:
+        audio = np.ndarray((samples,), dtype=np.float32, buffer=shm.buf)
+        try:
+            # The client records the time against its own prediction
+            return _load_model(model_size).transcribe_audio(audio, language=language, record=False)
+        finally:
+            del audio  # the block cannot be closed while a view is alive
+    finally:
+        shm.close()
+
+# Server
+
+class TranscriptionServer:
+    """
+    Accepts transcription requests on a local socket and runs them on a pool of
+    worker processes, each holding its Whisper models for its whole lifetime.
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        workers: int = TRANSCRIPTION_WORKERS,
+        model_size: str = "base",
+        authkey: Optional[str] = None
+    ):
+        """
+        Initialize server
+
+        Args:
+            address: (host, port) or Unix socket path
+            workers: Number of worker processes (one model copy each)
+            model_size: Model preloaded in every worker; other sizes load on first use
+            authkey: Shared secret clients must present
+        """
+        self.address = address
+        self.workers = workers
+        self.model_size = model_size
+        self._authkey = _authkey(authkey)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._listener: Optional[Listener] = None
+        self._closed = threading.Event()
+
+    def start(self):
+        """Start worker processes and listen for clients"""
+        # Workers split the Whisper threads planned for this host instead of each taking all cores
+        threads = max(1, governor.plan["whisper_threads"] // self.workers) if governor.plan["whisper_threads"] else None
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self.model_size, threads)
+        )
+        self._listener = Listener(self.address, authkey=self._authkey)
+        self.address = self._listener.address
+
+    def serve_forever(self):
+        """Accept clients until close() is called, one thread per connection"""
+        if self._listener is None:
+            self.start()
+        while not self._closed.is_set():
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                break
+            except Exception:
+                # Failed handshake (wrong authkey, garbage); keep serving others
+                continue
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def close(self):
+        """Stop accepting clients and shut down the workers"""
+        self._closed.set()
+        if self._listener is not None:
+            self._listener.close()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                conn.send(self._respond(request))
+
+    def _respond(self, request) -> Dict:
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Malformed request"}
+        if request.get("op") == "ping":
+            return {"ok": True, "workers": self.workers, "model_size": self.model_size}
+        if request.get("op") != "transcribe":
+            return {"ok": False, "error": f"Unknown op '{request.get('op')}'"}
+        try:
+            future = self._pool.submit(
+                _transcribe_shared,
+                request["shm"],
+                int(request["samples"]),
+                request.get("model_size") or self.model_size,
+                request.get("language")
+            )
+            return {"ok": True, "result": future.result()}
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+# Client
+
+class TranscriptionClient:
+    """Thin client used by app processes instead of loading Whisper themselves"""
+
+    def __init__(self, address: Optional[Union[str, Address]] = None, authkey: Optional[str] = None):
+        """
+        Initialize client
+
+        Args:
+            address: Server address ("host:port", socket path or tuple); defaults to the configured server
+            authkey: Shared secret (defaults to the configured one)
+        """
+        address = address or TRANSCRIPTION_SERVER
+        if not address:
+            raise ValueError("No transcription server configured (set INTERVIEW_ANALYZER_TRANSCRIPTION_SERVER)")
+        self.address = parse_address(address) if isinstance(address, str) else address
+        self._authkey = _authkey(authkey)
+
+    def ping(self) -> Dict:
+        """Check that the server is reachable"""
+        return self._call({"op": "ping"})
+
+    def transcribe_array(self, audio: np.ndarray, model_size: str = "base", language: Optional[str] = None) -> Dict:
+        """
+        Transcribe decoded audio
+
+        Args:
+            audio: Mono samples at 16 kHz
+            model_size: Whisper model size
+            language: Optional language code
+
+        Returns:
+            Dictionary with text, segments and language
+        """
+        audio = np.asarray(audio, dtype=np.float32).ravel()
+        with _SharedAudio(len(audio)) as shared:
+            shared.samples[:] = audio
+            return self._transcribe(shared, model_size, language)
+
+    def transcribe_file(self, audio_path: str, model_size: str = "base", language: Optional[str] = None) -> Dict:
+        """
+        Decode an audio file chunk by chunk straight into shared memory and transcribe it
+
+        The block is sized from ffprobe's duration when available and doubled if the
+        decoded stream turns out longer.
+        """
+        with _SharedAudio(estimate_samples(audio_path) or 60 * SAMPLE_RATE) as shared:
+            filled = 0
+            for pcm in decode_pcm_chunks(audio_path):
+                end = filled + len(pcm)
+                if end > shared.length:
+                    shared.resize(max(end, 2 * shared.length), keep=filled)
+                np.multiply(pcm, 1 / 32768.0, out=shared.samples[filled:end], casting="unsafe")
+                filled = end
+            return self._transcribe(shared, model_size, language, samples=filled)
+
+    def _transcribe(
+        self,
+        shared: "_SharedAudio",
+        model_size: str,
+        language: Optional[str],
+        samples: Optional[int] = None
+    ) -> Dict:
+        return self._call({
+            "op": "transcribe",
+            "shm": shared.name,
+            "samples": shared.length if samples is None else samples,
+            "model_size": model_size,
+            "language": language,
+        })["result"]
+
+    def _call(self, request: Dict) -> Dict:
+        with Client(self.address, authkey=self._authkey) as conn:
+            conn.send(request)
+            response = conn.recv()
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "Transcription server error"))
+        return response
+
+class _SharedAudio:
+    """Client-owned shared memory block holding float32 samples for one request"""
+
+    def __init__(self, length: int):
+        self._allocate(length)
+
+    def _allocate(self, length: int):
+        shm = shared_memory.SharedMemory(create=True, size=max(length, 1) * 4)
+        self._shm, self.name, self.length = shm, shm.name, length
+        self.samples = np.ndarray((length,), dtype=np.float32, buffer=self._shm.buf)
+
+    def _release(self):
+        del self.samples
+        self._shm.close()
+        self._shm.unlink()
+
+    def resize(self, length: int, keep: int):
+        """Move the first `keep` samples into a new block of `length` samples"""
+        old_shm, old_samples = self._shm, self.samples
+        self._allocate(length)
+        self.samples[:keep] = old_samples[:keep]
+        del old_samples
+        old_shm.close()
+        old_shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._release()
+        return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Interview Analyzer transcription server")
+    parser.add_argument("--address", default=TRANSCRIPTION_SERVER or "127.0.0.1:8765",
+                        help='"host:port" (":port" binds to localhost) or a Unix socket path')
+    parser.add_argument("--workers", type=int, default=TRANSCRIPTION_WORKERS, help="Worker processes")
+    parser.add_argument("--model-size", default="base", help="Whisper model preloaded in every worker")
+    args = parser.parse_args()
+
+    try:
+        server = TranscriptionServer(parse_address(args.address), args.workers, args.model_size)
+    except ValueError as e:
+        parser.error(str(e))
+    server.start()
+    print(f"🎧 Transcription server listening on {server.address} "
+          f"({args.workers} worker(s), whisper-{args.model_size})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    main()
@@ -138,6 +138,1469 @@ def test_sentiment_analyzer():
         print(f"❌ Sentiment analyzer test failed: {e}")
         return False
 
+def test_report_model():
+    """Test compact report model round-trip and memory footprint"""
+    print("\nTesting report model...")
+    
+    from interview_analyzer.models import InterviewReport, TranscriptStore, deep_sizeof
+    
+    transcript = "Interviewer: Tell me about yourself.\nCandidate: Sure, I build data pipelines.\n" * 2000
+    participant = {
+        "name": "Candidate",
+        "sentiment": "Positive",
+        "tone": "Confident",
+        "confidence_score": 0.8,
+        "clarity_score": 0.7,
+        "empathy_score": 0.6,
+        "engagement_score": 0.9,
+        "key_points": ["pipelines"],
+        "strengths": ["clear"],
+        "improvements": ["pace"],
+        "filler_words_count": 3,
+        "speaking_pace": "Moderate",
+        "communication_quality": "Good",
+    }
+    report_data = {
+        "timestamp": "2024-01-01 10:00:00",
+        "overall_summary": "Summary",
+        "participants": {f"speaker_{i}": dict(participant) for i in range(10)},
+        "sentiment_trend": [],
+        "topics": ["data"],
+        "keywords": ["python"],
+        "assessment": {"recommendation": "Hire"},
+        "detailed_feedback": {},
+        "raw_transcript": transcript,
+    }
+    
+    store = TranscriptStore()
+    report = InterviewReport.from_dict(dict(report_data), store=store)
+    assert store.get(report.transcript_id) == transcript
+    
+    restored = report.to_dict(include_transcript=False)
+    restored["raw_transcript"] = store.get(restored.pop("transcript_id"))
+    assert restored == report_data
+    
+    # A session used to hold the analysis, the report and its own transcript copy
+    legacy = [dict(report_data, raw_transcript="".join(transcript)) for _ in range(3)]
+    compact = [report, store.get(report.transcript_id)]
+    legacy_size, compact_size = deep_sizeof(legacy), deep_sizeof(compact)
+    assert compact_size < legacy_size
+    
+    # Reports read from their own store and give their reference back when dropped
+    from interview_analyzer.models import transcript_store
+    assert report.raw_transcript == transcript and report.transcript_id not in transcript_store
+    replacement = InterviewReport.from_dict(dict(report_data), store=store)
+    report.release()
+    report.release()
+    assert store.get(replacement.transcript_id) == transcript
+    del report, replacement, compact
+    import gc
+    gc.collect()
+    assert len(store) == 0
+    print(f"✅ Report model round-trip works ({legacy_size} -> {compact_size} bytes per session)")
+    return True
+
+def test_disk_quota():
+    """Test least-recently-used cleanup of the output directories"""
+    print("\nTesting disk quota...")
+    
+    import tempfile
+    from interview_analyzer.storage import disk_usage, enforce_disk_quota
+    
+    with tempfile.TemporaryDirectory() as outputs, tempfile.TemporaryDirectory() as uploads:
+        paths = []
+        for i, directory in enumerate([outputs, uploads, outputs]):
+            path = os.path.join(directory, f"file_{i}.bin")
+            with open(path, "wb") as f:
+                f.write(b"x" * 1000)
+            os.utime(path, (1000 + i, 1000 + i))
+            paths.append(path)
+        
+        removed = enforce_disk_quota([outputs, uploads], quota_bytes=2000)
+        assert removed == [paths[0]]
+        assert os.path.exists(paths[1]) and os.path.exists(paths[2])
+        
+        # Only evictable files outside keep are removed, even if that leaves the quota exceeded
+        removed = enforce_disk_quota([outputs, uploads], 0, evictable=lambda p: p.startswith(outputs), keep=[paths[2]])
+        assert removed == [] and os.path.exists(paths[1])
+        assert disk_usage([outputs, uploads]) == 2000
+    
+    # Uploads of queued and running jobs are pinned; finished jobs no longer need theirs
+    from interview_analyzer.jobs import JobStore, QUEUED, RUNNING, DONE
+    store = JobStore(":memory:")
+    queued = store.create("transcription", {"audio_path": "queued.wav"})
+    running = store.create("transcription", {"audio_path": "running.wav"})
+    finished = store.create("transcription", {"audio_path": "finished.wav"})
+    store.create("analysis", {"transcript": "No upload"})
+    store.update(running, status=RUNNING)
+    store.update(finished, status=DONE)
+    assert sorted(store.param_values("audio_path", QUEUED, RUNNING)) == ["queued.wav", "running.wav"]
+    
+    # Concurrent renders of one report each use their own temp file, and writing PDFs
+    # only evicts cached PDFs, never the one just written or uploads waiting for jobs
+    import threading
+    from interview_analyzer import pdf_generator
+    report = {"overall_summary": "Summary", "participants": {}, "sentiment_trend": []}
+    with tempfile.TemporaryDirectory() as outputs, tempfile.TemporaryDirectory() as uploads:
+        upload_dir, pdf_generator.UPLOAD_DIR = pdf_generator.UPLOAD_DIR, uploads
+        try:
+            upload = os.path.join(uploads, "queued.wav")
+            with open(upload, "wb") as f:
+                f.write(b"x" * 1000)
+            os.utime(upload, (1000, 1000))
+            generator = pdf_generator.PDFGenerator(outputs, include_charts=False, disk_quota_mb=0)
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(generator.render_pdf(report))) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert len(results) == 4 and all(pdf.startswith(b"%PDF") for pdf in results)
+            assert [name for name in os.listdir(outputs) if name.endswith(".tmp")] == []
+            first = generator.generate_pdf(report)
+            second = generator.generate_pdf(dict(report, overall_summary="Other"))
+            assert not os.path.exists(first) and os.path.exists(second) and os.path.exists(upload)
+        finally:
+            pdf_generator.UPLOAD_DIR = upload_dir
+    
+    print("✅ Disk quota removes least recently used files first")
+    return True
+
+def test_batch_pdf():
+    """Test parallel batch export and merged cohort reports"""
+    print("\nTesting batch PDF export...")
+    
+    import tempfile
+    import zipfile
+    from interview_analyzer.batch_pdf import BatchPDFGenerator
+    
+    def report(name, score):
+        return {
+            "timestamp": "2024-01-01 10:00:00",
+            "overall_summary": f"Interview with {name}",
+            "participants": {"speaker_1": {"name": name, "confidence_score": score, "key_points": ["pipelines"]}},
+            "sentiment_trend": [],
+            "topics": ["data"],
+            "keywords": ["python"],
+            "assessment": {"recommendation": "Hire"},
+            "detailed_feedback": {},
+            "raw_transcript": f"{name}: I build data pipelines.",
+        }
+    
+    # "Jane Doe" and "Jane/Doe" map to the same safe file name
+    reports = [("Jane Doe", report("Jane", 0.8)), ("Jane/Doe", report("Jane", 0.4)), ("Raj", report("Raj", 0.6))]
+    with tempfile.TemporaryDirectory() as tmp:
+        zip_path = os.path.join(tmp, "batch.zip")
+        batch = BatchPDFGenerator(tmp, max_workers=2).generate_batch(reports, zip_path=zip_path)
+        assert batch["failed"] == 0 and batch["workers"] == 2
+        paths = sorted(os.path.basename(r["path"]) for r in batch["results"])
+        assert paths == ["Jane_Doe.pdf", "Jane_Doe_2.pdf", "Raj.pdf"], paths
+        # Neither Jane overwrote the other
+        contents = {}
+        for result in batch["results"]:
+            with open(result["path"], "rb") as f:
+                contents[result["name"]] = f.read()
+        assert contents["Jane/Doe"] != contents["Jane Doe"]
+        with zipfile.ZipFile(zip_path) as archive:
+            assert sorted(archive.namelist()) == paths
+            assert all(archive.read(name).startswith(b"%PDF") for name in paths)
+        
+        cohort = BatchPDFGenerator(tmp).generate_cohort_pdf(reports, write_file=False)
+        assert cohort.startswith(b"%PDF") and len(cohort) > max(r["size_bytes"] for r in batch["results"])
+        # Names are text, not paragraph markup, in the contents and the section heading
+        import base64
+        import re
+        import zlib
+        marked_up = BatchPDFGenerator(tmp).generate_cohort_pdf([("R&D <Lead>", report("Kim", 0.7))], write_file=False)
+        streams = re.findall(rb"/ASCII85Decode /FlateDecode \] /Length \d+\s*>>\s*stream\r?\n(.*?)~>", marked_up, re.S)
+        content = b"".join(zlib.decompress(base64.a85decode(stream.replace(b"\n", b""))) for stream in streams)
+        assert b"".join(re.findall(rb"\((.*?)\) Tj", content)).count(b"R&D <Lead>") == 2
+    
+    print(f"✅ {len(paths)} reports exported with distinct file names, plus a cohort PDF")
+    return True
+
+def test_pdf_charts():
+    """Test report charts drawn as native ReportLab graphics in PDFs"""
+    print("\nTesting PDF charts...")
+    
+    from reportlab.graphics import renderPDF
+    from reportlab.graphics.shapes import Drawing
+    from interview_analyzer.pdf_charts import sentiment_trend_drawing, participant_comparison_drawing, radar_drawing
+    from interview_analyzer.pdf_generator import PDFGenerator
+    
+    participants = {
+        "speaker_1": {"name": "Ann", "confidence_score": 0.9, "clarity_score": 0.7, "empathy_score": 0.5, "engagement_score": 0.6},
+        "speaker_2": {"name": "Raj", "confidence_score": 0.4, "clarity_score": 0.8, "empathy_score": 0.6, "engagement_score": 0.3},
+    }
+    trend = [{"segment": "Opening", "sentiment": "Positive"}, {"segment": "Middle", "sentiment": "Negative"}]
+    
+    def chart(drawing):
+        return next(item for item in drawing.contents if hasattr(item, "data"))
+    
+    assert chart(sentiment_trend_drawing(trend)).data == [[1, -1]]
+    assert chart(sentiment_trend_drawing(trend)).categoryAxis.categoryNames == ["Opening", "Middle"]
+    assert chart(participant_comparison_drawing(participants)).data == [[0.9, 0.4], [0.7, 0.8], [0.5, 0.6]]
+    assert chart(radar_drawing(participants["speaker_1"])).data[0] == [0.9, 0.7, 0.5, 0.6, 0.8]
+    # Without data a short placeholder is drawn instead of an empty chart
+    assert sentiment_trend_drawing([]).height < sentiment_trend_drawing(trend).height
+    assert renderPDF.drawToString(participant_comparison_drawing(participants)).startswith(b"%PDF")
+    
+    report = {"overall_summary": "Summary", "participants": participants, "sentiment_trend": trend}
+    with_charts = PDFGenerator(use_cache=False).build_story(report)
+    without = PDFGenerator(include_charts=False, use_cache=False).build_story(report)
+    drawings = [item for item in with_charts if isinstance(item, Drawing)]
+    assert len(drawings) == 2 and not any(isinstance(item, Drawing) for item in without)
+    assert PDFGenerator(use_cache=False).render_pdf(report).startswith(b"%PDF")
+    
+    print(f"✅ Sentiment, comparison and radar charts drawn natively ({len(with_charts) - len(without)} extra flowables)")
+    return True
+
+def test_instrumentation():
+    """Test stage timings, counters, per-stage memory and Prometheus export"""
+    print("\nTesting instrumentation...")
+    
+    import threading
+    import time
+    import tracemalloc
+    from interview_analyzer.instrumentation import Instrumentation
+    
+    disabled = Instrumentation(enabled=False)
+    with disabled.stage("idle") as stage:
+        stage.add("chars", 5)
+    disabled.count("hits")
+    assert disabled.snapshot() == {"stages": {}, "counters": []}
+    
+    was_tracing = tracemalloc.is_tracing()
+    metrics = Instrumentation(enabled=True, track_memory=True)
+    try:
+        with metrics.stage("llm.analyze") as stage:
+            time.sleep(0.02)
+            stage.add("prompt_chars", 120)
+        try:
+            with metrics.stage("llm.analyze"):
+                raise ValueError("quota")
+        except ValueError:
+            pass
+        metrics.timed("vader.polarity")(lambda: None)()
+        metrics.count("pdf_cache_hits")
+        metrics.count("pdf_cache_hits", 2)
+        metrics.count("governor_decisions", action="shrink")
+        
+        # The outer stage measures its own allocations; nested stages don't reset its peak
+        retained = bytearray(4 * 1024 * 1024)
+        with metrics.stage("outer"):
+            with metrics.stage("inner"):
+                block = bytearray(2 * 1024 * 1024)
+                del block
+            with metrics.stage("inner"):
+                pass
+        # Overlapping stages in other threads share the global peak, so it isn't reported
+        barrier = threading.Barrier(2)
+        def concurrent():
+            with metrics.stage("concurrent"):
+                barrier.wait()
+                block = bytearray(2 * 1024 * 1024)
+                barrier.wait()
+                del block
+        threads = [threading.Thread(target=concurrent) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        del retained
+        
+        stages = metrics.snapshot()["stages"]
+        llm = stages["llm.analyze"]
+        assert llm["calls"] == 2 and llm["failures"] == 1 and llm["prompt_chars"] == 120
+        assert llm["wall_seconds"] >= 0.02 and llm["max_wall_seconds"] >= 0.02
+        assert stages["vader.polarity"]["calls"] == 1
+        assert 2 * 1024 * 1024 <= stages["outer"]["peak_memory_bytes"] < 3 * 1024 * 1024
+        assert stages["inner"]["peak_memory_bytes"] == 0
+        assert stages["concurrent"]["calls"] == 2 and stages["concurrent"]["peak_memory_bytes"] == 0
+        
+        text = metrics.prometheus_text()
+        assert "# TYPE interview_analyzer_stage_calls_total counter" in text
+        assert 'interview_analyzer_stage_calls_total{stage="llm.analyze"} 2' in text
+        assert 'interview_analyzer_stage_failures_total{stage="llm.analyze"} 1' in text
+        assert 'interview_analyzer_stage_prompt_chars_total{stage="llm.analyze"} 120' in text
+        assert "interview_analyzer_pdf_cache_hits_total 3" in text
+        assert 'interview_analyzer_governor_decisions_total{action="shrink"} 1' in text
+        assert "interview_analyzer_stage_peak_memory_bytes" in text
+        
+        metrics.reset()
+        assert metrics.snapshot() == {"stages": {}, "counters": []}
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    print(f"✅ Stages, counters and Prometheus text recorded ({len(text.splitlines())} lines)")
+    return True
+
+def test_job_queue():
+    """Test enqueueing, claiming, completing, failing and purging background jobs"""
+    print("\nTesting job queue...")
+    
+    import threading
+    import time
+    from interview_analyzer.jobs import JobQueue, JobStore, QueueFullError, QUEUED, RUNNING, DONE, FAILED
+    
+    store = JobStore(":memory:")
+    job_id = store.create("analysis", {"transcript": "hi"})
+    assert store.get(job_id)["status"] == QUEUED and store.get(job_id)["params"] == {"transcript": "hi"}
+    
+    # Of many workers racing for one job, exactly one claims it
+    claims = []
+    barrier = threading.Barrier(8)
+    def claim():
+        barrier.wait()
+        claims.append(store.claim(job_id))
+    threads = [threading.Thread(target=claim) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    claimed = [job for job in claims if job is not None]
+    assert len(claimed) == 1 and claimed[0]["status"] == RUNNING and claimed[0]["started_at"]
+    assert store.claim(job_id) is None
+    
+    # Handlers run once per job even if a job is queued twice
+    runs = []
+    def handler(params, progress):
+        progress("Working", 50)
+        runs.append(params["n"])
+        if params["n"] < 0:
+            raise ValueError("negative input")
+        return {"double": params["n"] * 2}
+    job_queue = JobQueue(store, max_workers=2, max_pending=3, retention_days=0)
+    job_queue.register("double", handler)
+    # A failing done callback is logged with its traceback and leaves the job done
+    import logging
+    logged = []
+    class Capture(logging.Handler):
+        def emit(self, record):
+            logged.append(record)
+    capture = Capture()
+    logging.getLogger("interview_analyzer.jobs").addHandler(capture)
+    def broken_callback(job_id, kind, params, result):
+        raise KeyError("missing")
+    job_queue.add_done_callback(broken_callback)
+    ok, bad = job_queue.submit("double", {"n": 21}), job_queue.submit("double", {"n": -1})
+    job_queue._pending["analysis"].put((ok, 0))
+    job_queue.start()
+    deadline = time.time() + 5
+    while any(store.get(j)["status"] in (QUEUED, RUNNING) for j in (ok, bad)) and time.time() < deadline:
+        time.sleep(0.01)
+    job_queue.shutdown()
+    logging.getLogger("interview_analyzer.jobs").removeHandler(capture)
+    assert [(r.levelno, r.getMessage(), r.exc_info[0]) for r in logged] == [
+        (logging.ERROR, f"Done callback for job {ok} failed", KeyError)
+    ]
+    done, failed = store.get(ok), store.get(bad)
+    assert done["status"] == DONE and done["result"] == {"double": 42} and done["progress"] == 100
+    assert "Working" in done["stage_timings"] and done["finished_at"] >= done["started_at"]
+    assert failed["status"] == FAILED and failed["error"] == "negative input" and failed["result"] is None
+    assert sorted(runs) == [-1, 21]
+    
+    # Submissions beyond max_pending are refused while workers are stopped
+    for _ in range(3):
+        job_queue.submit("double", {"n": 1})
+    try:
+        job_queue.submit("double", {"n": 1})
+        assert False, "expected QueueFullError"
+    except QueueFullError:
+        pass
+    
+    # Finished jobs past the retention period are purged on startup; queued ones stay
+    store.update(ok, finished_at=time.time() - 8 * 86400)
+    purging = JobQueue(store, max_workers=1, retention_days=7)
+    purging.register("double", handler)
+    purging.start()
+    purging.shutdown()
+    assert store.get(ok) is None and store.get(bad) is not None
+    
+    # Starting up re-queues only jobs whose owner exited or stopped sending heartbeats;
+    # a job another live process is running stays with it
+    import os
+    import subprocess
+    import sys
+    from interview_analyzer.jobs import STALE_AFTER
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    store = JobStore(":memory:")
+    owners = {"live": (os.getppid(), time.time()), "exited": (exited.pid, time.time()),
+              "stale": (os.getppid(), time.time() - 2 * STALE_AFTER)}
+    jobs = {}
+    for name, (pid, heartbeat) in owners.items():
+        jobs[name] = store.create("double", {"n": 1})
+        store.claim(jobs[name])
+        store.update(jobs[name], owner_pid=pid, heartbeat_at=heartbeat)
+    assert store.heartbeat(os.getppid()) == 2
+    store.update(jobs["stale"], heartbeat_at=time.time() - 2 * STALE_AFTER)
+    resuming = JobQueue(store, max_workers=1, retention_days=0)
+    resuming.register("double", handler)
+    resuming.start()
+    deadline = time.time() + 5
+    while any(store.get(jobs[name])["status"] != DONE for name in ("exited", "stale")) and time.time() < deadline:
+        time.sleep(0.01)
+    resuming.shutdown()
+    assert store.get(jobs["exited"])["status"] == DONE and store.get(jobs["stale"])["status"] == DONE
+    assert store.get(jobs["live"])["status"] == RUNNING and store.get(jobs["live"])["owner_pid"] == os.getppid()
+    print("✅ Jobs are claimed once, completed, failed and purged; only orphaned jobs are resumed")
+    return True
+
+def test_stage_graph():
+    """Test that independent pipeline stages run concurrently"""
+    print("\nTesting pipeline stage graph...")
+    
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from interview_analyzer.pipeline import StageGraph
+    
+    def slow(value):
+        time.sleep(0.2)
+        return value
+    
+    graph = StageGraph()
+    graph.add("a", slow, args=(1,))
+    graph.add("b", slow, args=(2,))
+    graph.add("c", slow, args=(3,))
+    graph.add("total", lambda a, b, c: a + b + c, deps=("a", "b", "c"))
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results, timings = graph.run(pool)
+    elapsed = time.perf_counter() - start
+    
+    assert results["total"] == 6
+    assert set(timings) == {"a", "b", "c", "total"}
+    assert elapsed < 0.5
+    print(f"✅ Stage graph ran 3 x 0.2s stages in {elapsed:.2f}s")
+    return True
+
+def test_whisper_quantization():
+    """Test int8 quantization of linear layers and the one-time torch thread setting"""
+    print("\nTesting Whisper int8 quantization...")
+    
+    try:
+        import torch
+    except ImportError:
+        print("⚠️  torch not installed, skipping quantization test")
+        return True
+    from interview_analyzer import audio_processor
+    
+    class WhisperLinear(torch.nn.Linear):
+        """Stands in for Whisper's nn.Linear subclass, which quantize_dynamic skips"""
+    
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(16, 32), torch.nn.ReLU(), WhisperLinear(32, 4))
+    inputs = torch.randn(3, 16)
+    expected = model(inputs)
+    quantized = audio_processor.quantize_linear_layers(model)
+    outputs = quantized(inputs)
+    assert outputs.shape == (3, 4) and outputs.dtype == torch.float32
+    assert all("quantized" in type(layer).__module__ for layer in (quantized[0], quantized[2]))
+    assert torch.allclose(outputs, expected, atol=0.1)
+    
+    # torch threads are set by the first call only
+    threads = torch.get_num_threads()
+    configured = audio_processor._torch_threads_configured
+    audio_processor._torch_threads_configured = False
+    try:
+        audio_processor.configure_torch_threads(threads)
+        audio_processor.configure_torch_threads(threads + 1)
+        assert torch.get_num_threads() == threads
+    finally:
+        audio_processor._torch_threads_configured = configured
+    print(f"✅ Quantized {type(quantized[2]).__name__} layers keep output shape {tuple(outputs.shape)}")
+    return True
+
+def test_model_selection():
+    """Test latency-budget Whisper model selection and refinement"""
+    print("\nTesting Whisper model selection...")
+    
+    from interview_analyzer.model_selection import ModelSelector
+    
+    selector = ModelSelector(profile_path=None)
+    ten_minutes = 600
+    
+    generous = selector.choose(ten_minutes, budget_seconds=3600)
+    tight = selector.choose(ten_minutes, budget_seconds=60)
+    assert generous["model_size"] == "large"
+    assert tight["model_size"] in ("tiny", "base")
+    assert selector.choose(ten_minutes, budget_seconds=1)["within_budget"] is False
+    
+    # A busy queue pushes the choice towards smaller models
+    queued = selector.choose(ten_minutes, budget_seconds=600, queue_depth=4)
+    idle = selector.choose(ten_minutes, budget_seconds=600)
+    assert queued["predicted_seconds"] > idle["predicted_seconds"] or queued["model_size"] != idle["model_size"]
+    
+    # Faster-than-predicted runs make larger models fit
+    before = selector.choose(ten_minutes, budget_seconds=300)["model_size"]
+    for _ in range(10):
+        selector.record("medium", ten_minutes, actual_seconds=120, predicted_seconds=720)
+    after = selector.choose(ten_minutes, budget_seconds=300)["model_size"]
+    assert before != "medium" and after == "medium"
+    
+    # The shared selector is only read from disk when first used
+    import subprocess
+    probe = ("import interview_analyzer.pipeline, interview_analyzer.audio_processor\n"
+             "from interview_analyzer import model_selection\n"
+             "assert model_selection._model_selector is None")
+    assert subprocess.run([sys.executable, "-c", probe], capture_output=True).returncode == 0
+    
+    # Concurrent jobs on one shared processor each score their own prediction
+    import threading
+    import numpy as np
+    from interview_analyzer import model_selection
+    from interview_analyzer.audio_processor import AudioProcessor
+    
+    barrier = threading.Barrier(2)
+    class SharedModel:
+        def transcribe(self, audio, **options):
+            barrier.wait()
+            return {"text": "hi", "segments": [{"start": 0.0, "end": 1.0, "text": "hi"}], "language": "en"}
+    processor = AudioProcessor.__new__(AudioProcessor)
+    processor.model, processor.model_size, processor.precision, processor.int8 = SharedModel(), "base", "fp32", False
+    recorded = []
+    shared, model_selection._model_selector = model_selection._model_selector, ModelSelector(profile_path=None)
+    model_selection._model_selector.record = lambda *args: recorded.append(args[3])
+    try:
+        threads = [
+            threading.Thread(target=processor.transcribe_audio, args=(np.zeros(16000, dtype=np.float32),),
+                             kwargs={"predicted_seconds": predicted})
+            for predicted in (1.5, 30.0)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Screening windows are excerpts, so their times are not scored against the file's prediction
+        import tempfile
+        import wave
+        from interview_analyzer.screening import QuickScreener
+        barrier = threading.Barrier(1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "long.wav")
+            with wave.open(path, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(16000)
+                wav.writeframes(np.zeros(3 * 16000, dtype="<i2").tobytes())
+            plan = {"windows": [{"start": 0.0, "end": 1.0}, {"start": 2.0, "end": 3.0}]}
+            transcript, segments = QuickScreener().transcribe(path, processor, plan, diarize=False)
+        assert transcript == "hi hi" and [s["start"] for s in segments] == [0.0, 2.0]
+    finally:
+        model_selection._model_selector = shared
+    assert sorted(recorded) == [1.5, 30.0]
+    print(f"✅ Model selection: {before} -> {after} after calibration")
+    return True
+
+def test_pause_detection():
+    """Test streaming pause detection and alignment to speaker segments"""
+    print("\nTesting acoustic pause detection...")
+    
+    import numpy as np
+    from interview_analyzer.acoustic_analyzer import AcousticAnalyzer
+    
+    rate = 16000
+    def tone(seconds):
+        t = np.arange(int(seconds * rate)) / rate
+        return (0.3 * np.sin(2 * np.pi * 150 * t)).astype(np.float32)
+    def silence(seconds):
+        return np.zeros(int(seconds * rate), dtype=np.float32)
+    
+    # Lead-in, a hesitation inside A's turn, a long gap before B answers, trailing silence
+    audio = np.concatenate([silence(1), tone(2), silence(0.5), tone(1), silence(2.5), tone(3), silence(1)])
+    segments = [{"start": 1.0, "end": 4.5, "speaker": "A"}, {"start": 7.0, "end": 10.0, "speaker": "B"}]
+    
+    results = [
+        AcousticAnalyzer(block_seconds=block).analyze_array(audio, rate, segments)
+        for block in (0.37, 60.0)
+    ]
+    for result in results:
+        assert result["pause_count"] == 2
+        assert result["long_pause_count"] == 1
+        assert result["speakers"]["A"]["hesitation_count"] == 1
+        assert result["speakers"]["B"]["mean_response_gap_seconds"] > 2
+    assert results[0]["long_pauses"] == results[1]["long_pauses"]
+    print("✅ Pauses detected identically across block sizes")
+    return True
+
+def test_diarization():
+    """Test speaker labelling of segments from two synthetic voices"""
+    print("\nTesting speaker diarization...")
+    
+    import numpy as np
+    from interview_analyzer.diarization import SpeakerDiarizer, speaker_transcript
+    
+    rate = 16000
+    rng = np.random.default_rng(0)
+    def voice(f0, tilt, seconds):
+        t = np.arange(int(seconds * rate)) / rate
+        harmonics = sum(np.sin(2 * np.pi * f0 * k * t) / k ** tilt for k in range(1, 12))
+        return (0.2 * harmonics * np.sin(2 * np.pi * 3 * t) ** 2).astype(np.float32)
+    
+    voices = [(110, 1.0), (210, 2.0)]
+    order = [0, 1, 0, 1, 1, 0, 1, 0, 0, 1, 0, 1]
+    pieces, segments, start = [], [], 0.0
+    for i, who in enumerate(order):
+        seconds = rng.uniform(2, 5)
+        pieces += [voice(*voices[who], seconds), np.zeros(rate // 2, dtype=np.float32)]
+        segments.append({"start": start, "end": start + seconds, "text": f"line {i}"})
+        start += seconds + 0.5
+    
+    labelled = SpeakerDiarizer(block_seconds=7).diarize_array(np.concatenate(pieces), rate, segments)
+    labels = [segment["speaker"] for segment in labelled]
+    assert labels[0] == "Speaker 1"
+    assert len(set(labels)) == 2
+    assert all((a == b) == (order[i] == order[j]) for i, a in enumerate(labels) for j, b in enumerate(labels))
+    assert speaker_transcript(labelled).splitlines()[:2] == ["Speaker 1: line 0", "Speaker 2: line 1"]
+    print("✅ Segments labelled with two speakers")
+    return True
+
+def test_group_fanout():
+    """Test per-participant fan-out analysis of a large group discussion"""
+    print("\nTesting group discussion fan-out...")
+    
+    import threading
+    from interview_analyzer.ai_analyzer import StubAIAnalyzer, CONTEXT_TRANSCRIPT_CHARS
+    
+    names = [f"Participant {i}" for i in range(1, 11)]
+    transcript = "\n".join(
+        f"{name}: I think remote work {'helps' if i % 2 else 'hurts'} focus and collaboration."
+        for _ in range(3) for i, name in enumerate(names)
+    )
+    analyzer = StubAIAnalyzer(latency=0)
+    prompts = []
+    lock = threading.Lock()
+    overlapped = threading.Event()
+    active = [0, 0]  # in flight, most in flight at once
+    generate = analyzer.model.generate_content
+    def tracked(prompt):
+        prompts.append(prompt)
+        if "\nPARTICIPANT: " not in prompt:
+            return generate(prompt)
+        with lock:
+            active[0] += 1
+            active[1] = max(active)
+            if active[0] > 1:
+                overlapped.set()
+        # Hold each participant call until another one is in flight
+        overlapped.wait(5)
+        with lock:
+            active[0] -= 1
+        return generate(prompt)
+    analyzer.model.generate_content = tracked
+    
+    analysis = analyzer.analyze_conversation(transcript, domain="Group Discussion")
+    
+    assert [p["name"] for p in analysis["participants"].values()] == names
+    assert len(prompts) == len(names) + 1
+    assert all("Participant 2:" not in p for p in prompts if "PARTICIPANT: Participant 1\n" in p)
+    assert analysis["overall_summary"] and analysis["sentiment_trend"]
+    assert active[1] > 1, "participant calls did not overlap"
+    
+    # The context pass of a long discussion gets a condensed transcript covering all of it
+    long_transcript = "\n".join(
+        f"{name}: Turn {turn}. " + "Remote work changes how teams plan and review their work. " * 4
+        for turn in range(200) for name in names
+    )
+    prompts.clear()
+    overlapped.set()
+    long_analysis = analyzer.analyze_conversation(long_transcript, domain="Group Discussion")
+    context = next(p for p in prompts if "\nPARTICIPANT: " not in p)
+    assert len(long_transcript) > 40 * CONTEXT_TRANSCRIPT_CHARS
+    assert len(context) < CONTEXT_TRANSCRIPT_CHARS + 3000 and "turns omitted" in context
+    assert "Participant 1: Turn 0." in context and "Turn 199." in context
+    assert long_analysis["raw_transcript"] == long_transcript
+    
+    single = StubAIAnalyzer(latency=0).analyze_conversation(transcript, domain="Tech")
+    assert len(single["participants"]) == len(names)
+    print(f"✅ {len(names)} participants analyzed with up to {active[1]} calls in flight; "
+          f"context pass sent {len(context):,} of {len(long_transcript):,} chars")
+    return True
+
+def test_screening_windows():
+    """Test speech-density window selection for quick screening"""
+    print("\nTesting screening window selection...")
+    
+    import numpy as np
+    from interview_analyzer.screening import speech_density, choose_windows, sampling_confidence
+    
+    rate = 8000
+    # 20 minutes alternating between 50 s of silence and 50 s of tone
+    t = np.arange(50 * rate) / rate
+    tone = (0.3 * np.sin(2 * np.pi * 150 * t)).astype(np.float32)
+    audio = np.concatenate([np.zeros_like(tone), tone] * 12)
+    blocks = [audio[i:i + 7 * rate] for i in range(0, len(audio), 7 * rate)]
+    density = speech_density(blocks, rate, window_seconds=5)
+    assert len(density) == 240
+    assert density[:10].max() < 0.01 and density[10:20].min() > 0.99
+    
+    windows = choose_windows(density, 5, 1200, opening=60, closing=60, samples=4, sample_seconds=30)
+    assert windows[0] == (0.0, 60) and windows[-1] == (1140, 1200) and len(windows) == 6
+    for start, end in windows[1:-1]:
+        assert end - start == 30 and density[int(start // 5):int(end // 5)].min() > 0.99
+    assert choose_windows(density, 5, 1200, opening=600, closing=600) == [(0.0, 1200)]
+    
+    assert sampling_confidence([0.5, 0.5, 0.5], population=40) == 1.0
+    assert sampling_confidence([-0.9, 0.9, 0.0], population=40) < 0.5
+    assert sampling_confidence([-0.9, 0.9], population=2) == 1.0
+    print("✅ Opening, closing and densest span per stratum selected")
+    return True
+
+def test_live_transcription():
+    """Test rolling-window live transcription with overlap de-duplication"""
+    print("\nTesting live transcription...")
+    
+    import numpy as np
+    from interview_analyzer.live import LiveTranscriber
+    
+    rate = 16000
+    vocab = ["um", "we", "should", "ship", "the", "great", "design"]
+    rng = np.random.default_rng(1)
+    spoken = [vocab[i] for i in rng.integers(len(vocab), size=60)]
+    
+    # Each word is a 0.3 s tone whose pitch encodes it; pauses vary from short to long
+    pieces = []
+    for word in spoken:
+        t = np.arange(int(0.3 * rate)) / rate
+        pieces.append((0.3 * np.sin(2 * np.pi * (300 + 50 * vocab.index(word)) * t)).astype(np.float32))
+        pieces.append(np.zeros(int(rng.choice([0.15, 0.2, 1.0]) * rate), dtype=np.float32))
+    audio = np.concatenate(pieces)
+    
+    class ToneTranscriber:
+        """Reads tone-words back; words closer than 0.5 s form one segment"""
+        def transcribe_audio(self, samples, language=None, record=True):
+            assert not record, "live steps must not be recorded as whole jobs"
+            frames = samples[:len(samples) // 160 * 160].reshape(-1, 160)
+            voiced = np.concatenate(([0], ((frames ** 2).mean(axis=1) > 1e-4).astype(int), [0]))
+            segments = []
+            for start, end in zip(np.flatnonzero(np.diff(voiced) == 1), np.flatnonzero(np.diff(voiced) == -1)):
+                tone = samples[start * 160:end * 160]
+                pitch = np.argmax(np.abs(np.fft.rfft(tone))) * rate / len(tone)
+                index = int(round((pitch - 300) / 50))
+                word = vocab[index] if 0 <= index < len(vocab) else "?"
+                if segments and start / 100 - segments[-1]["end"] < 0.5:
+                    segments[-1]["end"], segments[-1]["text"] = end / 100, segments[-1]["text"] + " " + word
+                else:
+                    segments.append({"start": start / 100, "end": end / 100, "text": word})
+            return {"text": "", "segments": segments}
+    
+    transcriber = LiveTranscriber(ToneTranscriber(), window_seconds=6, step_seconds=1)
+    updates = list(transcriber.run(audio[i:i + rate // 2] for i in range(0, len(audio), rate // 2)))
+    words = [word for update in updates for word in update["text"].split()]
+    assert words == spoken, (len(words), len(spoken))
+    assert len(updates) > 5
+    final = updates[-1]["metrics"]
+    assert final["words"] == len(spoken) and final["filler_words_count"] == spoken.count("um")
+    assert max(update["latency_seconds"] for update in updates) < 3
+    print(f"✅ {len(spoken)} words transcribed once each across {len(updates)} updates")
+    return True
+
+def test_search_index():
+    """Test BM25 search with score filters over indexed reports"""
+    print("\nTesting report search...")
+    
+    from interview_analyzer.search import ReportIndex, fts_query
+    
+    def report(transcript, confidence, topics=()):
+        return {
+            "timestamp": "2025-01-01 10:00:00",
+            "overall_summary": transcript[:20],
+            "raw_transcript": transcript,
+            "topics": list(topics),
+            "participants": {"speaker_1": {"name": "Candidate", "confidence_score": confidence, "key_points": []}},
+        }
+    
+    index = ReportIndex(":memory:")
+    index.add("a", report("We discussed system design and caching at length.", 0.9))
+    index.add("b", report("Design of the system was rushed; testing mattered more.", 0.4))
+    index.add("c", report("Mostly about hiring and team culture.", 0.8, topics=["system design"]))
+    assert len(index) == 3
+    
+    # Phrases need adjacent words; topics outweigh transcript text
+    assert [r["key"] for r in index.search('"system design"')] == ["c", "a"]
+    assert {r["key"] for r in index.search("system design")} == {"a", "b", "c"}
+    assert "**" in index.search("caching")[0]["snippet"]
+    
+    # Filters apply to participant scores, with or without text
+    assert [r["key"] for r in index.search("design", {"confidence_score": (None, 0.5)})] == ["b"]
+    assert [r["key"] for r in index.search("", {"confidence_score": (0.75, None)})] == ["c", "a"]
+    
+    # Re-indexing a key replaces it
+    index.add("a", report("Only behavioural questions this time.", 0.2))
+    assert len(index) == 3 and [r["key"] for r in index.search("caching")] == []
+    
+    # Rank window falls back to the newest matches
+    assert [r["key"] for r in index.search("design", rank_window=1)] == ["c"]
+    
+    # Transcript text in snippets is escaped before matches are highlighted for display
+    index.add("d", report("[click](http://x.io)\n# **yes** $x$ :red[hi] latency", 0.5))
+    result = index.search("latency")[0]
+    assert result["key"] == "d" and "**latency**" in result["snippet"]
+    rendered = result["snippet_markdown"]
+    assert "**latency**" in rendered and "\\[click\\]\\(http\\:" in rendered and "\\*\\*yes\\*\\*" in rendered
+    assert "\\$x\\$" in rendered and "\\:red\\[hi\\]" in rendered and "\n" not in rendered
+    
+    assert fts_query('AND "a-b" NEAR(') == '"AND" "a b" "NEAR"'
+    assert index.search('") OR *') == []
+    print("✅ Phrase ranking, score filters and re-indexing verified")
+    return True
+
+def test_near_duplicates():
+    """Test MinHash/LSH near-duplicate lookup and diff-scoped re-analysis"""
+    print("\nTesting near-duplicate detection...")
+    
+    from interview_analyzer.ai_analyzer import StubAIAnalyzer
+    from interview_analyzer.dedup import NearDuplicateIndex, reanalyze
+    from interview_analyzer.report_generator import ReportGenerator
+    
+    def interview(topic, answers):
+        return "\n".join(
+            f"Interviewer: Tell me about the {topic} project number {i}.\n"
+            f"Candidate: For {topic} number {i} I {answer} and measured the results carefully."
+            for i, answer in enumerate(answers)
+        )
+    
+    answers = ["split the service", "added caching", "rewrote the scheduler", "paired with QA",
+               "wrote the runbook", "led the rollout", "cut the cloud bill", "mentored two juniors"]
+    original = interview("payments", answers)
+    reformatted = original.replace("carefully.", "carefully!").replace("Candidate:", "Candidate :")
+    edited = original.replace("added caching", "added a read-through cache")
+    
+    index = NearDuplicateIndex(":memory:")
+    index.add("original", original)
+    index.add("other", interview("onboarding", reversed(answers)))
+    assert [m["key"] for m in index.find(reformatted)] == ["original"]
+    assert index.find(reformatted)[0]["similarity"] == 1.0
+    assert [m["key"] for m in index.find(edited)] == ["original"]
+    assert index.find(interview("search", ["tuned the ranking"] * 8)) == []
+    
+    # Only analyses of the same owner match
+    index.add("alice", original, owner="alice")
+    assert [m["key"] for m in index.find(original, owner="alice")] == ["alice"]
+    assert [m["key"] for m in index.find(original, owner="bob")] == []
+    
+    # Indexes created before owners existed gain the column
+    import sqlite3
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dedup.db")
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE signatures (key TEXT PRIMARY KEY, signature BLOB NOT NULL, added_at REAL)")
+        conn.close()
+        upgraded = NearDuplicateIndex(path)
+        upgraded.add("original", original, owner="alice")
+        assert [m["key"] for m in upgraded.find(edited, owner="alice")] == ["original"]
+        upgraded._conn.close()
+    
+    analyzer = StubAIAnalyzer(latency=0)
+    prompts = []
+    generate = analyzer.model.generate_content
+    analyzer.model.generate_content = lambda prompt: prompts.append(prompt) or generate(prompt)
+    report = ReportGenerator().generate_report_data(analyzer.analyze_conversation(original))
+    previous = {"key": "original", "transcript": original, "report": report}
+    
+    # Formatting-only edits reuse the analysis without an LLM call
+    prompts.clear()
+    reused = reanalyze(previous, reformatted, analyzer)
+    assert prompts == [] and reused["reuse"]["llm"] == "skipped"
+    assert reused["participants"] == report["participants"] and reused["raw_transcript"] == reformatted
+    
+    # Real edits send only the changed sentence
+    revised = reanalyze(previous, edited, analyzer)
+    assert revised["reuse"] == {"from": "original", "changed_sentences": 1, "llm": "diff"}
+    assert len(prompts) == 1 and "read-through cache" in prompts[0] and "rewrote the scheduler" not in prompts[0]
+    assert revised["topics_discussed"] == report["topics"] and revised["raw_transcript"] == edited
+    
+    # A revision that is valid JSON but not an object keeps the earlier analysis
+    from types import SimpleNamespace
+    from interview_analyzer.instrumentation import metrics
+    enabled, track_memory = metrics.enabled, metrics.track_memory
+    metrics.configure(True)
+    metrics.reset()
+    try:
+        analyzer.model.generate_content = lambda prompt: SimpleNamespace(text="[1, 2]")
+        kept = analyzer.update_analysis(revised, [], edited)
+        assert kept == revised and "interview_analyzer_llm_fallback_parses_total 1" in metrics.prometheus_text()
+    finally:
+        metrics.reset()
+        metrics.configure(enabled, track_memory)
+    print("✅ Near duplicates matched and edits re-analyzed from the diff")
+    return True
+
+def test_facts_narrative():
+    """Test regenerating only the feedback from cached facts for a new tone"""
+    print("\nTesting tone changes from cached facts...")
+    
+    from interview_analyzer.ai_analyzer import StubAIAnalyzer
+    from interview_analyzer.facts import FactsCache, split_analysis, merge_analysis
+    
+    transcript = "\n".join(
+        f"Interviewer: Question {i} about the migration?\nCandidate: Um, we moved service {i} with zero downtime."
+        for i in range(200)
+    )
+    analyzer = StubAIAnalyzer(latency=0)
+    prompts = []
+    generate = analyzer.model.generate_content
+    analyzer.model.generate_content = lambda prompt: prompts.append(prompt) or generate(prompt)
+    
+    full = analyzer.analyze_conversation(transcript, feedback_tone="Professional")
+    facts, narrative = split_analysis(full)
+    assert "overall_assessment" not in facts and "raw_transcript" not in facts
+    assert "strengths" not in facts["participants"]["speaker_1"] and "key_points" in facts["participants"]["speaker_1"]
+    merged = merge_analysis(facts, narrative)
+    assert merged == {k: v for k, v in full.items() if k != "raw_transcript"}
+    
+    cache = FactsCache(":memory:", max_entries=2)
+    cache.put(transcript, facts)
+    assert cache.get(transcript) == facts and cache.get(transcript + " ") is None
+    
+    rewritten = analyzer.write_narrative(cache.get(transcript), transcript, feedback_tone="Encouraging")
+    assert "Provide warm, encouraging feedback" in prompts[-1] and "zero downtime" not in prompts[-1]
+    assert len(prompts[-1]) * 5 < len(prompts[0])
+    for speaker_id, data in full["participants"].items():
+        assert rewritten["participants"][speaker_id]["confidence_score"] == data["confidence_score"]
+        assert rewritten["participants"][speaker_id]["improvements"]
+    assert rewritten["topics_discussed"] == full["topics_discussed"]
+    assert rewritten["overall_assessment"] and rewritten["raw_transcript"] == transcript
+    
+    # Least recently used facts are evicted
+    cache.put("second", facts)
+    cache.get(transcript)
+    cache.put("third", facts)
+    assert len(cache) == 2 and cache.get("second") is None
+    
+    # The pipeline only reuses facts when the framing changed, and can be told not to
+    from interview_analyzer import pipeline
+    create, pipeline_cache = pipeline.create_ai_analyzer, pipeline._facts_cache
+    pipeline.create_ai_analyzer = lambda: StubAIAnalyzer(latency=0)
+    pipeline._facts_cache = FactsCache(":memory:")
+    try:
+        reuse = lambda **kwargs: pipeline.run_analysis(transcript, **kwargs).get("reuse")  # noqa: E731
+        assert reuse() is None and reuse() is None
+        assert reuse(feedback_tone="Critical") == {"llm": "narrative"}
+        assert reuse(feedback_tone="Critical") is None
+        assert reuse(domain="HR", use_cached_facts=False) is None
+        assert reuse(domain="Tech") == {"llm": "narrative"}
+    finally:
+        pipeline.create_ai_analyzer, pipeline._facts_cache = create, pipeline_cache
+    print(f"✅ Feedback rewritten from a {len(prompts[-1])}-char prompt instead of {len(prompts[0])}")
+    return True
+
+def test_job_pools():
+    """Test multi-step jobs moving between transcription and analysis pools"""
+    print("\nTesting job pools...")
+    
+    import threading
+    import time
+    from interview_analyzer.jobs import JobQueue, JobStore, DONE, RUNNING
+    
+    active = {"transcription": 0, "analysis": 0}
+    peak = dict(active)
+    lock = threading.Lock()
+    overlap = threading.Event()
+    
+    def step(pool, output):
+        def handler(params, progress):
+            with lock:
+                active[pool] += 1
+                peak[pool] = max(peak[pool], active[pool])
+                if all(active.values()):
+                    overlap.set()
+            progress(f"{pool} {params['name']}", 50)
+            # Every step after the first transcription holds its worker until an analysis
+            # and a transcription run at once, which only happens if the pools overlap
+            if pool == "analysis" or params["name"] != "file0":
+                overlap.wait(timeout=5)
+            with lock:
+                active[pool] -= 1
+            return output(params)
+        return handler
+    
+    job_queue = JobQueue(JobStore(":memory:"), max_workers=3, pools={"transcription": 1})
+    job_queue.register_steps("audio", [
+        ("transcription", step("transcription", lambda p: {"transcript": f"text of {p['name']}"})),
+        ("analysis", step("analysis", lambda p: {"summary": p["transcript"].upper()})),
+    ])
+    finished = []
+    job_queue.add_done_callback(lambda job_id, kind, params, result: finished.append(result["summary"]))
+    job_queue.start()
+    
+    start = time.perf_counter()
+    job_ids = [job_queue.submit("audio", {"name": f"file{i}"}) for i in range(5)]
+    while len(finished) < 5 and time.perf_counter() - start < 10:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    job_queue.shutdown()
+    
+    jobs = [job_queue.get(job_id) for job_id in job_ids]
+    assert all(job["status"] == DONE for job in jobs)
+    assert [job["result"]["summary"] for job in jobs] == [f"TEXT OF FILE{i}" for i in range(5)]
+    assert set(jobs[0]["stage_timings"]) == {"transcription file0", "analysis file0"}
+    assert peak["transcription"] == 1
+    # The first analysis ran alongside the next transcription
+    assert overlap.is_set()
+    
+    # A job interrupted during its analysis step resumes there after a restart,
+    # reusing the transcript instead of transcribing again
+    store = JobStore(":memory:")
+    job_id = store.create("audio", {"name": "file9"})
+    assert store.claim(job_id, 1) is None and store.claim(job_id)["status"] == RUNNING
+    store.update(job_id, step=1, params={"name": "file9", "transcript": "kept text"})
+    calls = []
+    restarted = JobQueue(store, max_workers=1, pools={"transcription": 1})
+    restarted.register_steps("audio", [
+        ("transcription", lambda params, progress: calls.append("transcription") or {"transcript": "new"}),
+        ("analysis", lambda params, progress: calls.append("analysis") or {"summary": params["transcript"]}),
+    ])
+    restarted.start()
+    deadline = time.time() + 5
+    while store.get(job_id)["status"] != DONE and time.time() < deadline:
+        time.sleep(0.01)
+    restarted.shutdown()
+    assert calls == ["analysis"] and store.get(job_id)["result"] == {"summary": "kept text"}
+    
+    # Whisper model selection sees the jobs waiting for the pool and the budget left after queueing
+    from interview_analyzer import audio_processor, pipeline
+    from interview_analyzer.jobs import current_job
+    selections = []
+    def select(audio_path, budget_seconds, queue_depth, workers, loaded):
+        selections.append((budget_seconds, queue_depth, workers))
+        return object(), {"model_size": "tiny"}
+    def transcribe(params, progress):
+        processor, selection = pipeline._get_audio_processor(params["audio_path"], 60)
+        pipeline._release_audio_processor(selection["model_size"])
+        return {"transcript": "text"}
+    select_audio_processor, loaded = audio_processor.select_audio_processor, dict(pipeline._audio_processors)
+    audio_processor.select_audio_processor = select
+    try:
+        store = JobStore(":memory:")
+        waiting = JobQueue(store, max_workers=1, pools={"transcription": 1})
+        waiting.register("transcribe", transcribe, pool="transcription")
+        job_ids = [waiting.submit("transcribe", {"audio_path": f"file{i}.wav"}) for i in range(3)]
+        store.update(job_ids[0], created_at=time.time() - 30)
+        waiting.start()
+        deadline = time.time() + 5
+        while any(store.get(j)["status"] != DONE for j in job_ids) and time.time() < deadline:
+            time.sleep(0.01)
+        waiting.shutdown()
+    finally:
+        audio_processor.select_audio_processor = select_audio_processor
+        pipeline._audio_processors.clear()
+        pipeline._audio_processors.update(loaded)
+    budget, queue_depth, workers = selections[0]
+    assert 29 < budget <= 30 and queue_depth == 2 and workers == 1
+    assert [depth for _, depth, _ in selections] == [2, 1, 0] and current_job() is None
+    print(f"✅ 5 two-step jobs pipelined across pools in {elapsed * 1000:.0f} ms")
+    return True
+
+def test_resource_governor():
+    """Test cgroup detection, pool sizing and adjustment to queue depth and memory pressure"""
+    print("\nTesting resource governor...")
+    
+    import os
+    import tempfile
+    import threading
+    import time
+    from interview_analyzer.jobs import JobQueue, JobStore
+    from interview_analyzer.resources import ResourceGovernor, size_plan, _IDLE_TICKS
+    
+    def write(root, path, text):
+        os.makedirs(os.path.dirname(os.path.join(root, path)), exist_ok=True)
+        with open(os.path.join(root, path), "w") as f:
+            f.write(text)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # cgroup v2 container: 1.5 CPUs and 2 GiB on a 64 GiB host
+        proc, cgroup = os.path.join(tmp, "proc"), os.path.join(tmp, "cgroup")
+        write(proc, "meminfo", "MemTotal:       67108864 kB\nMemAvailable:   60000000 kB\n")
+        write(proc, "self/cgroup", "0::/app\n")
+        write(cgroup, "app/cpu.max", "150000 100000\n")
+        write(cgroup, "app/memory.max", f"{2 * 2 ** 30}\n")
+        write(cgroup, "app/memory.current", f"{2 ** 30}\n")
+        write(cgroup, "app/memory.stat", f"anon 900000000\ninactive_file {2 ** 29}\n")
+        governor = ResourceGovernor(cgroup, proc, enabled=True, interval=60)
+        host = governor.detect()
+        assert host["cpus"] == min(1.5, len(os.sched_getaffinity(0)))
+        assert host["memory_bytes"] == 2 * 2 ** 30 and host["memory_source"] == "cgroup"
+        pressure = governor.memory_pressure()
+        assert pressure["used_bytes"] == 2 ** 29 and pressure["fraction"] == 0.25
+        
+        # cgroup v1 without a memory limit falls back to the host
+        proc1, cgroup1 = os.path.join(tmp, "proc1"), os.path.join(tmp, "cgroup1")
+        write(proc1, "meminfo", "MemTotal:       8388608 kB\nMemAvailable:   6291456 kB\n")
+        write(proc1, "self/cgroup", "4:memory:/\n3:cpu,cpuacct:/\n")
+        write(cgroup1, "cpu,cpuacct/cpu.cfs_quota_us", "-1\n")
+        write(cgroup1, "cpu,cpuacct/cpu.cfs_period_us", "100000\n")
+        write(cgroup1, "memory/memory.limit_in_bytes", "9223372036854771712\n")
+        host = ResourceGovernor(cgroup1, proc1).detect()
+        assert host["memory_bytes"] == 8 * 2 ** 30 and host["memory_source"] == "meminfo"
+        assert host["cpu_source"] != "cgroup"
+        
+        # CPU-bound pools follow cores; analyses may outgrow them
+        small, large = size_plan(1.5, 2 * 2 ** 30), size_plan(32, 128 * 2 ** 30)
+        assert small["whisper_threads"] == 1 and small["render_processes"] == 1
+        assert large["whisper_threads"] == 31 and large["render_processes"] == 32
+        assert small["analysis_max"] == 4 and large["analysis_max"] == 32
+        
+        # Waiting jobs grow the analysis pool
+        release = threading.Event()
+        job_queue = JobQueue(JobStore(":memory:"), max_workers=1)
+        job_queue.register("slow", lambda params, progress: release.wait(5) and {})
+        job_queue.start()
+        governor.attach(job_queue)
+        for i in range(4):
+            job_queue.submit("slow", {})
+        time.sleep(0.2)
+        decisions = governor.tick()
+        assert decisions[0]["action"] == "resize" and decisions[0]["after"] == 4, decisions
+        time.sleep(0.2)
+        assert job_queue.pending_in("analysis") == 0
+        
+        # Memory pressure halves the pool and empties registered caches
+        evicted = []
+        governor.add_cache("models", lambda budget: evicted.append(budget) or 300)
+        write(cgroup, "app/memory.stat", "anon 1900000000\ninactive_file 0\n")
+        write(cgroup, "app/memory.current", "1900000000\n")
+        decisions = governor.tick()
+        assert [d["action"] for d in decisions] == ["resize", "evict"], decisions
+        assert job_queue.pool_sizes["analysis"] == 2 and evicted == [0]
+        release.set()
+        deadline = time.perf_counter() + 3
+        while len(job_queue._workers["analysis"]) > 2 and time.perf_counter() < deadline:
+            time.sleep(0.05)
+        assert len(job_queue._workers["analysis"]) == 2
+        job_queue.shutdown()
+        snapshot = governor.snapshot()
+        assert len(snapshot["decisions"]) == 3 and snapshot["plan"]["analysis_max"] == 4
+        
+        # Each pool of each attached queue is sized on its own, with its own idle count
+        class FakeQueue:
+            def __init__(self, sizes, pending):
+                self.pool_sizes, self.pending = dict(sizes), pending
+            def pending_in(self, pool):
+                return self.pending.get(pool, 0)
+            def resize(self, pool, size):
+                self.pool_sizes[pool] = size
+        write(cgroup, "app/memory.stat", "anon 500000000\ninactive_file 0\n")
+        write(cgroup, "app/memory.current", "500000000\n")
+        pools = ResourceGovernor(cgroup, proc, enabled=True, interval=60)
+        pools._plan = {**pools.plan, "analysis_workers": 2, "analysis_min": 2, "analysis_max": 8,
+                       "transcription_workers": 4, "render_processes": 4}
+        busy = FakeQueue({"analysis": 2, "transcription": 4, "other": 3}, {"analysis": 3, "transcription": 2})
+        idle = FakeQueue({"analysis": 5}, {})
+        pools.attach(busy)
+        pools.attach(idle)
+        for _ in range(_IDLE_TICKS):
+            pools.tick()
+        assert busy.pool_sizes == {"analysis": 8, "transcription": 4, "other": 3}
+        assert idle.pool_sizes == {"analysis": 4}
+        assert pools.pool_size("render_processes") == 4
+        
+        # Memory pressure halves transcription pools too, and pools created now
+        write(cgroup, "app/memory.stat", "anon 1900000000\ninactive_file 0\n")
+        write(cgroup, "app/memory.current", "1900000000\n")
+        pools.detach(idle)
+        pools.tick()
+        assert busy.pool_sizes == {"analysis": 4, "transcription": 2, "other": 3}
+        assert idle.pool_sizes == {"analysis": 4} and pools.pool_size("render_processes") == 2
+    
+    # Models a job is transcribing with survive eviction
+    from interview_analyzer import pipeline
+    loaded, in_use = dict(pipeline._audio_processors), dict(pipeline._audio_processors_in_use)
+    pipeline._audio_processors.update({"base": object(), "small": object()})
+    pipeline._audio_processors_in_use["small"] = 1
+    try:
+        assert pipeline._trim_audio_processors(0) > 0
+        assert "small" in pipeline._audio_processors and "base" not in pipeline._audio_processors
+        pipeline._release_audio_processor("small")
+        assert "small" not in pipeline._audio_processors_in_use
+    finally:
+        pipeline._audio_processors.clear()
+        pipeline._audio_processors.update(loaded)
+        pipeline._audio_processors_in_use.clear()
+        pipeline._audio_processors_in_use.update(in_use)
+    
+    # Importing the pipeline and app-facing modules leaves host detection for first use
+    import subprocess
+    probe = ("import interview_analyzer.pipeline, interview_analyzer.server, interview_analyzer.batch_pdf\n"
+             "from interview_analyzer.resources import governor\n"
+             "assert governor._plan is None")
+    assert subprocess.run([sys.executable, "-c", probe], capture_output=True).returncode == 0
+    
+    print(f"✅ Governor sized pools to a 1.5-CPU cgroup and resized them: "
+          + "; ".join(f"{d['action']} ({d['reason']})" for d in snapshot["decisions"]))
+    return True
+
+def test_http_service():
+    """Test HTTP routing, body size limits and error responses on an ephemeral port"""
+    print("\nTesting HTTP analysis service...")
+    
+    import asyncio
+    import http.client
+    import json
+    import socket
+    import threading
+    import time
+    from interview_analyzer import server
+    
+    def fake_analysis(transcript, progress=None, **kwargs):
+        progress("Analyzing", 50)
+        return {"words": len(transcript.split()), "domain": kwargs["domain"]}
+    
+    run_analysis, server.run_analysis = server.run_analysis, fake_analysis
+    loop = asyncio.new_event_loop()
+    service = server.AnalysisService(workers=1, queue_size=2, max_body_mb=20)
+    listener = loop.run_until_complete(service.start("127.0.0.1", 0))
+    port = listener.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    
+    def request(method, path, body=None):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        try:
+            conn.request(method, path, body=body)
+            response = conn.getresponse()
+            return response.status, response.read().decode("utf-8")
+        finally:
+            conn.close()
+    
+    try:
+        status, body = request("GET", "/health")
+        assert status == 200 and json.loads(body)["status"] == "ok"
+        assert request("GET", "/nowhere")[0] == 404
+        assert request("POST", "/health", body=b"ignored")[0] == 405
+        assert request("GET", "/analyze/transcript")[0] == 405
+        assert request("POST", "/analyze/transcript", body=b"not json")[0] == 400
+        assert request("POST", "/analyze/transcript", body=b'{"domain": "HR"}')[0] == 400
+        assert request("POST", "/analyze/audio?filename=a.exe", body=b"RIFF")[0] == 415
+        
+        # Oversized bodies are refused from their Content-Length before any of the body is sent
+        for path, limit in (("/analyze/transcript", server.MAX_JSON_BYTES), ("/analyze/audio", 20 * 1024 * 1024)):
+            with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+                sock.sendall(f"POST {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {limit + 1}\r\n\r\n".encode())
+                reply = sock.recv(4096).decode("latin-1")
+            assert reply.startswith("HTTP/1.1 413") and "Connection: close" in reply, reply
+        
+        status, body = request("POST", "/analyze/transcript",
+                               body=json.dumps({"transcript": "a b c", "domain": "HR"}).encode())
+        events = [json.loads(line) for line in body.splitlines()]
+        assert status == 200 and [e["event"] for e in events] == ["queued", "progress", "result"]
+        assert events[-1]["report"] == {"words": 3, "domain": "HR"}
+        
+        # The governor resizes the worker tasks and the transcription pool from its own thread
+        def settled(check):
+            deadline = time.time() + 5
+            while not check() and time.time() < deadline:
+                time.sleep(0.01)
+            return check()
+        assert service in server.governor._queues
+        service.resize("analysis", 3)
+        assert settled(lambda: len(service._worker_tasks) == 3 and len(service._idle_workers) == 3)
+        service.resize("analysis", 1)
+        assert settled(lambda: len(service._worker_tasks) == 1 and len(service._idle_workers) == 1)
+        previous = service._transcription_pool
+        service.resize("transcription", 2)
+        assert settled(lambda: service._transcription_pool is not previous)
+        assert service._transcription_pool._max_workers == 2 and json.loads(request("GET", "/health")[1])["workers"] == 1
+        status, body = request("POST", "/analyze/transcript", body=json.dumps({"transcript": "a b"}).encode())
+        assert status == 200 and json.loads(body.splitlines()[-1])["report"]["words"] == 2
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        listener.close()
+        loop.run_until_complete(listener.wait_closed())
+        loop.run_until_complete(service.stop())
+        loop.close()
+        server.run_analysis = run_analysis
+    assert service not in server.governor._queues
+    print("✅ Routes, size limits and errors answered over HTTP")
+    return True
+
+def test_cold_start_imports():
+    """Test that text mode and app.py's own imports leave heavy modules unloaded"""
+    print("\nTesting cold-start imports...")
+    
+    import json
+    import subprocess
+    import tempfile
+    
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "import_time.py")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results_path = os.path.join(tmp_dir, "results.json")
+        # Only the heavy-module checks are asserted; timings vary too much between machines
+        completed = subprocess.run(
+            [sys.executable, script, "--runs", "1", "--max-import-ms", "1e9", "--max-rss-mb", "1e9",
+             "--json", results_path],
+            capture_output=True, text=True, timeout=300
+        )
+        assert completed.returncode == 0, completed.stdout[-2000:] + completed.stderr[-2000:]
+        with open(results_path) as f:
+            results = json.load(f)
+    assert "interview_analyzer.pipeline" in results["app_modules"] and "streamlit" not in results["app_modules"]
+    assert results["heavy_modules_loaded"] == [] and results["app_heavy_modules_loaded"] == []
+    print(f"✅ {len(results['app_modules'])} app imports loaded in {results['import_ms']} ms without heavy modules")
+    return True
+
+def test_app_workspace():
+    """Test that app sessions keep their workspace ID in the URL across refreshes"""
+    print("\nTesting app workspace identity...")
+    
+    import subprocess
+    import tempfile
+    try:
+        import streamlit  # noqa: F401
+    except ImportError:
+        print("⚠️  streamlit not installed, skipping app workspace test")
+        return True
+    
+    script = """
+import sys
+from streamlit.testing.v1 import AppTest
+first = AppTest.from_file(sys.argv[1], default_timeout=60).run()
+workspace = first.query_params["workspace"]
+assert workspace and first.session_state["owner"] == workspace
+refreshed = AppTest.from_file(sys.argv[1], default_timeout=60)
+refreshed.query_params["workspace"] = workspace
+refreshed.run()
+assert refreshed.session_state["owner"] == workspace
+assert AppTest.from_file(sys.argv[1], default_timeout=60).run().session_state["owner"] != workspace
+"""
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = dict(os.environ, TMPDIR=tmp_dir, INTERVIEW_ANALYZER_STUB_LLM="1")
+        for store in ("JOB", "SEARCH", "DEDUP"):
+            env[f"INTERVIEW_ANALYZER_{store}_DB"] = os.path.join(tmp_dir, f"{store.lower()}.sqlite3")
+        completed = subprocess.run(
+            [sys.executable, "-c", script, app_path],
+            cwd=tmp_dir, env=env, capture_output=True, text=True, timeout=300
+        )
+        assert completed.returncode == 0, completed.stdout[-2000:] + completed.stderr[-2000:]
+    print("✅ A refreshed session keeps its workspace; a new one gets its own")
+    return True
+
+def test_load_test_app_mode():
+    """Test the load test's Streamlit AppTest sessions against app.py"""
+    print("\nTesting load test app sessions...")
+    
+    import json
+    import subprocess
+    import tempfile
+    try:
+        import streamlit  # noqa: F401
+    except ImportError:
+        print("⚠️  streamlit not installed, skipping app-mode load test")
+        return True
+    
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "load_test.py")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results_path = os.path.join(tmp_dir, "results.json")
+        env = dict(os.environ, TMPDIR=tmp_dir)
+        completed = subprocess.run(
+            [sys.executable, script, "--mode", "app", "--sessions", "2", "--actions", "4",
+             "--mix", "analyze=1,view=1,pdf=1", "--think", "0", "--llm-latency", "0", "--json", results_path],
+            cwd=tmp_dir, env=env, capture_output=True, text=True, timeout=600
+        )
+        assert completed.returncode == 0, completed.stdout[-2000:] + completed.stderr[-2000:]
+        with open(results_path) as f:
+            results = json.load(f)
+        assert results["errors"] == {} and results["actions"]["analyze"]["count"] >= 2
+        assert sum(stats["count"] for stats in results["actions"].values()) == 8
+        # Job and index databases went to a temporary directory that was removed
+        assert "data" not in os.listdir(tmp_dir)
+        assert not [name for name in os.listdir(tmp_dir) if name.startswith("load_test_")]
+    print(f"✅ {len(results['actions'])} action types replayed through AppTest without errors")
+    return True
+
+def test_transcription_server():
+    """Test the transcription server's auth handshake and chunked audio decoding"""
+    print("\nTesting transcription server...")
+    
+    import shutil
+    import tempfile
+    import threading
+    import wave
+    from multiprocessing import AuthenticationError
+    from multiprocessing import shared_memory
+    import numpy as np
+    from interview_analyzer import transcription_server
+    from interview_analyzer.transcription_server import TranscriptionServer, TranscriptionClient
+    
+    # Pickled messages are never accepted without a shared secret
+    for make in (lambda: TranscriptionServer(("127.0.0.1", 0), authkey=""),
+                 lambda: TranscriptionClient("127.0.0.1:1", authkey="")):
+        try:
+            make()
+            assert False, "expected ValueError without an authkey"
+        except ValueError:
+            pass
+    assert transcription_server.parse_address(":8765") == ("127.0.0.1", 8765)
+    
+    server = TranscriptionServer(("127.0.0.1", 0), workers=1, model_size="tiny", authkey="s3cret")
+    server.start()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        address = f"{server.address[0]}:{server.address[1]}"
+        assert TranscriptionClient(address, authkey="s3cret").ping()["model_size"] == "tiny"
+        try:
+            TranscriptionClient(address, authkey="wrong").ping()
+            assert False, "expected AuthenticationError"
+        except AuthenticationError:
+            pass
+        # A failed handshake doesn't stop the server
+        assert TranscriptionClient(address, authkey="s3cret").ping()["ok"]
+    finally:
+        server.close()
+    
+    if not shutil.which("ffmpeg"):
+        print("⚠️  ffmpeg not installed, skipping decode round-trip")
+        print("✅ Transcription server requires and checks its authkey")
+        return True
+    
+    rng = np.random.default_rng(0)
+    samples = (rng.uniform(-0.5, 0.5, 16000 * 3 + 123) * 32767).astype("<i2")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "clip.wav")
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(samples.tobytes())
+        
+        chunks = list(transcription_server.decode_pcm_chunks(path, chunk_samples=4000))
+        assert len(chunks) == 13 and max(len(chunk) for chunk in chunks) == 4000
+        assert np.array_equal(np.concatenate(chunks), samples)
+        try:
+            list(transcription_server.decode_pcm_chunks(os.path.join(tmp_dir, "missing.wav")))
+            assert False, "expected RuntimeError"
+        except RuntimeError as e:
+            assert "Failed to load audio" in str(e)
+        
+        # The client streams the decoded file into shared memory, growing it past a short estimate
+        client = TranscriptionClient("127.0.0.1:1", authkey="s3cret")
+        received = {}
+        def call(request):
+            shm = shared_memory.SharedMemory(name=request["shm"])
+            try:
+                view = np.ndarray((request["samples"],), dtype=np.float32, buffer=shm.buf)
+                received["audio"] = view.copy()
+                del view
+            finally:
+                shm.close()
+            return {"ok": True, "result": {"text": "hello"}}
+        client._call = call
+        estimate = transcription_server.estimate_samples
+        transcription_server.estimate_samples = lambda path: 1000
+        try:
+            assert client.transcribe_file(path)["text"] == "hello"
+        finally:
+            transcription_server.estimate_samples = estimate
+        assert np.allclose(received["audio"], samples / 32768.0)
+    print("✅ Authkey enforced and audio decoded in chunks into shared memory")
+    return True
+
 def main():
     """Run all tests"""
     print("=" * 50)
@@ -153,6 +1616,77 @@ def main():
     if not test_local_modules():
         all_passed = False
     
+    if not test_report_model():
+        all_passed = False
+    
+    if not test_disk_quota():
+        all_passed = False
+    
+    if not test_batch_pdf():
+        all_passed = False
+    
+    if not test_pdf_charts():
+        all_passed = False
+    
+    if not test_instrumentation():
+        all_passed = False
+    
+    if not test_job_queue():
+        all_passed = False
+    
+    if not test_stage_graph():
+        all_passed = False
+    
+    if not test_whisper_quantization():
+        all_passed = False
+    
+    if not test_model_selection():
+        all_passed = False
+    
+    if not test_pause_detection():
+        all_passed = False
+    
+    if not test_diarization():
+        all_passed = False
+    
+    if not test_group_fanout():
+        all_passed = False
+    
+    if not test_screening_windows():
+        all_passed = False
+    
+    if not test_live_transcription():
+        all_passed = False
+    
+    if not test_search_index():
+        all_passed = False
+    
+    if not test_near_duplicates():
+        all_passed = False
+    
+    if not test_facts_narrative():
+        all_passed = False
+    
+    if not test_job_pools():
+        all_passed = False
+    
+    if not test_resource_governor():
+        all_passed = False
+    
+    if not test_http_service():
+        all_passed = False
+    
+    if not test_transcription_server():
+        all_passed = False
+    
+    if not test_cold_start_imports():
+        all_passed = False
+    
+    if not test_app_workspace():
+        all_passed = False
+    if not test_load_test_app_mode():
+        all_passed = False
+    
     api_key_ok = test_api_key()
     
     if test_sentiment_analyzer():